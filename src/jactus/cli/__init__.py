@@ -204,6 +204,15 @@ def main(
     version: bool | None = typer.Option(
         None, "--version", callback=_version_callback, is_eager=True
     ),  # noqa: UP007
+    warmup: bool = typer.Option(
+        False, "--warmup", help="Pre-compile array-mode batch kernels before the command"
+    ),
+    warmup_types: str = typer.Option(
+        "all", "--warmup-types", help="Contract types to pre-compile, e.g. PAM,LAM"
+    ),
+    warmup_shapes: str = typer.Option(
+        "1024x128", "--warmup-shapes", help="Batch shapes to pre-compile, e.g. 1024x128,4096x256"
+    ),
 ) -> None:
     """JACTUS — JAX ACTUS Financial Contract Simulation."""
     # Resolve output format
@@ -225,6 +234,23 @@ def main(
         level=getattr(logging, log_level.upper(), logging.WARNING), stream=sys.stderr
     )
 
+    if warmup:
+        _run_warmup(warmup_types, warmup_shapes)
+
+
+def _run_warmup(types: str, shapes: str) -> None:
+    """Compile batch kernels up front (``--warmup``), logging the cost to stderr."""
+    from jactus.engine.warmup import parse_warmup_shapes, parse_warmup_types
+    from jactus.engine.warmup import warmup as _warmup
+
+    try:
+        report = _warmup(parse_warmup_types(types), parse_warmup_shapes(shapes))
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from None
+    logging.getLogger("jactus.cli").info(
+        "Warmup compiled %d kernels in %.1fs", len(report.compiled), report.total_seconds
+    )
+
 
 # ---------------------------------------------------------------------------
 # Register subcommand groups (imported lazily to avoid circular deps)
@@ -4,10 +4,10 @@ from __future__ import annotations
 
 import json
 import logging
-from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import typer
 
 from jactus.cli.output import (
@@ -149,12 +149,16 @@ def aggregate(
     frequency: str = typer.Option(
         "daily", "--frequency", help="Bucketing: daily, monthly, quarterly, annual"
     ),
+    by: str | None = typer.Option(  # noqa: UP007
+        None, "--by", help="Split by: contract_type, currency, label"
+    ),
     currency: str | None = typer.Option(None, "--currency", help="Display currency label"),  # noqa: UP007
 ) -> None:
     """Aggregate net cash flows across all contracts by date."""
     from jactus.cli import get_state, prepare_attributes
-    from jactus.contracts import create_contract
+    from jactus.contracts.portfolio import simulate_portfolio
     from jactus.core import ContractAttributes
+    from jactus.engine import aggregate_cashflows
 
     state = get_state()
 
@@ -163,14 +167,16 @@ def aggregate(
     except Exception as e:
         print_error(str(e))
         raise typer.Exit(code=1) from None
+    if by is not None and by not in ("contract_type", "currency", "label"):
+        print_error(f"Unknown --by '{by}'. Use contract_type, currency or label.")
+        raise typer.Exit(code=1)
 
     portfolio_id = portfolio.get("portfolio_id", "unknown")
     rf_observer = _create_observer_from_config(portfolio.get("observer"))
     valid_fields = set(ContractAttributes.model_fields.keys())
 
-    # Collect all events across all contracts
-    all_events: list[tuple[str, str, float]] = []  # (date_str, contract_id, payoff)
-
+    contracts: list[tuple[ContractAttributes, Any]] = []
+    labels: list[str] = []
     for entry in portfolio["contracts"]:
         ct = entry.get("type", "")
         raw_attrs = entry.get("attrs", {})
@@ -180,70 +186,111 @@ def aggregate(
             prepared = prepare_attributes(raw_attrs)
             prepared = {k: v for k, v in prepared.items() if k in valid_fields}
             contract_attrs = ContractAttributes(**prepared)
-            contract = create_contract(contract_attrs, rf_observer)
-            result = contract.simulate()
-
-            for event in result.events:
-                payoff = float(event.payoff)
-                if abs(payoff) > 1e-10:
-                    date_str = event.to_dict()["event_time"][:10]  # YYYY-MM-DD
-                    all_events.append((date_str, contract_attrs.contract_id, payoff))
-        except Exception:
+        except Exception as e:
+            logger.warning(f"Skipping contract {raw_attrs.get('contract_id', 'unknown')}: {e}")
             continue
+        contracts.append((contract_attrs, rf_observer))
+        labels.append(str(entry.get("label", "")))
+
+    # Composite contracts (SWAPS, CAPFL, CEG, CEC) resolve their children
+    # among the portfolio's contracts and the optional "child_contracts"
+    child_contracts = {attrs.contract_id: attrs for attrs, _ in contracts}
+    for child_id, child_raw in portfolio.get("child_contracts", {}).items():
+        try:
+            prepared = prepare_attributes(dict(child_raw))
+            prepared = {k: v for k, v in prepared.items() if k in valid_fields}
+            child_contracts[child_id] = ContractAttributes(**prepared)
+        except Exception as e:
+            logger.warning(f"Skipping child contract {child_id}: {e}")
+
+    try:
+        result = simulate_portfolio(contracts, child_contracts=child_contracts)
+    except Exception:
+        # Drop the contracts that fail on their own and keep the rest
+        kept = []
+        for i, contract in enumerate(contracts):
+            try:
+                simulate_portfolio([contract], child_contracts=child_contracts)
+            except Exception as e:
+                logger.warning(f"Skipping contract {contract[0].contract_id}: {e}")
+                continue
+            kept.append(i)
+        contracts = [contracts[i] for i in kept]
+        labels = [labels[i] for i in kept]
+        result = None
+
+    try:
+        if result is None:
+            result = simulate_portfolio(contracts, child_contracts=child_contracts)
+        per_contract = aggregate_cashflows(result, frequency, by="contract", contracts=contracts)
+        grouped = None
+        if by is not None:
+            grouped = aggregate_cashflows(
+                result, frequency, by=labels if by == "label" else by, contracts=contracts
+            )
+    except Exception as e:
+        print_error(str(e))
+        raise typer.Exit(code=1) from None
 
-    # Bucket by period — use separate dicts for type safety
-    payoff_buckets: dict[str, float] = defaultdict(float)
-    contract_buckets: dict[str, list[str]] = defaultdict(list)
-
-    for date_str, contract_id, payoff in all_events:
-        period = _to_period(date_str, frequency)
-        payoff_buckets[period] += payoff
-        if contract_id not in contract_buckets[period]:
-            contract_buckets[period].append(contract_id)
-
-    # Sort by period
-    sorted_periods = sorted(payoff_buckets.keys())
-    cashflows = [
-        {
-            "period": p,
-            "net_payoff": round(payoff_buckets[p], 2),
-            "contracts": contract_buckets[p],
-        }
-        for p in sorted_periods
-    ]
+    # Only periods with at least one non-zero cash flow are reported
+    counts = np.asarray(per_contract.counts)
+    amounts = np.asarray(per_contract.amounts)
+    live = [k for k in range(len(per_contract.periods)) if counts[:, k].any()]
+    cashflows: list[dict[str, Any]] = []
+    if grouped is None:
+        for k in live:
+            cashflows.append(
+                {
+                    "period": per_contract.periods[k],
+                    "net_payoff": round(float(amounts[:, k].sum()), 2),
+                    "contracts": [per_contract.groups[i] for i in np.flatnonzero(counts[:, k])],
+                }
+            )
+    else:
+        group_counts = np.asarray(grouped.counts)
+        group_amounts = np.asarray(grouped.amounts)
+        for g, group in enumerate(grouped.groups):
+            for k in live:
+                if group_counts[g, k]:
+                    cashflows.append(
+                        {
+                            "group": group,
+                            "period": grouped.periods[k],
+                            "net_payoff": round(float(group_amounts[g, k]), 2),
+                        }
+                    )
 
     output: dict[str, Any] = {
         "portfolio_id": portfolio_id,
         "frequency": frequency,
         "cashflows": cashflows,
     }
+    if by is not None:
+        output["by"] = by
     if currency:
         output["currency"] = currency
 
     if state.output == OutputFormat.JSON:
         print_json(output, state.pretty)
-    else:
+    elif grouped is None:
         table_rows: list[list[str]] = []
         for cf in cashflows:
-            net = float(cf["net_payoff"])  # type: ignore[arg-type]
-            contracts: list[str] = cf["contracts"]  # type: ignore[assignment]
-            table_rows.append([str(cf["period"]), format_currency(net), ", ".join(contracts)])
+            net = float(cf["net_payoff"])
+            contract_ids: list[str] = cf["contracts"]
+            table_rows.append([str(cf["period"]), format_currency(net), ", ".join(contract_ids)])
         print_table(
             f"AGGREGATE: {portfolio_id} ({frequency})",
             ["Period", "Net Payoff", "Contracts"],
             table_rows,
             state.no_color,
         )
-
-
-def _to_period(date_str: str, frequency: str) -> str:
-    """Convert a YYYY-MM-DD date to a period string."""
-    if frequency == "monthly":
-        return date_str[:7]  # YYYY-MM
-    if frequency == "quarterly":
-        month = int(date_str[5:7])
-        quarter = (month - 1) // 3 + 1
-        return f"{date_str[:4]}-Q{quarter}"
-    if frequency == "annual":
-        return date_str[:4]
-    return date_str  # daily
+    else:
+        print_table(
+            f"AGGREGATE: {portfolio_id} ({frequency}, by {by})",
+            ["Group", "Period", "Net Payoff"],
+            [
+                [str(cf["group"]), str(cf["period"]), format_currency(float(cf["net_payoff"]))]
+                for cf in cashflows
+            ],
+            state.no_color,
+        )
@@ -1,4 +1,10 @@
-"""``jactus risk`` subcommands: dv01, duration, convexity, sensitivities."""
+"""``jactus risk`` subcommands: dv01, duration, convexity, sensitivities, portfolio.
+
+Contracts with a differentiable batch kernel (see
+:func:`jactus.risk.is_differentiable`) get every metric from one compiled
+forward-over-reverse evaluation; the rest fall back to central finite
+differences over the scalar engine.
+"""
 
 from __future__ import annotations
 
@@ -19,29 +25,48 @@ risk_app = typer.Typer(no_args_is_help=True)
 # ---------------------------------------------------------------------------
 
 
+def _contract_attributes(raw_attrs: dict[str, Any]) -> Any:
+    """Build ``ContractAttributes`` from raw CLI attributes."""
+    from jactus.cli import prepare_attributes
+    from jactus.core import ContractAttributes
+
+    prepared = prepare_attributes(dict(raw_attrs))
+    valid_fields = set(ContractAttributes.model_fields.keys())
+    prepared = {k: v for k, v in prepared.items() if k in valid_fields}
+    return ContractAttributes(**prepared)
+
+
+def _is_differentiable(raw_attrs: dict[str, Any]) -> bool:
+    """Whether the contract can be valued by a differentiable batch kernel."""
+    from jactus.risk import is_differentiable
+
+    try:
+        return is_differentiable(_contract_attributes(raw_attrs))
+    except Exception:
+        # Invalid attributes fail on the finite-difference path instead
+        return False
+
+
 def _simulate_npv(
-    raw_attrs: dict[str, Any], rate_override: float | None = None
+    raw_attrs: dict[str, Any],
+    rate_override: float | None = None,
+    rf_observer: Any = None,
 ) -> tuple[float, str]:
     """Simulate a contract and return (NPV, contract_id).
 
     NPV is the sum of payoffs discounted at the contract's nominal interest rate.
     If *rate_override* is provided, it replaces nominal_interest_rate.
     """
-    from jactus.cli import prepare_attributes
     from jactus.contracts import create_contract
-    from jactus.core import ContractAttributes
     from jactus.observers import ConstantRiskFactorObserver
 
     attrs = dict(raw_attrs)
     if rate_override is not None:
         attrs["nominal_interest_rate"] = rate_override
+    contract_attrs = _contract_attributes(attrs)
 
-    prepared = prepare_attributes(attrs)
-    valid_fields = set(ContractAttributes.model_fields.keys())
-    prepared = {k: v for k, v in prepared.items() if k in valid_fields}
-    contract_attrs = ContractAttributes(**prepared)
-
-    rf_observer = ConstantRiskFactorObserver(constant_value=0.0)
+    if rf_observer is None:
+        rf_observer = ConstantRiskFactorObserver(constant_value=0.0)
     contract = create_contract(contract_attrs, rf_observer)
     result = contract.simulate()
 
@@ -56,7 +81,7 @@ def _simulate_npv(
             if abs(payoff) < 1e-10:
                 continue
             # Years from status date to event time
-            days = event.event_time.days_between(contract_attrs.status_date)
+            days = contract_attrs.status_date.days_between(event.event_time)
             years = days / 365.25
             if years > 0 and discount_rate > 0:
                 npv += payoff / ((1 + discount_rate) ** years)
@@ -66,39 +91,107 @@ def _simulate_npv(
     return npv, contract_attrs.contract_id
 
 
-def _compute_dv01(raw_attrs: dict[str, Any], bump: float = 0.0001) -> float:
+def _compute_dv01(
+    raw_attrs: dict[str, Any], bump: float = 0.0001, rf_observer: Any = None
+) -> float:
     """Compute DV01 using central finite difference."""
     base_rate = float(raw_attrs.get("nominal_interest_rate", 0.0))
-    npv_up, _ = _simulate_npv(raw_attrs, base_rate + bump / 2)
-    npv_down, _ = _simulate_npv(raw_attrs, base_rate - bump / 2)
+    npv_up, _ = _simulate_npv(raw_attrs, base_rate + bump / 2, rf_observer)
+    npv_down, _ = _simulate_npv(raw_attrs, base_rate - bump / 2, rf_observer)
     return npv_up - npv_down
 
 
-def _compute_duration(raw_attrs: dict[str, Any], bump: float = 0.0001) -> tuple[float, float]:
+def _compute_duration(
+    raw_attrs: dict[str, Any], bump: float = 0.0001, rf_observer: Any = None
+) -> tuple[float, float]:
     """Compute (modified_duration, macaulay_duration)."""
     base_rate = float(raw_attrs.get("nominal_interest_rate", 0.0))
-    npv_base, _ = _simulate_npv(raw_attrs)
+    npv_base, _ = _simulate_npv(raw_attrs, rf_observer=rf_observer)
     if abs(npv_base) < 1e-10:
         return 0.0, 0.0
 
-    dv01 = _compute_dv01(raw_attrs, bump)
+    dv01 = _compute_dv01(raw_attrs, bump, rf_observer)
     modified = -dv01 / (npv_base * bump)
     macaulay = modified * (1 + base_rate)
     return modified, macaulay
 
 
-def _compute_convexity(raw_attrs: dict[str, Any], bump: float = 0.0001) -> float:
+def _compute_convexity(
+    raw_attrs: dict[str, Any], bump: float = 0.0001, rf_observer: Any = None
+) -> float:
     """Compute convexity using central finite difference."""
     base_rate = float(raw_attrs.get("nominal_interest_rate", 0.0))
-    npv_base, _ = _simulate_npv(raw_attrs)
+    npv_base, _ = _simulate_npv(raw_attrs, rf_observer=rf_observer)
     if abs(npv_base) < 1e-10:
         return 0.0
 
-    npv_up, _ = _simulate_npv(raw_attrs, base_rate + bump)
-    npv_down, _ = _simulate_npv(raw_attrs, base_rate - bump)
+    npv_up, _ = _simulate_npv(raw_attrs, base_rate + bump, rf_observer)
+    npv_down, _ = _simulate_npv(raw_attrs, base_rate - bump, rf_observer)
     return (npv_up + npv_down - 2 * npv_base) / (npv_base * bump * bump)
 
 
+def _ad_metrics(
+    raws: list[dict[str, Any]], bump: float = 0.0001, rf_observer: Any = None
+) -> list[dict[str, float]]:
+    """All metrics for differentiable contracts from one batched AD evaluation."""
+    from jactus.observers import ConstantRiskFactorObserver
+    from jactus.risk import rate_sensitivities
+
+    if rf_observer is None:
+        rf_observer = ConstantRiskFactorObserver(constant_value=0.0)
+    risk = rate_sensitivities([(_contract_attributes(r), rf_observer) for r in raws], bump)
+    return [
+        {
+            "npv": float(risk.present_values[i]),
+            "dv01": float(risk.dv01[i]),
+            "modified_duration": float(risk.modified_duration[i]),
+            "macaulay_duration": float(risk.macaulay_duration[i]),
+            "convexity": float(risk.convexity[i]),
+        }
+        for i in range(len(raws))
+    ]
+
+
+def _fd_metrics(
+    raw_attrs: dict[str, Any],
+    requested: set[str],
+    bump: float = 0.0001,
+    rf_observer: Any = None,
+) -> dict[str, float]:
+    """Requested metrics for one contract by finite differences."""
+    metrics: dict[str, float] = {"npv": _simulate_npv(raw_attrs, rf_observer=rf_observer)[0]}
+    if "dv01" in requested:
+        metrics["dv01"] = _compute_dv01(raw_attrs, bump, rf_observer)
+    if "duration" in requested:
+        mod, mac = _compute_duration(raw_attrs, bump, rf_observer)
+        metrics["modified_duration"] = mod
+        metrics["macaulay_duration"] = mac
+    if "convexity" in requested:
+        metrics["convexity"] = _compute_convexity(raw_attrs, rf_observer=rf_observer)
+    return metrics
+
+
+_METRIC_UNITS = {
+    "dv01": "USD/bp",
+    "modified_duration": "years",
+    "macaulay_duration": "years",
+    "convexity": "years^2",
+}
+
+
+# Requested metric name -> output keys
+_METRIC_KEYS = {
+    "dv01": ("dv01",),
+    "duration": ("modified_duration", "macaulay_duration"),
+    "convexity": ("convexity",),
+}
+
+
+def _select_metrics(metrics: dict[str, float], requested: set[str]) -> dict[str, float]:
+    """Keep the output keys of the requested metric names."""
+    return {k: metrics[k] for name, keys in _METRIC_KEYS.items() if name in requested for k in keys}
+
+
 # ---------------------------------------------------------------------------
 # Commands
 # ---------------------------------------------------------------------------
@@ -124,7 +217,10 @@ def dv01(
     raw.setdefault("contract_type", contract_type.upper())
 
     try:
-        val = _compute_dv01(raw, bump)
+        if _is_differentiable(raw):
+            val = _ad_metrics([raw], bump)[0]["dv01"]
+        else:
+            val = _compute_dv01(raw, bump)
         contract_id = raw.get("contract_id", "unknown")
         result = {
             "contract_id": contract_id,
@@ -163,7 +259,11 @@ def duration(
     raw.setdefault("contract_type", contract_type.upper())
 
     try:
-        modified, macaulay = _compute_duration(raw)
+        if _is_differentiable(raw):
+            metrics = _ad_metrics([raw])[0]
+            modified, macaulay = metrics["modified_duration"], metrics["macaulay_duration"]
+        else:
+            modified, macaulay = _compute_duration(raw)
         result = {
             "contract_id": raw.get("contract_id", "unknown"),
             "metric": "duration",
@@ -202,7 +302,10 @@ def convexity(
     raw.setdefault("contract_type", contract_type.upper())
 
     try:
-        val = _compute_convexity(raw)
+        if _is_differentiable(raw):
+            val = _ad_metrics([raw])[0]["convexity"]
+        else:
+            val = _compute_convexity(raw)
         result = {
             "contract_id": raw.get("contract_id", "unknown"),
             "metric": "convexity",
@@ -252,24 +355,12 @@ def sensitivities(
             "sensitivities": {},
         }
 
-        if "dv01" in requested:
-            val = _compute_dv01(raw)
-            result["sensitivities"]["dv01"] = {"value": round(val, 6), "units": "USD/bp"}
-
-        if "duration" in requested:
-            mod, mac = _compute_duration(raw)
-            result["sensitivities"]["modified_duration"] = {
-                "value": round(mod, 6),
-                "units": "years",
-            }
-            result["sensitivities"]["macaulay_duration"] = {
-                "value": round(mac, 6),
-                "units": "years",
-            }
-
-        if "convexity" in requested:
-            val = _compute_convexity(raw)
-            result["sensitivities"]["convexity"] = {"value": round(val, 6), "units": "years^2"}
+        if _is_differentiable(raw):
+            values = _ad_metrics([raw])[0]
+        else:
+            values = _fd_metrics(raw, requested)
+        for name, val in _select_metrics(values, requested).items():
+            result["sensitivities"][name] = {"value": round(val, 6), "units": _METRIC_UNITS[name]}
 
         if state.output == OutputFormat.JSON:
             print_json(result, state.pretty)
@@ -287,3 +378,105 @@ def sensitivities(
     except Exception as e:
         print_error(f"Risk computation error: {e}")
         raise typer.Exit(code=2) from None
+
+
+@risk_app.command("portfolio")
+def portfolio(
+    file: str = typer.Option(..., "--file", help="Path to portfolio JSON file"),
+    metrics: str | None = typer.Option(
+        None, "--metrics", help="Comma-separated: dv01,duration,convexity"
+    ),  # noqa: UP007
+    bump: float = typer.Option(0.0001, "--bump", help="Rate bump size (default: 1bp)"),
+) -> None:
+    """Compute risk sensitivities for every contract in a portfolio file.
+
+    Differentiable contract types are valued together in one batched AD
+    evaluation per type; the rest are bumped one by one.
+    """
+    from jactus.cli import get_state
+    from jactus.cli.portfolio import _create_observer_from_config, _load_portfolio
+
+    state = get_state()
+    try:
+        data = _load_portfolio(file)
+    except Exception as e:
+        print_error(str(e))
+        raise typer.Exit(code=1) from None
+
+    requested = {"dv01", "duration", "convexity"}
+    if metrics:
+        requested = {m.strip().lower() for m in metrics.split(",")}
+
+    rf_observer = _create_observer_from_config(data.get("observer"))
+    raws = []
+    for spec in data["contracts"]:
+        raw = dict(spec.get("attrs", {}))
+        raw.setdefault("contract_type", str(spec.get("type", "")).upper())
+        raws.append(raw)
+
+    ad_rows = [i for i, raw in enumerate(raws) if _is_differentiable(raw)]
+    results: list[dict[str, Any]] = [{} for _ in raws]
+    try:
+        ad_metrics = _ad_metrics([raws[i] for i in ad_rows], bump, rf_observer) if ad_rows else []
+    except Exception as e:
+        print_error(f"Risk computation error: {e}")
+        raise typer.Exit(code=2) from None
+    for i, m in zip(ad_rows, ad_metrics, strict=True):
+        results[i] = {"method": "ad", **m}
+    for i, raw in enumerate(raws):
+        if results[i]:
+            continue
+        try:
+            results[i] = {
+                "method": "finite_difference",
+                **_fd_metrics(raw, requested, bump, rf_observer),
+            }
+        except Exception as e:
+            results[i] = {"status": "error", "error": str(e)}
+
+    contracts_output: list[dict[str, Any]] = []
+    total_npv = 0.0
+    total_dv01 = 0.0
+    for raw, res in zip(raws, results, strict=True):
+        entry: dict[str, Any] = {
+            "contract_id": raw.get("contract_id", "unknown"),
+            "contract_type": raw["contract_type"],
+        }
+        if "error" in res:
+            contracts_output.append({**entry, **res})
+            continue
+        total_npv += res["npv"]
+        total_dv01 += res.get("dv01", 0.0)
+        entry["method"] = res["method"]
+        entry["npv"] = round(res["npv"], 6)
+        entry["sensitivities"] = {
+            name: {"value": round(val, 6), "units": _METRIC_UNITS[name]}
+            for name, val in _select_metrics(res, requested).items()
+        }
+        contracts_output.append(entry)
+
+    output: dict[str, Any] = {
+        "portfolio_id": data.get("portfolio_id", "unknown"),
+        "contracts": contracts_output,
+        "aggregate": {"npv": round(total_npv, 6)},
+    }
+    if "dv01" in requested:
+        output["aggregate"]["dv01"] = round(total_dv01, 6)
+
+    if state.output == OutputFormat.JSON:
+        print_json(output, state.pretty)
+    else:
+        names = [k for name, keys in _METRIC_KEYS.items() if name in requested for k in keys]
+        rows = []
+        for c in contracts_output:
+            if "error" in c:
+                rows.append([c["contract_id"], c["contract_type"], "ERROR", c["error"]])
+                continue
+            values = [str(c["sensitivities"][n]["value"]) for n in names]
+            rows.append([c["contract_id"], c["contract_type"], str(c["npv"]), *values])
+        print_table(
+            f"RISK: {output['portfolio_id']}",
+            ["Contract", "Type", "NPV", *names],
+            rows,
+            state.no_color,
+        )
@@ -33,6 +33,8 @@ Example::
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable, Sequence
 from datetime import datetime as _datetime
 from typing import Any
 
@@ -47,8 +49,19 @@ from jactus.contracts.array_common import (
 # Import shared infrastructure from array_common
 from jactus.contracts.array_common import (
     NOP_EVENT_IDX,
+    CanonicalShapes,
+    PrecisionPolicy,
+    RFScenarios,
+    check_scenario_options,
     # Schedule helpers
     get_yf_fn,
+    pad_event_ordinals,
+    precision_scope,
+    precompute_raw_list,
+    prepayment_inputs,
+    resolve_precision,
+    run_batch_kernel,
+    simulate_scenarios,
 )
 from jactus.contracts.array_common import (
     PRF_IDX as _PRF_IDX,
@@ -80,9 +93,15 @@ from jactus.contracts.array_common import (
 from jactus.contracts.array_common import (
     get_role_sign as _get_role_sign,
 )
+from jactus.contracts.array_common import (
+    merge_prepayment_events as _merge_prepayment_events,
+)
 from jactus.contracts.array_common import (
     prequery_risk_factors as _prequery_risk_factors,
 )
+from jactus.contracts.array_common import (
+    state_dtype as _state_dtype,
+)
 
 # ---------------------------------------------------------------------------
 # Reuse NAM's kernel, state, and params -- ANN is numerically identical
@@ -94,6 +113,7 @@ from jactus.contracts.nam_array import (
     _params_raw_to_jax,
     batch_simulate_nam,
     batch_simulate_nam_auto,
+    batch_simulate_nam_prepayment,
     simulate_nam_array,
     simulate_nam_array_jit,
 )
@@ -141,6 +161,7 @@ simulate_ann_array_jit = simulate_nam_array_jit
 
 batch_simulate_ann = batch_simulate_nam
 batch_simulate_ann_auto = batch_simulate_nam_auto
+batch_simulate_ann_prepayment = batch_simulate_nam_prepayment
 batch_simulate_ann_vmap = jax.vmap(simulate_ann_array)
 
 
@@ -370,7 +391,9 @@ def _precompute_raw(
     from jactus.core.types import DayCountConvention
 
     # 1. Schedule generation via AnnuityContract (handles PRF events)
-    schedule = _fallback_ann_schedule(attrs, rf_observer)
+    schedule = _merge_prepayment_events(
+        _fallback_ann_schedule(attrs, rf_observer), attrs, rf_observer
+    )
 
     # 2. State initialization via AnnuityContract (handles annuity formula)
     nt, ipnr, ipac, feac, nsc, isc, prnxt, ipcb, init_sd_dt = _fast_ann_init_state(
@@ -408,6 +431,7 @@ def _precompute_raw(
         year_fractions=yf_list,
         rf_values=rf_list,
         params=params_raw,
+        event_ordinals=[evt_dt.toordinal() for _, evt_dt, _ in schedule],
     )
 
 
@@ -423,7 +447,9 @@ def _precompute_raw_da(
     from jactus.core.types import DayCountConvention
 
     # 1. Schedule
-    schedule = _fallback_ann_schedule(attrs, rf_observer)
+    schedule = _merge_prepayment_events(
+        _fallback_ann_schedule(attrs, rf_observer), attrs, rf_observer
+    )
 
     # 2. State initialization
     nt, ipnr, ipac, feac, nsc, isc, prnxt, ipcb, init_sd_dt = _fast_ann_init_state(
@@ -459,6 +485,7 @@ def _precompute_raw_da(
         year_fractions=yf_list,
         rf_values=rf_list,
         params=params_raw,
+        event_ordinals=[evt_dt.toordinal() for _, evt_dt, _ in schedule],
     )
 
 
@@ -522,6 +549,7 @@ def _raw_list_to_jax_batch(
     Pads shorter contracts with NOP events and builds NumPy arrays first
     (fast C-level construction) then transfers to JAX via ``jnp.asarray``.
     """
+    float_dtype = _state_dtype()
     max_events = max(len(r.event_types) for r in raw_list)
 
     # State fields: (batch,) each -- ANN has 8 state fields (same as NAM)
@@ -556,20 +584,20 @@ def _raw_list_to_jax_batch(
 
     # Build NumPy arrays first (fast C-level), then transfer to JAX
     batched_states = ANNArrayState(
-        nt=jnp.asarray(np.array(state_nt, dtype=np.float32)),
-        ipnr=jnp.asarray(np.array(state_ipnr, dtype=np.float32)),
-        ipac=jnp.asarray(np.array(state_ipac, dtype=np.float32)),
-        feac=jnp.asarray(np.array(state_feac, dtype=np.float32)),
-        nsc=jnp.asarray(np.array(state_nsc, dtype=np.float32)),
-        isc=jnp.asarray(np.array(state_isc, dtype=np.float32)),
-        prnxt=jnp.asarray(np.array(state_prnxt, dtype=np.float32)),
-        ipcb=jnp.asarray(np.array(state_ipcb, dtype=np.float32)),
+        nt=jnp.asarray(np.array(state_nt, dtype=float_dtype)),
+        ipnr=jnp.asarray(np.array(state_ipnr, dtype=float_dtype)),
+        ipac=jnp.asarray(np.array(state_ipac, dtype=float_dtype)),
+        feac=jnp.asarray(np.array(state_feac, dtype=float_dtype)),
+        nsc=jnp.asarray(np.array(state_nsc, dtype=float_dtype)),
+        isc=jnp.asarray(np.array(state_isc, dtype=float_dtype)),
+        prnxt=jnp.asarray(np.array(state_prnxt, dtype=float_dtype)),
+        ipcb=jnp.asarray(np.array(state_ipcb, dtype=float_dtype)),
     )
 
     batched_et = jnp.asarray(np.array(et_batch, dtype=np.int32))
-    batched_yf = jnp.asarray(np.array(yf_batch, dtype=np.float32))
-    batched_rf = jnp.asarray(np.array(rf_batch, dtype=np.float32))
-    batched_masks = jnp.asarray(np.array(mask_batch, dtype=np.float32))
+    batched_yf = jnp.asarray(np.array(yf_batch, dtype=float_dtype))
+    batched_rf = jnp.asarray(np.array(rf_batch, dtype=float_dtype))
+    batched_masks = jnp.asarray(np.array(mask_batch, dtype=float_dtype))
 
     _int_fields = {"fee_basis", "penalty_type", "ipcb_mode"}
     batched_params = ANNArrayParams(
@@ -577,7 +605,7 @@ def _raw_list_to_jax_batch(
             k: jnp.asarray(
                 np.array(
                     param_fields[k],
-                    dtype=np.int32 if k in _int_fields else np.float32,
+                    dtype=np.int32 if k in _int_fields else float_dtype,
                 )
             )
             for k in ANNArrayParams._fields
@@ -589,6 +617,7 @@ def _raw_list_to_jax_batch(
 
 def prepare_ann_batch(
     contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
 ) -> tuple[ANNArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, ANNArrayParams, jnp.ndarray]:
     """Pre-compute and pad arrays for a batch of ANN contracts.
 
@@ -596,19 +625,42 @@ def prepare_ann_batch(
 
     Args:
         contracts: List of ``(attributes, rf_observer)`` pairs.
+        workers: If greater than 1, run the per-contract pre-computation
+            in a pool of this many processes (see
+            :func:`~jactus.contracts.array_common.precompute_raw_list`).
 
     Returns:
         ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
         where each array has a leading batch dimension.
     """
-    raw_list = [_precompute_raw(attrs, obs) for attrs, obs in contracts]
-    return _raw_list_to_jax_batch(raw_list)
+    return _prepare_ann_batch_dated(contracts, workers)[0]
+
+
+def _prepare_ann_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
+) -> tuple[
+    tuple[ANNArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, ANNArrayParams, jnp.ndarray],
+    jnp.ndarray,
+]:
+    """``prepare_ann_batch`` plus the ``[B, T]`` int32 event ordinals."""
+    raw_list = precompute_raw_list(_precompute_raw, contracts, workers)
+    batch = _raw_list_to_jax_batch(raw_list)
+    return batch, pad_event_ordinals([r.event_ordinals for r in raw_list], batch[1].shape[1])
 
 
 def simulate_ann_portfolio(
     contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
     discount_rate: float | None = None,
     year_fractions_from_valuation: jnp.ndarray | None = None,
+    length_buckets: int | None = None,
+    pad_shape: tuple[int, int] | None = None,
+    devices: int | Sequence[Any] | None = None,
+    canonical_shapes: CanonicalShapes | bool | None = None,
+    precision: PrecisionPolicy | str | None = None,
+    rf_scenarios: RFScenarios | None = None,
+    scenario_output: str = "payoffs",
+    scenario_batch_size: int | None = None,
 ) -> dict[str, Any]:
     """End-to-end portfolio simulation with optional PV.
 
@@ -619,11 +671,43 @@ def simulate_ann_portfolio(
             from valuation date for PV discounting.  If ``None`` and
             ``discount_rate`` is set, year fractions are computed from each
             contract's ``status_date``.
+        length_buckets: If set, sort contracts by event count and
+            simulate them in at most this many length buckets, each
+            trimmed to its own longest contract, instead of padding the
+            whole batch to the longest one.
+        pad_shape: If set, pad the batch to at least ``(rows, events)``
+            (events rounded up to a power of two) so repeated calls reuse
+            one compiled kernel; used by chunked streaming.
+        devices: If set, shard the batch axis across this many JAX devices
+            (or this list of devices); results come back in input order.
+        canonical_shapes: If set, pad the batch up to canonical sizes
+            (``True`` for powers of two, or a ``CanonicalShapes`` of
+            allowed sizes) so portfolios of similar size reuse one
+            compiled kernel.
+        precision: Precision policy (``"f32"``, ``"f64"``, ``"mixed"`` or a
+            ``PrecisionPolicy``); defaults to the active policy.  Sets the
+            dtype of the prepared batch and of payoff and PV accumulation.
+        rf_scenarios: If set, an ``[S, B, T]`` array of risk-factor values
+            (or a callable ``(event_ordinals, rf_values) -> [S, B, T]``)
+            run against the shared schedules and parameters in one
+            compiled call; see
+            :func:`~jactus.contracts.array_common.simulate_scenarios`.
+        scenario_output: ``"payoffs"``, ``"totals"`` or ``"portfolio"``
+            (sum over contracts on device), with ``rf_scenarios``.
+        scenario_batch_size: Scenarios evaluated at once with
+            ``rf_scenarios``; ``None`` runs them all together.
 
     Returns:
-        Dict with ``payoffs``, ``masks``, ``final_states``, and optionally
-        ``present_values`` and ``total_pv``.
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``,
+        ``final_states``, optionally ``present_values`` and ``total_pv``, and
+        ``length_buckets`` (the :class:`LengthBuckets` plan) or
+        ``padded_shape`` when bucketing or padding.  With ``rf_scenarios``
+        the totals and present values gain a leading ``[S]`` axis (see
+        :func:`~jactus.contracts.array_common.simulate_scenarios`).
     """
+    policy = resolve_precision(precision)
+    with precision_scope(policy):
+        batch, event_ordinals = _prepare_ann_batch_dated(contracts)
     (
         batched_states,
         batched_et,
@@ -631,24 +715,67 @@ def simulate_ann_portfolio(
         batched_rf,
         batched_params,
         batched_masks,
-    ) = prepare_ann_batch(contracts)
+    ) = batch
+    prepayment = prepayment_inputs(contracts, batched_et, event_ordinals, batched_rf.dtype)
+
+    if rf_scenarios is not None:
+        if prepayment is not None:
+            raise ValueError("rf_scenarios cannot be combined with in-kernel prepayment")
+        check_scenario_options(
+            length_buckets=length_buckets,
+            pad_shape=pad_shape,
+            devices=devices,
+            canonical_shapes=canonical_shapes,
+        )
+        scenario_result = simulate_scenarios(
+            batch_simulate_ann_auto,
+            batched_states,
+            (batched_et, batched_yf, batched_rf),
+            batched_params,
+            batched_masks,
+            event_ordinals,
+            rf_scenarios,
+            accumulate_dtype=policy.accumulate_dtype,
+            discount_rate=discount_rate,
+            year_fractions_from_valuation=year_fractions_from_valuation,
+            output=scenario_output,
+            scenario_batch_size=scenario_batch_size,
+        )
+        scenario_result["num_contracts"] = len(contracts)
+        return scenario_result
 
     # Run batched simulation
-    final_states, payoffs = batch_simulate_ann_auto(
-        batched_states, batched_et, batched_yf, batched_rf, batched_params
+    simulate_fn: Callable[..., tuple[Any, jnp.ndarray]] = batch_simulate_ann_auto
+    event_arrays: tuple[jnp.ndarray, ...] = (batched_et, batched_yf, batched_rf)
+    if prepayment is not None:
+        # PP amounts come from the surface and the live scan state
+        simulate_fn = functools.partial(batch_simulate_ann_prepayment, surfaces=prepayment.surfaces)
+        event_arrays += (prepayment.market_rates, prepayment.loan_ages, prepayment.surface_ids)
+    final_states, payoffs, layout = run_batch_kernel(
+        simulate_fn,
+        batched_states,
+        event_arrays,
+        batched_params,
+        batched_masks,
+        length_buckets=length_buckets,
+        pad_shape=pad_shape,
+        devices=devices,
+        canonical_shapes=canonical_shapes,
     )
 
     # Mask padding
-    masked_payoffs = payoffs * batched_masks
+    masked_payoffs = payoffs.astype(policy.accumulate_dtype) * batched_masks
     total_cashflows = jnp.sum(masked_payoffs, axis=1)
 
     result: dict[str, Any] = {
         "payoffs": masked_payoffs,
         "masks": batched_masks,
+        "event_ordinals": event_ordinals,
         "final_states": final_states,
         "total_cashflows": total_cashflows,
         "num_contracts": len(contracts),
     }
+    result.update(layout)
 
     if discount_rate is not None:
         # Use cumulative year fractions for discounting
@@ -656,7 +783,7 @@ def simulate_ann_portfolio(
             disc_yfs = year_fractions_from_valuation
         else:
             # Approximate: use cumulative sum of per-event year fractions
-            disc_yfs = jnp.cumsum(batched_yf, axis=1)
+            disc_yfs = jnp.cumsum(batched_yf.astype(policy.accumulate_dtype), axis=1)
         discount_factors = 1.0 / (1.0 + discount_rate * disc_yfs)
         pvs = jnp.sum(masked_payoffs * discount_factors, axis=1)
         result["present_values"] = pvs
@@ -9,20 +9,34 @@ Extracted from ``pam_array.py`` to avoid code duplication across contract types.
 
 from __future__ import annotations
 
+import atexit as _atexit
+import functools as _functools
+import math
+import os as _os
 import re as _re
-from collections.abc import Callable, Sequence
+import threading as _threading
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime as _datetime
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 if TYPE_CHECKING:
     from jactus.core.types import DayCountConvention
     from jactus.observers import RiskFactorObserver
+    from jactus.utilities.surface import Surface2D
 
 import jax.numpy as jnp
 import numpy as np
 
 from jactus.core import ActusDateTime, ContractAttributes, ContractRole, EventType
 from jactus.core.types import NUM_EVENT_TYPES
+from jactus.observers.prepayment import PrepaymentSurfaceObserver
+from jactus.observers.risk_factor import (
+    DAYS_PER_YEAR,
+    CurveRiskFactorObserver,
+    JaxCurveRiskFactorObserver,
+)
 from jactus.utilities.conventions import year_fraction
 
 # ---------------------------------------------------------------------------
@@ -41,6 +55,114 @@ USE_DATE_ARRAY: bool = True
 #: Batch schedule feature flag — enables JAX-native batch schedule generation.
 USE_BATCH_SCHEDULE: bool = True
 
+#: Environment variable naming a persistent XLA compilation cache directory,
+#: applied when ``array_common`` is first imported.
+ENV_COMPILATION_CACHE_DIR = "ACTUS_JAX_COMPILATION_CACHE_DIR"
+
+# ---------------------------------------------------------------------------
+# Precision policy
+# ---------------------------------------------------------------------------
+
+
+class PrecisionPolicy(NamedTuple):
+    """Floating-point dtypes used by the batch path.
+
+    Attributes:
+        name: Policy name (``"f32"``, ``"f64"`` or ``"mixed"``).
+        state_dtype: dtype of the prepared batch arrays and therefore of the
+            scan state and per-event payoffs.
+        accumulate_dtype: dtype in which payoffs are masked, summed into
+            totals and discounted into present values.
+    """
+
+    name: str
+    state_dtype: type[np.floating[Any]]
+    accumulate_dtype: type[np.floating[Any]]
+
+    @property
+    def needs_x64(self) -> bool:
+        """Whether the policy needs ``jax_enable_x64``."""
+        return np.float64 in (self.state_dtype, self.accumulate_dtype)
+
+
+#: Named precision policies: pure float32 (fastest, the default), pure
+#: float64, and float32 state with float64 payoff and PV accumulation.
+PRECISION_POLICIES: dict[str, PrecisionPolicy] = {
+    "f32": PrecisionPolicy("f32", np.float32, np.float32),
+    "f64": PrecisionPolicy("f64", np.float64, np.float64),
+    "mixed": PrecisionPolicy("mixed", np.float32, np.float64),
+}
+
+# The process-wide default lives in a module global so every thread sees
+# it; precision_scope overrides it per context (thread or asyncio task).
+_DEFAULT_PRECISION: PrecisionPolicy = PRECISION_POLICIES["f32"]
+_PRECISION: ContextVar[PrecisionPolicy | None] = ContextVar("jactus_precision", default=None)
+
+
+def resolve_precision(policy: PrecisionPolicy | str | None = None) -> PrecisionPolicy:
+    """Resolve a policy name or instance; ``None`` means the active policy.
+
+    Raises:
+        ValueError: If the name is unknown, or the policy needs float64
+            and ``jax_enable_x64`` is off (JAX would silently downcast).
+    """
+    if policy is None:
+        return get_precision()
+    if isinstance(policy, str):
+        if policy not in PRECISION_POLICIES:
+            raise ValueError(
+                f"Unknown precision policy {policy!r}; use one of {sorted(PRECISION_POLICIES)}"
+            )
+        policy = PRECISION_POLICIES[policy]
+    if policy.needs_x64:
+        if jnp.zeros(()).dtype != jnp.float64:
+            raise ValueError(
+                f"Precision policy {policy.name!r} needs float64; call "
+                f'jax.config.update("jax_enable_x64", True) before importing JACTUS'
+            )
+    return policy
+
+
+def get_precision() -> PrecisionPolicy:
+    """Return the active precision policy."""
+    policy = _PRECISION.get()
+    return _DEFAULT_PRECISION if policy is None else policy
+
+
+def set_precision(policy: PrecisionPolicy | str) -> PrecisionPolicy:
+    """Set the process-wide default precision policy.
+
+    The default is shared by all threads.  Inside a
+    :func:`precision_scope` block the scope's policy still wins.
+
+    Returns:
+        The previous default policy.
+    """
+    global _DEFAULT_PRECISION
+    previous = _DEFAULT_PRECISION
+    _DEFAULT_PRECISION = resolve_precision(policy)
+    return previous
+
+
+@contextmanager
+def precision_scope(policy: PrecisionPolicy | str | None) -> Iterator[PrecisionPolicy]:
+    """Activate ``policy`` for the ``with`` block (``None`` keeps the current one).
+
+    The override is local to the current thread or asyncio task.
+    """
+    active = resolve_precision(policy)
+    token = _PRECISION.set(active)
+    try:
+        yield active
+    finally:
+        _PRECISION.reset(token)
+
+
+def state_dtype() -> type[np.floating[Any]]:
+    """NumPy float dtype for prepared batch arrays under the active policy."""
+    return get_precision().state_dtype
+
+
 # ---------------------------------------------------------------------------
 # Cached EventType index values for fast comparison
 # ---------------------------------------------------------------------------
@@ -129,6 +251,48 @@ def dt_to_adt(dt: _datetime) -> ActusDateTime:
     return ActusDateTime(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second)
 
 
+def settlement_dt(
+    base: ActusDateTime, attrs: ContractAttributes, adjust: bool = False
+) -> _datetime:
+    """Offset ``base`` by the contract's settlement period (``STD`` event date).
+
+    Mirrors the scalar contracts' ``_apply_settlement_period``: the ISO ``P``
+    prefix and any ``L`` suffix are stripped, ``D``/``W``/``M`` periods are
+    supported.  With ``adjust=True`` the result is also shifted to a
+    Monday-to-Friday business day when a BDC and calendar are set.
+    """
+    from datetime import timedelta
+
+    from dateutil.relativedelta import relativedelta
+
+    from jactus.utilities.calendars import MondayToFridayCalendar
+
+    dt = adt_to_dt(base)
+    sp = attrs.settlement_period
+    if sp and sp != "P0D":
+        s = sp.removeprefix("P")
+        if "L" in s:
+            s = s[: s.index("L")]
+        mult, period, _ = parse_cycle_fast(s)
+        if period == "W":
+            dt += timedelta(weeks=mult)
+        elif period == "M":
+            dt += relativedelta(months=mult)
+        else:
+            dt += timedelta(days=mult)
+
+    bdc = attrs.business_day_convention
+    cal = attrs.calendar
+    if not adjust or not bdc or bdc == "NULL" or not cal or cal in ("NO_CALENDAR", "NC"):
+        return dt
+    bdc_val = bdc.value if hasattr(bdc, "value") else str(bdc)
+    if bdc_val in ("CSF", "SCF", "CSMF", "SCMF"):
+        return adt_to_dt(MondayToFridayCalendar().next_business_day(dt_to_adt(dt)))
+    if bdc_val in ("CSP", "SCP", "CSMP", "SCMP"):
+        return adt_to_dt(MondayToFridayCalendar().previous_business_day(dt_to_adt(dt)))
+    return dt
+
+
 # ---------------------------------------------------------------------------
 # Schedule generation helpers
 # ---------------------------------------------------------------------------
@@ -431,6 +595,7 @@ def jax_batch_year_fractions(
     event_ordinals: jnp.ndarray,
     event_valid: jnp.ndarray,
     params: BatchContractParams,
+    dtype: Any = jnp.float32,
 ) -> jnp.ndarray:
     """Compute year fractions for all events in the batch (JAX-native).
 
@@ -438,7 +603,7 @@ def jax_batch_year_fractions(
     year fractions between consecutive entries using the per-contract DCC.
 
     Returns:
-        ``(N, max_events)`` float32 year fractions.
+        ``(N, max_events)`` year fractions of ``dtype`` (float32 by default).
     """
     from jactus.utilities.date_array import _ordinal_to_ymd as _jax_ordinal_to_ymd
 
@@ -450,7 +615,7 @@ def jax_batch_year_fractions(
     )  # (N, max_events)
 
     # Delta days (for A360/A365)
-    delta_days = (event_ordinals - sd_chain).astype(jnp.float32)
+    delta_days = (event_ordinals - sd_chain).astype(dtype)
     yf_a360 = delta_days / 360.0
     yf_a365 = delta_days / 365.0
 
@@ -462,13 +627,13 @@ def jax_batch_year_fractions(
     dd1_e = jnp.where(sd_d == 31, 30, sd_d)
     dd2_e = jnp.where(evt_d == 31, 30, evt_d)
     days_30e = (evt_y - sd_y) * 360 + (evt_m - sd_m) * 30 + (dd2_e - dd1_e)
-    yf_30e360 = days_30e.astype(jnp.float32) / 360.0
+    yf_30e360 = days_30e.astype(dtype) / 360.0
 
     # 30/360 US (Bond Basis)
     dd1_b = jnp.where(sd_d == 31, 30, sd_d)
     dd2_b = jnp.where((dd1_b >= 30) & (evt_d == 31), 30, evt_d)
     days_30b = (evt_y - sd_y) * 360 + (evt_m - sd_m) * 30 + (dd2_b - dd1_b)
-    yf_b30360 = days_30b.astype(jnp.float32) / 360.0
+    yf_b30360 = days_30b.astype(dtype) / 360.0
 
     # Select per-contract DCC
     dcc = params.dcc_code.reshape(-1, 1)  # (N, 1)
@@ -528,6 +693,572 @@ def pad_arrays(
     return event_types, year_fractions, rf_values, mask
 
 
+def pad_event_ordinals(ordinals: Sequence[Sequence[int]], max_events: int) -> jnp.ndarray:
+    """Pad per-contract event ordinals into a ``[B, max_events]`` int32 array.
+
+    Each row holds ``datetime.toordinal()`` of the contract's events in
+    kernel order; padding positions hold 0, matching the batch ``masks``.
+    """
+    out = np.zeros((len(ordinals), max_events), dtype=np.int32)
+    for i, ords in enumerate(ordinals):
+        out[i, : len(ords)] = ords
+    return jnp.asarray(out)
+
+
+# ---------------------------------------------------------------------------
+# Length-bucketed simulation
+# ---------------------------------------------------------------------------
+
+
+class LengthBuckets(NamedTuple):
+    """Split of a padded ``[B, T]`` batch into event-count buckets.
+
+    ``rows[k]`` are the batch rows simulated together in bucket ``k`` with
+    ``lengths[k]`` scan steps.  The padding ratios are the fraction of scan
+    steps spent on NOP padding with and without bucketing.
+    """
+
+    rows: list[np.ndarray]
+    lengths: list[int]
+    padding_ratio: float
+    unbucketed_padding_ratio: float
+
+
+def plan_length_buckets(event_counts: np.ndarray, num_buckets: int) -> LengthBuckets:
+    """Group contracts into at most ``num_buckets`` event-count buckets.
+
+    Boundaries are chosen over the sorted distinct event counts to
+    minimise the total number of padded scan steps ``sum(B_k * T_k)``.
+    """
+    counts = np.maximum(np.asarray(event_counts, dtype=np.int64), 1)
+    n = len(counts)
+    if n == 0:
+        return LengthBuckets([], [], 0.0, 0.0)
+    lengths, multiplicity = np.unique(counts, return_counts=True)
+    num_buckets = max(1, min(num_buckets, len(lengths)))
+    cum = np.concatenate([[0], np.cumsum(multiplicity)])
+
+    # best[j]: min padded steps covering distinct lengths [0, j] with k buckets
+    best = cum[1:] * lengths
+    splits: list[np.ndarray] = []
+    for _ in range(1, num_buckets):
+        prev = np.concatenate([[0], best])
+        new_best = best.copy()
+        start = np.zeros(len(lengths), dtype=np.int64)
+        for j in range(1, len(lengths)):
+            # Last bucket covers distinct lengths [i, j] for i in 1..j
+            costs = prev[1 : j + 1] + (cum[j + 1] - cum[1 : j + 1]) * lengths[j]
+            i = int(np.argmin(costs))
+            if costs[i] < new_best[j]:
+                new_best[j] = costs[i]
+                start[j] = i + 1
+        splits.append(start)
+        best = new_best
+
+    # Backtrack bucket boundaries (indices into the distinct lengths)
+    bounds: list[tuple[int, int]] = []
+    j = len(lengths) - 1
+    for start in reversed(splits):
+        i = int(start[j])
+        if i == 0:
+            continue  # fewer buckets were optimal for this prefix
+        bounds.append((i, j))
+        j = i - 1
+    bounds.append((0, j))
+    bounds.reverse()
+
+    rows = []
+    bucket_lengths = []
+    for i, j in bounds:
+        rows.append(np.flatnonzero((counts >= lengths[i]) & (counts <= lengths[j])))
+        bucket_lengths.append(int(lengths[j]))
+
+    real = float(np.sum(np.asarray(event_counts)))
+    padded = float(sum(len(r) * t for r, t in zip(rows, bucket_lengths, strict=True)))
+    unbucketed = float(n * np.max(counts))
+    return LengthBuckets(
+        rows=rows,
+        lengths=bucket_lengths,
+        padding_ratio=1.0 - real / padded,
+        unbucketed_padding_ratio=1.0 - real / unbucketed,
+    )
+
+
+def simulate_length_bucketed(
+    simulate_fn: Callable[..., tuple[Any, jnp.ndarray]],
+    initial_states: Any,
+    event_arrays: Sequence[jnp.ndarray],
+    params: Any,
+    masks: jnp.ndarray,
+    num_buckets: int,
+) -> tuple[Any, jnp.ndarray, LengthBuckets]:
+    """Run a batch kernel per event-count bucket and reassemble in input order.
+
+    Rows are grouped with :func:`plan_length_buckets`; each bucket is
+    trimmed to its own longest contract, so short contracts no longer scan
+    the NOP tail of the longest one.  Trailing NOP steps leave the state
+    unchanged, so final states and payoffs match the unbucketed run.
+
+    Args:
+        simulate_fn: ``batch_simulate_<type>_auto``-style kernel called as
+            ``simulate_fn(states, *event_arrays, params)``.
+        initial_states: Batched state NamedTuple (leading ``[B]`` axis).
+        event_arrays: ``[B, T, ...]`` per-event inputs (event types, year
+            fractions, risk factors, ...), in kernel argument order.
+        params: Batched params NamedTuple (leading ``[B]`` axis).
+        masks: ``[B, T]`` validity mask of the padded batch.
+        num_buckets: Maximum number of buckets (compiled shapes).
+
+    Returns:
+        ``(final_states, payoffs, plan)`` with ``payoffs`` padded back to
+        ``[B, T]``.
+    """
+    import jax
+
+    num_rows, max_events = masks.shape
+    plan = plan_length_buckets(np.asarray(masks).sum(axis=1).astype(np.int64), num_buckets)
+
+    payoffs = np.zeros((num_rows, max_events), dtype=masks.dtype)
+    state_parts = []
+    for rows, length in zip(plan.rows, plan.lengths, strict=True):
+        idx = jnp.asarray(rows)
+        bucket_states, bucket_payoffs = simulate_fn(
+            jax.tree.map(lambda x, i=idx: x[i], initial_states),
+            *[a[idx, :length] for a in event_arrays],
+            jax.tree.map(lambda x, i=idx: x[i], params),
+        )
+        payoffs[rows, :length] = np.asarray(bucket_payoffs)
+        state_parts.append(bucket_states)
+
+    inverse = jnp.asarray(np.argsort(np.concatenate(plan.rows)))
+    final_states = jax.tree.map(lambda *xs: jnp.concatenate(xs)[inverse], *state_parts)
+    return final_states, jnp.asarray(payoffs), plan
+
+
+def canonical_size(n: int, sizes: Sequence[int] = ()) -> int:
+    """Smallest of ``sizes`` that holds ``n``, else the next power of two."""
+    fitting = [s for s in sizes if s >= n]
+    if fitting:
+        return min(fitting)
+    return 1 << max(n - 1, 0).bit_length()
+
+
+class CanonicalShapes(NamedTuple):
+    """Canonical batch sizes that kernel inputs are padded up to.
+
+    Every ``(B, T)`` that reaches a jitted kernel is a separate XLA
+    compile; padding to a few canonical sizes lets runs with slightly
+    different portfolios reuse one executable (in-process, or across
+    processes via :func:`configure_compilation_cache`).
+
+    Attributes:
+        rows: Allowed batch sizes; empty means powers of two.  Batches
+            larger than every entry fall back to the next power of two.
+        events: Allowed event counts, with the same rules.
+    """
+
+    rows: tuple[int, ...] = ()
+    events: tuple[int, ...] = ()
+
+    def shape(self, num_rows: int, num_events: int) -> tuple[int, int]:
+        """Canonical ``(rows, events)`` for a ``[num_rows, num_events]`` batch."""
+        return canonical_size(num_rows, self.rows), canonical_size(num_events, self.events)
+
+
+def simulate_padded(
+    simulate_fn: Callable[..., tuple[Any, jnp.ndarray]],
+    initial_states: Any,
+    event_arrays: Sequence[jnp.ndarray],
+    params: Any,
+    masks: jnp.ndarray,
+    pad_shape: tuple[int, int],
+    event_sizes: Sequence[int] = (),
+) -> tuple[Any, jnp.ndarray, tuple[int, int]]:
+    """Run a batch kernel on a batch padded up to a reusable shape.
+
+    Rows are padded to at least ``pad_shape[0]`` by repeating the last
+    contract, and events to at least ``pad_shape[1]`` and the next
+    canonical event count (:func:`canonical_size` over ``event_sizes``)
+    with NOP steps, so batches of similar size share one compiled
+    kernel.  Padding is sliced off the outputs.
+
+    Args:
+        simulate_fn: Kernel called as ``simulate_fn(states, *event_arrays, params)``.
+        initial_states: Batched state NamedTuple (leading ``[B]`` axis).
+        event_arrays: ``[B, T, ...]`` per-event inputs; the first must be
+            the event types (padded with ``NOP_EVENT_IDX``).
+        params: Batched params NamedTuple (leading ``[B]`` axis).
+        masks: ``[B, T]`` validity mask.
+        pad_shape: Minimum ``(rows, events)`` of the compiled batch.
+        event_sizes: Allowed event counts; empty means powers of two.
+
+    Returns:
+        ``(final_states, payoffs, shape)`` where ``shape`` is the padded
+        ``(rows, events)`` the kernel ran with.
+    """
+    import jax
+
+    num_rows, max_events = masks.shape
+    rows = max(num_rows, pad_shape[0])
+    events = max(canonical_size(max_events, event_sizes), pad_shape[1])
+
+    def _pad_rows(x: jnp.ndarray) -> jnp.ndarray:
+        if rows == num_rows:
+            return x
+        return jnp.concatenate([x, jnp.repeat(x[-1:], rows - num_rows, axis=0)])
+
+    padded_events = []
+    for k, a in enumerate(event_arrays):
+        widths = [(0, 0), (0, events - max_events)] + [(0, 0)] * (a.ndim - 2)
+        fill = NOP_EVENT_IDX if k == 0 else 0
+        padded_events.append(jnp.pad(_pad_rows(a), widths, constant_values=fill))
+
+    final_states, payoffs = simulate_fn(
+        jax.tree.map(_pad_rows, initial_states),
+        *padded_events,
+        jax.tree.map(_pad_rows, params),
+    )
+    final_states = jax.tree.map(lambda x: x[:num_rows], final_states)
+    return final_states, payoffs[:num_rows, :max_events], (rows, events)
+
+
+def resolve_devices(devices: int | Sequence[Any]) -> list[Any]:
+    """Resolve ``devices`` (a count or explicit list) to JAX devices.
+
+    Raises:
+        ValueError: If more devices are requested than are available.
+    """
+    import jax
+
+    if not isinstance(devices, int):
+        return list(devices)
+    available = jax.devices()
+    if devices < 1 or devices > len(available):
+        raise ValueError(
+            f"Requested {devices} devices but {len(available)} are available; on CPU set "
+            f"XLA_FLAGS=--xla_force_host_platform_device_count=N before importing JAX"
+        )
+    return list(available[:devices])
+
+
+def shard_batch_kernel(
+    simulate_fn: Callable[..., tuple[Any, jnp.ndarray]],
+    devices: Sequence[Any],
+) -> Callable[..., tuple[Any, jnp.ndarray]]:
+    """Wrap a batch kernel so its batch axis is split across ``devices``.
+
+    The wrapped kernel pads the batch to a multiple of the device count
+    (repeating the last contract), places every input with a
+    ``NamedSharding`` over a 1-D ``"batch"`` mesh and calls ``simulate_fn``;
+    jit then partitions the scan so each device runs its slice of rows.
+    Outputs are trimmed back to the input rows, in input order.
+    """
+    import jax
+    from jax.sharding import Mesh, NamedSharding, PartitionSpec
+
+    mesh = Mesh(np.asarray(devices), ("batch",))
+    by_row = NamedSharding(mesh, PartitionSpec("batch"))  # type: ignore[no-untyped-call]
+    replicated = NamedSharding(mesh, PartitionSpec())  # type: ignore[no-untyped-call]
+    num_devices = len(devices)
+
+    def sharded(initial_states: Any, *args: Any) -> tuple[Any, jnp.ndarray]:
+        *event_arrays, params = args
+        num_rows = event_arrays[0].shape[0]
+        pad = -num_rows % num_devices
+
+        def _place(x: jnp.ndarray) -> jnp.ndarray:
+            if x.ndim == 0:
+                return jax.device_put(x, replicated)  # type: ignore[no-any-return]
+            if pad:
+                x = jnp.concatenate([x, jnp.repeat(x[-1:], pad, axis=0)])
+            return jax.device_put(x, by_row)  # type: ignore[no-any-return]
+
+        final_states, payoffs = simulate_fn(
+            jax.tree.map(_place, initial_states),
+            *[_place(a) for a in event_arrays],
+            jax.tree.map(_place, params),
+        )
+        final_states = jax.tree.map(lambda x: x[:num_rows], final_states)
+        return final_states, payoffs[:num_rows]
+
+    return sharded
+
+
+def run_batch_kernel(
+    simulate_fn: Callable[..., tuple[Any, jnp.ndarray]],
+    initial_states: Any,
+    event_arrays: Sequence[jnp.ndarray],
+    params: Any,
+    masks: jnp.ndarray,
+    length_buckets: int | None = None,
+    pad_shape: tuple[int, int] | None = None,
+    devices: int | Sequence[Any] | None = None,
+    canonical_shapes: CanonicalShapes | bool | None = None,
+) -> tuple[Any, jnp.ndarray, dict[str, Any]]:
+    """Run a scan kernel on a padded batch, optionally bucketed or reshaped.
+
+    Dispatches to :func:`simulate_length_bucketed` when ``length_buckets``
+    is set, to :func:`simulate_padded` when ``pad_shape`` or
+    ``canonical_shapes`` is set (``True`` meaning powers of two), and to
+    ``simulate_fn`` directly otherwise.  With ``devices`` (a count or a
+    list of JAX devices) every kernel call is sharded along the batch
+    axis via :func:`shard_batch_kernel`.
+
+    Returns:
+        ``(final_states, payoffs, layout)`` where ``layout`` holds the
+        ``length_buckets`` plan or the ``padded_shape`` the kernel ran
+        with, for merging into the portfolio result dict.
+
+    Raises:
+        ValueError: If ``length_buckets`` is combined with ``pad_shape``
+            or ``canonical_shapes``.
+    """
+    if canonical_shapes is True:
+        canonical_shapes = CanonicalShapes()
+    elif canonical_shapes is False:
+        canonical_shapes = None
+    if length_buckets is not None and (pad_shape is not None or canonical_shapes is not None):
+        raise ValueError("length_buckets cannot be combined with pad_shape or canonical_shapes")
+    if canonical_shapes is not None:
+        rows, events = canonical_shapes.shape(*masks.shape)
+        if pad_shape is not None:
+            rows, events = max(rows, pad_shape[0]), max(events, pad_shape[1])
+        pad_shape = (rows, events)
+    if devices is not None:
+        simulate_fn = shard_batch_kernel(simulate_fn, resolve_devices(devices))
+    if length_buckets is not None:
+        final_states, payoffs, plan = simulate_length_bucketed(
+            simulate_fn, initial_states, event_arrays, params, masks, length_buckets
+        )
+        return final_states, payoffs, {"length_buckets": plan}
+    if pad_shape is not None:
+        final_states, payoffs, shape = simulate_padded(
+            simulate_fn,
+            initial_states,
+            event_arrays,
+            params,
+            masks,
+            pad_shape,
+            canonical_shapes.events if canonical_shapes is not None else (),
+        )
+        return final_states, payoffs, {"padded_shape": shape}
+    final_states, payoffs = simulate_fn(initial_states, *event_arrays, params)
+    return final_states, payoffs, {}
+
+
+# ---------------------------------------------------------------------------
+# Scenario axis
+# ---------------------------------------------------------------------------
+
+#: Result layouts of a scenario run (see :func:`simulate_scenarios`).
+SCENARIO_OUTPUTS = ("payoffs", "totals", "portfolio")
+
+#: Risk-factor scenarios: an ``[S, B, T]`` array (broadcastable, e.g.
+#: ``[S, 1, T]``) or a callable ``(event_ordinals, rf_values) -> [S, B, T]``
+#: receiving the ``[B, T]`` event days and base risk-factor values.
+RFScenarios = jnp.ndarray | np.ndarray | Callable[[jnp.ndarray, jnp.ndarray], jnp.ndarray]
+
+
+def resolve_rf_scenarios(
+    rf_scenarios: RFScenarios,
+    event_ordinals: jnp.ndarray,
+    rf_values: jnp.ndarray,
+) -> jnp.ndarray:
+    """Materialise ``rf_scenarios`` as an ``[S, B, T]`` array of ``rf_values.dtype``.
+
+    Raises:
+        ValueError: If the scenarios are not 3-D or do not broadcast to
+            the batch's ``[B, T]`` layout.
+    """
+    if callable(rf_scenarios):
+        rf_scenarios = rf_scenarios(event_ordinals, rf_values)
+    scenarios = jnp.asarray(rf_scenarios, dtype=rf_values.dtype)
+    if scenarios.ndim != 3:
+        raise ValueError(f"rf_scenarios must be [S, B, T], got shape {scenarios.shape}")
+    shape = (scenarios.shape[0], *rf_values.shape)
+    try:
+        return jnp.broadcast_to(scenarios, shape)
+    except ValueError:
+        raise ValueError(
+            f"rf_scenarios of shape {scenarios.shape} do not match the batch layout {shape}"
+        ) from None
+
+
+def check_scenario_options(**options: Any) -> None:
+    """Raise if a batch-layout option that ``rf_scenarios`` cannot honour is set.
+
+    Raises:
+        ValueError: Naming every option passed with a value.
+    """
+    used = [name for name, value in options.items() if value is not None and value is not False]
+    if used:
+        raise ValueError(f"rf_scenarios cannot be combined with {', '.join(used)}")
+
+
+@_functools.cache
+def _scenario_evaluator(
+    simulate_fn: Callable[..., tuple[Any, jnp.ndarray]],
+    output: str,
+    accumulate_dtype: Any,
+    scenario_batch_size: int | None,
+) -> Callable[..., dict[str, jnp.ndarray]]:
+    """Jitted ``[S]``-scenario evaluation of one kernel (cached per layout)."""
+    import jax
+
+    def evaluate(
+        initial_states: Any,
+        event_arrays: tuple[jnp.ndarray, ...],
+        rf_scenarios: jnp.ndarray,
+        params: Any,
+        masks: jnp.ndarray,
+        discount_factors: jnp.ndarray | None,
+    ) -> dict[str, jnp.ndarray]:
+        weights = masks.astype(accumulate_dtype)
+
+        def one(rf_values: jnp.ndarray) -> dict[str, jnp.ndarray]:
+            arrays = (*event_arrays[:2], rf_values, *event_arrays[3:])
+            _, payoffs = simulate_fn(initial_states, *arrays, params)
+            payoffs = payoffs.astype(accumulate_dtype) * weights
+            out = {"total_cashflows": jnp.sum(payoffs, axis=1)}
+            if discount_factors is not None:
+                out["present_values"] = jnp.sum(payoffs * discount_factors, axis=1)
+            if output == "portfolio":
+                return {k: jnp.sum(v) for k, v in out.items()}
+            if output == "payoffs":
+                out["payoffs"] = payoffs
+            return out
+
+        if scenario_batch_size is None:
+            return jax.vmap(one)(rf_scenarios)
+        return jax.lax.map(one, rf_scenarios, batch_size=scenario_batch_size)  # type: ignore[no-any-return]
+
+    return jax.jit(evaluate)
+
+
+def simulate_scenarios(
+    simulate_fn: Callable[..., tuple[Any, jnp.ndarray]],
+    initial_states: Any,
+    event_arrays: Sequence[jnp.ndarray],
+    params: Any,
+    masks: jnp.ndarray,
+    event_ordinals: jnp.ndarray,
+    rf_scenarios: RFScenarios,
+    accumulate_dtype: Any = np.float32,
+    discount_rate: float | None = None,
+    year_fractions_from_valuation: jnp.ndarray | None = None,
+    output: str = "payoffs",
+    scenario_batch_size: int | None = None,
+) -> dict[str, Any]:
+    """Run a scan kernel over a leading scenario axis of risk-factor values.
+
+    The prepared schedules, year fractions and parameters are shared by
+    every scenario; only ``rf_values`` (``event_arrays[2]``) is replaced by
+    each ``[B, T]`` slice of ``rf_scenarios``.  All scenarios run in one
+    compiled call: vectorised at once, or ``scenario_batch_size`` at a
+    time with :func:`jax.lax.map` to bound device memory.
+
+    Args:
+        simulate_fn: Kernel called as ``simulate_fn(states, *event_arrays, params)``.
+        initial_states: Batched state NamedTuple (leading ``[B]`` axis).
+        event_arrays: ``(event_types, year_fractions, rf_values, ...)``.
+        params: Batched params NamedTuple.
+        masks: ``[B, T]`` validity mask.
+        event_ordinals: ``[B, T]`` event days, passed to a callable
+            ``rf_scenarios``.
+        rf_scenarios: ``[S, B, T]`` array or callable, see
+            :data:`RFScenarios`.
+        accumulate_dtype: dtype of payoffs, totals and present values.
+        discount_rate: If provided, compute present values as the
+            ``simulate_<type>_portfolio`` functions do.
+        year_fractions_from_valuation: ``[B, T]`` discounting year
+            fractions; defaults to the cumulative event year fractions.
+        output: ``"payoffs"`` for ``[S, B, T]`` payoffs plus ``[S, B]``
+            totals, ``"totals"`` for the ``[S, B]`` totals only, or
+            ``"portfolio"`` to also sum over contracts on device, giving
+            ``[S]`` totals.
+        scenario_batch_size: Scenarios evaluated at once; ``None`` means
+            all of them.
+
+    Returns:
+        Dict with ``total_cashflows`` (and ``present_values`` and
+        ``total_pv`` with ``discount_rate``) per scenario, ``payoffs`` for
+        ``output="payoffs"``, ``masks``, ``event_ordinals`` and
+        ``num_scenarios``.
+
+    Raises:
+        ValueError: If ``output`` is unknown, ``scenario_batch_size`` is
+            not positive, or ``rf_scenarios`` does not fit the batch.
+    """
+    if output not in SCENARIO_OUTPUTS:
+        raise ValueError(f"output must be one of {SCENARIO_OUTPUTS}, got '{output}'")
+    if scenario_batch_size is not None and scenario_batch_size < 1:
+        raise ValueError(f"scenario_batch_size must be positive, got {scenario_batch_size}")
+    scenarios = resolve_rf_scenarios(rf_scenarios, event_ordinals, event_arrays[2])
+
+    discount_factors = None
+    if discount_rate is not None:
+        if year_fractions_from_valuation is not None:
+            disc_yfs = jnp.asarray(year_fractions_from_valuation, dtype=accumulate_dtype)
+        else:
+            disc_yfs = jnp.cumsum(event_arrays[1].astype(accumulate_dtype), axis=1)
+        discount_factors = 1.0 / (1.0 + discount_rate * disc_yfs)
+
+    evaluate = _scenario_evaluator(
+        simulate_fn, output, np.dtype(accumulate_dtype).type, scenario_batch_size
+    )
+    result: dict[str, Any] = evaluate(
+        initial_states, tuple(event_arrays), scenarios, params, masks, discount_factors
+    )
+    if discount_rate is not None:
+        pvs = result["present_values"]
+        result["total_pv"] = pvs if output == "portfolio" else jnp.sum(pvs, axis=1)
+    result["masks"] = masks
+    result["event_ordinals"] = event_ordinals
+    result["num_scenarios"] = scenarios.shape[0]
+    return result
+
+
+def configure_compilation_cache(
+    cache_dir: str | _os.PathLike[str] | None = None,
+    min_compile_time_secs: float = 0.0,
+) -> str | None:
+    """Point JAX's persistent compilation cache at ``cache_dir``.
+
+    Compiled kernels are written to the directory and reloaded by later
+    processes that compile the same kernel for the same shapes, so
+    repeated runs (especially with :class:`CanonicalShapes` padding) skip
+    XLA compilation.  Called automatically on import when
+    ``ACTUS_JAX_COMPILATION_CACHE_DIR`` is set.
+
+    Args:
+        cache_dir: Cache directory, created if missing.  Defaults to
+            ``ACTUS_JAX_COMPILATION_CACHE_DIR``.
+        min_compile_time_secs: Only cache kernels that took at least this
+            long to compile (JAX's own default is 1 second).
+
+    Returns:
+        The absolute cache directory, or ``None`` if none is configured.
+    """
+    import jax
+    from jax.experimental.compilation_cache import compilation_cache
+
+    path = cache_dir if cache_dir is not None else _os.environ.get(ENV_COMPILATION_CACHE_DIR)
+    if not path:
+        return None
+    path = _os.path.abspath(_os.path.expanduser(_os.fspath(path)))
+    _os.makedirs(path, exist_ok=True)
+    update = jax.config.update
+    update("jax_compilation_cache_dir", path)  # type: ignore[no-untyped-call]
+    update("jax_persistent_cache_min_compile_time_secs", min_compile_time_secs)  # type: ignore[no-untyped-call]
+    # Drop an already-initialised cache so the new directory takes effect
+    compilation_cache.reset_cache()
+    return path
+
+
+if _os.environ.get(ENV_COMPILATION_CACHE_DIR):
+    configure_compilation_cache()
+
+
 # ---------------------------------------------------------------------------
 # Common pre-computed data container
 # ---------------------------------------------------------------------------
@@ -537,7 +1268,8 @@ class RawPrecomputed(NamedTuple):
     """Pre-computed data as Python types (no JAX overhead).
 
     ``state`` is a tuple of floats; its length depends on the contract type
-    (6 for PAM, 8 for LAM/NAM, etc.).
+    (6 for PAM, 8 for LAM/NAM, etc.).  ``event_ordinals`` holds each event
+    date's ``toordinal()``, aligned with ``event_types``.
     """
 
     state: tuple[float, ...]
@@ -545,6 +1277,111 @@ class RawPrecomputed(NamedTuple):
     year_fractions: list[float]
     rf_values: list[float]
     params: dict[str, float | int]
+    event_ordinals: Sequence[int] = ()
+
+
+def _precompute_chunk(
+    precompute_fn: Callable[[ContractAttributes, RiskFactorObserver], Any],
+    chunk: Sequence[tuple[ContractAttributes, RiskFactorObserver]],
+) -> list[Any]:
+    """Worker body of :func:`precompute_raw_list`; module-level so it pickles."""
+    return [precompute_fn(attrs, obs) for attrs, obs in chunk]
+
+
+# Process pool reused by every precompute_raw_list call with the same
+# worker count, so spawn and import costs are paid once per process.
+_POOL: tuple[int, Any] | None = None
+_POOL_LOCK = _threading.Lock()
+
+
+def _precompute_pool(workers: int) -> Any:
+    """Return the shared ``spawn`` pool with ``workers`` processes."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL[0] != workers:
+            _POOL[1].shutdown()
+            _POOL = None
+        if _POOL is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+            _POOL = (workers, pool)
+        return _POOL[1]
+
+
+def shutdown_precompute_pool() -> None:
+    """Shut down the worker pool kept by :func:`precompute_raw_list`.
+
+    Called automatically at interpreter exit; call it earlier to release
+    the worker processes.  The next call with ``workers > 1`` starts a new
+    pool.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL[1].shutdown()
+            _POOL = None
+
+
+_atexit.register(shutdown_precompute_pool)
+
+
+def precompute_raw_list(
+    precompute_fn: Callable[[ContractAttributes, RiskFactorObserver], Any],
+    contracts: Sequence[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
+) -> list[Any]:
+    """Run a per-contract ``_precompute_raw`` over ``contracts``, in order.
+
+    With ``workers > 1`` the contracts are split into about four chunks
+    per worker and pre-computed in a ``spawn`` process pool; only the
+    ``RawPrecomputed`` tuples (Python lists and floats) travel back.  The
+    pool is started on first use and reused by later calls with the same
+    ``workers`` (see :func:`shutdown_precompute_pool`).
+    ``precompute_fn`` must be a module-level function, and the contracts
+    and their observers must pickle.  Scripts using a pool need the usual
+    ``if __name__ == "__main__":`` guard.
+
+    In-process, rate resets observed off a ``CurveRiskFactorObserver``
+    are left out of the per-contract pass and filled for all contracts at
+    once by :func:`fill_curve_rf_values`.  With ``workers > 1`` this fill
+    is not deferred: each worker observes its curve rates per contract.
+
+    Args:
+        precompute_fn: The contract type's ``_precompute_raw``.
+        contracts: ``(attributes, rf_observer)`` pairs.
+        workers: Number of worker processes; ``None`` or ``1`` runs in
+            the calling process.
+
+    Returns:
+        One pre-computed tuple per contract, in input order.
+
+    Raises:
+        ValueError: If ``workers`` is less than 1.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if workers is None or workers == 1 or len(contracts) < 2:
+        token = _DEFER_CURVE_RF.set(True)
+        try:
+            raws = _precompute_chunk(precompute_fn, contracts)
+        finally:
+            _DEFER_CURVE_RF.reset(token)
+        return fill_curve_rf_values(raws, contracts)
+
+    from concurrent.futures.process import BrokenProcessPool
+
+    pool = _precompute_pool(workers)
+    chunk_size = -(-len(contracts) // (4 * min(workers, len(contracts))))
+    chunks = [contracts[i : i + chunk_size] for i in range(0, len(contracts), chunk_size)]
+    try:
+        parts = pool.map(_functools.partial(_precompute_chunk, precompute_fn), chunks)
+        return [raw for part in parts for raw in part]
+    except BrokenProcessPool:
+        # A dead worker breaks the pool for good; start afresh next time
+        shutdown_precompute_pool()
+        raise
 
 
 # ---------------------------------------------------------------------------
@@ -619,6 +1456,140 @@ def compute_vectorised_year_fractions(
 # ---------------------------------------------------------------------------
 
 
+# Set while precompute_raw_list runs in-process: curve lookups are deferred
+# to one fill_curve_rf_values call over the whole batch.
+_DEFER_CURVE_RF: ContextVar[bool] = ContextVar("jactus_defer_curve_rf", default=False)
+
+
+def _is_batch_curve(rf_observer: object, identifier: str) -> bool:
+    """Whether the observer's curve can be evaluated batch-wide by date."""
+    if not isinstance(rf_observer, CurveRiskFactorObserver) or rf_observer.reference_date is None:
+        return False
+    nodes = rf_observer._curve_arrays.get(identifier)
+    return nodes is not None and nodes[0].size > 0
+
+
+@_functools.cache
+def _curve_evaluator() -> Callable[..., jnp.ndarray]:
+    import jax
+
+    return jax.jit(lambda curve, ordinals: curve.evaluate_at(ordinals))
+
+
+def fill_curve_rf_values(
+    raws: list[Any],
+    contracts: Sequence[tuple[ContractAttributes, RiskFactorObserver]],
+) -> list[Any]:
+    """Evaluate deferred curve observations for a whole batch at once.
+
+    :func:`prequery_risk_factors` leaves NaN at the rate-reset positions
+    of contracts observed off a ``CurveRiskFactorObserver`` while
+    :func:`precompute_raw_list` runs.  This gathers those positions across
+    all contracts sharing a curve and evaluates them in one jitted
+    :meth:`~jactus.observers.JaxCurveRiskFactorObserver.evaluate_at` call.
+
+    Args:
+        raws: Per-contract ``RawPrecomputed`` tuples, in contract order.
+        contracts: The matching ``(attributes, rf_observer)`` pairs.
+
+    Returns:
+        ``raws`` with the NaN ``rf_values`` replaced.
+    """
+    groups: dict[tuple[int, str], list[tuple[int, np.ndarray]]] = {}
+    for k, raw in enumerate(raws):
+        rf = np.asarray(raw.rf_values, dtype=np.float64)
+        pending = np.flatnonzero(np.isnan(rf))
+        if pending.size:
+            attrs, obs = contracts[k]
+            key = (id(obs), attrs.rate_reset_market_object or "")
+            groups.setdefault(key, []).append((k, pending))
+
+    raws = list(raws)
+    for (_, identifier), members in groups.items():
+        observer: CurveRiskFactorObserver = contracts[members[0][0]][1]  # type: ignore[assignment]
+        curve = observer.to_jax(identifier)
+        ordinals = np.concatenate(
+            [np.asarray(raws[k].event_ordinals, dtype=np.int32)[pos] for k, pos in members]
+        )
+        values = np.asarray(_curve_evaluator()(curve, ordinals), dtype=np.float64)
+        offset = 0
+        for k, pos in members:
+            rf = np.asarray(raws[k].rf_values, dtype=np.float64)
+            rf[pos] = values[offset : offset + pos.size]
+            offset += pos.size
+            raws[k] = raws[k]._replace(rf_values=rf.tolist())
+    return raws
+
+
+def curve_rf_values(
+    curve: JaxCurveRiskFactorObserver,
+    event_types: jnp.ndarray,
+    event_ordinals: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    reference_ordinals: jnp.ndarray | None = None,
+) -> jnp.ndarray:
+    """``[B, T]`` risk factors with every rate reset read off ``curve``.
+
+    The pure-``jnp`` counterpart of :func:`fill_curve_rf_values`: use it
+    inside a differentiated function to get sensitivities of kernel
+    output to the curve nodes.
+
+    Args:
+        curve: JAX curve; its ``rates`` may be traced.
+        event_types: ``[B, T]`` event type indices.
+        event_ordinals: ``[B, T]`` event day ordinals.
+        rf_values: ``[B, T]`` pre-queried risk factors (kept off RR events).
+        reference_ordinals: Tenor reference per row (``[B, 1]``); defaults
+            to ``curve.reference_ordinal``.
+
+    Returns:
+        ``[B, T]`` risk factors in the dtype of ``curve.rates``.
+    """
+    curve_rates = curve.evaluate_at(event_ordinals, reference_ordinals)
+    return jnp.where(event_types == RR_IDX, curve_rates, rf_values.astype(curve_rates.dtype))
+
+
+#: On-device source of rate-reset fixings for the stateful batch kernels: any
+#: pytree with a ``get_batch(ordinals) -> rates`` method, such as
+#: :class:`~jactus.observers.risk_factor.JaxTimeSeriesRiskFactorObserver` (a
+#: rate path) or :class:`~jactus.observers.risk_factor.JaxCurveRiskFactorObserver`.
+RatePath = Any
+
+
+def rate_reset_rf_values(
+    rate_path: RatePath | None,
+    event_types: jnp.ndarray,
+    reset_ordinals: jnp.ndarray | None,
+    rf_values: jnp.ndarray,
+) -> jnp.ndarray:
+    """``[B, T]`` risk factors with RR fixings looked up from ``rate_path``.
+
+    Runs inside the stateful ``batch_simulate_<type>`` kernels, so a new
+    rate path only costs a kernel call, not a new Phase-1 pre-computation,
+    and gradients flow back to the path's values.  Positions other than RR
+    events keep ``rf_values``.
+
+    Args:
+        rate_path: :data:`RatePath`, or ``None`` to return ``rf_values``.
+        event_types: ``[B, T]`` event type indices.
+        reset_ordinals: ``[B, T]`` fixing day ordinals (the batch's
+            ``event_ordinals``).
+        rf_values: ``[B, T]`` pre-queried risk factors.
+
+    Returns:
+        ``[B, T]`` risk factors in the dtype of ``rf_values``.
+
+    Raises:
+        ValueError: If ``rate_path`` is given without ``reset_ordinals``.
+    """
+    if rate_path is None:
+        return rf_values
+    if reset_ordinals is None:
+        raise ValueError("rate_path requires reset_ordinals")
+    fixings = rate_path.get_batch(reset_ordinals).astype(rf_values.dtype)
+    return jnp.where(event_types == RR_IDX, fixings, rf_values)
+
+
 def prequery_risk_factors(
     schedule: list[tuple[int, _datetime, _datetime]],
     attrs: ContractAttributes,
@@ -631,6 +1602,12 @@ def prequery_risk_factors(
     ``additional_rf_events`` can specify extra event types that need
     risk factor observation.
 
+    Observers implementing
+    :class:`~jactus.observers.BatchRiskFactorObserver` answer all market
+    observations in one ``observe_risk_factor_batch`` call; others (and
+    batch calls that raise) fall back to one ``observe_risk_factor`` call
+    per event.
+
     Args:
         schedule: List of ``(evt_idx, evt_dt, calc_dt)`` tuples.
         attrs: Contract attributes.
@@ -643,11 +1620,32 @@ def prequery_risk_factors(
     """
     market_object = attrs.rate_reset_market_object or ""
     contract_id = attrs.contract_id or ""
+    market_events = ({RR_IDX} | (additional_rf_events or set())) - {PP_IDX}
+
+    observed: dict[int, float] = {}
+    observe_batch = getattr(rf_observer, "observe_risk_factor_batch", None)
+    if _DEFER_CURVE_RF.get() and _is_batch_curve(rf_observer, market_object):
+        # NaN marks the positions fill_curve_rf_values evaluates batch-wide
+        observed = {
+            i: math.nan for i, (evt_idx, _, _) in enumerate(schedule) if evt_idx in market_events
+        }
+    elif observe_batch is not None:
+        positions = [i for i, (evt_idx, _, _) in enumerate(schedule) if evt_idx in market_events]
+        if positions:
+            ordinals = np.array([schedule[i][1].toordinal() for i in positions], dtype=np.int64)
+            try:
+                values = np.asarray(observe_batch(market_object, ordinals), dtype=np.float64)
+            except (KeyError, NotImplementedError, TypeError):
+                pass  # scalar loop below reports 0.0 per failing event
+            else:
+                observed = dict(zip(positions, values.tolist(), strict=True))
 
     rf_list: list[float] = []
-    for evt_idx, evt_dt, _calc_dt in schedule:
+    for i, (evt_idx, evt_dt, _calc_dt) in enumerate(schedule):
         rf_val = 0.0
-        if evt_idx == RR_IDX:
+        if i in observed:
+            rf_val = observed[i]
+        elif evt_idx in market_events:
             try:
                 rf_val = float(rf_observer.observe_risk_factor(market_object, dt_to_adt(evt_dt)))
             except (KeyError, NotImplementedError, TypeError):
@@ -659,15 +1657,176 @@ def prequery_risk_factors(
                 )
             except (KeyError, NotImplementedError, TypeError):
                 rf_val = 0.0
-        elif additional_rf_events and evt_idx in additional_rf_events:
-            try:
-                rf_val = float(rf_observer.observe_risk_factor(market_object, dt_to_adt(evt_dt)))
-            except (KeyError, NotImplementedError, TypeError):
-                rf_val = 0.0
         rf_list.append(rf_val)
     return rf_list
 
 
+# ---------------------------------------------------------------------------
+# In-kernel prepayment
+# ---------------------------------------------------------------------------
+
+
+class PrepaymentInputs(NamedTuple):
+    """Inputs of the in-kernel prepayment lookup (see :func:`prepayment_amount`).
+
+    Attributes:
+        surfaces: The distinct prepayment surfaces (spread x loan age) of
+            the batch.
+        market_rates: ``[B, T]`` market reference rate at each PP event;
+            NaN where the pre-queried ``rf_values`` amount applies.
+        loan_ages: ``[B, T]`` years since the initial exchange date.
+        surface_ids: ``[B, T]`` int32 index into ``surfaces`` of each
+            row's surface.
+    """
+
+    surfaces: tuple[Surface2D, ...]
+    market_rates: jnp.ndarray
+    loan_ages: jnp.ndarray
+    surface_ids: jnp.ndarray
+
+
+def merge_prepayment_events(
+    schedule: list[tuple[int, _datetime, _datetime]],
+    attrs: ContractAttributes,
+    rf_observer: object,
+) -> list[tuple[int, _datetime, _datetime]]:
+    """Add a prepayment model's MRD callouts to a schedule as PP events.
+
+    Mirrors the scalar engine's callout merge for a
+    :class:`~jactus.observers.prepayment.PrepaymentSurfaceObserver` passed
+    as the contract's observer: each callout after the status date becomes
+    a ``(PP_IDX, date, date)`` entry placed by date and event priority,
+    skipping dates that already carry a PP event.  Other observers leave
+    the schedule unchanged.
+    """
+    if not isinstance(rf_observer, PrepaymentSurfaceObserver):
+        return schedule
+    status_dt = adt_to_dt(attrs.status_date)
+    existing = {evt_dt for evt_idx, evt_dt, _ in schedule if evt_idx == PP_IDX}
+    callout_dts = sorted(
+        {adt_to_dt(c.time) for c in rf_observer.contract_start(attrs) if c.callout_type == "MRD"}
+    )
+    merged = list(schedule)
+    pp_priority = get_evt_priority(PP_IDX)
+    for dt in callout_dts:
+        if dt <= status_dt or dt in existing:
+            continue
+        pos = next(
+            (
+                i
+                for i, (evt_idx, evt_dt, _) in enumerate(merged)
+                if (evt_dt, get_evt_priority(evt_idx)) > (dt, pp_priority)
+            ),
+            len(merged),
+        )
+        merged.insert(pos, (PP_IDX, dt, dt))
+    return merged
+
+
+def prepayment_inputs(
+    contracts: Sequence[tuple[ContractAttributes, object]],
+    event_types: jnp.ndarray,
+    event_ordinals: jnp.ndarray,
+    dtype: Any = np.float32,
+) -> PrepaymentInputs | None:
+    """Build the in-kernel prepayment inputs of a prepared batch.
+
+    Rows whose observer is a
+    :class:`~jactus.observers.prepayment.PrepaymentSurfaceObserver` get the
+    market rate and loan age of each PP event; market rates come from one
+    :meth:`~jactus.observers.prepayment.PrepaymentSurfaceObserver.market_rates`
+    call per observer.  Every other position keeps a NaN market rate, so
+    the kernel pays the pre-queried ``rf_values`` amount there.  Observers
+    whose surfaces hold the same grid and values share one entry of
+    ``surfaces``; each row looks up its own entry through ``surface_ids``.
+
+    Args:
+        contracts: The ``(attributes, rf_observer)`` pairs of the batch.
+        event_types: ``[B, T]`` event type indices.
+        event_ordinals: ``[B, T]`` event days.
+        dtype: float dtype of the returned arrays.
+
+    Returns:
+        A :class:`PrepaymentInputs`, or ``None`` if no contract uses a
+        prepayment surface.
+    """
+    groups: dict[int, tuple[PrepaymentSurfaceObserver, list[int]]] = {}
+    for b, (_, obs) in enumerate(contracts):
+        if isinstance(obs, PrepaymentSurfaceObserver):
+            groups.setdefault(id(obs), (obs, []))[1].append(b)
+    if not groups:
+        return None
+
+    et = np.asarray(event_types)
+    ords = np.asarray(event_ordinals)
+    market_rates = np.full(et.shape, np.nan, dtype=dtype)
+    loan_ages = np.zeros(et.shape, dtype=dtype)
+    surface_ids = np.zeros(et.shape, dtype=np.int32)
+    surfaces: list[Surface2D] = []
+    surface_index: dict[tuple[Any, ...], int] = {}
+    for observer, rows in groups.values():
+        key = _surface_key(observer.surface)
+        if key not in surface_index:
+            surface_index[key] = len(surfaces)
+            surfaces.append(observer.surface)
+        surface_ids[rows] = surface_index[key]
+        positions = []
+        for b in rows:
+            ied = contracts[b][0].initial_exchange_date
+            if ied is None:
+                continue  # the scalar model reports no prepayment without an IED
+            cols = np.flatnonzero(et[b] == PP_IDX)
+            positions.append((b, cols))
+            loan_ages[b, cols] = (ords[b, cols] - adt_to_dt(ied).toordinal()) / DAYS_PER_YEAR
+        if not positions:
+            continue
+        rates = observer.market_rates(np.concatenate([ords[b, cols] for b, cols in positions]))
+        start = 0
+        for b, cols in positions:
+            market_rates[b, cols] = rates[start : start + cols.size]
+            start += cols.size
+
+    return PrepaymentInputs(
+        tuple(surfaces),
+        jnp.asarray(market_rates),
+        jnp.asarray(loan_ages),
+        jnp.asarray(surface_ids),
+    )
+
+
+def _surface_key(surface: Surface2D) -> tuple[Any, ...]:
+    """Hashable identity of a surface's grid, values and extrapolation."""
+    arrays = (surface.x_margins, surface.y_margins, surface.values)
+    return (surface.extrapolation,) + tuple(
+        (a.shape, str(a.dtype), a.tobytes()) for a in map(np.asarray, arrays)
+    )
+
+
+def prepayment_amount(
+    surfaces: Sequence[Surface2D],
+    surface_ids: jnp.ndarray,
+    notional: jnp.ndarray,
+    nominal_rate: jnp.ndarray,
+    market_rates: jnp.ndarray,
+    loan_ages: jnp.ndarray,
+    rf_values: jnp.ndarray,
+) -> jnp.ndarray:
+    """Prepaid principal at one scan step, from the live contract state.
+
+    The spread is the state's ``ipnr`` minus the market rate; the surface
+    rate at ``(spread, loan age)`` is the fraction of the notional prepaid
+    (MRD semantics).  Each position reads the surface ``surface_ids``
+    selects; positions with a NaN market rate return ``rf_values``.
+    Jittable and differentiable in the surface values.
+    """
+    observed = ~jnp.isnan(market_rates)
+    spread = nominal_rate - jnp.where(observed, market_rates, 0.0)
+    rate = surfaces[0].evaluate_batch(spread, loan_ages)
+    for k, surface in enumerate(surfaces[1:], start=1):
+        rate = jnp.where(surface_ids == k, surface.evaluate_batch(spread, loan_ages), rate)
+    return jnp.where(observed, rate * notional, rf_values).astype(notional.dtype)
+
+
 # ---------------------------------------------------------------------------
 # Batch params extraction helper
 # ---------------------------------------------------------------------------
@@ -9,7 +9,7 @@ References:
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Any
 
 import flax.nnx as nnx
@@ -666,8 +666,7 @@ def _merge_callout_events(
     Returns:
         New EventSchedule with callout events merged in.
     """
-    from jactus.core.events import EVENT_SEQUENCE_ORDER
-    from jactus.core.types import EventType
+    from jactus.core.types import EVENT_SCHEDULE_PRIORITY, EventType
 
     # Map callout types to ACTUS event types
     callout_type_map: dict[str, EventType] = {
@@ -675,6 +674,9 @@ def _merge_callout_events(
         "AFD": EventType.AD,  # Deposit transaction → Analysis/Monitoring event
     }
 
+    def order(event_time: ActusDateTime, event_type: EventType) -> tuple[ActusDateTime, int]:
+        return event_time, EVENT_SCHEDULE_PRIORITY.get(event_type, 99)
+
     new_events = list(schedule.events)
     existing_times_and_types = {(e.event_time, e.event_type) for e in schedule.events}
 
@@ -689,10 +691,20 @@ def _merge_callout_events(
                 event_time=callout.time,
                 payoff=jnp.array(0.0),
                 currency=attributes.currency or "XXX",
-                sequence=EVENT_SEQUENCE_ORDER.get(event_type, 20),
             )
-            new_events.append(new_event)
+            # Place after same-day events of equal or higher priority, the
+            # way contract schedules order their own events
+            pos = next(
+                (
+                    i
+                    for i, e in enumerate(new_events)
+                    if order(e.event_time, e.event_type) > order(callout.time, event_type)
+                ),
+                len(new_events),
+            )
+            new_events.insert(pos, new_event)
             existing_times_and_types.add(key)
 
-    new_events.sort()
-    return EventSchedule(tuple(new_events), schedule.contract_id)
+    # Reassign sequence numbers
+    merged = tuple(replace(e, sequence=i) for i, e in enumerate(new_events))
+    return EventSchedule(merged, schedule.contract_id)
@@ -367,42 +367,7 @@ class CapFloorContract(BaseContract):
         When no IED is specified, find the earliest cycle-aligned date
         after the status date by stepping backward from MD.
         """
-        import re
-
-        cycle_str = terms.get("cycleOfInterestPayment", terms.get("cycleOfRateReset", ""))
-        cycle = self._parse_cycle(cycle_str)
-
-        match = re.match(r"(\d+)([DWMY])", cycle)
-        if not match:
-            return self.attributes.status_date
-
-        n = int(match.group(1))
-        unit = match.group(2)
-
-        if unit == "M":
-            months = n
-        elif unit == "Y":
-            months = n * 12
-        else:
-            return self.attributes.status_date
-
-        # Step backward from MD until we pass status_date
-        sd = self.attributes.status_date
-        current = md
-        while True:
-            year = current.year
-            month = current.month - months
-            while month <= 0:
-                year -= 1
-                month += 12
-            day = min(current.day, 28)
-            try:
-                prev = ActusDateTime(year, month, day, 0, 0, 0)
-            except Exception:
-                prev = ActusDateTime(year, month, 28, 0, 0, 0)
-            if prev <= sd:
-                return current
-            current = prev
+        return _derive_start_from_md(md, terms, self.attributes.status_date)
 
     def _generate_child_observer_schedule(self) -> list[ContractEvent]:
         """Generate schedule using child observer (legacy approach)."""
@@ -578,6 +543,52 @@ class CapFloorContract(BaseContract):
         )
 
 
+def _derive_start_from_md(
+    md: ActusDateTime, terms: dict[str, Any], status_date: ActusDateTime
+) -> ActusDateTime:
+    """Derive the underlier schedule start by stepping backward from MD.
+
+    Returns the earliest cycle-aligned date after ``status_date``.  Used when
+    the embedded underlier terms carry no ``initialExchangeDate``.
+    """
+    import re
+
+    cycle_str = terms.get("cycleOfInterestPayment", terms.get("cycleOfRateReset", ""))
+    cycle = CapFloorContract._parse_cycle(cycle_str)
+
+    match = re.match(r"(\d+)([DWMY])", cycle)
+    if not match:
+        return status_date
+
+    n = int(match.group(1))
+    unit = match.group(2)
+
+    if unit == "M":
+        months = n
+    elif unit == "Y":
+        months = n * 12
+    else:
+        return status_date
+
+    # Step backward from MD until we pass status_date
+    sd = status_date
+    current = md
+    while True:
+        year = current.year
+        month = current.month - months
+        while month <= 0:
+            year -= 1
+            month += 12
+        day = min(current.day, 28)
+        try:
+            prev = ActusDateTime(year, month, day, 0, 0, 0)
+        except Exception:
+            prev = ActusDateTime(year, month, 28, 0, 0, 0)
+        if prev <= sd:
+            return current
+        current = prev
+
+
 def _parse_dcc(dcc_str: str) -> DayCountConvention:
     """Parse day count convention string to enum."""
     mapping = {
@@ -0,0 +1,520 @@
+"""Array-mode CAPFL simulation — cap/floor differentials on the underlier kernel.
+
+A cap or floor pays the difference between the underlier's interest
+payments with and without the cap/floor applied to its reset rate.  Instead
+of re-deriving the underlier's schedule event by event, this module reuses
+the arrays that the PAM and LAM array modules already produce for the
+underlier:
+
+1. Pre-computation builds the underlier's ``ContractAttributes`` (from the
+   terms embedded in ``contract_structure`` or from an explicit mapping of
+   underlier IDs) and runs ``precompute_pam_arrays`` /
+   ``precompute_lam_arrays`` on them.
+2. The kernel clamps the underlier's rate parameters (initial rate, RR
+   cap/floor) as vectorized ops, runs the underlier kernel once over the
+   stacked ``[2B, T]`` uncapped + clamped batch, and takes the payoff
+   difference at IP events.
+
+Payoff at each IP event::
+
+    R(CAPFL) * |IP_uncapped - IP_clamped|
+
+which equals ``max(0, r - cap) * NT * YF + max(0, floor - r) * NT * YF`` for
+the rate ``r`` in force over the period.
+
+Example::
+
+    from jactus.contracts.capfl_array import simulate_capfl_portfolio
+
+    result = simulate_capfl_portfolio(contracts)
+    result["total_cashflows"]  # cap/floor payout per contract
+
+    # Re-run one cap book under a different rate path: only rf_values change
+    from jactus.contracts.capfl_array import prepare_capfl_batch, batch_simulate_capfl
+
+    states, et, yf, rf, params, masks = prepare_capfl_batch(contracts)
+    _, payoffs = batch_simulate_capfl(states, et, yf, rf_scenario, params)
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from typing import Any, NamedTuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jactus.contracts.array_common import F32, IP_IDX
+from jactus.contracts.lam_array import (
+    LAMArrayParams,
+    LAMArrayState,
+    _prepare_lam_batch_dated,
+    batch_simulate_lam,
+    precompute_lam_arrays,
+    simulate_lam_array,
+)
+from jactus.contracts.pam_array import (
+    PAMArrayState,
+    _prepare_pam_batch_dated,
+    batch_simulate_pam,
+    precompute_pam_arrays,
+    simulate_pam_array,
+)
+from jactus.core import ActusDateTime, ContractAttributes, ContractRole, ContractType
+from jactus.observers import RiskFactorObserver
+
+# Underlier types whose array kernels can drive a cap/floor
+_UNDERLIER_TYPES = frozenset({ContractType.PAM, ContractType.LAM})
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+
+class CAPFLArrayParams(NamedTuple):
+    """Static cap/floor parameters plus the underlier's array params.
+
+    ``underlier`` is a ``PAMArrayParams`` or ``LAMArrayParams``; the initial
+    state passed alongside these params is the underlier's state.
+    """
+
+    underlier: Any  # PAMArrayParams | LAMArrayParams
+    role_sign: jnp.ndarray  # +1.0 buyer of protection, -1.0 seller
+    cap_rate: jnp.ndarray
+    floor_rate: jnp.ndarray
+    has_cap: jnp.ndarray  # 1.0 if RRLC is set, else 0.0
+    has_floor: jnp.ndarray  # 1.0 if RRLF is set, else 0.0
+
+
+# ============================================================================
+# Vectorized clamp and differential
+# ============================================================================
+
+
+def _clamp_rate(rate: jnp.ndarray, params: CAPFLArrayParams) -> jnp.ndarray:
+    """Apply the cap/floor to a rate (elementwise)."""
+    rate = jnp.where(params.has_floor > 0.5, jnp.maximum(rate, params.floor_rate), rate)
+    return jnp.where(params.has_cap > 0.5, jnp.minimum(rate, params.cap_rate), rate)
+
+
+def _clamp_underlier(state: Any, params: CAPFLArrayParams) -> tuple[Any, Any]:
+    """Return the underlier state/params with the cap/floor applied.
+
+    The initial rate (and a mid-life ``ipnr``) is clamped directly; resets
+    are clamped by tightening the underlier's own RR cap/floor so that the
+    kernel's reset formula applies them.
+    """
+    u = params.underlier
+    cap = jnp.where(
+        u.has_rate_cap > 0.5, jnp.minimum(u.rate_reset_cap, params.cap_rate), params.cap_rate
+    )
+    floor = jnp.where(
+        u.has_rate_floor > 0.5,
+        jnp.maximum(u.rate_reset_floor, params.floor_rate),
+        params.floor_rate,
+    )
+    clamped_params = u._replace(
+        nominal_interest_rate=_clamp_rate(u.nominal_interest_rate, params),
+        rate_reset_cap=jnp.where(params.has_cap > 0.5, cap, u.rate_reset_cap),
+        has_rate_cap=jnp.maximum(u.has_rate_cap, params.has_cap),
+        rate_reset_floor=jnp.where(params.has_floor > 0.5, floor, u.rate_reset_floor),
+        has_rate_floor=jnp.maximum(u.has_rate_floor, params.has_floor),
+    )
+    clamped_state = state._replace(ipnr=_clamp_rate(state.ipnr, params))
+    return clamped_state, clamped_params
+
+
+def _differential(
+    uncapped: jnp.ndarray,
+    clamped: jnp.ndarray,
+    event_types: jnp.ndarray,
+    role_sign: jnp.ndarray,
+) -> jnp.ndarray:
+    """Cap/floor payoff: ``R(CAPFL) * |uncapped - clamped|`` at IP events."""
+    return jnp.where(event_types == IP_IDX, role_sign * jnp.abs(uncapped - clamped), 0.0)
+
+
+# ============================================================================
+# Simulation kernels
+# ============================================================================
+
+
+def simulate_capfl_array(
+    initial_state: PAMArrayState | LAMArrayState,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    params: CAPFLArrayParams,
+) -> tuple[PAMArrayState | LAMArrayState, jnp.ndarray]:
+    """Run a single cap/floor simulation as a pure JAX function.
+
+    This function is JIT-compilable and differentiable.
+
+    Args:
+        initial_state: Underlier starting state.
+        event_types: ``(num_events,)`` int32 — the underlier's event types.
+        year_fractions: ``(num_events,)`` float32 — the underlier's YFs.
+        rf_values: ``(num_events,)`` float32 — observed rates at RR events.
+        params: Cap/floor parameters wrapping the underlier params.
+
+    Returns:
+        ``(final_state, payoffs)`` where ``final_state`` is the clamped
+        underlier's final state and payoffs is ``(num_events,)`` float32.
+    """
+    kernel: Any = (
+        simulate_lam_array if isinstance(params.underlier, LAMArrayParams) else simulate_pam_array
+    )
+    clamped_state, clamped_params = _clamp_underlier(initial_state, params)
+    _, uncapped = kernel(initial_state, event_types, year_fractions, rf_values, params.underlier)
+    final_state, clamped = kernel(
+        clamped_state, event_types, year_fractions, rf_values, clamped_params
+    )
+    return final_state, _differential(uncapped, clamped, event_types, params.role_sign)
+
+
+# JIT-compiled version for single-contract use
+simulate_capfl_array_jit = jax.jit(simulate_capfl_array)
+
+
+@jax.jit
+def batch_simulate_capfl(
+    initial_states: PAMArrayState | LAMArrayState,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    params: CAPFLArrayParams,
+) -> tuple[PAMArrayState | LAMArrayState, jnp.ndarray]:
+    """Batched cap/floor simulation over the underlier's ``[B, T]`` arrays.
+
+    The uncapped and clamped underliers are stacked into a single ``[2B, T]``
+    batch so the underlier kernel runs in one scan.
+
+    Args:
+        initial_states: Underlier state with each field shape ``[B]``.
+        event_types: ``[B, T]`` int32.
+        year_fractions: ``[B, T]`` float32.
+        rf_values: ``[B, T]`` float32.
+        params: ``CAPFLArrayParams`` with each field (and each underlier
+            param) shape ``[B]``.
+
+    Returns:
+        ``(final_states, payoffs)`` — clamped underlier final states and
+        ``[B, T]`` cap/floor payoffs.
+    """
+    kernel: Any = (
+        batch_simulate_lam if isinstance(params.underlier, LAMArrayParams) else batch_simulate_pam
+    )
+    n = event_types.shape[0]
+    clamped_states, clamped_params = _clamp_underlier(initial_states, params)
+
+    def stack(a: jnp.ndarray, b: jnp.ndarray) -> jnp.ndarray:
+        return jnp.concatenate([a, b], axis=0)
+
+    final_states, payoffs = kernel(
+        jax.tree.map(stack, initial_states, clamped_states),
+        stack(event_types, event_types),
+        stack(year_fractions, year_fractions),
+        stack(rf_values, rf_values),
+        jax.tree.map(stack, params.underlier, clamped_params),
+    )
+    clamped_final = jax.tree.map(lambda x: x[n:], final_states)
+    role_sign = params.role_sign[:, None]
+    return clamped_final, _differential(payoffs[:n], payoffs[n:], event_types, role_sign)
+
+
+# ============================================================================
+# Pre-computation bridge — Python -> JAX arrays
+# ============================================================================
+
+
+def _role_sign(role: ContractRole) -> float:
+    """Buyers of protection receive the differential, sellers pay it."""
+    return -1.0 if role in (ContractRole.RPL, ContractRole.ST, ContractRole.SEL) else 1.0
+
+
+def _extract_params_raw(attrs: ContractAttributes) -> dict[str, float]:
+    """Extract cap/floor params as plain Python floats."""
+    return {
+        "role_sign": _role_sign(attrs.contract_role),
+        "cap_rate": attrs.rate_reset_cap or 0.0,
+        "floor_rate": attrs.rate_reset_floor or 0.0,
+        "has_cap": 1.0 if attrs.rate_reset_cap is not None else 0.0,
+        "has_floor": 1.0 if attrs.rate_reset_floor is not None else 0.0,
+    }
+
+
+def _first_cycle_date(start: ActusDateTime, cycle: str, md: ActusDateTime) -> ActusDateTime | None:
+    """First schedule date after ``start`` (the scalar path skips ``start``)."""
+    from jactus.utilities.schedules import generate_schedule
+
+    dates = generate_schedule(start=start, cycle=cycle, end=md)
+    return dates[1] if len(dates) > 1 else None
+
+
+def _underlier_from_terms(attrs: ContractAttributes, terms: dict[str, Any]) -> ContractAttributes:
+    """Build underlier attributes from ACTUS terms embedded in ``contract_structure``.
+
+    Reads the same terms as ``CapFloorContract._generate_standalone_schedule``
+    so the IP/RR grid matches the scalar path.
+    """
+    from jactus.contracts.capfl import CapFloorContract, _derive_start_from_md, _parse_dcc
+
+    md_str = terms.get("maturityDate")
+    if md_str is None:
+        raise ValueError(f"CAPFL {attrs.contract_id}: embedded underlier has no maturityDate")
+    md = ActusDateTime.from_iso(md_str)
+    ied_str = terms.get("initialExchangeDate")
+    start = (
+        ActusDateTime.from_iso(ied_str)
+        if ied_str
+        else _derive_start_from_md(md, terms, attrs.status_date)
+    )
+
+    ct = ContractType(terms.get("contractType", "PAM"))
+    if ct not in _UNDERLIER_TYPES:
+        raise ValueError(f"CAPFL {attrs.contract_id}: unsupported underlier type {ct.value}")
+
+    kwargs: dict[str, Any] = {
+        "contract_id": terms.get("contractID", f"{attrs.contract_id}-UL"),
+        "contract_type": ct,
+        "contract_role": ContractRole.RPA,
+        "status_date": attrs.status_date,
+        "initial_exchange_date": start,
+        "maturity_date": md,
+        "currency": attrs.currency or terms.get("currency", "USD"),
+        "notional_principal": float(terms.get("notionalPrincipal", 0.0)),
+        "nominal_interest_rate": float(terms.get("nominalInterestRate", 0.0)),
+        "day_count_convention": _parse_dcc(terms.get("dayCountConvention", "A365")),
+        "rate_reset_market_object": (
+            terms.get("marketObjectCodeOfRateReset") or attrs.rate_reset_market_object
+        ),
+        "rate_reset_spread": float(terms.get("rateSpread", 0.0)),
+        "rate_reset_multiplier": float(terms.get("rateMultiplier", 1.0)),
+    }
+
+    ip_cycle = CapFloorContract._parse_cycle(terms.get("cycleOfInterestPayment", ""))
+    if ip_cycle:
+        kwargs["interest_payment_cycle"] = ip_cycle
+        kwargs["interest_payment_anchor"] = _first_cycle_date(start, ip_cycle, md)
+    rr_cycle = CapFloorContract._parse_cycle(terms.get("cycleOfRateReset", ""))
+    if rr_cycle:
+        kwargs["rate_reset_cycle"] = rr_cycle
+        kwargs["rate_reset_anchor"] = _first_cycle_date(start, rr_cycle, md)
+    if ct == ContractType.LAM:
+        pr_cycle = CapFloorContract._parse_cycle(terms.get("cycleOfPrincipalRedemption", ""))
+        if pr_cycle:
+            kwargs["principal_redemption_cycle"] = pr_cycle
+        if terms.get("nextPrincipalRedemptionPayment") is not None:
+            kwargs["next_principal_redemption_amount"] = float(
+                terms["nextPrincipalRedemptionPayment"]
+            )
+
+    return ContractAttributes(**kwargs)
+
+
+def _underlier_attributes(
+    attrs: ContractAttributes,
+    underliers: Mapping[str, ContractAttributes] | None = None,
+) -> ContractAttributes:
+    """Resolve a CAPFL's underlier to PAM/LAM ``ContractAttributes``.
+
+    Embedded terms (``{"Underlying": {...}}``) are converted directly; an
+    underlier referenced by ID is looked up in ``underliers``.
+
+    Raises:
+        ValueError: If the underlier cannot be resolved or is not PAM/LAM.
+    """
+    try:
+        underlying = json.loads(attrs.contract_structure or "{}").get("Underlying")
+    except (json.JSONDecodeError, AttributeError) as e:
+        raise ValueError(f"CAPFL {attrs.contract_id}: invalid contract_structure: {e}") from e
+
+    if isinstance(underlying, dict):
+        return _underlier_from_terms(attrs, underlying)
+
+    if underliers is None or underlying not in underliers:
+        raise ValueError(
+            f"CAPFL {attrs.contract_id}: underlier {underlying!r} must be embedded in "
+            "contract_structure or passed via `underliers`"
+        )
+    resolved = underliers[underlying]
+    if resolved.contract_type not in _UNDERLIER_TYPES:
+        raise ValueError(
+            f"CAPFL {attrs.contract_id}: unsupported underlier type {resolved.contract_type.value}"
+        )
+    return resolved
+
+
+def _capfl_params_to_jax(raw: dict[str, float], underlier: Any) -> CAPFLArrayParams:
+    """Wrap underlier params with JAX cap/floor params."""
+    return CAPFLArrayParams(
+        underlier=underlier, **{k: jnp.array(v, dtype=F32) for k, v in raw.items()}
+    )
+
+
+def precompute_capfl_arrays(
+    attrs: ContractAttributes,
+    rf_observer: RiskFactorObserver,
+    underliers: Mapping[str, ContractAttributes] | None = None,
+) -> tuple[PAMArrayState | LAMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, CAPFLArrayParams]:
+    """Pre-compute JAX arrays for array-mode CAPFL simulation.
+
+    Runs the underlier's own pre-computation (``precompute_pam_arrays`` or
+    ``precompute_lam_arrays``) and wraps its params with the cap/floor terms.
+
+    Args:
+        attrs: Contract attributes (must be CAPFL type).
+        rf_observer: Risk factor observer (queried for the underlier's RR
+            events).
+        underliers: Optional mapping of underlier IDs to attributes, for
+            CAPFLs whose ``contract_structure`` references the underlier by ID.
+
+    Returns:
+        ``(initial_state, event_types, year_fractions, rf_values, params)``
+    """
+    ul_attrs = _underlier_attributes(attrs, underliers)
+    precompute = (
+        precompute_lam_arrays
+        if ul_attrs.contract_type == ContractType.LAM
+        else precompute_pam_arrays
+    )
+    state, et, yf, rf, ul_params = precompute(ul_attrs, rf_observer)
+    return state, et, yf, rf, _capfl_params_to_jax(_extract_params_raw(attrs), ul_params)
+
+
+# ============================================================================
+# Batch / portfolio API
+# ============================================================================
+
+
+def prepare_capfl_batch(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    underliers: Mapping[str, ContractAttributes] | None = None,
+) -> tuple[
+    PAMArrayState | LAMArrayState,
+    jnp.ndarray,
+    jnp.ndarray,
+    jnp.ndarray,
+    CAPFLArrayParams,
+    jnp.ndarray,
+]:
+    """Pre-compute and pad arrays for a batch of CAPFLs on one underlier type.
+
+    All underliers in the batch must share a contract type (PAM or LAM);
+    ``simulate_capfl_portfolio`` groups mixed books automatically.
+
+    Returns:
+        ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
+        where ``masks`` marks the underlier's IP events (the only events at
+        which a cap/floor pays).
+
+    Raises:
+        ValueError: If the underliers have mixed contract types.
+    """
+    return _prepare_capfl_batch_dated(contracts, underliers)[0]
+
+
+def _prepare_capfl_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    underliers: Mapping[str, ContractAttributes] | None = None,
+) -> tuple[
+    tuple[
+        PAMArrayState | LAMArrayState,
+        jnp.ndarray,
+        jnp.ndarray,
+        jnp.ndarray,
+        CAPFLArrayParams,
+        jnp.ndarray,
+    ],
+    jnp.ndarray,
+]:
+    """``prepare_capfl_batch`` plus the ``[B, T]`` int32 event ordinals.
+
+    Ordinals come from the underlier's schedule and are zeroed wherever the
+    IP mask is, so they share the returned ``masks``.
+    """
+    ul_contracts = [(_underlier_attributes(a, underliers), obs) for a, obs in contracts]
+    ul_types = {ul.contract_type for ul, _ in ul_contracts}
+    if len(ul_types) > 1:
+        raise ValueError(f"prepare_capfl_batch needs a single underlier type, got {ul_types}")
+
+    prepare = _prepare_lam_batch_dated if ContractType.LAM in ul_types else _prepare_pam_batch_dated
+    (states, et, yf, rf, ul_params, masks), ordinals = prepare(ul_contracts)
+
+    raw = [_extract_params_raw(a) for a, _ in contracts]
+    params = CAPFLArrayParams(
+        underlier=ul_params,
+        **{k: jnp.asarray(np.array([r[k] for r in raw], dtype=np.float32)) for k in raw[0]},
+    )
+    ip_masks = masks * (et == IP_IDX)
+    return (states, et, yf, rf, params, ip_masks), jnp.where(ip_masks > 0, ordinals, 0)
+
+
+def simulate_capfl_portfolio(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    discount_rate: float | None = None,
+    underliers: Mapping[str, ContractAttributes] | None = None,
+) -> dict[str, Any]:
+    """End-to-end CAPFL portfolio simulation with optional PV.
+
+    Contracts are grouped by underlier type (PAM / LAM), each group runs
+    through ``batch_simulate_capfl``, and the results are reassembled in
+    input order with the event axis padded to the longest group.
+
+    Args:
+        contracts: List of ``(attributes, rf_observer)`` pairs.
+        discount_rate: If provided, compute present values.
+        underliers: Optional mapping of underlier IDs to attributes.
+
+    Returns:
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``,
+        ``final_states`` (keyed by underlier ``ContractType``), ``total_cashflows``, and optionally
+        ``present_values`` and ``total_pv``.
+    """
+    groups: dict[ContractType, list[int]] = {}
+    for i, (attrs, _obs) in enumerate(contracts):
+        ct = _underlier_attributes(attrs, underliers).contract_type
+        groups.setdefault(ct, []).append(i)
+
+    n = len(contracts)
+    group_out: list[tuple[list[int], jnp.ndarray, jnp.ndarray, jnp.ndarray, jnp.ndarray]] = []
+    final_states: dict[ContractType, Any] = {}
+    for ct, idx in groups.items():
+        (states, et, yf, rf, params, masks), ordinals = _prepare_capfl_batch_dated(
+            [contracts[i] for i in idx], underliers
+        )
+        final_states[ct], payoffs = batch_simulate_capfl(states, et, yf, rf, params)
+        group_out.append((idx, payoffs * masks, masks, yf, ordinals))
+
+    max_events = max((p.shape[1] for _, p, _, _, _ in group_out), default=1)
+    all_payoffs = np.zeros((n, max_events), dtype=np.float32)
+    all_masks = np.zeros((n, max_events), dtype=np.float32)
+    all_yf = np.zeros((n, max_events), dtype=np.float32)
+    all_ordinals = np.zeros((n, max_events), dtype=np.int32)
+    for idx, payoffs, masks, yf, ordinals in group_out:
+        t = payoffs.shape[1]
+        all_payoffs[idx, :t] = np.asarray(payoffs)
+        all_masks[idx, :t] = np.asarray(masks)
+        all_yf[idx, :t] = np.asarray(yf)
+        all_ordinals[idx, :t] = np.asarray(ordinals)
+
+    masked_payoffs = jnp.asarray(all_payoffs)
+    result: dict[str, Any] = {
+        "payoffs": masked_payoffs,
+        "masks": jnp.asarray(all_masks),
+        "event_ordinals": jnp.asarray(all_ordinals),
+        "final_states": final_states,
+        "total_cashflows": jnp.sum(masked_payoffs, axis=1),
+        "num_contracts": n,
+    }
+
+    if discount_rate is not None:
+        disc_yfs = jnp.cumsum(jnp.asarray(all_yf), axis=1)
+        discount_factors = 1.0 / (1.0 + discount_rate * disc_yfs)
+        pvs = jnp.sum(masked_payoffs * discount_factors, axis=1)
+        result["present_values"] = pvs
+        result["total_pv"] = jnp.sum(pvs)
+
+    return result
@@ -0,0 +1,99 @@
+"""Array-mode CEC simulation — collateral settled on batched children.
+
+A credit enhancement collateral (CEC) contract settles the smaller of the
+covered exposure and the collateral posted by its covering contracts when
+a covered contract hits a credit event.  It shares the CEG pipeline in
+``jactus.contracts.ceg_array``: covered and covering contracts are
+simulated once per book through their batch kernels, and
+``settle_credit_events`` caps the exercise amount by the collateral value
+on-device.
+
+Collateral at a credit event is the sum over covering contracts of
+``|quantity * price|`` for COM contracts (price observed on
+``market_object_code``) and ``|NT|`` for the rest.
+
+Payoffs::
+
+    STD: R(CEC) * min(CECV * sum |NT (+ IPAC + Y * IPNR * NT)|, collateral)
+
+Example::
+
+    from jactus.contracts.cec_array import simulate_cec_portfolio
+
+    result = simulate_cec_portfolio(
+        [(cec_attrs, rf_obs)],
+        child_contracts={"LOAN-1": loan_attrs, "GOLD": com_attrs},
+        credit_events={"LOAN-1": [(ActusDateTime(2025, 6, 1), ContractPerformance.DF)]},
+    )
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from jactus.contracts.cec import CreditEnhancementCollateralContract
+from jactus.contracts.ceg_array import (
+    CreditEnhancementArrays,
+    CreditEvents,
+    _prepare_credit_enhancement_batch,
+    _simulate_credit_enhancement_portfolio,
+)
+from jactus.contracts.composite_array import ChildBatch
+from jactus.core import ContractAttributes
+from jactus.observers import RiskFactorObserver
+
+
+def prepare_cec_batch(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    child_contracts: Mapping[str, ContractAttributes] | None = None,
+    credit_events: CreditEvents | None = None,
+) -> tuple[list[ChildBatch], CreditEnhancementArrays]:
+    """Pre-compute child batches and settlement inputs for a CEC book.
+
+    Covered and covering contracts are simulated once each, with the risk
+    factor observer of the first contract that references them.  COM
+    collateral is valued with the CEC's own observer.
+
+    Args:
+        contracts: List of ``(attributes, rf_observer)`` pairs.
+        child_contracts: Mapping of covered and covering contract IDs to
+            their attributes.
+        credit_events: Mapping of covered contract IDs to observed
+            ``(time, performance)`` credit events.
+
+    Returns:
+        ``(child_batches, arrays)``
+
+    Raises:
+        ValueError: If a child contract cannot be resolved or has no
+            array-mode kernel.
+    """
+    return _prepare_credit_enhancement_batch(
+        contracts, CreditEnhancementCollateralContract, child_contracts, credit_events
+    )
+
+
+def simulate_cec_portfolio(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    discount_rate: float | None = None,
+    child_contracts: Mapping[str, ContractAttributes] | None = None,
+    credit_events: CreditEvents | None = None,
+) -> dict[str, Any]:
+    """End-to-end CEC portfolio simulation with optional PV.
+
+    Args:
+        contracts: List of ``(attributes, rf_observer)`` pairs.
+        discount_rate: If provided, compute present values (A365 from each
+            contract's status date, as for CEG).
+        child_contracts: Mapping of covered and covering contract IDs to
+            attributes.
+        credit_events: Mapping of covered contract IDs to observed
+            ``(time, performance)`` credit events.
+
+    Returns:
+        Same layout as ``simulate_ceg_portfolio``; CEC contracts have no
+        PRD/FP slots.
+    """
+    batches, arrays = prepare_cec_batch(contracts, child_contracts, credit_events)
+    return _simulate_credit_enhancement_portfolio(contracts, batches, arrays, discount_rate)
@@ -0,0 +1,671 @@
+"""Array-mode CEG simulation — credit enhancement settled on batched children.
+
+A credit enhancement guarantee (CEG) pays a share of its covered
+contracts' exposure when one of them hits a credit event.  The scalar
+``CreditEnhancementGuaranteeContract`` simulates every covered contract
+through a ``ChildContractObserver`` and walks the child histories in
+Python.  This module keeps the children in array mode and settles a whole
+book in one vectorized pass:
+
+1. **Children** (``jactus.contracts.composite_array``): the distinct
+   covered contracts of the book are grouped by type and run through their
+   batch kernels once, recording per-event state trajectories.  A child
+   shared by several guarantees is simulated once.
+2. **Pre-computation** (Python, once per book): every guarantee gets a
+   fixed set of query points — its coverage time plus one candidate per
+   observed credit event on its covered contracts — with the trajectory
+   column, presence flag and accrual year fraction of each covered child
+   at each query point, and the settlement date of each candidate.
+3. **Settlement** (JAX): ``settle_credit_events`` gathers the children's
+   notional, rate and accrued interest at every query point, computes
+   coverage, picks the first candidate whose performance matches the
+   guarantee's credit event type, and writes the XD/STD/MD slots.
+
+Credit events are observed inputs, as in the ACTUS test cases
+(``eventsObserved``): ``credit_events`` maps a child contract ID to its
+``(time, performance)`` observations.
+
+Payoffs::
+
+    PRD: -R(CEG) * PPRD
+    FP:   R(CEG) * FER                    (dropped from the settlement date on)
+    STD:  R(CEG) * (CECV * sum |NT (+ IPAC + Y * IPNR * NT)| + accrual)
+
+Example::
+
+    from jactus.contracts.ceg_array import simulate_ceg_portfolio
+
+    result = simulate_ceg_portfolio(
+        [(ceg_attrs, rf_obs)],
+        child_contracts={"LOAN-1": loan_attrs},
+        credit_events={"LOAN-1": [(ActusDateTime(2025, 6, 1), ContractPerformance.DF)]},
+    )
+    result["total_cashflows"]  # guarantee cash flow per contract
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from datetime import datetime as _datetime
+from typing import Any, NamedTuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jactus.contracts.array_common import (
+    FP_IDX,
+    MD_IDX,
+    PRD_IDX,
+    STD_IDX,
+    XD_IDX,
+    adt_to_dt,
+    dt_to_adt,
+)
+from jactus.contracts.ceg import CreditEnhancementGuaranteeContract
+from jactus.contracts.composite_array import (
+    ChildBatch,
+    ChildTrajectory,
+    check_child_type,
+    prepare_child_batches,
+    simulate_child_trajectories,
+)
+from jactus.core import (
+    ActusDateTime,
+    ContractAttributes,
+    ContractPerformance,
+    ContractType,
+)
+from jactus.core.types import DayCountConvention
+from jactus.observers import MockChildContractObserver, RiskFactorObserver
+from jactus.utilities.conventions import year_fraction
+from jactus.utilities.schedules import generate_schedule
+
+CreditEvents = Mapping[str, Sequence[tuple[ActusDateTime, ContractPerformance | str]]]
+
+# Integer codes for performance comparisons on-device
+_PERFORMANCE_CODES: dict[ContractPerformance, int] = {
+    p: i for i, p in enumerate(ContractPerformance)
+}
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+
+class CreditEnhancementArrays(NamedTuple):
+    """Pre-computed inputs for settling a book of CEG/CEC contracts.
+
+    Shapes use ``G`` guarantees, ``K`` covered and ``J`` covering child
+    slots, ``C`` credit event candidates and ``S`` event slots.  Query
+    point 0 is the coverage time and query point ``c + 1`` is candidate
+    ``c``, so query arrays have ``Q = C + 1`` entries.
+    """
+
+    # Covered children (coverage amount)
+    covered_rows: jnp.ndarray  # [G, K] int32 child row in the trajectory
+    covered_masks: jnp.ndarray  # [G, K] 1.0 for occupied child slots
+    query_columns: jnp.ndarray  # [G, Q, K] int32 trajectory column at each query
+    query_present: jnp.ndarray  # [G, Q, K] 1.0 if the child has a state at the query
+    query_year_fractions: jnp.ndarray  # [G, Q, K] accrual from the child's state date
+    settle_year_fractions: jnp.ndarray  # [G, C, K] accrual over the settlement period
+    # Covering children (CEC collateral)
+    covering_rows: jnp.ndarray  # [G, J] int32
+    covering_columns: jnp.ndarray  # [G, C, J] int32
+    covering_present: jnp.ndarray  # [G, C, J] 1.0 if valued from the child's notional
+    covering_values: jnp.ndarray  # [G, C, J] market value of COM collateral
+    # Credit event candidates
+    ce_performance: jnp.ndarray  # [G, C] int32 observed performance code
+    ce_ordinals: jnp.ndarray  # [G, C] int32
+    std_ordinals: jnp.ndarray  # [G, C] int32 settlement date ordinal
+    ce_valid: jnp.ndarray  # [G, C] bool: observed in [status date, maturity]
+    # Guarantee terms
+    role_sign: jnp.ndarray  # [G]
+    coverage: jnp.ndarray  # [G] coverage ratio (CECV)
+    include_interest: jnp.ndarray  # [G] 1.0 for CEGE = NI
+    target_performance: jnp.ndarray  # [G] int32 credit event type code
+    has_collateral: jnp.ndarray  # [G] bool: exercise capped by collateral (CEC)
+    # Event slots: [PRD, FP..., XD, STD, MD]
+    event_types: jnp.ndarray  # [G, S] int32
+    event_ordinals: jnp.ndarray  # [G, S] int32 (XD/STD filled in at settlement)
+    static_payoffs: jnp.ndarray  # [G, S] PRD/FP payoffs
+    static_masks: jnp.ndarray  # [G, S] 1.0 for scheduled PRD/FP/MD slots
+
+
+class CreditEnhancementSettlement(NamedTuple):
+    """Outputs of ``settle_credit_events``."""
+
+    payoffs: jnp.ndarray  # [G, S] masked payoffs
+    masks: jnp.ndarray  # [G, S]
+    event_ordinals: jnp.ndarray  # [G, S]
+    coverage: jnp.ndarray  # [G] coverage amount at the coverage time
+    exercised: jnp.ndarray  # [G] bool
+    exercise_amounts: jnp.ndarray  # [G] amount settled at STD (0 if not exercised)
+
+
+# ============================================================================
+# Settlement kernel
+# ============================================================================
+
+
+@jax.jit
+def settle_credit_events(
+    trajectory: ChildTrajectory,
+    arrays: CreditEnhancementArrays,
+) -> CreditEnhancementSettlement:
+    """Compute coverage, detect credit events and settle every guarantee.
+
+    Args:
+        trajectory: Child state trajectories from ``simulate_child_trajectories``.
+        arrays: Pre-computed inputs from ``prepare_ceg_batch`` /
+            ``prepare_cec_batch``.
+
+    Returns:
+        ``CreditEnhancementSettlement`` for the book.
+    """
+    a = arrays
+    rows = a.covered_rows[:, None, :]
+    nt = jnp.abs(trajectory.nt[rows, a.query_columns])
+    ipnr = jnp.abs(trajectory.ipnr[rows, a.query_columns])
+    ipac = jnp.abs(trajectory.ipac[rows, a.query_columns])
+    weight = a.covered_masks[:, None, :] * a.query_present
+
+    # Coverage at every query point: CECV * sum(|NT| (+ |IPAC| + Y * |IPNR| * |NT|))
+    interest = a.include_interest[:, None, None] * (ipac + a.query_year_fractions * ipnr * nt)
+    coverage = a.coverage[:, None] * jnp.sum(weight * (nt + interest), axis=2)  # [G, Q]
+    ce_coverage = coverage[:, 1:]
+    accrual = jnp.sum(
+        weight[:, 1:] * a.settle_year_fractions * ipnr[:, 1:] * nt[:, 1:], axis=2
+    )  # [G, C]
+
+    collateral_nt = jnp.abs(trajectory.nt[a.covering_rows[:, None, :], a.covering_columns])
+    collateral = jnp.sum(a.covering_values + a.covering_present * collateral_nt, axis=2)
+    exercise = jnp.where(
+        a.has_collateral[:, None],
+        jnp.minimum(ce_coverage, collateral),
+        ce_coverage + accrual,
+    )
+
+    # First candidate (covered-contract order, then observation order) that matches
+    match = a.ce_valid & (a.ce_performance == a.target_performance[:, None])
+    exercised = jnp.any(match, axis=1)
+    first = jnp.argmax(match, axis=1)[:, None]
+
+    def pick(x: jnp.ndarray) -> jnp.ndarray:
+        return jnp.take_along_axis(x, first, axis=1)[:, 0]
+
+    exercise_amounts = jnp.where(exercised, pick(exercise), 0.0)
+    std_ordinals = pick(a.std_ordinals)
+
+    xd, std, md = -3, -2, -1
+    ordinals = a.event_ordinals.at[:, xd].set(pick(a.ce_ordinals)).at[:, std].set(std_ordinals)
+    # PRD/FP events on or after the settlement date are dropped once exercised
+    settled = exercised[:, None] & (a.event_ordinals >= std_ordinals[:, None])
+    masks = jnp.where(settled, 0.0, a.static_masks)
+    masks = (
+        masks.at[:, xd]
+        .set(exercised.astype(masks.dtype))
+        .at[:, std]
+        .set(exercised.astype(masks.dtype))
+        .at[:, md]
+        .set(jnp.where(exercised, 0.0, a.static_masks[:, md]))
+    )
+    payoffs = a.static_payoffs.at[:, std].set(a.role_sign * exercise_amounts) * masks
+
+    return CreditEnhancementSettlement(
+        payoffs=payoffs,
+        masks=masks,
+        event_ordinals=ordinals,
+        coverage=coverage[:, 0],
+        exercised=exercised,
+        exercise_amounts=exercise_amounts,
+    )
+
+
+# ============================================================================
+# Pre-computation bridge — Python -> JAX arrays
+# ============================================================================
+
+
+class _ChildRegistry:
+    """Deduplicated child contracts of a book, in first-reference order."""
+
+    def __init__(self, child_contracts: Mapping[str, ContractAttributes] | None) -> None:
+        self.child_contracts = child_contracts or {}
+        self.rows: dict[str, int] = {}
+        self.children: list[tuple[ContractAttributes, RiskFactorObserver]] = []
+
+    def attributes(self, parent: ContractAttributes, child_id: str) -> ContractAttributes:
+        if child_id not in self.child_contracts:
+            raise ValueError(
+                f"{parent.contract_type.value} {parent.contract_id}: child contract "
+                f"{child_id!r} must be passed via `child_contracts`"
+            )
+        return self.child_contracts[child_id]
+
+    def row(self, parent: ContractAttributes, child_id: str, obs: RiskFactorObserver) -> int:
+        """Return the child's row, registering it on first reference."""
+        if child_id not in self.rows:
+            child = self.attributes(parent, child_id)
+            check_child_type(parent, child)
+            self.rows[child_id] = len(self.children)
+            self.children.append((child, obs))
+        return self.rows[child_id]
+
+
+class _ChildTimeline(NamedTuple):
+    """A child's status date, event dates (kernel order) and day count."""
+
+    status_date: _datetime
+    dates: list[_datetime]
+    dcc: DayCountConvention
+
+    def lookup(self, t: _datetime) -> tuple[int, bool, _datetime]:
+        """Trajectory column, presence flag and state date at time ``t``.
+
+        Mirrors ``SimulatedChildContractObserver``: the state after the last
+        event at or before ``t``, else the initial state from the status date.
+        """
+        k = bisect_right(self.dates, t)
+        if k > 0:
+            return k, True, self.dates[k - 1]
+        return 0, self.status_date <= t, self.status_date
+
+    def year_fraction(self, start: _datetime, end: _datetime) -> float:
+        return float(year_fraction(dt_to_adt(start), dt_to_adt(end), self.dcc))
+
+
+class _Candidate(NamedTuple):
+    """One observed credit event on a covered contract."""
+
+    time: _datetime
+    performance: int
+    settlement: _datetime  # STD date
+    settlement_end: _datetime | None  # unadjusted end of a non-zero settlement period
+    valid: bool  # observed within [status date, maturity]
+
+
+class _GuaranteeSpec(NamedTuple):
+    """Python-side description of one guarantee before padding."""
+
+    covered: list[int]  # child rows
+    covering: list[int | None]  # child rows; None for COM collateral
+    covering_values: list[list[float]]  # [J][C] COM market values
+    coverage_time: _datetime
+    candidates: list[_Candidate]
+    slots: list[tuple[int, _datetime, float]]  # PRD/FP slots: (event, date, payoff)
+    maturity: _datetime | None
+
+
+def _effective_maturity(
+    attrs: ContractAttributes, covered: list[ContractAttributes]
+) -> ActusDateTime | None:
+    """The guarantee's maturity, or the latest covered-contract maturity."""
+    if attrs.maturity_date is not None:
+        return attrs.maturity_date
+    dates = [c.maturity_date for c in covered if c.maturity_date is not None]
+    return max(dates) if dates else None
+
+
+def _candidates(
+    contract: Any,
+    covered_ids: list[str],
+    credit_events: CreditEvents | None,
+    maturity: ActusDateTime | None,
+    accrue_settlement: bool,
+) -> list[_Candidate]:
+    """Credit event candidates in detection order with their settlement dates.
+
+    ``accrue_settlement`` (CEG) records the unadjusted settlement end so
+    interest accrued over a non-zero settlement period is paid at STD.
+    """
+    attrs = contract.attributes
+    has_delay = accrue_settlement and contract._get_settlement_period_days() > 0
+    out = []
+    for cid in covered_ids:
+        for time, perf in (credit_events or {}).get(cid, ()):
+            valid = time >= attrs.status_date and (maturity is None or time <= maturity)
+            out.append(
+                _Candidate(
+                    adt_to_dt(time),
+                    _PERFORMANCE_CODES[ContractPerformance(perf)],
+                    adt_to_dt(contract._compute_settlement_time(time)),
+                    adt_to_dt(contract._compute_raw_settlement_end(time)) if has_delay else None,
+                    valid,
+                )
+            )
+    return out
+
+
+def _fee_slots(
+    attrs: ContractAttributes, maturity: ActusDateTime | None
+) -> list[tuple[int, _datetime, float]]:
+    """PRD and FP slots of a CEG (fees are a flat ``R(CEG) * FER`` per date)."""
+    role_sign = float(attrs.contract_role.get_sign())
+    slots = []
+    if attrs.purchase_date is not None:
+        slots.append(
+            (
+                PRD_IDX,
+                adt_to_dt(attrs.purchase_date),
+                -role_sign * (attrs.price_at_purchase_date or 0.0),
+            )
+        )
+    if attrs.fee_payment_cycle and attrs.fee_rate is not None:
+        fp_dates = generate_schedule(
+            start=attrs.fee_payment_anchor or attrs.purchase_date or attrs.status_date,
+            cycle=attrs.fee_payment_cycle,
+            end=maturity or attrs.status_date,
+        )
+        slots.extend(
+            (FP_IDX, adt_to_dt(t), role_sign * attrs.fee_rate)
+            for t in fp_dates
+            if t > attrs.status_date
+        )
+    return slots
+
+
+def _cec_coverage_time(
+    attrs: ContractAttributes, covered: list[ContractAttributes]
+) -> ActusDateTime:
+    """CEC coverage time: purchase/status date, or the first covered IED if later."""
+    coverage_time = attrs.purchase_date or attrs.status_date
+    for child in covered:
+        if child.initial_exchange_date:
+            return max(coverage_time, child.initial_exchange_date)
+    return coverage_time
+
+
+def _com_value(obs: RiskFactorObserver, child: ContractAttributes, t: _datetime) -> float:
+    """Market value of COM collateral: ``|quantity * price|`` at ``t``."""
+    if not child.market_object_code:
+        raise ValueError(f"COM covering contract {child.contract_id} needs a market_object_code")
+    price = obs.observe_risk_factor(child.market_object_code, dt_to_adt(t), None, None)
+    return abs(float(child.quantity or 1) * float(price))
+
+
+def _prepare_credit_enhancement_batch(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    contract_cls: Any,
+    child_contracts: Mapping[str, ContractAttributes] | None,
+    credit_events: CreditEvents | None,
+) -> tuple[list[ChildBatch], CreditEnhancementArrays]:
+    """Shared CEG/CEC pre-computation.
+
+    ``contract_cls`` is the scalar contract class; it validates
+    ``contract_structure``, fills in the attribute defaults and provides
+    the settlement-date helpers.  Covering contracts (CEC) are read when the
+    class defines ``_get_covering_contract_ids``.
+    """
+    registry = _ChildRegistry(child_contracts)
+    parsed = []
+    for attrs, obs in contracts:
+        contract = contract_cls(attrs.model_copy(), obs, MockChildContractObserver())
+        covered_ids = contract._get_covered_contract_ids()
+        covered = [registry.row(attrs, cid, obs) for cid in covered_ids]
+        covering: list[tuple[ContractAttributes, int | None]] = []
+        if hasattr(contract, "_get_covering_contract_ids"):
+            for cid in contract._get_covering_contract_ids():
+                child = registry.attributes(attrs, cid)
+                row = (
+                    None
+                    if child.contract_type == ContractType.COM
+                    else registry.row(attrs, cid, obs)
+                )
+                covering.append((child, row))
+        parsed.append((contract, obs, covered_ids, covered, covering))
+
+    # Every distinct child runs through its type's batch kernel once
+    batches, child_events = prepare_child_batches(registry.children)
+    timelines = [
+        _ChildTimeline(
+            adt_to_dt(child.status_date),
+            [dt for _, dt in events],
+            child.day_count_convention or DayCountConvention.A365,
+        )
+        for (child, _), events in zip(registry.children, child_events, strict=True)
+    ]
+
+    specs = []
+    for contract, obs, covered_ids, covered, covering in parsed:
+        attrs = contract.attributes
+        covered_attrs = [registry.child_contracts[cid] for cid in covered_ids]
+        maturity = _effective_maturity(attrs, covered_attrs)
+        candidates = _candidates(
+            contract, covered_ids, credit_events, maturity, accrue_settlement=not covering
+        )
+        if covering:
+            coverage_time = _cec_coverage_time(attrs, covered_attrs)
+            slots: list[tuple[int, _datetime, float]] = []
+        else:
+            coverage_time = attrs.purchase_date or attrs.status_date
+            slots = _fee_slots(attrs, maturity)
+        specs.append(
+            _GuaranteeSpec(
+                covered=covered,
+                covering=[row for _, row in covering],
+                covering_values=[
+                    [0.0 if row is not None else _com_value(obs, child, c.time) for c in candidates]
+                    for child, row in covering
+                ],
+                coverage_time=adt_to_dt(coverage_time),
+                candidates=candidates,
+                slots=slots,
+                maturity=adt_to_dt(maturity) if maturity is not None else None,
+            )
+        )
+
+    return batches, _pad_specs(contracts, specs, timelines)
+
+
+def _pad_specs(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    specs: list[_GuaranteeSpec],
+    timelines: list[_ChildTimeline],
+) -> CreditEnhancementArrays:
+    """Lay the per-guarantee specs out as padded ``[G, ...]`` arrays."""
+    g = len(specs)
+    k = max([len(s.covered) for s in specs] + [1])
+    j = max([len(s.covering) for s in specs] + [1])
+    c = max([len(s.candidates) for s in specs] + [1])
+    n_slots = max([len(s.slots) for s in specs] + [0]) + 3
+    covered_rows = np.zeros((g, k), dtype=np.int32)
+    covered_masks = np.zeros((g, k), dtype=np.float32)
+    query_columns = np.zeros((g, c + 1, k), dtype=np.int32)
+    query_present = np.zeros((g, c + 1, k), dtype=np.float32)
+    query_yf = np.zeros((g, c + 1, k), dtype=np.float32)
+    settle_yf = np.zeros((g, c, k), dtype=np.float32)
+    covering_rows = np.zeros((g, j), dtype=np.int32)
+    covering_columns = np.zeros((g, c, j), dtype=np.int32)
+    covering_present = np.zeros((g, c, j), dtype=np.float32)
+    covering_values = np.zeros((g, c, j), dtype=np.float32)
+    ce_performance = np.full((g, c), -1, dtype=np.int32)
+    ce_ordinals = np.zeros((g, c), dtype=np.int32)
+    std_ordinals = np.zeros((g, c), dtype=np.int32)
+    ce_valid = np.zeros((g, c), dtype=bool)
+    role_sign = np.zeros(g, dtype=np.float32)
+    coverage = np.zeros(g, dtype=np.float32)
+    include_interest = np.zeros(g, dtype=np.float32)
+    target = np.zeros(g, dtype=np.int32)
+    has_collateral = np.zeros(g, dtype=bool)
+    event_types = np.full((g, n_slots), FP_IDX, dtype=np.int32)
+    event_types[:, -3:] = (XD_IDX, STD_IDX, MD_IDX)
+    event_ordinals = np.zeros((g, n_slots), dtype=np.int32)
+    static_payoffs = np.zeros((g, n_slots), dtype=np.float32)
+    static_masks = np.zeros((g, n_slots), dtype=np.float32)
+
+    for i, ((attrs, _), spec) in enumerate(zip(contracts, specs, strict=True)):
+        cege = attrs.credit_enhancement_guarantee_extent or "NO"
+        role_sign[i] = attrs.contract_role.get_sign()
+        coverage[i] = 1.0 if attrs.coverage is None else attrs.coverage
+        include_interest[i] = cege == "NI"
+        target[i] = _PERFORMANCE_CODES[
+            ContractPerformance(attrs.credit_event_type or ContractPerformance.DF)
+        ]
+        has_collateral[i] = bool(spec.covering)
+
+        queries = [spec.coverage_time] + [cand.time for cand in spec.candidates]
+        for kk, row in enumerate(spec.covered):
+            timeline = timelines[row]
+            covered_rows[i, kk] = row
+            covered_masks[i, kk] = 1.0
+            for q, t in enumerate(queries):
+                col, present, state_sd = timeline.lookup(t)
+                query_columns[i, q, kk] = col
+                query_present[i, q, kk] = present
+                if present and cege == "NI":
+                    query_yf[i, q, kk] = timeline.year_fraction(state_sd, t)
+            for cc, cand in enumerate(spec.candidates):
+                if cand.settlement_end is not None:
+                    settle_yf[i, cc, kk] = timeline.year_fraction(cand.time, cand.settlement_end)
+
+        for jj, covering_row in enumerate(spec.covering):
+            covering_values[i, : len(spec.candidates), jj] = spec.covering_values[jj]
+            if covering_row is None:
+                continue
+            covering_rows[i, jj] = covering_row
+            for cc, cand in enumerate(spec.candidates):
+                col, present, _ = timelines[covering_row].lookup(cand.time)
+                covering_columns[i, cc, jj] = col
+                covering_present[i, cc, jj] = present
+
+        for cc, cand in enumerate(spec.candidates):
+            ce_performance[i, cc] = cand.performance
+            ce_ordinals[i, cc] = cand.time.toordinal()
+            std_ordinals[i, cc] = cand.settlement.toordinal()
+            ce_valid[i, cc] = cand.valid
+
+        for u, (evt, dt, payoff) in enumerate(spec.slots):
+            event_types[i, u] = evt
+            event_ordinals[i, u] = dt.toordinal()
+            static_payoffs[i, u] = payoff
+            static_masks[i, u] = 1.0
+        if spec.maturity is not None:
+            event_ordinals[i, -1] = spec.maturity.toordinal()
+            static_masks[i, -1] = 1.0
+
+    return CreditEnhancementArrays(
+        covered_rows=jnp.asarray(covered_rows),
+        covered_masks=jnp.asarray(covered_masks),
+        query_columns=jnp.asarray(query_columns),
+        query_present=jnp.asarray(query_present),
+        query_year_fractions=jnp.asarray(query_yf),
+        settle_year_fractions=jnp.asarray(settle_yf),
+        covering_rows=jnp.asarray(covering_rows),
+        covering_columns=jnp.asarray(covering_columns),
+        covering_present=jnp.asarray(covering_present),
+        covering_values=jnp.asarray(covering_values),
+        ce_performance=jnp.asarray(ce_performance),
+        ce_ordinals=jnp.asarray(ce_ordinals),
+        std_ordinals=jnp.asarray(std_ordinals),
+        ce_valid=jnp.asarray(ce_valid),
+        role_sign=jnp.asarray(role_sign),
+        coverage=jnp.asarray(coverage),
+        include_interest=jnp.asarray(include_interest),
+        target_performance=jnp.asarray(target),
+        has_collateral=jnp.asarray(has_collateral),
+        event_types=jnp.asarray(event_types),
+        event_ordinals=jnp.asarray(event_ordinals),
+        static_payoffs=jnp.asarray(static_payoffs),
+        static_masks=jnp.asarray(static_masks),
+    )
+
+
+def prepare_ceg_batch(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    child_contracts: Mapping[str, ContractAttributes] | None = None,
+    credit_events: CreditEvents | None = None,
+) -> tuple[list[ChildBatch], CreditEnhancementArrays]:
+    """Pre-compute child batches and settlement inputs for a CEG book.
+
+    Each covered contract is simulated once with the risk factor observer
+    of the first guarantee that references it.
+
+    Args:
+        contracts: List of ``(attributes, rf_observer)`` pairs.
+        child_contracts: Mapping of covered contract IDs (as referenced in
+            ``contract_structure``) to their attributes.
+        credit_events: Mapping of covered contract IDs to observed
+            ``(time, performance)`` credit events.
+
+    Returns:
+        ``(child_batches, arrays)``
+
+    Raises:
+        ValueError: If a covered contract cannot be resolved or has no
+            array-mode kernel.
+    """
+    return _prepare_credit_enhancement_batch(
+        contracts, CreditEnhancementGuaranteeContract, child_contracts, credit_events
+    )
+
+
+# ============================================================================
+# Batch / portfolio API
+# ============================================================================
+
+
+def _simulate_credit_enhancement_portfolio(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    batches: list[ChildBatch],
+    arrays: CreditEnhancementArrays,
+    discount_rate: float | None,
+) -> dict[str, Any]:
+    """Run the children, settle the book and assemble the result dict."""
+    final_states, trajectory = simulate_child_trajectories(batches)
+    settlement = settle_credit_events(trajectory, arrays)
+
+    result: dict[str, Any] = {
+        "payoffs": settlement.payoffs,
+        "masks": settlement.masks,
+        "event_types": arrays.event_types,
+        "event_ordinals": jnp.where(settlement.masks > 0, settlement.event_ordinals, 0),
+        "final_states": final_states,
+        "coverage": settlement.coverage,
+        "exercised": settlement.exercised,
+        "exercise_amounts": settlement.exercise_amounts,
+        "total_cashflows": jnp.sum(settlement.payoffs, axis=1),
+        "num_contracts": len(contracts),
+    }
+
+    if discount_rate is not None:
+        sd_ordinals = np.array(
+            [adt_to_dt(a.status_date).toordinal() for a, _ in contracts], dtype=np.int32
+        )
+        t = (settlement.event_ordinals - jnp.asarray(sd_ordinals)[:, None]) / 365.0
+        discount_factors = 1.0 / (1.0 + discount_rate * jnp.maximum(t, 0.0))
+        pvs = jnp.sum(settlement.payoffs * discount_factors, axis=1)
+        result["present_values"] = pvs
+        result["total_pv"] = jnp.sum(pvs)
+
+    return result
+
+
+def simulate_ceg_portfolio(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    discount_rate: float | None = None,
+    child_contracts: Mapping[str, ContractAttributes] | None = None,
+    credit_events: CreditEvents | None = None,
+) -> dict[str, Any]:
+    """End-to-end CEG portfolio simulation with optional PV.
+
+    Args:
+        contracts: List of ``(attributes, rf_observer)`` pairs.
+        discount_rate: If provided, compute present values.  Slots are
+            discounted with ``1 / (1 + r * t)`` where ``t`` is the A365
+            year fraction from each guarantee's status date.
+        child_contracts: Mapping of covered contract IDs to attributes.
+        credit_events: Mapping of covered contract IDs to observed
+            ``(time, performance)`` credit events.
+
+    Returns:
+        Dict with ``payoffs`` (``[B, S]`` over the ``[PRD, FP..., XD, STD,
+        MD]`` slots), ``masks``, ``event_types``, ``event_ordinals``,
+        ``final_states`` (covered contracts' final states keyed by
+        ``ContractType``), ``coverage``, ``exercised``,
+        ``exercise_amounts``, ``total_cashflows``, ``num_contracts``, and
+        optionally ``present_values`` and ``total_pv``.
+    """
+    batches, arrays = prepare_ceg_batch(contracts, child_contracts, credit_events)
+    return _simulate_credit_enhancement_portfolio(contracts, batches, arrays, discount_rate)
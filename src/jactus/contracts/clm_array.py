@@ -0,0 +1,942 @@
+"""Array-mode CLM simulation — JIT-compiled, vmap-able pure JAX.
+
+This module provides a high-performance simulation path for CLM (Call Money)
+contracts using ``jax.lax.scan`` for the event loop and ``jax.lax.switch``
+for payoff/state-transition dispatch.  The simulation kernel is
+JIT-compilable and can be vectorized across a portfolio with ``jax.vmap``.
+
+Architecture:
+    Pre-computation (Python) -> Pure JAX kernel (jit + vmap)
+
+    The schedule of a CLM is only known once its maturity has been observed
+    (the call or repayment notice sets ``maturity_date``).  Pre-computation
+    replicates ``CallMoneyContract.generate_event_schedule`` for that observed
+    maturity — AD, IED, periodic IPCI, RR, and the terminal IP + MD pair —
+    and converts it to JAX arrays.  Contracts without an observed maturity
+    only carry their AD/IED events, exactly as in the scalar path.
+
+Key CLM specifics:
+    - Interest is paid once, by the IP event at the observed maturity.
+    - IPCI capitalizes ``ipac + yf * ipnr * nt`` into the notional.
+    - RR observes ``rate_reset_market_object`` (default ``"RATE"``); for
+      business-day-shifted resets the unadjusted schedule date is observed.
+    - Same-day events are ordered by event-type name, as in the scalar path.
+
+Example::
+
+    from jactus.contracts.clm_array import precompute_clm_arrays, simulate_clm_array
+
+    arrays = precompute_clm_arrays(attrs, rf_observer)
+    final_state, payoffs = simulate_clm_array(*arrays)
+
+    # Portfolio:
+    from jactus.contracts.clm_array import simulate_clm_portfolio
+    result = simulate_clm_portfolio(contracts, discount_rate=0.05)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime as _datetime
+from typing import Any, NamedTuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jactus.contracts.array_common import (
+    AD_IDX,
+    F32,
+    FP_IDX,
+    IED_IDX,
+    IP_IDX,
+    IPCI_IDX,
+    MD_IDX,
+    NOP_EVENT_IDX,
+    PR_IDX,
+    RR_IDX,
+    RRF_IDX,
+    CanonicalShapes,
+    PrecisionPolicy,
+    RawPrecomputed,
+    RFScenarios,
+    adt_to_dt,
+    check_scenario_options,
+    compute_vectorised_year_fractions,
+    dt_to_adt,
+    fast_schedule,
+    get_role_sign,
+    pad_event_ordinals,
+    precision_scope,
+    precompute_raw_list,
+    resolve_precision,
+    run_batch_kernel,
+    simulate_scenarios,
+    state_dtype,
+)
+from jactus.core import ContractAttributes, EventType
+from jactus.observers import RiskFactorObserver
+
+# Same-day ordering used by ``CallMoneyContract.generate_event_schedule``:
+# events are sorted by ``(event_time, event_type.value)``.
+_EVENT_NAME: dict[int, str] = {et.index: et.value for et in EventType}
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+
+class CLMArrayState(NamedTuple):
+    """Minimal scan-loop state for CLM simulation.
+
+    All fields are scalar ``jnp.ndarray`` (float32). ``sd`` (status date) is
+    omitted because year fractions are pre-computed before the JIT boundary.
+    """
+
+    nt: jnp.ndarray  # Notional principal (signed)
+    ipnr: jnp.ndarray  # Nominal interest rate
+    ipac: jnp.ndarray  # Accrued interest
+    feac: jnp.ndarray  # Accrued fees
+    nsc: jnp.ndarray  # Notional scaling multiplier
+    isc: jnp.ndarray  # Interest scaling multiplier
+
+
+class CLMArrayParams(NamedTuple):
+    """Static contract parameters extracted from ``ContractAttributes``.
+
+    These do not change during the scan loop.
+    """
+
+    role_sign: jnp.ndarray  # +1.0 or -1.0
+    notional_principal: jnp.ndarray
+    nominal_interest_rate: jnp.ndarray
+    premium_discount_at_ied: jnp.ndarray
+    rate_reset_spread: jnp.ndarray
+    rate_reset_multiplier: jnp.ndarray
+    rate_reset_floor: jnp.ndarray
+    rate_reset_cap: jnp.ndarray
+    rate_reset_next: jnp.ndarray
+    has_rate_floor: jnp.ndarray  # 1.0 if floor is active, else 0.0
+    has_rate_cap: jnp.ndarray  # 1.0 if cap is active, else 0.0
+    has_rate_reset_next: jnp.ndarray  # 1.0 if RRF fixes the rate, else 0.0
+
+
+# ============================================================================
+# Pure JAX payoff functions  (state, params, yf, rf) -> scalar payoff
+# ============================================================================
+
+
+def _pof_zero(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> jnp.ndarray:
+    """Zero payoff (AD, IPCI, RR, RRF, CE, unused event types and padding)."""
+    return jnp.array(0.0, dtype=F32)
+
+
+def _pof_ied(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> jnp.ndarray:
+    """POF_IED_CLM: R(CNTRL) * (-1) * (NT + PDIED)."""
+    return params.role_sign * (-1.0) * (params.notional_principal + params.premium_discount_at_ied)
+
+
+def _pof_principal(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> jnp.ndarray:
+    """POF_PR_CLM / POF_MD_CLM: Nsc * Nt (``nt`` is already signed)."""
+    return state.nsc * state.nt
+
+
+def _pof_fp(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> jnp.ndarray:
+    """POF_FP_CLM: pay accrued fees."""
+    return state.feac
+
+
+def _pof_ip(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> jnp.ndarray:
+    """POF_IP_CLM: Isc * (Ipac + Y(Sd, t) * Ipnr * Nt)."""
+    return state.isc * (state.ipac + yf * state.ipnr * state.nt)
+
+
+# ============================================================================
+# Pure JAX state transition functions  (state, params, yf, rf) -> new state
+# ============================================================================
+
+
+def _accrue_interest(state: CLMArrayState, yf: jnp.ndarray) -> jnp.ndarray:
+    """Common sub-expression: ipac + yf * ipnr * nt."""
+    return state.ipac + yf * state.ipnr * state.nt
+
+
+def _clamp_rate(params: CLMArrayParams, rf: jnp.ndarray) -> jnp.ndarray:
+    """Apply multiplier, spread, floor and cap to an observed market rate."""
+    raw_rate = params.rate_reset_multiplier * rf + params.rate_reset_spread
+    clamped = jnp.where(
+        params.has_rate_floor > 0.5,
+        jnp.maximum(raw_rate, params.rate_reset_floor),
+        raw_rate,
+    )
+    return jnp.where(
+        params.has_rate_cap > 0.5,
+        jnp.minimum(clamped, params.rate_reset_cap),
+        clamped,
+    )
+
+
+def _stf_ad(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> CLMArrayState:
+    return state._replace(ipac=_accrue_interest(state, yf))
+
+
+def _stf_ied(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> CLMArrayState:
+    return CLMArrayState(
+        nt=params.role_sign * params.notional_principal,
+        ipnr=params.nominal_interest_rate,
+        ipac=jnp.array(0.0, dtype=F32),
+        feac=jnp.array(0.0, dtype=F32),
+        nsc=jnp.array(1.0, dtype=F32),
+        isc=jnp.array(1.0, dtype=F32),
+    )
+
+
+def _stf_pr(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> CLMArrayState:
+    return state._replace(nt=jnp.array(0.0, dtype=F32), ipac=_accrue_interest(state, yf))
+
+
+def _stf_md(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> CLMArrayState:
+    return state._replace(
+        nt=jnp.array(0.0, dtype=F32),
+        ipac=jnp.array(0.0, dtype=F32),
+        feac=jnp.array(0.0, dtype=F32),
+    )
+
+
+def _stf_fp(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> CLMArrayState:
+    return state._replace(feac=jnp.array(0.0, dtype=F32))
+
+
+def _stf_ip(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> CLMArrayState:
+    return state._replace(ipac=jnp.array(0.0, dtype=F32))
+
+
+def _stf_ipci(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> CLMArrayState:
+    return state._replace(
+        nt=state.nt + _accrue_interest(state, yf),
+        ipac=jnp.array(0.0, dtype=F32),
+    )
+
+
+def _stf_rr(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> CLMArrayState:
+    return state._replace(ipnr=_clamp_rate(params, rf), ipac=_accrue_interest(state, yf))
+
+
+def _stf_rrf(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> CLMArrayState:
+    new_ipnr = jnp.where(params.has_rate_reset_next > 0.5, params.rate_reset_next, state.ipnr)
+    return state._replace(ipnr=new_ipnr)
+
+
+def _stf_noop(
+    state: CLMArrayState, params: CLMArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> CLMArrayState:
+    """No-op state transition (CE, unused event types and padding)."""
+    return state
+
+
+# ============================================================================
+# Dispatch tables — indexed by EventType.index (0..23) + NOP (24)
+# ============================================================================
+
+# fmt: off
+_POF_TABLE: list[Any] = [
+    _pof_zero,       # 0  AD
+    _pof_ied,        # 1  IED
+    _pof_principal,  # 2  MD
+    _pof_principal,  # 3  PR
+    _pof_zero,       # 4  PI   (not used in CLM)
+    _pof_zero,       # 5  PP   (not used in CLM)
+    _pof_zero,       # 6  PY   (not used in CLM)
+    _pof_zero,       # 7  PRF  (not used in CLM)
+    _pof_fp,         # 8  FP
+    _pof_zero,       # 9  PRD  (not used in CLM)
+    _pof_zero,       # 10 TD   (not used in CLM)
+    _pof_ip,         # 11 IP
+    _pof_zero,       # 12 IPCI
+    _pof_zero,       # 13 IPCB (not used in CLM)
+    _pof_zero,       # 14 RR
+    _pof_zero,       # 15 RRF
+    _pof_zero,       # 16 DV   (not used in CLM)
+    _pof_zero,       # 17 DVF  (not used in CLM)
+    _pof_zero,       # 18 SC   (not used in CLM)
+    _pof_zero,       # 19 STD  (not used in CLM)
+    _pof_zero,       # 20 XD   (not used in CLM)
+    _pof_zero,       # 21 CE
+    _pof_zero,       # 22 IPFX (not used in CLM)
+    _pof_zero,       # 23 IPFL (not used in CLM)
+    _pof_zero,       # 24 NOP  (padding)
+]
+
+_STF_TABLE: list[Any] = [
+    _stf_ad,    # 0  AD
+    _stf_ied,   # 1  IED
+    _stf_md,    # 2  MD
+    _stf_pr,    # 3  PR
+    _stf_noop,  # 4  PI
+    _stf_noop,  # 5  PP
+    _stf_noop,  # 6  PY
+    _stf_noop,  # 7  PRF
+    _stf_fp,    # 8  FP
+    _stf_noop,  # 9  PRD
+    _stf_noop,  # 10 TD
+    _stf_ip,    # 11 IP
+    _stf_ipci,  # 12 IPCI
+    _stf_noop,  # 13 IPCB
+    _stf_rr,    # 14 RR
+    _stf_rrf,   # 15 RRF
+    _stf_noop,  # 16 DV
+    _stf_noop,  # 17 DVF
+    _stf_noop,  # 18 SC
+    _stf_noop,  # 19 STD
+    _stf_noop,  # 20 XD
+    _stf_noop,  # 21 CE
+    _stf_noop,  # 22 IPFX
+    _stf_noop,  # 23 IPFL
+    _stf_noop,  # 24 NOP
+]
+# fmt: on
+
+assert len(_POF_TABLE) == NOP_EVENT_IDX + 1
+assert len(_STF_TABLE) == NOP_EVENT_IDX + 1
+
+
+# ============================================================================
+# JIT-compiled simulation kernel
+# ============================================================================
+
+
+def simulate_clm_array(
+    initial_state: CLMArrayState,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    params: CLMArrayParams,
+) -> tuple[CLMArrayState, jnp.ndarray]:
+    """Run a CLM simulation as a pure JAX function.
+
+    This function is JIT-compilable and vmap-able.
+
+    Args:
+        initial_state: Starting state (6 scalar fields).
+        event_types: ``(num_events,)`` int32 — ``EventType.index`` values.
+        year_fractions: ``(num_events,)`` float32 — pre-computed YF per event.
+        rf_values: ``(num_events,)`` float32 — observed market rate for RR,
+            0.0 otherwise.
+        params: Static contract parameters.
+
+    Returns:
+        ``(final_state, payoffs)`` where payoffs is ``(num_events,)`` float32.
+    """
+
+    def step(
+        state: CLMArrayState, inputs: tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]
+    ) -> tuple[CLMArrayState, jnp.ndarray]:
+        evt_idx, yf, rf = inputs
+        payoff = jax.lax.switch(evt_idx, _POF_TABLE, state, params, yf, rf)
+        new_state = jax.lax.switch(evt_idx, _STF_TABLE, state, params, yf, rf)
+        return new_state, payoff
+
+    final_state, payoffs = jax.lax.scan(
+        step, initial_state, (event_types, year_fractions, rf_values), unroll=8
+    )
+    return final_state, payoffs
+
+
+# JIT-compiled version for single-contract use
+simulate_clm_array_jit = jax.jit(simulate_clm_array)
+
+# Vmapped version (kept as fallback)
+batch_simulate_clm_vmap = jax.vmap(simulate_clm_array)
+
+
+def batch_simulate_clm_auto(
+    initial_states: CLMArrayState,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    params: CLMArrayParams,
+) -> tuple[CLMArrayState, jnp.ndarray]:
+    """Batched simulation using the optimal strategy for all backends.
+
+    Uses the single-scan batch approach (``batch_simulate_clm``) which
+    processes all contracts in shaped ``[B, T]`` arrays via a single
+    ``lax.scan``.
+    """
+    return batch_simulate_clm(initial_states, event_types, year_fractions, rf_values, params)  # type: ignore[no-any-return]
+
+
+# ============================================================================
+# Manually-batched simulation — eliminates vmap dispatch overhead on CPU
+# ============================================================================
+
+
+@jax.jit
+def batch_simulate_clm(
+    initial_states: CLMArrayState,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    params: CLMArrayParams,
+) -> tuple[CLMArrayState, jnp.ndarray]:
+    """Batched CLM simulation without vmap — single scan over ``[B]`` arrays.
+
+    Args:
+        initial_states: ``CLMArrayState`` with each field shape ``[B]``.
+        event_types: ``[B, T]`` int32 — event type indices per contract.
+        year_fractions: ``[B, T]`` float32.
+        rf_values: ``[B, T]`` float32.
+        params: ``CLMArrayParams`` with each field shape ``[B]``.
+
+    Returns:
+        ``(final_states, payoffs)`` where ``payoffs`` is ``[B, T]``.
+    """
+    # Transpose to [T, B] so scan iterates over time steps
+    et_t = event_types.T
+    yf_t = year_fractions.T
+    rf_t = rf_values.T
+
+    def step(
+        states: CLMArrayState,
+        inputs: tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray],
+    ) -> tuple[CLMArrayState, jnp.ndarray]:
+        et, yf, rf = inputs  # each [B]
+
+        # Common sub-expression: interest accrual
+        accrue = states.ipac + yf * states.ipnr * states.nt
+
+        # ---- Payoffs (branchless jnp.where dispatch) ----
+        payoff = jnp.zeros_like(states.nt)
+        payoff = jnp.where(
+            et == IED_IDX,
+            params.role_sign
+            * (-1.0)
+            * (params.notional_principal + params.premium_discount_at_ied),
+            payoff,
+        )
+        payoff = jnp.where((et == MD_IDX) | (et == PR_IDX), states.nsc * states.nt, payoff)
+        payoff = jnp.where(et == FP_IDX, states.feac, payoff)
+        payoff = jnp.where(et == IP_IDX, states.isc * accrue, payoff)
+
+        # ---- State transitions (branchless) ----
+
+        # nt: set at IED, capitalized at IPCI, zero at PR/MD
+        new_nt = states.nt
+        new_nt = jnp.where(et == IED_IDX, params.role_sign * params.notional_principal, new_nt)
+        new_nt = jnp.where(et == IPCI_IDX, states.nt + accrue, new_nt)
+        new_nt = jnp.where((et == PR_IDX) | (et == MD_IDX), 0.0, new_nt)
+
+        # ipnr: set at IED, reset at RR, fixed at RRF
+        new_ipnr = states.ipnr
+        new_ipnr = jnp.where(et == IED_IDX, params.nominal_interest_rate, new_ipnr)
+        new_ipnr = jnp.where(et == RR_IDX, _clamp_rate(params, rf), new_ipnr)
+        new_ipnr = jnp.where(
+            (et == RRF_IDX) & (params.has_rate_reset_next > 0.5),
+            params.rate_reset_next,
+            new_ipnr,
+        )
+
+        # ipac:
+        #   accrue group: AD, PR, RR
+        #   zero group:   IED, MD, IP, IPCI
+        #   default:      unchanged (FP, RRF, CE and padding)
+        is_accrue = (et == AD_IDX) | (et == PR_IDX) | (et == RR_IDX)
+        is_zero_ipac = (et == IED_IDX) | (et == MD_IDX) | (et == IP_IDX) | (et == IPCI_IDX)
+        new_ipac = jnp.where(is_accrue, accrue, states.ipac)
+        new_ipac = jnp.where(is_zero_ipac, 0.0, new_ipac)
+
+        # feac: zero at IED, MD, FP
+        new_feac = jnp.where(
+            (et == IED_IDX) | (et == MD_IDX) | (et == FP_IDX),
+            0.0,
+            states.feac,
+        )
+
+        # nsc, isc: only change at IED (set to 1.0)
+        new_nsc = jnp.where(et == IED_IDX, 1.0, states.nsc)
+        new_isc = jnp.where(et == IED_IDX, 1.0, states.isc)
+
+        new_state = CLMArrayState(
+            nt=new_nt,
+            ipnr=new_ipnr,
+            ipac=new_ipac,
+            feac=new_feac,
+            nsc=new_nsc,
+            isc=new_isc,
+        )
+        return new_state, payoff
+
+    final_states, payoffs_t = jax.lax.scan(step, initial_states, (et_t, yf_t, rf_t), unroll=8)
+    # payoffs_t is [T, B]; transpose back to [B, T]
+    return final_states, payoffs_t.T
+
+
+# ============================================================================
+# Pre-computation bridge — Python -> JAX arrays
+# ============================================================================
+
+
+def _extract_params_raw(attrs: ContractAttributes) -> dict[str, float | int]:
+    """Extract params as plain Python floats (no jnp.array overhead)."""
+    ipnr = attrs.nominal_interest_rate or 0.0
+    return {
+        "role_sign": get_role_sign(attrs.contract_role),
+        "notional_principal": attrs.notional_principal or 0.0,
+        "nominal_interest_rate": ipnr,
+        "premium_discount_at_ied": attrs.premium_discount_at_ied or 0.0,
+        "rate_reset_spread": attrs.rate_reset_spread or 0.0,
+        "rate_reset_multiplier": (
+            attrs.rate_reset_multiplier if attrs.rate_reset_multiplier is not None else 1.0
+        ),
+        "rate_reset_floor": attrs.rate_reset_floor or 0.0,
+        "rate_reset_cap": attrs.rate_reset_cap or 1.0,
+        "rate_reset_next": attrs.rate_reset_next if attrs.rate_reset_next is not None else ipnr,
+        "has_rate_floor": 1.0 if attrs.rate_reset_floor is not None else 0.0,
+        "has_rate_cap": 1.0 if attrs.rate_reset_cap is not None else 0.0,
+        "has_rate_reset_next": 1.0 if attrs.rate_reset_next is not None else 0.0,
+    }
+
+
+def _params_raw_to_jax(raw: dict[str, float | int]) -> CLMArrayParams:
+    """Convert raw Python params to JAX CLMArrayParams."""
+    return CLMArrayParams(**{k: jnp.array(raw[k], dtype=F32) for k in CLMArrayParams._fields})
+
+
+# ---------------------------------------------------------------------------
+# Fast schedule generation — bypasses CallMoneyContract entirely
+# ---------------------------------------------------------------------------
+
+
+def _fast_clm_schedule(
+    attrs: ContractAttributes,
+) -> tuple[list[tuple[int, _datetime, _datetime]], dict[_datetime, _datetime]]:
+    """Generate CLM schedule as lightweight (evt_idx, evt_dt, calc_dt) tuples.
+
+    Replicates ``CallMoneyContract.generate_event_schedule`` for the observed
+    maturity.  Returns the schedule plus a mapping from business-day-shifted
+    RR dates to the unadjusted dates on which the rate is observed (empty on
+    the fast path, where no shifting occurs).
+    """
+    from jactus.core.types import BusinessDayConvention
+
+    ied = attrs.initial_exchange_date
+    if not ied:
+        return [], {}
+
+    bdc = attrs.business_day_convention
+    has_bdc = bdc is not None and bdc != BusinessDayConvention.NULL
+    has_eomc = (
+        attrs.end_of_month_convention is not None and attrs.end_of_month_convention.value != "SD"
+    )
+    if has_bdc or has_eomc:
+        return _fallback_clm_schedule(attrs)
+
+    sd_dt = adt_to_dt(attrs.status_date)
+    ied_dt = adt_to_dt(ied)
+    md = attrs.maturity_date
+
+    events: list[tuple[int, _datetime, _datetime]] = [(AD_IDX, sd_dt, sd_dt)]
+
+    # IED (skipped when SD >= IED)
+    if sd_dt < ied_dt:
+        events.append((IED_IDX, ied_dt, ied_dt))
+
+    if md is not None:
+        md_dt = adt_to_dt(md)
+
+        # IPCI: periodic capitalization strictly between SD and the observed maturity
+        if attrs.interest_payment_cycle:
+            ipci_end = attrs.interest_capitalization_end_date or md
+            for dt in fast_schedule(
+                attrs.interest_payment_anchor or ied, attrs.interest_payment_cycle, ipci_end
+            ):
+                if sd_dt < dt < md_dt:
+                    events.append((IPCI_IDX, dt, dt))
+
+        # RR: cyclic resets, or a single reset at the anchor
+        if attrs.rate_reset_cycle:
+            for dt in fast_schedule(attrs.rate_reset_anchor or ied, attrs.rate_reset_cycle, md):
+                if sd_dt < dt <= md_dt:
+                    events.append((RR_IDX, dt, dt))
+        elif attrs.rate_reset_anchor and attrs.rate_reset_market_object:
+            rr_dt = adt_to_dt(attrs.rate_reset_anchor)
+            if sd_dt < rr_dt <= md_dt:
+                events.append((RR_IDX, rr_dt, rr_dt))
+
+        # Terminal interest payment and principal repayment
+        events.append((IP_IDX, md_dt, md_dt))
+        events.append((MD_IDX, md_dt, md_dt))
+
+    events.sort(key=lambda e: (e[1], _EVENT_NAME[e[0]]))
+    return events, {}
+
+
+def _fallback_clm_schedule(
+    attrs: ContractAttributes,
+) -> tuple[list[tuple[int, _datetime, _datetime]], dict[_datetime, _datetime]]:
+    """Fall back to the full CallMoneyContract for BDC/EOMC cases."""
+    from jactus.contracts.clm import CallMoneyContract
+    from jactus.observers import ConstantRiskFactorObserver
+
+    rf_obs = ConstantRiskFactorObserver(constant_value=0.0)
+    contract = CallMoneyContract(attrs, rf_obs)
+    schedule = contract.generate_event_schedule()
+    result: list[tuple[int, _datetime, _datetime]] = []
+    for event in schedule.events:
+        evt_dt = adt_to_dt(event.event_time)
+        calc_dt = adt_to_dt(event.calculation_time) if event.calculation_time else evt_dt
+        result.append((event.event_type.index, evt_dt, calc_dt))
+
+    obs_dates: dict[_datetime, _datetime] = {}
+    for event in schedule.events:
+        unadjusted = contract._rr_observation_dates.get(event.event_time.to_iso())
+        if event.event_type == EventType.RR and unadjusted is not None:
+            obs_dates[adt_to_dt(event.event_time)] = adt_to_dt(unadjusted)
+    return result, obs_dates
+
+
+def _fast_clm_init_state(
+    attrs: ContractAttributes,
+) -> tuple[float, float, float, float, float, float, _datetime]:
+    """Compute initial CLM state as Python floats.
+
+    Mirrors ``CallMoneyContract.initialize_state``: when SD >= IED the IED
+    event is skipped, so the state starts from the contract attributes.
+
+    Returns ``(nt, ipnr, ipac, feac, nsc, isc, sd_datetime)``.
+    """
+    sd = attrs.status_date
+    ied = attrs.initial_exchange_date
+    sd_dt = adt_to_dt(sd)
+
+    if ied and sd >= ied:
+        role_sign = get_role_sign(attrs.contract_role)
+        nt = role_sign * (attrs.notional_principal or 0.0)
+        ipnr = attrs.nominal_interest_rate or 0.0
+        ipac = attrs.accrued_interest or 0.0
+        return (nt, ipnr, ipac, 0.0, 1.0, 1.0, sd_dt)
+
+    return (0.0, 0.0, 0.0, 0.0, 1.0, 1.0, sd_dt)
+
+
+def _prequery_clm_rates(
+    schedule: list[tuple[int, _datetime, _datetime]],
+    obs_dates: dict[_datetime, _datetime],
+    attrs: ContractAttributes,
+    rf_observer: RiskFactorObserver,
+) -> list[float]:
+    """Pre-query the market rate for every RR event in a CLM schedule.
+
+    Uses the same identifier default (``"RATE"``) and unadjusted observation
+    dates as ``CLMStateTransitionFunction._stf_rr``.
+    """
+    identifier = attrs.rate_reset_market_object or "RATE"
+    rf_list: list[float] = []
+    for evt_idx, evt_dt, _calc_dt in schedule:
+        rf_val = 0.0
+        if evt_idx == RR_IDX:
+            obs_dt = obs_dates.get(evt_dt, evt_dt)
+            try:
+                rf_val = float(rf_observer.observe_risk_factor(identifier, dt_to_adt(obs_dt)))
+            except (KeyError, NotImplementedError, TypeError):
+                rf_val = 0.0
+        rf_list.append(rf_val)
+    return rf_list
+
+
+def _precompute_raw(
+    attrs: ContractAttributes,
+    rf_observer: RiskFactorObserver,
+) -> RawPrecomputed:
+    """Pre-compute all data as pure Python types (no JAX arrays)."""
+    from jactus.core.types import DayCountConvention
+
+    schedule, obs_dates = _fast_clm_schedule(attrs)
+    nt, ipnr, ipac, feac, nsc, isc, init_sd_dt = _fast_clm_init_state(attrs)
+    params_raw = _extract_params_raw(attrs)
+
+    dcc = attrs.day_count_convention or DayCountConvention.A360
+    return RawPrecomputed(
+        state=(nt, ipnr, ipac, feac, nsc, isc),
+        event_types=[evt_idx for evt_idx, _, _ in schedule],
+        year_fractions=compute_vectorised_year_fractions(schedule, init_sd_dt, dcc),
+        rf_values=_prequery_clm_rates(schedule, obs_dates, attrs, rf_observer),
+        params=params_raw,
+        event_ordinals=[evt_dt.toordinal() for _, evt_dt, _ in schedule],
+    )
+
+
+def _raw_to_jax(
+    raw: RawPrecomputed,
+) -> tuple[CLMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, CLMArrayParams]:
+    """Convert raw pre-computed data to JAX arrays."""
+    nt, ipnr, ipac, feac, nsc, isc = raw.state
+    return (
+        CLMArrayState(
+            nt=jnp.array(nt, dtype=F32),
+            ipnr=jnp.array(ipnr, dtype=F32),
+            ipac=jnp.array(ipac, dtype=F32),
+            feac=jnp.array(feac, dtype=F32),
+            nsc=jnp.array(nsc, dtype=F32),
+            isc=jnp.array(isc, dtype=F32),
+        ),
+        jnp.array(raw.event_types, dtype=jnp.int32),
+        jnp.array(raw.year_fractions, dtype=F32),
+        jnp.array(raw.rf_values, dtype=F32),
+        _params_raw_to_jax(raw.params),
+    )
+
+
+def precompute_clm_arrays(
+    attrs: ContractAttributes,
+    rf_observer: RiskFactorObserver,
+) -> tuple[CLMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, CLMArrayParams]:
+    """Pre-compute JAX arrays for array-mode CLM simulation.
+
+    Generates the event schedule for the observed maturity and the initial
+    state directly from attributes (bypassing ``CallMoneyContract``), then
+    converts to JAX arrays suitable for ``simulate_clm_array``.
+
+    Args:
+        attrs: Contract attributes (must be CLM type).
+        rf_observer: Risk factor observer (queried for RR events).
+
+    Returns:
+        ``(initial_state, event_types, year_fractions, rf_values, params)``
+    """
+    return _raw_to_jax(_precompute_raw(attrs, rf_observer))
+
+
+# ============================================================================
+# Batch / portfolio API
+# ============================================================================
+
+
+def _raw_list_to_jax_batch(
+    raw_list: list[RawPrecomputed],
+) -> tuple[CLMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, CLMArrayParams, jnp.ndarray]:
+    """Convert a list of ``RawPrecomputed`` to padded JAX batch arrays.
+
+    Writes directly into pre-allocated NumPy arrays, then transfers to JAX
+    via ``jnp.asarray``.  Contracts without an IED carry no events, so the
+    event axis is padded to at least one NOP column.
+    """
+    float_dtype = state_dtype()
+    n = len(raw_list)
+    max_events = max(max((len(r.event_types) for r in raw_list), default=0), 1)
+
+    et = np.full((n, max_events), NOP_EVENT_IDX, dtype=np.int32)
+    yf = np.zeros((n, max_events), dtype=float_dtype)
+    rf = np.zeros((n, max_events), dtype=float_dtype)
+    mask = np.zeros((n, max_events), dtype=float_dtype)
+    state = np.zeros((len(CLMArrayState._fields), n), dtype=float_dtype)
+    param = np.zeros((len(CLMArrayParams._fields), n), dtype=float_dtype)
+
+    for i, r in enumerate(raw_list):
+        n_ev = len(r.event_types)
+        et[i, :n_ev] = r.event_types
+        yf[i, :n_ev] = r.year_fractions
+        rf[i, :n_ev] = r.rf_values
+        mask[i, :n_ev] = 1.0
+        state[:, i] = r.state
+        for k, name in enumerate(CLMArrayParams._fields):
+            param[k, i] = r.params[name]
+
+    return (
+        CLMArrayState(*(jnp.asarray(s) for s in state)),
+        jnp.asarray(et),
+        jnp.asarray(yf),
+        jnp.asarray(rf),
+        CLMArrayParams(*(jnp.asarray(p) for p in param)),
+        jnp.asarray(mask),
+    )
+
+
+def prepare_clm_batch(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
+) -> tuple[CLMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, CLMArrayParams, jnp.ndarray]:
+    """Pre-compute and pad arrays for a batch of CLM contracts.
+
+    Args:
+        contracts: List of ``(attributes, rf_observer)`` pairs.
+        workers: If greater than 1, run the per-contract pre-computation
+            in a pool of this many processes (see
+            :func:`~jactus.contracts.array_common.precompute_raw_list`).
+
+    Returns:
+        ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
+        where each array has a leading batch dimension.
+    """
+    return _prepare_clm_batch_dated(contracts, workers)[0]
+
+
+def _prepare_clm_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
+) -> tuple[
+    tuple[CLMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, CLMArrayParams, jnp.ndarray],
+    jnp.ndarray,
+]:
+    """``prepare_clm_batch`` plus the ``[B, T]`` int32 event ordinals."""
+    raw_list = precompute_raw_list(_precompute_raw, contracts, workers)
+    batch = _raw_list_to_jax_batch(raw_list)
+    return batch, pad_event_ordinals([r.event_ordinals for r in raw_list], batch[1].shape[1])
+
+
+def simulate_clm_portfolio(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    discount_rate: float | None = None,
+    year_fractions_from_valuation: jnp.ndarray | None = None,
+    length_buckets: int | None = None,
+    pad_shape: tuple[int, int] | None = None,
+    devices: int | Sequence[Any] | None = None,
+    canonical_shapes: CanonicalShapes | bool | None = None,
+    precision: PrecisionPolicy | str | None = None,
+    rf_scenarios: RFScenarios | None = None,
+    scenario_output: str = "payoffs",
+    scenario_batch_size: int | None = None,
+) -> dict[str, Any]:
+    """End-to-end CLM portfolio simulation with optional PV.
+
+    Args:
+        contracts: List of ``(attributes, rf_observer)`` pairs.
+        discount_rate: If provided, compute present values.
+        year_fractions_from_valuation: ``(batch, max_events)`` year fractions
+            from valuation date for PV discounting.  If ``None`` and
+            ``discount_rate`` is set, year fractions are computed from each
+            contract's ``status_date``.
+        length_buckets: If set, sort contracts by event count and
+            simulate them in at most this many length buckets, each
+            trimmed to its own longest contract, instead of padding the
+            whole batch to the longest one.
+        pad_shape: If set, pad the batch to at least ``(rows, events)``
+            (events rounded up to a power of two) so repeated calls reuse
+            one compiled kernel; used by chunked streaming.
+        devices: If set, shard the batch axis across this many JAX devices
+            (or this list of devices); results come back in input order.
+        canonical_shapes: If set, pad the batch up to canonical sizes
+            (``True`` for powers of two, or a ``CanonicalShapes`` of
+            allowed sizes) so portfolios of similar size reuse one
+            compiled kernel.
+        precision: Precision policy (``"f32"``, ``"f64"``, ``"mixed"`` or a
+            ``PrecisionPolicy``); defaults to the active policy.  Sets the
+            dtype of the prepared batch and of payoff and PV accumulation.
+        rf_scenarios: If set, an ``[S, B, T]`` array of risk-factor values
+            (or a callable ``(event_ordinals, rf_values) -> [S, B, T]``)
+            run against the shared schedules and parameters in one
+            compiled call; see
+            :func:`~jactus.contracts.array_common.simulate_scenarios`.
+        scenario_output: ``"payoffs"``, ``"totals"`` or ``"portfolio"``
+            (sum over contracts on device), with ``rf_scenarios``.
+        scenario_batch_size: Scenarios evaluated at once with
+            ``rf_scenarios``; ``None`` runs them all together.
+
+    Returns:
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``,
+        ``final_states``, optionally ``present_values`` and ``total_pv``, and
+        ``length_buckets`` (the :class:`LengthBuckets` plan) or
+        ``padded_shape`` when bucketing or padding.  With ``rf_scenarios``
+        the totals and present values gain a leading ``[S]`` axis (see
+        :func:`~jactus.contracts.array_common.simulate_scenarios`).
+    """
+    policy = resolve_precision(precision)
+    with precision_scope(policy):
+        batch, event_ordinals = _prepare_clm_batch_dated(contracts)
+    (
+        batched_states,
+        batched_et,
+        batched_yf,
+        batched_rf,
+        batched_params,
+        batched_masks,
+    ) = batch
+
+    if rf_scenarios is not None:
+        check_scenario_options(
+            length_buckets=length_buckets,
+            pad_shape=pad_shape,
+            devices=devices,
+            canonical_shapes=canonical_shapes,
+        )
+        scenario_result = simulate_scenarios(
+            batch_simulate_clm_auto,
+            batched_states,
+            (batched_et, batched_yf, batched_rf),
+            batched_params,
+            batched_masks,
+            event_ordinals,
+            rf_scenarios,
+            accumulate_dtype=policy.accumulate_dtype,
+            discount_rate=discount_rate,
+            year_fractions_from_valuation=year_fractions_from_valuation,
+            output=scenario_output,
+            scenario_batch_size=scenario_batch_size,
+        )
+        scenario_result["num_contracts"] = len(contracts)
+        return scenario_result
+
+    final_states, payoffs, layout = run_batch_kernel(
+        batch_simulate_clm_auto,
+        batched_states,
+        (batched_et, batched_yf, batched_rf),
+        batched_params,
+        batched_masks,
+        length_buckets=length_buckets,
+        pad_shape=pad_shape,
+        devices=devices,
+        canonical_shapes=canonical_shapes,
+    )
+
+    # Mask padding
+    masked_payoffs = payoffs.astype(policy.accumulate_dtype) * batched_masks
+    total_cashflows = jnp.sum(masked_payoffs, axis=1)
+
+    result: dict[str, Any] = {
+        "payoffs": masked_payoffs,
+        "masks": batched_masks,
+        "event_ordinals": event_ordinals,
+        "final_states": final_states,
+        "total_cashflows": total_cashflows,
+        "num_contracts": len(contracts),
+    }
+    result.update(layout)
+
+    if discount_rate is not None:
+        if year_fractions_from_valuation is not None:
+            disc_yfs = year_fractions_from_valuation
+        else:
+            disc_yfs = jnp.cumsum(batched_yf.astype(policy.accumulate_dtype), axis=1)
+        discount_factors = 1.0 / (1.0 + discount_rate * disc_yfs)
+        pvs = jnp.sum(masked_payoffs * discount_factors, axis=1)
+        result["present_values"] = pvs
+        result["total_pv"] = jnp.sum(pvs)
+
+    return result
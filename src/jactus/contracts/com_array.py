@@ -32,6 +32,7 @@ from jactus.contracts.array_common import (
     TD_IDX,
     adt_to_dt,
     get_role_sign,
+    pad_event_ordinals,
 )
 from jactus.core import ContractAttributes
 from jactus.observers import RiskFactorObserver
@@ -168,6 +169,14 @@ def precompute_com_arrays(
     Returns:
         ``(initial_state, event_types, year_fractions, rf_values, params)``
     """
+    return _precompute_com_dated(attrs, rf_observer)[0]
+
+
+def _precompute_com_dated(
+    attrs: ContractAttributes,
+    rf_observer: RiskFactorObserver,
+) -> tuple[tuple[COMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, COMArrayParams], list[int]]:
+    """``precompute_com_arrays`` plus the ordinal of each event date."""
     role_sign = get_role_sign(attrs.contract_role)
 
     initial_state = COMArrayState(nt=jnp.array(0.0, dtype=F32))
@@ -180,6 +189,7 @@ def precompute_com_arrays(
 
     # Build schedule: PRD, TD
     et_list: list[int] = []
+    ord_list: list[int] = []
     sd_dt = adt_to_dt(attrs.status_date)
 
     # PRD
@@ -187,23 +197,26 @@ def precompute_com_arrays(
         prd_dt = adt_to_dt(attrs.purchase_date)
         if prd_dt > sd_dt:
             et_list.append(PRD_IDX)
+            ord_list.append(prd_dt.toordinal())
 
     # TD
     if attrs.termination_date:
         td_dt = adt_to_dt(attrs.termination_date)
         if td_dt > sd_dt:
             et_list.append(TD_IDX)
+            ord_list.append(td_dt.toordinal())
 
     # If empty schedule, add a single AD event
     if not et_list:
         et_list.append(AD_IDX)
+        ord_list.append(sd_dt.toordinal())
 
     n_events = len(et_list)
     event_types = jnp.array(et_list, dtype=jnp.int32)
     year_fractions = jnp.zeros(n_events, dtype=F32)
     rf_values = jnp.zeros(n_events, dtype=F32)
 
-    return initial_state, event_types, year_fractions, rf_values, com_params
+    return (initial_state, event_types, year_fractions, rf_values, com_params), ord_list
 
 
 def prepare_com_batch(
@@ -217,8 +230,19 @@ def prepare_com_batch(
     Returns:
         ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
     """
+    return _prepare_com_batch_dated(contracts)[0]
+
+
+def _prepare_com_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+) -> tuple[
+    tuple[COMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, COMArrayParams, jnp.ndarray],
+    jnp.ndarray,
+]:
+    """``prepare_com_batch`` plus the ``[B, T]`` int32 event ordinals."""
     n = len(contracts)
-    precomputed = [precompute_com_arrays(a, o) for a, o in contracts]
+    dated = [_precompute_com_dated(a, o) for a, o in contracts]
+    precomputed = [arrays for arrays, _ in dated]
 
     # Find max events across all contracts
     max_events = max(p[1].shape[0] for p in precomputed)
@@ -254,7 +278,7 @@ def prepare_com_batch(
         quantity=jnp.asarray(qty_arr),
     )
 
-    return (
+    batch = (
         initial_states,
         jnp.asarray(et_batch),
         jnp.asarray(yf_batch),
@@ -262,6 +286,7 @@ def prepare_com_batch(
         com_params,
         jnp.asarray(mask_batch),
     )
+    return batch, pad_event_ordinals([ords for _, ords in dated], max_events)
 
 
 def simulate_com_portfolio(
@@ -275,8 +300,10 @@ def simulate_com_portfolio(
         discount_rate: If provided, compute present values.
 
     Returns:
-        Dict with ``payoffs``, ``masks``, ``final_states``, ``total_cashflows``.
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``, ``final_states``,
+        ``total_cashflows``.
     """
+    batch, event_ordinals = _prepare_com_batch_dated(contracts)
     (
         batched_states,
         batched_et,
@@ -284,7 +311,7 @@ def simulate_com_portfolio(
         batched_rf,
         batched_params,
         batched_masks,
-    ) = prepare_com_batch(contracts)
+    ) = batch
 
     final_states, payoffs = batch_simulate_com_auto(
         batched_states, batched_et, batched_yf, batched_rf, batched_params
@@ -296,6 +323,7 @@ def simulate_com_portfolio(
     result: dict[str, Any] = {
         "payoffs": masked_payoffs,
         "masks": batched_masks,
+        "event_ordinals": event_ordinals,
         "final_states": final_states,
         "total_cashflows": total_cashflows,
         "num_contracts": len(contracts),
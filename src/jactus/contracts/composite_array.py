@@ -0,0 +1,236 @@
+"""Shared child-contract batching for composite array-mode contracts.
+
+Composite contracts (SWAPS, CEG, CEC) derive their cash flows from child
+contracts.  Instead of simulating every child once per parent through a
+``ChildContractObserver``, the composite array modules collect the distinct
+children of a whole book, group them by contract type, and run each group
+through that type's batch kernel once.  This module holds the pieces they
+share:
+
+- ``CHILD_KERNELS``: the array-mode entry points per supported child type.
+- ``prepare_child_batches``: one ``ChildBatch`` per child type plus each
+  child's event dates (needed to align child events with parent dates).
+- ``simulate_child_batches``: payoffs gathered back into child order.
+- ``simulate_child_trajectories``: per-event state trajectories (notional,
+  rate, accrued interest) gathered back into child order.
+
+Example::
+
+    from jactus.contracts.composite_array import (
+        prepare_child_batches,
+        simulate_child_trajectories,
+    )
+
+    batches, child_events = prepare_child_batches(children)
+    final_states, trajectory = simulate_child_trajectories(batches)
+    trajectory.nt  # [N, T + 1] notional after each event (index 0 = initial)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime as _datetime
+from functools import partial
+from typing import Any, NamedTuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jactus.contracts import ann_array, lam_array, nam_array, pam_array
+from jactus.core import ContractAttributes, ContractType
+from jactus.observers import RiskFactorObserver
+
+# ---------------------------------------------------------------------------
+# Child kernel registry
+# ---------------------------------------------------------------------------
+
+
+class ChildKernel(NamedTuple):
+    """Array-mode entry points used to simulate one child contract type."""
+
+    schedule: Callable[[ContractAttributes, RiskFactorObserver], list[tuple[int, Any, Any]]]
+    prepare: Callable[..., tuple[Any, ...]]
+    simulate: Callable[..., tuple[Any, jnp.ndarray]]
+
+
+CHILD_KERNELS: dict[ContractType, ChildKernel] = {
+    ContractType.PAM: ChildKernel(
+        lambda attrs, _obs: pam_array._fast_pam_schedule(attrs),
+        pam_array.prepare_pam_batch,
+        pam_array.batch_simulate_pam,
+    ),
+    ContractType.LAM: ChildKernel(
+        lambda attrs, _obs: lam_array._fast_lam_schedule(attrs),
+        lam_array.prepare_lam_batch,
+        lam_array.batch_simulate_lam,
+    ),
+    ContractType.NAM: ChildKernel(
+        lambda attrs, _obs: nam_array._fast_nam_schedule(attrs),
+        nam_array.prepare_nam_batch,
+        nam_array.batch_simulate_nam,
+    ),
+    ContractType.ANN: ChildKernel(
+        ann_array._fallback_ann_schedule,
+        ann_array.prepare_ann_batch,
+        ann_array.batch_simulate_ann,
+    ),
+}
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+
+class ChildBatch(NamedTuple):
+    """Pre-computed arrays for all children of one contract type.
+
+    ``rows`` gives each child's position in the caller's child order.
+    """
+
+    contract_type: ContractType
+    rows: np.ndarray
+    states: Any
+    event_types: jnp.ndarray
+    year_fractions: jnp.ndarray
+    rf_values: jnp.ndarray
+    params: Any
+    masks: jnp.ndarray
+
+
+class ChildTrajectory(NamedTuple):
+    """Child state after each event, ``[N, T + 1]``; index 0 is the initial state."""
+
+    nt: jnp.ndarray
+    ipnr: jnp.ndarray
+    ipac: jnp.ndarray
+
+
+# ============================================================================
+# Pre-computation
+# ============================================================================
+
+
+def check_child_type(parent: ContractAttributes, child: ContractAttributes) -> None:
+    """Raise ``ValueError`` if ``child`` has no array-mode child kernel."""
+    if child.contract_type not in CHILD_KERNELS:
+        raise ValueError(
+            f"{parent.contract_type.value} {parent.contract_id}: unsupported child type "
+            f"{child.contract_type.value} (supported: "
+            f"{', '.join(ct.value for ct in CHILD_KERNELS)})"
+        )
+
+
+def prepare_child_batches(
+    children: list[tuple[ContractAttributes, RiskFactorObserver]],
+) -> tuple[list[ChildBatch], list[list[tuple[int, _datetime]]]]:
+    """Prepare one batch per child type and collect each child's event dates.
+
+    Args:
+        children: List of ``(attributes, rf_observer)`` pairs; every type
+            must be in ``CHILD_KERNELS``.
+
+    Returns:
+        ``(batches, child_events)`` where ``child_events[i]`` lists
+        ``(event_type_index, event_datetime)`` in the child's kernel order.
+    """
+    groups: dict[ContractType, list[int]] = {}
+    for i, (child, _obs) in enumerate(children):
+        groups.setdefault(child.contract_type, []).append(i)
+
+    batches: list[ChildBatch] = []
+    child_events: list[list[tuple[int, _datetime]]] = [[] for _ in children]
+    for ct, idx in groups.items():
+        kernel = CHILD_KERNELS[ct]
+        states, et, yf, rf, params, masks = kernel.prepare([children[i] for i in idx])
+        batches.append(
+            ChildBatch(ct, np.asarray(idx, dtype=np.intp), states, et, yf, rf, params, masks)
+        )
+        for i in idx:
+            child_events[i] = [(e, dt) for e, dt, _ in kernel.schedule(*children[i])]
+    return batches, child_events
+
+
+# ============================================================================
+# Simulation
+# ============================================================================
+
+
+def _gather_rows(blocks: list[jnp.ndarray], rows: list[np.ndarray]) -> jnp.ndarray:
+    """Pad per-type ``[B_g, T_g]`` blocks to a common width and restore child order."""
+    width = max(b.shape[1] for b in blocks)
+    padded = [jnp.pad(b, ((0, 0), (0, width - b.shape[1]))) for b in blocks]
+    order = np.argsort(np.concatenate(rows))
+    return jnp.concatenate(padded, axis=0)[order]
+
+
+def simulate_child_batches(
+    batches: list[ChildBatch],
+) -> tuple[dict[ContractType, Any], jnp.ndarray]:
+    """Run every child batch and gather masked payoffs into child order.
+
+    Returns:
+        ``(final_states, payoffs)`` where ``final_states`` is keyed by child
+        ``ContractType`` and ``payoffs`` is ``[N, T]``.
+    """
+    final_states: dict[ContractType, Any] = {}
+    blocks = []
+    for b in batches:
+        final_states[b.contract_type], payoffs = CHILD_KERNELS[b.contract_type].simulate(
+            b.states, b.event_types, b.year_fractions, b.rf_values, b.params
+        )
+        blocks.append(payoffs * b.masks)
+    return final_states, _gather_rows(blocks, [b.rows for b in batches])
+
+
+@partial(jax.jit, static_argnums=0)
+def _trace_states(
+    kernel: Callable[..., tuple[Any, jnp.ndarray]],
+    states: Any,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    params: Any,
+) -> tuple[Any, Any]:
+    """Run a batch kernel one event at a time, keeping every post-event state.
+
+    Each scan step feeds a ``[B, 1]`` slice to the type's own batch kernel,
+    so the trajectory follows exactly the kernel's state transitions.
+    """
+
+    def step(s: Any, inputs: tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]) -> tuple[Any, Any]:
+        et, yf, rf = inputs
+        new_s, _ = kernel(s, et[:, None], yf[:, None], rf[:, None], params)
+        return new_s, new_s
+
+    final, path = jax.lax.scan(step, states, (event_types.T, year_fractions.T, rf_values.T))
+    # Prepend the initial state and transpose each field back to [B, T + 1]
+    trajectory = jax.tree.map(lambda s0, p: jnp.concatenate([s0[None], p]).T, states, path)
+    return final, trajectory
+
+
+def simulate_child_trajectories(
+    batches: list[ChildBatch],
+) -> tuple[dict[ContractType, Any], ChildTrajectory]:
+    """Run every child batch and gather per-event states into child order.
+
+    Returns:
+        ``(final_states, trajectory)`` where ``trajectory`` fields are
+        ``[N, T + 1]``: column 0 is the initial state and column ``k + 1``
+        the state after the child's ``k``-th event.
+    """
+    final_states: dict[ContractType, Any] = {}
+    fields: dict[str, list[jnp.ndarray]] = {f: [] for f in ChildTrajectory._fields}
+    for b in batches:
+        final_states[b.contract_type], path = _trace_states(
+            CHILD_KERNELS[b.contract_type].simulate,
+            b.states,
+            b.event_types,
+            b.year_fractions,
+            b.rf_values,
+            b.params,
+        )
+        for f in ChildTrajectory._fields:
+            fields[f].append(getattr(path, f))
+    rows = [b.rows for b in batches]
+    return final_states, ChildTrajectory(*(_gather_rows(fields[f], rows) for f in fields))
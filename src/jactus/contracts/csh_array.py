@@ -26,7 +26,9 @@ import numpy as np
 from jactus.contracts.array_common import (
     AD_IDX,
     F32,
+    adt_to_dt,
     get_role_sign,
+    pad_event_ordinals,
 )
 from jactus.core import ContractAttributes
 from jactus.observers import RiskFactorObserver
@@ -168,6 +170,16 @@ def prepare_csh_batch(
     Returns:
         ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
     """
+    return _prepare_csh_batch_dated(contracts)[0]
+
+
+def _prepare_csh_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+) -> tuple[
+    tuple[CSHArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, CSHArrayParams, jnp.ndarray],
+    jnp.ndarray,
+]:
+    """``prepare_csh_batch`` plus the ``[B, 1]`` int32 event ordinals (the AD date)."""
     n = len(contracts)
 
     nt_arr = np.zeros(n, dtype=np.float32)
@@ -192,7 +204,9 @@ def prepare_csh_batch(
         notional_principal=jnp.asarray(np_arr),
     )
 
-    return initial_states, event_types, year_fractions, rf_values, params, masks
+    batch = (initial_states, event_types, year_fractions, rf_values, params, masks)
+    ad_ordinals = [[adt_to_dt(attrs.status_date).toordinal()] for attrs, _ in contracts]
+    return batch, pad_event_ordinals(ad_ordinals, 1)
 
 
 def simulate_csh_portfolio(
@@ -206,8 +220,10 @@ def simulate_csh_portfolio(
         discount_rate: If provided, compute present values.
 
     Returns:
-        Dict with ``payoffs``, ``masks``, ``final_states``, ``total_cashflows``.
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``, ``final_states``,
+        ``total_cashflows``.
     """
+    batch, event_ordinals = _prepare_csh_batch_dated(contracts)
     (
         batched_states,
         batched_et,
@@ -215,7 +231,7 @@ def simulate_csh_portfolio(
         batched_rf,
         batched_params,
         batched_masks,
-    ) = prepare_csh_batch(contracts)
+    ) = batch
 
     final_states, payoffs = batch_simulate_csh_auto(
         batched_states, batched_et, batched_yf, batched_rf, batched_params
@@ -227,6 +243,7 @@ def simulate_csh_portfolio(
     result: dict[str, Any] = {
         "payoffs": masked_payoffs,
         "masks": batched_masks,
+        "event_ordinals": event_ordinals,
         "final_states": final_states,
         "total_cashflows": total_cashflows,
         "num_contracts": len(contracts),
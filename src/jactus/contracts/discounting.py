@@ -0,0 +1,259 @@
+"""Term-structure discounting of array-mode cash flows.
+
+The ``discount_rate`` argument of the ``simulate_<type>_portfolio``
+functions applies one flat simple-interest rate.  This module discounts
+the ``[B, T]`` payoffs of any array-mode result off a zero curve instead:
+event dates (``event_ordinals``) are turned into year fractions from the
+valuation date, the zero rate at each is interpolated from the curve
+nodes, and the discount factors are computed in one jitted pass.
+
+Everything downstream of the curve nodes is plain ``jnp``, so present
+values can be differentiated with respect to ``ZeroCurve.rates``::
+
+    curve = ZeroCurve(jnp.array([0.5, 1.0, 5.0]), jnp.array([0.03, 0.035, 0.04]))
+    sim = simulate_pam_portfolio(contracts)
+    result = discount_cashflows(sim, curve, contracts=contracts)
+
+    def total_pv(rates):
+        discounted = discount_cashflows(sim, curve._replace(rates=rates), contracts=contracts)
+        return discounted["total_pv"]
+
+    node_sensitivities = jax.grad(total_pv)(curve.rates)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import partial
+from typing import Any, NamedTuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jactus.contracts.array_common import adt_to_dt, get_precision
+from jactus.core import ActusDateTime, ContractAttributes
+from jactus.observers.risk_factor import (
+    DAYS_PER_YEAR,
+    CurveRiskFactorObserver,
+    JaxCurveRiskFactorObserver,
+)
+
+#: Supported compounding conventions and their periods per year
+#: (``0`` = simple interest, ``None`` = continuous).
+COMPOUNDING: dict[str, int | None] = {
+    "simple": 0,
+    "annual": 1,
+    "semiannual": 2,
+    "quarterly": 4,
+    "monthly": 12,
+    "continuous": None,
+}
+
+
+class ZeroCurve(NamedTuple):
+    """Zero-rate term structure.
+
+    Attributes:
+        tenors: ``[K]`` increasing node tenors in years.
+        rates: ``[K]`` zero rates at the nodes.
+        interpolation: ``"linear"`` in rates or ``"log_linear"`` (linear in
+            log rates; rates must be positive).  Flat beyond the end nodes.
+    """
+
+    tenors: jnp.ndarray
+    rates: jnp.ndarray
+    interpolation: str = "linear"
+
+
+def as_zero_curve(
+    curve: ZeroCurve | CurveRiskFactorObserver | JaxCurveRiskFactorObserver | tuple[Any, Any],
+    identifier: str | None = None,
+) -> ZeroCurve:
+    """Normalize a zero curve, ``(tenors, rates)`` pair or curve observer.
+
+    Args:
+        curve: The curve.  A ``CurveRiskFactorObserver`` contributes its
+            nodes and interpolation for ``identifier``; a
+            ``JaxCurveRiskFactorObserver`` its (possibly traced) nodes.
+        identifier: Curve identifier; may be omitted when the observer
+            holds a single curve.
+
+    Raises:
+        ValueError: If the identifier is ambiguous or unknown.
+    """
+    if isinstance(curve, ZeroCurve):
+        return curve
+    if isinstance(curve, JaxCurveRiskFactorObserver):
+        return ZeroCurve(curve.tenors, curve.rates, curve.interpolation)
+    if isinstance(curve, CurveRiskFactorObserver):
+        curves = curve._curve_arrays
+        if identifier is None:
+            if len(curves) != 1:
+                raise ValueError(f"Observer holds {len(curves)} curves; pass the curve identifier")
+            identifier = next(iter(curves))
+        if identifier not in curves:
+            raise ValueError(f"Curve '{identifier}' not found in observer '{curve.name}'")
+        tenors, rates = curves[identifier]
+        dtype = get_precision().accumulate_dtype
+        return ZeroCurve(
+            tenors=jnp.asarray(tenors, dtype=dtype),
+            rates=jnp.asarray(rates, dtype=dtype),
+            interpolation=curve.interpolation,
+        )
+    tenors, rates = curve
+    return ZeroCurve(
+        jnp.asarray(tenors, dtype=get_precision().accumulate_dtype), jnp.asarray(rates)
+    )
+
+
+def _interpolate_zero(
+    tenors: jnp.ndarray, rates: jnp.ndarray, times: jnp.ndarray, interpolation: str
+) -> jnp.ndarray:
+    """Zero rates at ``times`` from the curve nodes (traceable)."""
+    if interpolation == "log_linear":
+        return jnp.exp(jnp.interp(times, tenors, jnp.log(rates)))
+    return jnp.interp(times, tenors, rates)
+
+
+def _zero_discount_factors(zero: jnp.ndarray, times: jnp.ndarray, compounding: str) -> jnp.ndarray:
+    """Discount factors for zero rates ``zero`` over ``times`` (traceable)."""
+    periods = COMPOUNDING[compounding]
+    if periods is None:
+        return jnp.exp(-zero * times)
+    if periods == 0:
+        return 1.0 / (1.0 + zero * times)
+    return (1.0 + zero / periods) ** (-periods * times)
+
+
+@partial(jax.jit, static_argnames=("interpolation", "compounding"))
+def _curve_discount_factors(
+    tenors: jnp.ndarray,
+    rates: jnp.ndarray,
+    times: jnp.ndarray,
+    interpolation: str,
+    compounding: str,
+) -> jnp.ndarray:
+    zero = _interpolate_zero(tenors, rates, times, interpolation)
+    return _zero_discount_factors(zero, times, compounding)
+
+
+def _check_curve_options(curve: ZeroCurve, compounding: str) -> None:
+    if compounding not in COMPOUNDING:
+        raise ValueError(f"compounding must be one of {tuple(COMPOUNDING)}, got '{compounding}'")
+    if curve.interpolation not in ("linear", "log_linear"):
+        raise ValueError(
+            f"interpolation must be 'linear' or 'log_linear', got '{curve.interpolation}'"
+        )
+
+
+def curve_discount_factors(
+    curve: ZeroCurve,
+    times: jnp.ndarray,
+    compounding: str = "continuous",
+) -> jnp.ndarray:
+    """Discount factors at ``times`` (years from valuation), any shape.
+
+    Args:
+        curve: Zero curve.
+        times: Year fractions from the valuation date.
+        compounding: One of :data:`COMPOUNDING`.
+
+    Returns:
+        Discount factors with the shape of ``times``, computed in the
+        active precision policy's accumulation dtype.
+
+    Raises:
+        ValueError: If the compounding or interpolation is unknown.
+    """
+    _check_curve_options(curve, compounding)
+    dtype = get_precision().accumulate_dtype
+    return _curve_discount_factors(  # type: ignore[no-any-return]
+        jnp.asarray(curve.tenors, dtype=dtype),
+        jnp.asarray(curve.rates, dtype=dtype),
+        jnp.asarray(times),
+        interpolation=curve.interpolation,
+        compounding=compounding,
+    )
+
+
+def _valuation_ordinals(
+    valuation_date: ActusDateTime | None,
+    contracts: Sequence[Any] | None,
+    num_rows: int,
+) -> jnp.ndarray:
+    """``[B, 1]`` valuation day per row: the given date or each status date."""
+    if valuation_date is not None:
+        return jnp.full((num_rows, 1), adt_to_dt(valuation_date).toordinal(), dtype=jnp.int32)
+    if contracts is None:
+        raise ValueError("Pass valuation_date, or contracts to value from each status_date")
+    attrs: list[ContractAttributes] = [c[0] if isinstance(c, tuple) else c for c in contracts]
+    if len(attrs) != num_rows:
+        raise ValueError(f"Got {len(attrs)} contracts for {num_rows} result rows")
+    ordinals = np.array([adt_to_dt(a.status_date).toordinal() for a in attrs], dtype=np.int32)
+    return jnp.asarray(ordinals)[:, None]
+
+
+def _curve_valuation_ordinals(
+    curve: Any,
+    valuation_date: ActusDateTime | None,
+    contracts: Sequence[Any] | None,
+    num_rows: int,
+) -> jnp.ndarray:
+    """``[B, 1]`` valuation days: the given date, the curve's reference date, or status dates."""
+    if valuation_date is None and isinstance(curve, CurveRiskFactorObserver):
+        valuation_date = curve.reference_date
+    if (
+        valuation_date is None
+        and isinstance(curve, JaxCurveRiskFactorObserver)
+        and curve.reference_ordinal is not None
+    ):
+        return jnp.full((num_rows, 1), curve.reference_ordinal, dtype=jnp.int32)
+    return _valuation_ordinals(valuation_date, contracts, num_rows)
+
+
+def discount_cashflows(
+    result: dict[str, Any],
+    curve: ZeroCurve | CurveRiskFactorObserver | JaxCurveRiskFactorObserver | tuple[Any, Any],
+    valuation_date: ActusDateTime | None = None,
+    contracts: Sequence[Any] | None = None,
+    compounding: str = "continuous",
+    curve_identifier: str | None = None,
+) -> dict[str, Any]:
+    """Discount a ``simulate_<type>_portfolio`` result off a zero curve.
+
+    Each event is discounted over the ``event_ordinals`` days from the
+    valuation date (``DAYS_PER_YEAR`` basis); events on or before the
+    valuation date get a discount factor of 1.
+
+    Args:
+        result: Per-type result with ``payoffs``, ``masks`` and
+            ``event_ordinals``.
+        curve: ``ZeroCurve``, ``(tenors, rates)`` pair,
+            ``CurveRiskFactorObserver`` or ``JaxCurveRiskFactorObserver``.
+        valuation_date: Common valuation date.  Defaults to the observer's
+            reference date, else each contract's ``status_date``.
+        contracts: The simulated contracts in result row order; needed
+            when no valuation date is available.
+        compounding: One of :data:`COMPOUNDING`.
+        curve_identifier: Curve to use from a multi-curve observer.
+
+    Returns:
+        A copy of ``result`` with ``discount_factors`` (``[B, T]``),
+        ``present_values`` (``[B]``) and ``total_pv``.
+    """
+    zero_curve = as_zero_curve(curve, curve_identifier)
+
+    payoffs = jnp.asarray(result["payoffs"])
+    ordinals = jnp.asarray(result["event_ordinals"])
+    valuation = _curve_valuation_ordinals(curve, valuation_date, contracts, payoffs.shape[0])
+    times = (jnp.maximum(ordinals - valuation, 0) / DAYS_PER_YEAR).astype(payoffs.dtype)
+    discount_factors = curve_discount_factors(zero_curve, times, compounding)
+
+    pvs = jnp.sum(payoffs * jnp.asarray(result["masks"]) * discount_factors, axis=1)
+    return {
+        **result,
+        "discount_factors": discount_factors,
+        "present_values": pvs,
+        "total_pv": jnp.sum(pvs),
+    }
@@ -20,6 +20,7 @@ Example::
 
 from __future__ import annotations
 
+from datetime import datetime as _datetime
 from typing import Any, NamedTuple
 
 import jax
@@ -37,6 +38,8 @@ from jactus.contracts.array_common import (
     XD_IDX,
     adt_to_dt,
     get_role_sign,
+    pad_event_ordinals,
+    settlement_dt,
 )
 from jactus.core import ContractAttributes
 from jactus.observers import RiskFactorObserver
@@ -200,6 +203,16 @@ def precompute_futur_arrays(
     Returns:
         ``(initial_state, event_types, year_fractions, rf_values, params)``
     """
+    return _precompute_futur_dated(attrs, rf_observer)[0]
+
+
+def _precompute_futur_dated(
+    attrs: ContractAttributes,
+    rf_observer: RiskFactorObserver,
+) -> tuple[
+    tuple[FUTURArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, FUTURArrayParams], list[int]
+]:
+    """``precompute_futur_arrays`` plus the ordinal of each event date."""
     role_sign = get_role_sign(attrs.contract_role)
     nt_val = attrs.notional_principal or 1.0
     futures_price = attrs.future_price or 0.0
@@ -212,8 +225,8 @@ def precompute_futur_arrays(
         nt=jnp.array(nt_val, dtype=F32),
     )
 
-    # Build schedule: (event_idx, rf_value)
-    schedule: list[tuple[int, float]] = []
+    # Build schedule: (event_idx, event_dt, rf_value)
+    schedule: list[tuple[int, _datetime, float]] = []
     sd_dt = adt_to_dt(attrs.status_date)
 
     # Check for pre-exercised state
@@ -222,23 +235,25 @@ def precompute_futur_arrays(
     if pre_exercised:
         # Pre-exercised: only STD with known exercise amount
         xa = attrs.exercise_amount or 0.0
-        schedule.append((STD_IDX, xa))
+        assert attrs.exercise_date is not None
+        schedule.append((STD_IDX, settlement_dt(attrs.exercise_date, attrs), xa))
     else:
         # PRD
         if attrs.purchase_date:
             prd_dt = adt_to_dt(attrs.purchase_date)
             if prd_dt > sd_dt:
-                schedule.append((PRD_IDX, 0.0))
+                schedule.append((PRD_IDX, prd_dt, 0.0))
 
         # TD
         if attrs.termination_date:
             td_dt = adt_to_dt(attrs.termination_date)
             if td_dt > sd_dt:
-                schedule.append((TD_IDX, 0.0))
+                schedule.append((TD_IDX, td_dt, 0.0))
 
         # MD at maturity
         assert attrs.maturity_date is not None
-        schedule.append((MD_IDX, 0.0))
+        md_dt = adt_to_dt(attrs.maturity_date)
+        schedule.append((MD_IDX, md_dt, 0.0))
 
         # XD at maturity: observe spot, compute Xa
         underlier_ref = attrs.contract_structure or ""
@@ -248,24 +263,25 @@ def precompute_futur_arrays(
             spot_price = 0.0
 
         xa = spot_price - futures_price
-        schedule.append((XD_IDX, 0.0))
+        schedule.append((XD_IDX, md_dt, 0.0))
 
         # STD: settlement amount = Xa (pre-computed)
-        schedule.append((STD_IDX, xa))
+        schedule.append((STD_IDX, settlement_dt(attrs.maturity_date, attrs, adjust=True), xa))
 
     # If empty schedule, add a single AD event
     if not schedule:
-        schedule.append((AD_IDX, 0.0))
+        schedule.append((AD_IDX, sd_dt, 0.0))
 
     n_events = len(schedule)
     et_list = [s[0] for s in schedule]
-    rf_list = [s[1] for s in schedule]
+    rf_list = [s[2] for s in schedule]
 
     event_types = jnp.array(et_list, dtype=jnp.int32)
     year_fractions = jnp.zeros(n_events, dtype=F32)
     rf_values = jnp.array(rf_list, dtype=F32)
 
-    return initial_state, event_types, year_fractions, rf_values, futur_params
+    arrays = (initial_state, event_types, year_fractions, rf_values, futur_params)
+    return arrays, [s[1].toordinal() for s in schedule]
 
 
 def prepare_futur_batch(
@@ -279,8 +295,19 @@ def prepare_futur_batch(
     Returns:
         ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
     """
+    return _prepare_futur_batch_dated(contracts)[0]
+
+
+def _prepare_futur_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+) -> tuple[
+    tuple[FUTURArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, FUTURArrayParams, jnp.ndarray],
+    jnp.ndarray,
+]:
+    """``prepare_futur_batch`` plus the ``[B, T]`` int32 event ordinals."""
     n = len(contracts)
-    precomputed = [precompute_futur_arrays(a, o) for a, o in contracts]
+    dated = [_precompute_futur_dated(a, o) for a, o in contracts]
+    precomputed = [arrays for arrays, _ in dated]
 
     # Find max events across all contracts
     max_events = max(p[1].shape[0] for p in precomputed)
@@ -316,7 +343,7 @@ def prepare_futur_batch(
         nt=jnp.asarray(nt_param_arr),
     )
 
-    return (
+    batch = (
         initial_states,
         jnp.asarray(et_batch),
         jnp.asarray(yf_batch),
@@ -324,6 +351,7 @@ def prepare_futur_batch(
         futur_params,
         jnp.asarray(mask_batch),
     )
+    return batch, pad_event_ordinals([ords for _, ords in dated], max_events)
 
 
 def simulate_futur_portfolio(
@@ -337,8 +365,10 @@ def simulate_futur_portfolio(
         discount_rate: If provided, compute present values.
 
     Returns:
-        Dict with ``payoffs``, ``masks``, ``final_states``, ``total_cashflows``.
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``, ``final_states``,
+        ``total_cashflows``.
     """
+    batch, event_ordinals = _prepare_futur_batch_dated(contracts)
     (
         batched_states,
         batched_et,
@@ -346,7 +376,7 @@ def simulate_futur_portfolio(
         batched_rf,
         batched_params,
         batched_masks,
-    ) = prepare_futur_batch(contracts)
+    ) = batch
 
     final_states, payoffs = batch_simulate_futur_auto(
         batched_states, batched_et, batched_yf, batched_rf, batched_params
@@ -358,6 +388,7 @@ def simulate_futur_portfolio(
     result: dict[str, Any] = {
         "payoffs": masked_payoffs,
         "masks": batched_masks,
+        "event_ordinals": event_ordinals,
         "final_states": final_states,
         "total_cashflows": total_cashflows,
         "num_contracts": len(contracts),
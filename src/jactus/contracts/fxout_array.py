@@ -19,6 +19,7 @@ Example::
 
 from __future__ import annotations
 
+from datetime import datetime as _datetime
 from typing import Any, NamedTuple
 
 import jax
@@ -34,6 +35,8 @@ from jactus.contracts.array_common import (
     TD_IDX,
     adt_to_dt,
     get_role_sign,
+    pad_event_ordinals,
+    settlement_dt,
 )
 from jactus.core import ContractAttributes
 from jactus.observers import RiskFactorObserver
@@ -221,6 +224,16 @@ def precompute_fxout_arrays(
     Returns:
         ``(initial_state, event_types, year_fractions, rf_values, params)``
     """
+    return _precompute_fxout_dated(attrs, rf_observer)[0]
+
+
+def _precompute_fxout_dated(
+    attrs: ContractAttributes,
+    rf_observer: RiskFactorObserver,
+) -> tuple[
+    tuple[FXOUTArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, FXOUTArrayParams], list[int]
+]:
+    """``precompute_fxout_arrays`` plus the ordinal of each event date."""
     role_sign = get_role_sign(attrs.contract_role)
 
     initial_state = FXOUTArrayState(nt=jnp.array(0.0, dtype=F32))
@@ -232,8 +245,8 @@ def precompute_fxout_arrays(
         notional_2=jnp.array(attrs.notional_principal_2 or 0.0, dtype=F32),
     )
 
-    # Build schedule: (event_idx, rf_value)
-    schedule: list[tuple[int, float]] = []
+    # Build schedule: (event_idx, event_dt, rf_value)
+    schedule: list[tuple[int, _datetime, float]] = []
     sd_dt = adt_to_dt(attrs.status_date)
 
     maturity_date = attrs.settlement_date or attrs.maturity_date
@@ -247,13 +260,13 @@ def precompute_fxout_arrays(
     if attrs.purchase_date:
         prd_dt = adt_to_dt(attrs.purchase_date)
         if prd_dt > sd_dt:
-            schedule.append((PRD_IDX, 0.0))
+            schedule.append((PRD_IDX, prd_dt, 0.0))
 
     # TD
     if attrs.termination_date:
         td_dt = adt_to_dt(attrs.termination_date)
         if td_dt > sd_dt:
-            schedule.append((TD_IDX, 0.0))
+            schedule.append((TD_IDX, td_dt, 0.0))
 
     # Settlement/maturity events (suppressed if early termination)
     if maturity_date and not early_term:
@@ -275,29 +288,30 @@ def precompute_fxout_arrays(
                 fx_rate = float(rf_observer.observe_risk_factor(rate_id, maturity_date))
             except (KeyError, NotImplementedError, TypeError):
                 fx_rate = 0.0
-            schedule.append((STD_IDX, fx_rate))
+            schedule.append((STD_IDX, settlement_dt(maturity_date, attrs), fx_rate))
         else:
             # Gross settlement: two MD events
             # First MD (leg 1, first currency): rf_values=0.0 -> +role_sign*NT1
-            schedule.append((MD_IDX, 0.0))
+            schedule.append((MD_IDX, adt_to_dt(maturity_date), 0.0))
             # Second MD (leg 2, second currency): rf_values=1.0 -> -role_sign*NT2
-            schedule.append((MD_IDX, 1.0))
+            schedule.append((MD_IDX, adt_to_dt(maturity_date), 1.0))
 
     # If empty schedule, add a single AD event
     if not schedule:
         from jactus.contracts.array_common import AD_IDX
 
-        schedule.append((AD_IDX, 0.0))
+        schedule.append((AD_IDX, sd_dt, 0.0))
 
     n_events = len(schedule)
     et_list = [s[0] for s in schedule]
-    rf_list = [s[1] for s in schedule]
+    rf_list = [s[2] for s in schedule]
 
     event_types = jnp.array(et_list, dtype=jnp.int32)
     year_fractions = jnp.zeros(n_events, dtype=F32)
     rf_values = jnp.array(rf_list, dtype=F32)
 
-    return initial_state, event_types, year_fractions, rf_values, fxout_params
+    arrays = (initial_state, event_types, year_fractions, rf_values, fxout_params)
+    return arrays, [s[1].toordinal() for s in schedule]
 
 
 def prepare_fxout_batch(
@@ -311,8 +325,19 @@ def prepare_fxout_batch(
     Returns:
         ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
     """
+    return _prepare_fxout_batch_dated(contracts)[0]
+
+
+def _prepare_fxout_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+) -> tuple[
+    tuple[FXOUTArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, FXOUTArrayParams, jnp.ndarray],
+    jnp.ndarray,
+]:
+    """``prepare_fxout_batch`` plus the ``[B, T]`` int32 event ordinals."""
     n = len(contracts)
-    precomputed = [precompute_fxout_arrays(a, o) for a, o in contracts]
+    dated = [_precompute_fxout_dated(a, o) for a, o in contracts]
+    precomputed = [arrays for arrays, _ in dated]
 
     # Find max events across all contracts
     max_events = max(p[1].shape[0] for p in precomputed)
@@ -351,7 +376,7 @@ def prepare_fxout_batch(
         notional_2=jnp.asarray(nt2_arr),
     )
 
-    return (
+    batch = (
         initial_states,
         jnp.asarray(et_batch),
         jnp.asarray(yf_batch),
@@ -359,6 +384,7 @@ def prepare_fxout_batch(
         fxout_params,
         jnp.asarray(mask_batch),
     )
+    return batch, pad_event_ordinals([ords for _, ords in dated], max_events)
 
 
 def simulate_fxout_portfolio(
@@ -372,8 +398,10 @@ def simulate_fxout_portfolio(
         discount_rate: If provided, compute present values.
 
     Returns:
-        Dict with ``payoffs``, ``masks``, ``final_states``, ``total_cashflows``.
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``, ``final_states``,
+        ``total_cashflows``.
     """
+    batch, event_ordinals = _prepare_fxout_batch_dated(contracts)
     (
         batched_states,
         batched_et,
@@ -381,7 +409,7 @@ def simulate_fxout_portfolio(
         batched_rf,
         batched_params,
         batched_masks,
-    ) = prepare_fxout_batch(contracts)
+    ) = batch
 
     final_states, payoffs = batch_simulate_fxout_auto(
         batched_states, batched_et, batched_yf, batched_rf, batched_params
@@ -393,6 +421,7 @@ def simulate_fxout_portfolio(
     result: dict[str, Any] = {
         "payoffs": masked_payoffs,
         "masks": batched_masks,
+        "event_ordinals": event_ordinals,
         "final_states": final_states,
         "total_cashflows": total_cashflows,
         "num_contracts": len(contracts),
@@ -39,7 +39,9 @@ Example::
 
 from __future__ import annotations
 
+import functools
 import math
+from collections.abc import Callable, Sequence
 from datetime import datetime as _datetime
 from typing import Any, NamedTuple
 
@@ -79,7 +81,20 @@ from jactus.contracts.array_common import (
 # Import shared infrastructure from array_common
 from jactus.contracts.array_common import (
     NOP_EVENT_IDX,
+    CanonicalShapes,
+    PrecisionPolicy,
+    RatePath,
+    RFScenarios,
+    check_scenario_options,
     get_yf_fn,
+    pad_event_ordinals,
+    precision_scope,
+    precompute_raw_list,
+    prepayment_inputs,
+    rate_reset_rf_values,
+    resolve_precision,
+    run_batch_kernel,
+    simulate_scenarios,
 )
 from jactus.contracts.array_common import (
     PP_IDX as _PP_IDX,
@@ -138,14 +153,24 @@ from jactus.contracts.array_common import (
 from jactus.contracts.array_common import (
     get_role_sign as _get_role_sign,
 )
+from jactus.contracts.array_common import (
+    merge_prepayment_events as _merge_prepayment_events,
+)
+from jactus.contracts.array_common import (
+    prepayment_amount as _prepayment_amount,
+)
 from jactus.contracts.array_common import (
     prequery_risk_factors as _prequery_risk_factors,
 )
+from jactus.contracts.array_common import (
+    state_dtype as _state_dtype,
+)
 from jactus.core import (
     ContractAttributes,
 )
 from jactus.observers import RiskFactorObserver
 from jactus.utilities.conventions import year_fraction
+from jactus.utilities.surface import Surface2D
 
 # ---------------------------------------------------------------------------
 # IPCB mode encoding
@@ -712,6 +737,8 @@ def batch_simulate_lam(
     year_fractions: jnp.ndarray,
     rf_values: jnp.ndarray,
     params: LAMArrayParams,
+    reset_ordinals: jnp.ndarray | None = None,
+    rate_path: RatePath | None = None,
 ) -> tuple[LAMArrayState, jnp.ndarray]:
     """Batched LAM simulation without vmap -- single scan over ``[B]`` arrays.
 
@@ -726,20 +753,96 @@ def batch_simulate_lam(
         year_fractions: ``[B, T]`` float32.
         rf_values: ``[B, T]`` float32.
         params: ``LAMArrayParams`` with each field shape ``[B]``.
+        reset_ordinals: ``[B, T]`` int32 fixing day ordinals (the batch's
+            ``event_ordinals``); required with ``rate_path``.
+        rate_path: Optional on-device rate source (see
+            :data:`~jactus.contracts.array_common.RatePath`).  RR fixings
+            are then looked up from it inside the kernel instead of read
+            from ``rf_values``, and gradients flow back to its values.
+
+    Returns:
+        ``(final_states, payoffs)`` where ``payoffs`` is ``[B, T]``.
+    """
+    rf_values = rate_reset_rf_values(rate_path, event_types, reset_ordinals, rf_values)
+    return _scan_lam(initial_states, event_types, year_fractions, rf_values, params)
+
+
+@jax.jit
+def batch_simulate_lam_prepayment(
+    initial_states: LAMArrayState,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    market_rates: jnp.ndarray,
+    loan_ages: jnp.ndarray,
+    surface_ids: jnp.ndarray,
+    params: LAMArrayParams,
+    surfaces: tuple[Surface2D, ...],
+) -> tuple[LAMArrayState, jnp.ndarray]:
+    """Batched LAM simulation with the prepayment surface evaluated in the scan.
+
+    Same as :func:`batch_simulate_lam`, except that each PP event with a
+    market rate prepays ``surface(ipnr - market_rate, loan_age) * nt`` from
+    the live scan state, with each row reading its own entry of ``surfaces`` (see
+    :func:`~jactus.contracts.array_common.prepayment_amount`) rather than
+    the pre-queried ``rf_values`` amount.  Differentiable in the surface.
+
+    Args:
+        initial_states: ``LAMArrayState`` with each field shape ``[B]``.
+        event_types: ``[B, T]`` int32 -- event type indices per contract.
+        year_fractions: ``[B, T]`` float32.
+        rf_values: ``[B, T]`` float32.
+        market_rates: ``[B, T]`` market reference rates; NaN where
+            ``rf_values`` is paid.
+        loan_ages: ``[B, T]`` years since the initial exchange date.
+        surface_ids: ``[B, T]`` int32 index into ``surfaces``.
+        params: ``LAMArrayParams`` with each field shape ``[B]``.
+        surfaces: Prepayment surfaces (spread x loan age).
 
     Returns:
         ``(final_states, payoffs)`` where ``payoffs`` is ``[B, T]``.
     """
+    return _scan_lam(
+        initial_states,
+        event_types,
+        year_fractions,
+        rf_values,
+        params,
+        (market_rates, loan_ages, surface_ids, surfaces),
+    )
+
+
+def _scan_lam(
+    initial_states: LAMArrayState,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    params: LAMArrayParams,
+    prepayment: tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray, tuple[Surface2D, ...]] | None = None,
+) -> tuple[LAMArrayState, jnp.ndarray]:
+    """Single-scan body of the batched LAM kernels.
+
+    ``prepayment`` is ``(market_rates, loan_ages, surface_ids, surfaces)`` for in-kernel
+    prepayment, or ``None`` to pay the pre-queried ``rf_values`` at PP events.
+    """
     # Transpose to [T, B] so scan iterates over time steps
-    et_t = event_types.T
-    yf_t = year_fractions.T
-    rf_t = rf_values.T
+    xs: tuple[jnp.ndarray, ...] = (event_types.T, year_fractions.T, rf_values.T)
+    if prepayment is not None:
+        xs += (prepayment[0].T, prepayment[1].T, prepayment[2].T)
 
     def step(
         states: LAMArrayState,
-        inputs: tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray],
+        inputs: tuple[jnp.ndarray, ...],
     ) -> tuple[LAMArrayState, jnp.ndarray]:
-        et, yf, rf = inputs  # each [B]
+        et, yf, rf = inputs[:3]  # each [B]
+        # PP: prepaid principal -- pre-queried, or looked up from the live state
+        if prepayment is None:
+            pp = rf
+        else:
+            market_rate, loan_age, surface_id = inputs[3:6]
+            pp = _prepayment_amount(
+                prepayment[3], surface_id, states.nt, states.ipnr, market_rate, loan_age, rf
+            )
 
         # Common sub-expression: interest accrual using ipcb (not nt)
         accrue = states.ipac + yf * states.ipnr * states.ipcb
@@ -768,8 +871,8 @@ def batch_simulate_lam(
             states.nsc * states.nt + states.isc * states.ipac + states.feac,
             payoff,
         )
-        # PP: rf (pre-computed prepayment amount)
-        payoff = jnp.where(et == _PP_IDX, rf, payoff)
+        # PP: prepaid principal
+        payoff = jnp.where(et == _PP_IDX, pp, payoff)
         # PY: penalty (type-dependent)
         payoff = jnp.where(
             et == _PY_IDX,
@@ -821,7 +924,7 @@ def batch_simulate_lam(
         # PR: nt -= effective_prnxt
         new_nt = jnp.where(et == _PR_IDX, states.nt - effective_prnxt, new_nt)
         new_nt = jnp.where((et == _MD_IDX) | (et == _TD_IDX), 0.0, new_nt)
-        new_nt = jnp.where(et == _PP_IDX, states.nt - rf, new_nt)
+        new_nt = jnp.where(et == _PP_IDX, states.nt - pp, new_nt)
         new_nt = jnp.where(et == _IPCI_IDX, states.nt + accrue, new_nt)
 
         # ipnr: default unchanged
@@ -898,7 +1001,7 @@ def batch_simulate_lam(
         pr_ipcb = jnp.where(params.ipcb_mode == IPCB_NTL, states.ipcb, new_nt)
         new_ipcb = jnp.where(et == _PR_IDX, pr_ipcb, new_ipcb)
         # PP: same as PR for ipcb update
-        pp_nt = states.nt - rf  # new_nt after PP
+        pp_nt = states.nt - pp  # new_nt after PP
         pp_ipcb = jnp.where(params.ipcb_mode == IPCB_NTL, states.ipcb, pp_nt)
         new_ipcb = jnp.where(et == _PP_IDX, pp_ipcb, new_ipcb)
         # IPCI: ipcb = new_nt if mode NT, otherwise unchanged
@@ -922,7 +1025,7 @@ def batch_simulate_lam(
         )
         return new_state, payoff
 
-    final_states, payoffs_t = jax.lax.scan(step, initial_states, (et_t, yf_t, rf_t), unroll=8)
+    final_states, payoffs_t = jax.lax.scan(step, initial_states, xs, unroll=8)
     # payoffs_t is [T, B]; transpose back to [B, T]
     return final_states, payoffs_t.T
 
@@ -1346,7 +1449,7 @@ def _precompute_raw(
     from jactus.core.types import DayCountConvention
 
     # 1. Fast schedule generation (no contract object)
-    schedule = _fast_lam_schedule(attrs)
+    schedule = _merge_prepayment_events(_fast_lam_schedule(attrs), attrs, rf_observer)
 
     # 2. Fast state initialization
     nt, ipnr, ipac, feac, nsc, isc, prnxt, ipcb, init_sd_dt = _fast_lam_init_state(attrs)
@@ -1379,6 +1482,7 @@ def _precompute_raw(
         year_fractions=yf_list,
         rf_values=rf_list,
         params=params_raw,
+        event_ordinals=[evt_dt.toordinal() for _, evt_dt, _ in schedule],
     )
 
 
@@ -1399,7 +1503,7 @@ def _precompute_raw_da(
     from jactus.core.types import DayCountConvention
 
     # 1. Schedule
-    schedule = _fast_lam_schedule(attrs)
+    schedule = _merge_prepayment_events(_fast_lam_schedule(attrs), attrs, rf_observer)
 
     # 2. State initialisation
     nt, ipnr, ipac, feac, nsc, isc, prnxt, ipcb, init_sd_dt = _fast_lam_init_state(attrs)
@@ -1431,6 +1535,7 @@ def _precompute_raw_da(
         year_fractions=yf_list,
         rf_values=rf_list,
         params=params_raw,
+        event_ordinals=[evt_dt.toordinal() for _, evt_dt, _ in schedule],
     )
 
 
@@ -1490,6 +1595,7 @@ def _raw_list_to_jax_batch(
     Pads shorter contracts with NOP events and builds NumPy arrays first
     (fast C-level construction) then transfers to JAX via ``jnp.asarray``.
     """
+    float_dtype = _state_dtype()
     max_events = max(len(r.event_types) for r in raw_list)
 
     # State fields: (batch,) each -- LAM has 8 state fields
@@ -1524,20 +1630,20 @@ def _raw_list_to_jax_batch(
 
     # Build NumPy arrays first (fast C-level), then transfer to JAX
     batched_states = LAMArrayState(
-        nt=jnp.asarray(np.array(state_nt, dtype=np.float32)),
-        ipnr=jnp.asarray(np.array(state_ipnr, dtype=np.float32)),
-        ipac=jnp.asarray(np.array(state_ipac, dtype=np.float32)),
-        feac=jnp.asarray(np.array(state_feac, dtype=np.float32)),
-        nsc=jnp.asarray(np.array(state_nsc, dtype=np.float32)),
-        isc=jnp.asarray(np.array(state_isc, dtype=np.float32)),
-        prnxt=jnp.asarray(np.array(state_prnxt, dtype=np.float32)),
-        ipcb=jnp.asarray(np.array(state_ipcb, dtype=np.float32)),
+        nt=jnp.asarray(np.array(state_nt, dtype=float_dtype)),
+        ipnr=jnp.asarray(np.array(state_ipnr, dtype=float_dtype)),
+        ipac=jnp.asarray(np.array(state_ipac, dtype=float_dtype)),
+        feac=jnp.asarray(np.array(state_feac, dtype=float_dtype)),
+        nsc=jnp.asarray(np.array(state_nsc, dtype=float_dtype)),
+        isc=jnp.asarray(np.array(state_isc, dtype=float_dtype)),
+        prnxt=jnp.asarray(np.array(state_prnxt, dtype=float_dtype)),
+        ipcb=jnp.asarray(np.array(state_ipcb, dtype=float_dtype)),
     )
 
     batched_et = jnp.asarray(np.array(et_batch, dtype=np.int32))
-    batched_yf = jnp.asarray(np.array(yf_batch, dtype=np.float32))
-    batched_rf = jnp.asarray(np.array(rf_batch, dtype=np.float32))
-    batched_masks = jnp.asarray(np.array(mask_batch, dtype=np.float32))
+    batched_yf = jnp.asarray(np.array(yf_batch, dtype=float_dtype))
+    batched_rf = jnp.asarray(np.array(rf_batch, dtype=float_dtype))
+    batched_masks = jnp.asarray(np.array(mask_batch, dtype=float_dtype))
 
     _int_fields = {"fee_basis", "penalty_type", "ipcb_mode"}
     batched_params = LAMArrayParams(
@@ -1545,7 +1651,7 @@ def _raw_list_to_jax_batch(
             k: jnp.asarray(
                 np.array(
                     param_fields[k],
-                    dtype=np.int32 if k in _int_fields else np.float32,
+                    dtype=np.int32 if k in _int_fields else float_dtype,
                 )
             )
             for k in LAMArrayParams._fields
@@ -1557,6 +1663,7 @@ def _raw_list_to_jax_batch(
 
 def prepare_lam_batch(
     contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
 ) -> tuple[LAMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, LAMArrayParams, jnp.ndarray]:
     """Pre-compute and pad arrays for a batch of LAM contracts.
 
@@ -1566,19 +1673,42 @@ def prepare_lam_batch(
 
     Args:
         contracts: List of ``(attributes, rf_observer)`` pairs.
+        workers: If greater than 1, run the per-contract pre-computation
+            in a pool of this many processes (see
+            :func:`~jactus.contracts.array_common.precompute_raw_list`).
 
     Returns:
         ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
         where each array has a leading batch dimension.
     """
-    raw_list = [_precompute_raw(attrs, obs) for attrs, obs in contracts]
-    return _raw_list_to_jax_batch(raw_list)
+    return _prepare_lam_batch_dated(contracts, workers)[0]
+
+
+def _prepare_lam_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
+) -> tuple[
+    tuple[LAMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, LAMArrayParams, jnp.ndarray],
+    jnp.ndarray,
+]:
+    """``prepare_lam_batch`` plus the ``[B, T]`` int32 event ordinals."""
+    raw_list = precompute_raw_list(_precompute_raw, contracts, workers)
+    batch = _raw_list_to_jax_batch(raw_list)
+    return batch, pad_event_ordinals([r.event_ordinals for r in raw_list], batch[1].shape[1])
 
 
 def simulate_lam_portfolio(
     contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
     discount_rate: float | None = None,
     year_fractions_from_valuation: jnp.ndarray | None = None,
+    length_buckets: int | None = None,
+    pad_shape: tuple[int, int] | None = None,
+    devices: int | Sequence[Any] | None = None,
+    canonical_shapes: CanonicalShapes | bool | None = None,
+    precision: PrecisionPolicy | str | None = None,
+    rf_scenarios: RFScenarios | None = None,
+    scenario_output: str = "payoffs",
+    scenario_batch_size: int | None = None,
 ) -> dict[str, Any]:
     """End-to-end portfolio simulation with optional PV.
 
@@ -1589,11 +1719,43 @@ def simulate_lam_portfolio(
             from valuation date for PV discounting.  If ``None`` and
             ``discount_rate`` is set, year fractions are computed from each
             contract's ``status_date``.
+        length_buckets: If set, sort contracts by event count and
+            simulate them in at most this many length buckets, each
+            trimmed to its own longest contract, instead of padding the
+            whole batch to the longest one.
+        pad_shape: If set, pad the batch to at least ``(rows, events)``
+            (events rounded up to a power of two) so repeated calls reuse
+            one compiled kernel; used by chunked streaming.
+        devices: If set, shard the batch axis across this many JAX devices
+            (or this list of devices); results come back in input order.
+        canonical_shapes: If set, pad the batch up to canonical sizes
+            (``True`` for powers of two, or a ``CanonicalShapes`` of
+            allowed sizes) so portfolios of similar size reuse one
+            compiled kernel.
+        precision: Precision policy (``"f32"``, ``"f64"``, ``"mixed"`` or a
+            ``PrecisionPolicy``); defaults to the active policy.  Sets the
+            dtype of the prepared batch and of payoff and PV accumulation.
+        rf_scenarios: If set, an ``[S, B, T]`` array of risk-factor values
+            (or a callable ``(event_ordinals, rf_values) -> [S, B, T]``)
+            run against the shared schedules and parameters in one
+            compiled call; see
+            :func:`~jactus.contracts.array_common.simulate_scenarios`.
+        scenario_output: ``"payoffs"``, ``"totals"`` or ``"portfolio"``
+            (sum over contracts on device), with ``rf_scenarios``.
+        scenario_batch_size: Scenarios evaluated at once with
+            ``rf_scenarios``; ``None`` runs them all together.
 
     Returns:
-        Dict with ``payoffs``, ``masks``, ``final_states``, and optionally
-        ``present_values`` and ``total_pv``.
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``,
+        ``final_states``, optionally ``present_values`` and ``total_pv``, and
+        ``length_buckets`` (the :class:`LengthBuckets` plan) or
+        ``padded_shape`` when bucketing or padding.  With ``rf_scenarios``
+        the totals and present values gain a leading ``[S]`` axis (see
+        :func:`~jactus.contracts.array_common.simulate_scenarios`).
     """
+    policy = resolve_precision(precision)
+    with precision_scope(policy):
+        batch, event_ordinals = _prepare_lam_batch_dated(contracts)
     (
         batched_states,
         batched_et,
@@ -1601,24 +1763,67 @@ def simulate_lam_portfolio(
         batched_rf,
         batched_params,
         batched_masks,
-    ) = prepare_lam_batch(contracts)
+    ) = batch
+    prepayment = prepayment_inputs(contracts, batched_et, event_ordinals, batched_rf.dtype)
+
+    if rf_scenarios is not None:
+        if prepayment is not None:
+            raise ValueError("rf_scenarios cannot be combined with in-kernel prepayment")
+        check_scenario_options(
+            length_buckets=length_buckets,
+            pad_shape=pad_shape,
+            devices=devices,
+            canonical_shapes=canonical_shapes,
+        )
+        scenario_result = simulate_scenarios(
+            batch_simulate_lam_auto,
+            batched_states,
+            (batched_et, batched_yf, batched_rf),
+            batched_params,
+            batched_masks,
+            event_ordinals,
+            rf_scenarios,
+            accumulate_dtype=policy.accumulate_dtype,
+            discount_rate=discount_rate,
+            year_fractions_from_valuation=year_fractions_from_valuation,
+            output=scenario_output,
+            scenario_batch_size=scenario_batch_size,
+        )
+        scenario_result["num_contracts"] = len(contracts)
+        return scenario_result
 
     # Run batched simulation
-    final_states, payoffs = batch_simulate_lam_auto(
-        batched_states, batched_et, batched_yf, batched_rf, batched_params
+    simulate_fn: Callable[..., tuple[Any, jnp.ndarray]] = batch_simulate_lam_auto
+    event_arrays: tuple[jnp.ndarray, ...] = (batched_et, batched_yf, batched_rf)
+    if prepayment is not None:
+        # PP amounts come from the surface and the live scan state
+        simulate_fn = functools.partial(batch_simulate_lam_prepayment, surfaces=prepayment.surfaces)
+        event_arrays += (prepayment.market_rates, prepayment.loan_ages, prepayment.surface_ids)
+    final_states, payoffs, layout = run_batch_kernel(
+        simulate_fn,
+        batched_states,
+        event_arrays,
+        batched_params,
+        batched_masks,
+        length_buckets=length_buckets,
+        pad_shape=pad_shape,
+        devices=devices,
+        canonical_shapes=canonical_shapes,
     )
 
     # Mask padding
-    masked_payoffs = payoffs * batched_masks
+    masked_payoffs = payoffs.astype(policy.accumulate_dtype) * batched_masks
     total_cashflows = jnp.sum(masked_payoffs, axis=1)
 
     result: dict[str, Any] = {
         "payoffs": masked_payoffs,
         "masks": batched_masks,
+        "event_ordinals": event_ordinals,
         "final_states": final_states,
         "total_cashflows": total_cashflows,
         "num_contracts": len(contracts),
     }
+    result.update(layout)
 
     if discount_rate is not None:
         # Use cumulative year fractions for discounting
@@ -1626,7 +1831,7 @@ def simulate_lam_portfolio(
             disc_yfs = year_fractions_from_valuation
         else:
             # Approximate: use cumulative sum of per-event year fractions
-            disc_yfs = jnp.cumsum(batched_yf, axis=1)
+            disc_yfs = jnp.cumsum(batched_yf.astype(policy.accumulate_dtype), axis=1)
         discount_factors = 1.0 / (1.0 + discount_rate * disc_yfs)
         pvs = jnp.sum(masked_payoffs * discount_factors, axis=1)
         result["present_values"] = pvs
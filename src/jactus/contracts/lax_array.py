@@ -37,6 +37,7 @@ Example::
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import datetime as _datetime
 from typing import Any, NamedTuple
 
@@ -76,6 +77,18 @@ from jactus.contracts.array_common import (
 # Import shared infrastructure from array_common
 from jactus.contracts.array_common import (
     NOP_EVENT_IDX,
+    CanonicalShapes,
+    PrecisionPolicy,
+    RatePath,
+    RFScenarios,
+    check_scenario_options,
+    pad_event_ordinals,
+    precision_scope,
+    precompute_raw_list,
+    rate_reset_rf_values,
+    resolve_precision,
+    run_batch_kernel,
+    simulate_scenarios,
 )
 from jactus.contracts.array_common import (
     PI_IDX as _PI_IDX,
@@ -130,6 +143,9 @@ from jactus.contracts.array_common import (
 from jactus.contracts.array_common import (
     prequery_risk_factors as _prequery_risk_factors,
 )
+from jactus.contracts.array_common import (
+    state_dtype as _state_dtype,
+)
 
 # Import IPCB mode constants from lam_array
 from jactus.contracts.lam_array import (
@@ -715,6 +731,8 @@ def batch_simulate_lax(
     rf_values: jnp.ndarray,
     prnxt_schedule: jnp.ndarray,
     params: LAXArrayParams,
+    reset_ordinals: jnp.ndarray | None = None,
+    rate_path: RatePath | None = None,
 ) -> tuple[LAXArrayState, jnp.ndarray]:
     """Batched LAX simulation without vmap -- single scan over ``[B]`` arrays.
 
@@ -725,10 +743,17 @@ def batch_simulate_lax(
         rf_values: ``[B, T]`` float32.
         prnxt_schedule: ``[B, T]`` float32 -- per-event prnxt values.
         params: ``LAXArrayParams`` with each field shape ``[B]``.
+        reset_ordinals: ``[B, T]`` int32 fixing day ordinals (the batch's
+            ``event_ordinals``); required with ``rate_path``.
+        rate_path: Optional on-device rate source (see
+            :data:`~jactus.contracts.array_common.RatePath`).  RR fixings
+            are then looked up from it inside the kernel instead of read
+            from ``rf_values``, and gradients flow back to its values.
 
     Returns:
         ``(final_states, payoffs)`` where ``payoffs`` is ``[B, T]``.
     """
+    rf_values = rate_reset_rf_values(rate_path, event_types, reset_ordinals, rf_values)
     # Transpose to [T, B] so scan iterates over time steps
     et_t = event_types.T
     yf_t = year_fractions.T
@@ -955,6 +980,7 @@ class _LAXRawPrecomputed(NamedTuple):
     rf_values: list[float]
     prnxt_values: list[float]  # per-event signed prnxt
     params: dict[str, float | int]
+    event_ordinals: Sequence[int] = ()
 
 
 def _extract_params(attrs: ContractAttributes) -> LAXArrayParams:
@@ -1244,6 +1270,7 @@ def _precompute_raw(
         rf_values=rf_list,
         prnxt_values=prnxt_list,
         params=params_raw,
+        event_ordinals=[evt_dt.toordinal() for _, evt_dt, _ in schedule],
     )
 
 
@@ -1305,6 +1332,7 @@ def _raw_list_to_jax_batch(
     Returns:
         ``(states, event_types, year_fractions, rf_values, prnxt_schedule, params, masks)``
     """
+    float_dtype = _state_dtype()
     max_events = max(len(r.event_types) for r in raw_list)
 
     # State fields
@@ -1341,21 +1369,21 @@ def _raw_list_to_jax_batch(
 
     # Build NumPy arrays, then transfer to JAX
     batched_states = LAXArrayState(
-        nt=jnp.asarray(np.array(state_nt, dtype=np.float32)),
-        ipnr=jnp.asarray(np.array(state_ipnr, dtype=np.float32)),
-        ipac=jnp.asarray(np.array(state_ipac, dtype=np.float32)),
-        feac=jnp.asarray(np.array(state_feac, dtype=np.float32)),
-        nsc=jnp.asarray(np.array(state_nsc, dtype=np.float32)),
-        isc=jnp.asarray(np.array(state_isc, dtype=np.float32)),
-        prnxt=jnp.asarray(np.array(state_prnxt, dtype=np.float32)),
-        ipcb=jnp.asarray(np.array(state_ipcb, dtype=np.float32)),
+        nt=jnp.asarray(np.array(state_nt, dtype=float_dtype)),
+        ipnr=jnp.asarray(np.array(state_ipnr, dtype=float_dtype)),
+        ipac=jnp.asarray(np.array(state_ipac, dtype=float_dtype)),
+        feac=jnp.asarray(np.array(state_feac, dtype=float_dtype)),
+        nsc=jnp.asarray(np.array(state_nsc, dtype=float_dtype)),
+        isc=jnp.asarray(np.array(state_isc, dtype=float_dtype)),
+        prnxt=jnp.asarray(np.array(state_prnxt, dtype=float_dtype)),
+        ipcb=jnp.asarray(np.array(state_ipcb, dtype=float_dtype)),
     )
 
     batched_et = jnp.asarray(np.array(et_batch, dtype=np.int32))
-    batched_yf = jnp.asarray(np.array(yf_batch, dtype=np.float32))
-    batched_rf = jnp.asarray(np.array(rf_batch, dtype=np.float32))
-    batched_prnxt = jnp.asarray(np.array(prnxt_batch, dtype=np.float32))
-    batched_masks = jnp.asarray(np.array(mask_batch, dtype=np.float32))
+    batched_yf = jnp.asarray(np.array(yf_batch, dtype=float_dtype))
+    batched_rf = jnp.asarray(np.array(rf_batch, dtype=float_dtype))
+    batched_prnxt = jnp.asarray(np.array(prnxt_batch, dtype=float_dtype))
+    batched_masks = jnp.asarray(np.array(mask_batch, dtype=float_dtype))
 
     _int_fields = {"fee_basis", "penalty_type", "ipcb_mode"}
     batched_params = LAXArrayParams(
@@ -1363,7 +1391,7 @@ def _raw_list_to_jax_batch(
             k: jnp.asarray(
                 np.array(
                     param_fields[k],
-                    dtype=np.int32 if k in _int_fields else np.float32,
+                    dtype=np.int32 if k in _int_fields else float_dtype,
                 )
             )
             for k in LAXArrayParams._fields
@@ -1383,6 +1411,7 @@ def _raw_list_to_jax_batch(
 
 def prepare_lax_batch(
     contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
 ) -> tuple[
     LAXArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, jnp.ndarray, LAXArrayParams, jnp.ndarray
 ]:
@@ -1390,18 +1419,49 @@ def prepare_lax_batch(
 
     Args:
         contracts: List of ``(attributes, rf_observer)`` pairs.
+        workers: If greater than 1, run the per-contract pre-computation
+            in a pool of this many processes (see
+            :func:`~jactus.contracts.array_common.precompute_raw_list`).
 
     Returns:
         ``(initial_states, event_types, year_fractions, rf_values, prnxt_schedule, params, masks)``
     """
-    raw_list = [_precompute_raw(attrs, obs) for attrs, obs in contracts]
-    return _raw_list_to_jax_batch(raw_list)
+    return _prepare_lax_batch_dated(contracts, workers)[0]
+
+
+def _prepare_lax_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
+) -> tuple[
+    tuple[
+        LAXArrayState,
+        jnp.ndarray,
+        jnp.ndarray,
+        jnp.ndarray,
+        jnp.ndarray,
+        LAXArrayParams,
+        jnp.ndarray,
+    ],
+    jnp.ndarray,
+]:
+    """``prepare_lax_batch`` plus the ``[B, T]`` int32 event ordinals."""
+    raw_list = precompute_raw_list(_precompute_raw, contracts, workers)
+    batch = _raw_list_to_jax_batch(raw_list)
+    return batch, pad_event_ordinals([r.event_ordinals for r in raw_list], batch[1].shape[1])
 
 
 def simulate_lax_portfolio(
     contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
     discount_rate: float | None = None,
     year_fractions_from_valuation: jnp.ndarray | None = None,
+    length_buckets: int | None = None,
+    pad_shape: tuple[int, int] | None = None,
+    devices: int | Sequence[Any] | None = None,
+    canonical_shapes: CanonicalShapes | bool | None = None,
+    precision: PrecisionPolicy | str | None = None,
+    rf_scenarios: RFScenarios | None = None,
+    scenario_output: str = "payoffs",
+    scenario_batch_size: int | None = None,
 ) -> dict[str, Any]:
     """End-to-end portfolio simulation with optional PV.
 
@@ -1410,11 +1470,43 @@ def simulate_lax_portfolio(
         discount_rate: If provided, compute present values.
         year_fractions_from_valuation: ``(batch, max_events)`` year fractions
             from valuation date for PV discounting.
+        length_buckets: If set, sort contracts by event count and
+            simulate them in at most this many length buckets, each
+            trimmed to its own longest contract, instead of padding the
+            whole batch to the longest one.
+        pad_shape: If set, pad the batch to at least ``(rows, events)``
+            (events rounded up to a power of two) so repeated calls reuse
+            one compiled kernel; used by chunked streaming.
+        devices: If set, shard the batch axis across this many JAX devices
+            (or this list of devices); results come back in input order.
+        canonical_shapes: If set, pad the batch up to canonical sizes
+            (``True`` for powers of two, or a ``CanonicalShapes`` of
+            allowed sizes) so portfolios of similar size reuse one
+            compiled kernel.
+        precision: Precision policy (``"f32"``, ``"f64"``, ``"mixed"`` or a
+            ``PrecisionPolicy``); defaults to the active policy.  Sets the
+            dtype of the prepared batch and of payoff and PV accumulation.
+        rf_scenarios: If set, an ``[S, B, T]`` array of risk-factor values
+            (or a callable ``(event_ordinals, rf_values) -> [S, B, T]``)
+            run against the shared schedules and parameters in one
+            compiled call; see
+            :func:`~jactus.contracts.array_common.simulate_scenarios`.
+        scenario_output: ``"payoffs"``, ``"totals"`` or ``"portfolio"``
+            (sum over contracts on device), with ``rf_scenarios``.
+        scenario_batch_size: Scenarios evaluated at once with
+            ``rf_scenarios``; ``None`` runs them all together.
 
     Returns:
-        Dict with ``payoffs``, ``masks``, ``final_states``, and optionally
-        ``present_values`` and ``total_pv``.
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``,
+        ``final_states``, optionally ``present_values`` and ``total_pv``, and
+        ``length_buckets`` (the :class:`LengthBuckets` plan) or
+        ``padded_shape`` when bucketing or padding.  With ``rf_scenarios``
+        the totals and present values gain a leading ``[S]`` axis (see
+        :func:`~jactus.contracts.array_common.simulate_scenarios`).
     """
+    policy = resolve_precision(precision)
+    with precision_scope(policy):
+        batch, event_ordinals = _prepare_lax_batch_dated(contracts)
     (
         batched_states,
         batched_et,
@@ -1423,30 +1515,64 @@ def simulate_lax_portfolio(
         batched_prnxt,
         batched_params,
         batched_masks,
-    ) = prepare_lax_batch(contracts)
+    ) = batch
+
+    if rf_scenarios is not None:
+        check_scenario_options(
+            length_buckets=length_buckets,
+            pad_shape=pad_shape,
+            devices=devices,
+            canonical_shapes=canonical_shapes,
+        )
+        scenario_result = simulate_scenarios(
+            batch_simulate_lax_auto,
+            batched_states,
+            (batched_et, batched_yf, batched_rf, batched_prnxt),
+            batched_params,
+            batched_masks,
+            event_ordinals,
+            rf_scenarios,
+            accumulate_dtype=policy.accumulate_dtype,
+            discount_rate=discount_rate,
+            year_fractions_from_valuation=year_fractions_from_valuation,
+            output=scenario_output,
+            scenario_batch_size=scenario_batch_size,
+        )
+        scenario_result["num_contracts"] = len(contracts)
+        return scenario_result
 
     # Run batched simulation
-    final_states, payoffs = batch_simulate_lax_auto(
-        batched_states, batched_et, batched_yf, batched_rf, batched_prnxt, batched_params
+    final_states, payoffs, layout = run_batch_kernel(
+        batch_simulate_lax_auto,
+        batched_states,
+        (batched_et, batched_yf, batched_rf, batched_prnxt),
+        batched_params,
+        batched_masks,
+        length_buckets=length_buckets,
+        pad_shape=pad_shape,
+        devices=devices,
+        canonical_shapes=canonical_shapes,
     )
 
     # Mask padding
-    masked_payoffs = payoffs * batched_masks
+    masked_payoffs = payoffs.astype(policy.accumulate_dtype) * batched_masks
     total_cashflows = jnp.sum(masked_payoffs, axis=1)
 
     result: dict[str, Any] = {
         "payoffs": masked_payoffs,
         "masks": batched_masks,
+        "event_ordinals": event_ordinals,
         "final_states": final_states,
         "total_cashflows": total_cashflows,
         "num_contracts": len(contracts),
     }
+    result.update(layout)
 
     if discount_rate is not None:
         if year_fractions_from_valuation is not None:
             disc_yfs = year_fractions_from_valuation
         else:
-            disc_yfs = jnp.cumsum(batched_yf, axis=1)
+            disc_yfs = jnp.cumsum(batched_yf.astype(policy.accumulate_dtype), axis=1)
         discount_factors = 1.0 / (1.0 + discount_rate * disc_yfs)
         pvs = jnp.sum(masked_payoffs * discount_factors, axis=1)
         result["present_values"] = pvs
@@ -20,6 +20,7 @@ Example::
 
 from __future__ import annotations
 
+from datetime import datetime as _datetime
 from typing import Any, NamedTuple
 
 import jax
@@ -38,6 +39,8 @@ from jactus.contracts.array_common import (
     adt_to_dt,
     dt_to_adt,
     get_role_sign,
+    pad_event_ordinals,
+    settlement_dt,
 )
 from jactus.core import ContractAttributes
 from jactus.observers import RiskFactorObserver
@@ -229,6 +232,16 @@ def precompute_optns_arrays(
     Returns:
         ``(initial_state, event_types, year_fractions, rf_values, params)``
     """
+    return _precompute_optns_dated(attrs, rf_observer)[0]
+
+
+def _precompute_optns_dated(
+    attrs: ContractAttributes,
+    rf_observer: RiskFactorObserver,
+) -> tuple[
+    tuple[OPTNSArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, OPTNSArrayParams], list[int]
+]:
+    """``precompute_optns_arrays`` plus the ordinal of each event date."""
     role_sign = get_role_sign(attrs.contract_role)
 
     initial_state = OPTNSArrayState(nt=jnp.array(0.0, dtype=F32))
@@ -238,8 +251,8 @@ def precompute_optns_arrays(
         ptd=jnp.array(attrs.price_at_termination_date or 0.0, dtype=F32),
     )
 
-    # Build schedule: (event_idx, rf_value)
-    schedule: list[tuple[int, float]] = []
+    # Build schedule: (event_idx, event_dt, rf_value)
+    schedule: list[tuple[int, _datetime, float]] = []
     sd_dt = adt_to_dt(attrs.status_date)
 
     option_type = attrs.option_type or "C"
@@ -253,23 +266,25 @@ def precompute_optns_arrays(
     if pre_exercised:
         # Pre-exercised: only STD with known exercise amount
         xa = attrs.exercise_amount or 0.0
-        schedule.append((STD_IDX, xa))
+        assert attrs.exercise_date is not None
+        schedule.append((STD_IDX, settlement_dt(attrs.exercise_date, attrs), xa))
     else:
         # PRD
         if attrs.purchase_date:
             prd_dt = adt_to_dt(attrs.purchase_date)
             if prd_dt > sd_dt:
-                schedule.append((PRD_IDX, 0.0))
+                schedule.append((PRD_IDX, prd_dt, 0.0))
 
         # TD
         if attrs.termination_date:
             td_dt = adt_to_dt(attrs.termination_date)
             if td_dt > sd_dt:
-                schedule.append((TD_IDX, 0.0))
+                schedule.append((TD_IDX, td_dt, 0.0))
 
         # MD at maturity
         assert attrs.maturity_date is not None
-        schedule.append((MD_IDX, 0.0))
+        md_dt = adt_to_dt(attrs.maturity_date)
+        schedule.append((MD_IDX, md_dt, 0.0))
 
         # XD: exercise date(s)
         # For European: single XD at maturity
@@ -286,7 +301,7 @@ def precompute_optns_arrays(
             except (KeyError, NotImplementedError, TypeError):
                 spot = 0.0
             xa = _compute_intrinsic_value(option_type, spot, strike_1, strike_2)
-            schedule.append((XD_IDX, 0.0))
+            schedule.append((XD_IDX, md_dt, 0.0))
         elif exercise_type == "A":
             # American: monthly XD dates; use last XD intrinsic value
             # (matches Python path where each XD overwrites xa, and STD
@@ -305,7 +320,7 @@ def precompute_optns_arrays(
                     except (KeyError, NotImplementedError, TypeError):
                         spot = 0.0
                     last_xa = _compute_intrinsic_value(option_type, spot, strike_1, strike_2)
-                    schedule.append((XD_IDX, 0.0))
+                    schedule.append((XD_IDX, xd_dt, 0.0))
             xa = last_xa
         elif exercise_type == "B":
             # Bermudan: exercise on specific date(s)
@@ -320,26 +335,27 @@ def precompute_optns_arrays(
                 except (KeyError, NotImplementedError, TypeError):
                     spot = 0.0
                 xa = _compute_intrinsic_value(option_type, spot, strike_1, strike_2)
-                schedule.append((XD_IDX, 0.0))
+                schedule.append((XD_IDX, adt_to_dt(attrs.option_exercise_end_date), 0.0))
         else:
             xa = 0.0
 
         # STD: settlement with pre-computed exercise amount
-        schedule.append((STD_IDX, xa))
+        schedule.append((STD_IDX, settlement_dt(attrs.maturity_date, attrs, adjust=True), xa))
 
     # If empty schedule, add a single AD event
     if not schedule:
-        schedule.append((AD_IDX, 0.0))
+        schedule.append((AD_IDX, sd_dt, 0.0))
 
     n_events = len(schedule)
     et_list = [s[0] for s in schedule]
-    rf_list = [s[1] for s in schedule]
+    rf_list = [s[2] for s in schedule]
 
     event_types = jnp.array(et_list, dtype=jnp.int32)
     year_fractions = jnp.zeros(n_events, dtype=F32)
     rf_values = jnp.array(rf_list, dtype=F32)
 
-    return initial_state, event_types, year_fractions, rf_values, optns_params
+    arrays = (initial_state, event_types, year_fractions, rf_values, optns_params)
+    return arrays, [s[1].toordinal() for s in schedule]
 
 
 def prepare_optns_batch(
@@ -353,8 +369,19 @@ def prepare_optns_batch(
     Returns:
         ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
     """
+    return _prepare_optns_batch_dated(contracts)[0]
+
+
+def _prepare_optns_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+) -> tuple[
+    tuple[OPTNSArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, OPTNSArrayParams, jnp.ndarray],
+    jnp.ndarray,
+]:
+    """``prepare_optns_batch`` plus the ``[B, T]`` int32 event ordinals."""
     n = len(contracts)
-    precomputed = [precompute_optns_arrays(a, o) for a, o in contracts]
+    dated = [_precompute_optns_dated(a, o) for a, o in contracts]
+    precomputed = [arrays for arrays, _ in dated]
 
     # Find max events across all contracts
     max_events = max(p[1].shape[0] for p in precomputed)
@@ -387,7 +414,7 @@ def prepare_optns_batch(
         ptd=jnp.asarray(ptd_arr),
     )
 
-    return (
+    batch = (
         initial_states,
         jnp.asarray(et_batch),
         jnp.asarray(yf_batch),
@@ -395,6 +422,7 @@ def prepare_optns_batch(
         optns_params,
         jnp.asarray(mask_batch),
     )
+    return batch, pad_event_ordinals([ords for _, ords in dated], max_events)
 
 
 def simulate_optns_portfolio(
@@ -408,8 +436,10 @@ def simulate_optns_portfolio(
         discount_rate: If provided, compute present values.
 
     Returns:
-        Dict with ``payoffs``, ``masks``, ``final_states``, ``total_cashflows``.
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``, ``final_states``,
+        ``total_cashflows``.
     """
+    batch, event_ordinals = _prepare_optns_batch_dated(contracts)
     (
         batched_states,
         batched_et,
@@ -417,7 +447,7 @@ def simulate_optns_portfolio(
         batched_rf,
         batched_params,
         batched_masks,
-    ) = prepare_optns_batch(contracts)
+    ) = batch
 
     final_states, payoffs = batch_simulate_optns_auto(
         batched_states, batched_et, batched_yf, batched_rf, batched_params
@@ -429,6 +459,7 @@ def simulate_optns_portfolio(
     result: dict[str, Any] = {
         "payoffs": masked_payoffs,
         "masks": batched_masks,
+        "event_ordinals": event_ordinals,
         "final_states": final_states,
         "total_cashflows": total_cashflows,
         "num_contracts": len(contracts),
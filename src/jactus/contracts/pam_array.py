@@ -28,6 +28,7 @@ Example::
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import datetime as _datetime
 from typing import Any, NamedTuple
 
@@ -68,6 +69,18 @@ from jactus.contracts.array_common import (
 # Import shared infrastructure from array_common
 from jactus.contracts.array_common import (
     NOP_EVENT_IDX,
+    CanonicalShapes,
+    PrecisionPolicy,
+    RatePath,
+    RFScenarios,
+    check_scenario_options,
+    pad_event_ordinals,
+    precision_scope,
+    precompute_raw_list,
+    rate_reset_rf_values,
+    resolve_precision,
+    run_batch_kernel,
+    simulate_scenarios,
 )
 from jactus.contracts.array_common import (
     PP_IDX as _PP_IDX,
@@ -147,6 +160,9 @@ from jactus.contracts.array_common import (
 from jactus.contracts.array_common import (
     prequery_risk_factors as _prequery_risk_factors,
 )
+from jactus.contracts.array_common import (
+    state_dtype as _state_dtype,
+)
 from jactus.core import (
     ContractAttributes,
 )
@@ -587,6 +603,8 @@ def batch_simulate_pam(
     year_fractions: jnp.ndarray,
     rf_values: jnp.ndarray,
     params: PAMArrayParams,
+    reset_ordinals: jnp.ndarray | None = None,
+    rate_path: RatePath | None = None,
 ) -> tuple[PAMArrayState, jnp.ndarray]:
     """Batched PAM simulation without vmap — single scan over ``[B]`` arrays.
 
@@ -601,10 +619,17 @@ def batch_simulate_pam(
         year_fractions: ``[B, T]`` float32.
         rf_values: ``[B, T]`` float32.
         params: ``PAMArrayParams`` with each field shape ``[B]``.
+        reset_ordinals: ``[B, T]`` int32 fixing day ordinals (the batch's
+            ``event_ordinals``); required with ``rate_path``.
+        rate_path: Optional on-device rate source (see
+            :data:`~jactus.contracts.array_common.RatePath`).  RR fixings
+            are then looked up from it inside the kernel instead of read
+            from ``rf_values``, and gradients flow back to its values.
 
     Returns:
         ``(final_states, payoffs)`` where ``payoffs`` is ``[B, T]``.
     """
+    rf_values = rate_reset_rf_values(rate_path, event_types, reset_ordinals, rf_values)
     # Transpose to [T, B] so scan iterates over time steps
     et_t = event_types.T
     yf_t = year_fractions.T
@@ -1133,6 +1158,7 @@ def _precompute_raw(
         year_fractions=yf_list,
         rf_values=rf_list,
         params=params_raw,
+        event_ordinals=[evt_dt.toordinal() for _, evt_dt, _ in schedule],
     )
 
 
@@ -1186,6 +1212,7 @@ def _precompute_raw_da(
         year_fractions=yf_list,
         rf_values=rf_list,
         params=params_raw,
+        event_ordinals=[evt_dt.toordinal() for _, evt_dt, _ in schedule],
     )
 
 
@@ -1346,17 +1373,22 @@ def _jax_batch_assemble(
 def _batch_precompute_pam_impl(
     params: _BatchContractParams,
     max_ip: int,
-) -> tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray, jnp.ndarray]:
-    """Inner implementation for batch pre-computation (pure JAX)."""
+    dtype: Any = jnp.float32,
+) -> tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+    """Inner implementation for batch pre-computation (pure JAX).
+
+    Year fractions and masks are built in ``dtype``.  Also returns the
+    event ordinals (0 at padding) for ``event_ordinals``.
+    """
     ip_ords, ip_valid = _jax_batch_ip_schedule(params, max_ip)
     evt_types, evt_ords, evt_valid, _n_events = _jax_batch_assemble(params, ip_ords, ip_valid)
-    yf = _jax_batch_year_fractions(evt_ords, evt_valid, params)
+    yf = _jax_batch_year_fractions(evt_ords, evt_valid, params, dtype)
     rf = jnp.zeros_like(yf)  # no RR/FP/SC in batch-eligible contracts
-    masks = evt_valid.astype(jnp.float32)
-    return evt_types, yf, rf, masks
+    masks = evt_valid.astype(dtype)
+    return evt_types, yf, rf, masks, jnp.where(evt_valid, evt_ords, 0)
 
 
-_batch_precompute_pam_jit = jax.jit(_batch_precompute_pam_impl, static_argnums=(1,))
+_batch_precompute_pam_jit = jax.jit(_batch_precompute_pam_impl, static_argnums=(1, 2))
 
 
 def batch_precompute_pam(
@@ -1376,7 +1408,7 @@ def batch_precompute_pam(
         ``(event_types, year_fractions, rf_values, masks)`` —
         all shape ``(N, max_events)`` where ``max_events = max_ip + 3``.
     """
-    return _batch_precompute_pam_jit(params, max_ip)  # type: ignore[no-any-return]
+    return _batch_precompute_pam_jit(params, max_ip, _state_dtype())[:4]  # type: ignore[no-any-return]
 
 
 def _raw_to_jax(
@@ -1433,6 +1465,7 @@ def _raw_list_to_jax_batch(
     Pads shorter contracts with NOP events and builds NumPy arrays first
     (fast C-level construction) then transfers to JAX via ``jnp.asarray``.
     """
+    float_dtype = _state_dtype()
     max_events = max(len(r.event_types) for r in raw_list)
 
     # State fields: (batch,) each
@@ -1465,18 +1498,18 @@ def _raw_list_to_jax_batch(
 
     # Build NumPy arrays first (fast C-level), then transfer to JAX
     batched_states = PAMArrayState(
-        nt=jnp.asarray(np.array(state_nt, dtype=np.float32)),
-        ipnr=jnp.asarray(np.array(state_ipnr, dtype=np.float32)),
-        ipac=jnp.asarray(np.array(state_ipac, dtype=np.float32)),
-        feac=jnp.asarray(np.array(state_feac, dtype=np.float32)),
-        nsc=jnp.asarray(np.array(state_nsc, dtype=np.float32)),
-        isc=jnp.asarray(np.array(state_isc, dtype=np.float32)),
+        nt=jnp.asarray(np.array(state_nt, dtype=float_dtype)),
+        ipnr=jnp.asarray(np.array(state_ipnr, dtype=float_dtype)),
+        ipac=jnp.asarray(np.array(state_ipac, dtype=float_dtype)),
+        feac=jnp.asarray(np.array(state_feac, dtype=float_dtype)),
+        nsc=jnp.asarray(np.array(state_nsc, dtype=float_dtype)),
+        isc=jnp.asarray(np.array(state_isc, dtype=float_dtype)),
     )
 
     batched_et = jnp.asarray(np.array(et_batch, dtype=np.int32))
-    batched_yf = jnp.asarray(np.array(yf_batch, dtype=np.float32))
-    batched_rf = jnp.asarray(np.array(rf_batch, dtype=np.float32))
-    batched_masks = jnp.asarray(np.array(mask_batch, dtype=np.float32))
+    batched_yf = jnp.asarray(np.array(yf_batch, dtype=float_dtype))
+    batched_rf = jnp.asarray(np.array(rf_batch, dtype=float_dtype))
+    batched_masks = jnp.asarray(np.array(mask_batch, dtype=float_dtype))
 
     _int_fields = {"fee_basis", "penalty_type"}
     batched_params = PAMArrayParams(
@@ -1484,7 +1517,7 @@ def _raw_list_to_jax_batch(
             k: jnp.asarray(
                 np.array(
                     param_fields[k],
-                    dtype=np.int32 if k in _int_fields else np.float32,
+                    dtype=np.int32 if k in _int_fields else float_dtype,
                 )
             )
             for k in PAMArrayParams._fields
@@ -1494,12 +1527,22 @@ def _raw_list_to_jax_batch(
     return batched_states, batched_et, batched_yf, batched_rf, batched_params, batched_masks
 
 
+_PAMBatch = tuple[PAMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, PAMArrayParams, jnp.ndarray]
+
+
 def _prepare_pam_batch_sequential(
     contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
-) -> tuple[PAMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, PAMArrayParams, jnp.ndarray]:
-    """Per-contract sequential pre-computation (original path)."""
-    raw_list = [_precompute_raw(attrs, obs) for attrs, obs in contracts]
-    return _raw_list_to_jax_batch(raw_list)
+    workers: int | None = None,
+) -> tuple[_PAMBatch, jnp.ndarray]:
+    """Per-contract sequential pre-computation (original path).
+
+    Returns:
+        ``(batch, event_ordinals)`` where ``batch`` is the
+        ``prepare_pam_batch`` tuple.
+    """
+    raw_list = precompute_raw_list(_precompute_raw, contracts, workers)
+    batch = _raw_list_to_jax_batch(raw_list)
+    return batch, pad_event_ordinals([r.event_ordinals for r in raw_list], batch[1].shape[1])
 
 
 def _extract_batch_states_and_params(
@@ -1513,21 +1556,22 @@ def _extract_batch_states_and_params(
 
     Returns JAX arrays ready for the simulation kernel.
     """
+    float_dtype = _state_dtype()
 
     n = len(indices)
     _int_fields = {"fee_basis", "penalty_type"}
 
     # Pre-allocate NumPy arrays for states
-    s_nt = np.zeros(n, dtype=np.float32)
-    s_ipnr = np.zeros(n, dtype=np.float32)
-    s_ipac = np.zeros(n, dtype=np.float32)
-    s_feac = np.zeros(n, dtype=np.float32)
-    s_nsc = np.ones(n, dtype=np.float32)
-    s_isc = np.ones(n, dtype=np.float32)
+    s_nt = np.zeros(n, dtype=float_dtype)
+    s_ipnr = np.zeros(n, dtype=float_dtype)
+    s_ipac = np.zeros(n, dtype=float_dtype)
+    s_feac = np.zeros(n, dtype=float_dtype)
+    s_nsc = np.ones(n, dtype=float_dtype)
+    s_isc = np.ones(n, dtype=float_dtype)
 
     # Pre-allocate NumPy arrays for params
     p_arrays: dict[str, np.ndarray] = {
-        k: np.zeros(n, dtype=np.int32 if k in _int_fields else np.float32)
+        k: np.zeros(n, dtype=np.int32 if k in _int_fields else float_dtype)
         for k in PAMArrayParams._fields
     }
 
@@ -1561,7 +1605,7 @@ def _extract_batch_states_and_params(
 def _prepare_pam_batch_all_eligible(
     contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
     batch_idx: list[int],
-) -> tuple[PAMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, PAMArrayParams, jnp.ndarray]:
+) -> tuple[_PAMBatch, jnp.ndarray]:
     """Fast path when ALL contracts are batch-eligible.
 
     Avoids the JAX→NumPy→JAX round-trip used by the mixed batch/fallback
@@ -1570,7 +1614,7 @@ def _prepare_pam_batch_all_eligible(
     bp = _extract_batch_params(contracts, batch_idx)
     max_ip = _compute_max_ip(bp)
 
-    evt_types, yf, rf, masks = batch_precompute_pam(bp, max_ip)
+    evt_types, yf, rf, masks, ordinals = _batch_precompute_pam_jit(bp, max_ip, _state_dtype())
 
     # Trim trailing NOP padding
     actual_max = int(masks.sum(axis=1).max())
@@ -1578,40 +1622,60 @@ def _prepare_pam_batch_all_eligible(
     yf = yf[:, :actual_max]
     rf = rf[:, :actual_max]
     masks = masks[:, :actual_max]
+    ordinals = ordinals[:, :actual_max]
 
     # Extract states + params (NumPy bulk → single JAX transfer)
     states, params = _extract_batch_states_and_params(contracts, batch_idx)
 
-    return states, evt_types, yf, rf, params, masks
+    return (states, evt_types, yf, rf, params, masks), ordinals
 
 
 def prepare_pam_batch(
     contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
-) -> tuple[PAMArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, PAMArrayParams, jnp.ndarray]:
+    workers: int | None = None,
+) -> _PAMBatch:
     """Pre-compute and pad arrays for a batch of PAM contracts.
 
     When ``_USE_BATCH_SCHEDULE`` is enabled, eligible contracts have their
     schedules and year fractions generated via a JAX-native batch path
     (GPU/TPU-ready).  Ineligible contracts fall back to per-contract
-    Python pre-computation.
+    Python pre-computation, optionally spread over ``workers`` processes.
 
     When **all** contracts are batch-eligible, a fast path avoids the
     JAX→NumPy→JAX round-trip, keeping schedule arrays on-device.
 
     Args:
         contracts: List of ``(attributes, rf_observer)`` pairs.
+        workers: If greater than 1, run the per-contract pre-computation
+            in a pool of this many processes (see
+            :func:`~jactus.contracts.array_common.precompute_raw_list`).
 
     Returns:
         ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
         where each array has a leading batch dimension.
     """
+    return _prepare_pam_batch_dated(contracts, workers)[0]
+
+
+def _prepare_pam_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
+) -> tuple[_PAMBatch, jnp.ndarray]:
+    """``prepare_pam_batch`` plus the ``[B, T]`` int32 event ordinals.
+
+    The batch schedule path takes the ordinals straight from the JAX
+    schedule; the fallback path converts each event datetime.
+    """
+    float_dtype = _state_dtype()
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
     if not _USE_BATCH_SCHEDULE or len(contracts) <= 1:
-        return _prepare_pam_batch_sequential(contracts)
+        return _prepare_pam_batch_sequential(contracts, workers)
 
     batch_idx, fallback_idx = _classify_contracts_for_batch(contracts)
 
     if not batch_idx:
-        return _prepare_pam_batch_sequential(contracts)
+        return _prepare_pam_batch_sequential(contracts, workers)
 
     # --- Fast path: all contracts are batch-eligible ---
     if not fallback_idx:
@@ -1621,7 +1685,9 @@ def prepare_pam_batch(
     bp = _extract_batch_params(contracts, batch_idx)
     max_ip = _compute_max_ip(bp)
 
-    evt_types_jax, yf_jax, rf_jax, masks_jax = batch_precompute_pam(bp, max_ip)
+    evt_types_jax, yf_jax, rf_jax, masks_jax, ords_jax = _batch_precompute_pam_jit(
+        bp, max_ip, _state_dtype()
+    )
 
     # Trim batch arrays to actual max valid events (remove trailing NOP padding)
     actual_max_batch = int(masks_jax.sum(axis=1).max())
@@ -1629,10 +1695,13 @@ def prepare_pam_batch(
     yf_jax = yf_jax[:, :actual_max_batch]
     rf_jax = rf_jax[:, :actual_max_batch]
     masks_jax = masks_jax[:, :actual_max_batch]
+    ords_jax = ords_jax[:, :actual_max_batch]
     max_events_batch = actual_max_batch
 
     # --- Fallback path: per-contract Python precompute ---
-    fallback_raws = [_precompute_raw(*contracts[i]) for i in fallback_idx]
+    fallback_raws = precompute_raw_list(
+        _precompute_raw, [contracts[i] for i in fallback_idx], workers
+    )
     max_events_fallback = max((len(r.event_types) for r in fallback_raws), default=0)
 
     # --- Determine final padded width ---
@@ -1642,19 +1711,20 @@ def prepare_pam_batch(
 
     # --- Allocate final NumPy arrays ---
     final_et = np.full((n_total, max_events), NOP_EVENT_IDX, dtype=np.int32)
-    final_yf = np.zeros((n_total, max_events), dtype=np.float32)
-    final_rf = np.zeros((n_total, max_events), dtype=np.float32)
-    final_mask = np.zeros((n_total, max_events), dtype=np.float32)
-
-    final_nt = np.zeros(n_total, dtype=np.float32)
-    final_ipnr = np.zeros(n_total, dtype=np.float32)
-    final_ipac = np.zeros(n_total, dtype=np.float32)
-    final_feac = np.zeros(n_total, dtype=np.float32)
-    final_nsc = np.zeros(n_total, dtype=np.float32)
-    final_isc = np.zeros(n_total, dtype=np.float32)
+    final_yf = np.zeros((n_total, max_events), dtype=float_dtype)
+    final_rf = np.zeros((n_total, max_events), dtype=float_dtype)
+    final_mask = np.zeros((n_total, max_events), dtype=float_dtype)
+    final_ord = np.zeros((n_total, max_events), dtype=np.int32)
+
+    final_nt = np.zeros(n_total, dtype=float_dtype)
+    final_ipnr = np.zeros(n_total, dtype=float_dtype)
+    final_ipac = np.zeros(n_total, dtype=float_dtype)
+    final_feac = np.zeros(n_total, dtype=float_dtype)
+    final_nsc = np.zeros(n_total, dtype=float_dtype)
+    final_isc = np.zeros(n_total, dtype=float_dtype)
 
     param_arrays = {
-        k: np.zeros(n_total, dtype=np.int32 if k in _int_fields else np.float32)
+        k: np.zeros(n_total, dtype=np.int32 if k in _int_fields else float_dtype)
         for k in PAMArrayParams._fields
     }
 
@@ -1664,6 +1734,7 @@ def prepare_pam_batch(
     final_yf[batch_idx_np, :max_events_batch] = np.asarray(yf_jax)
     final_rf[batch_idx_np, :max_events_batch] = np.asarray(rf_jax)
     final_mask[batch_idx_np, :max_events_batch] = np.asarray(masks_jax)
+    final_ord[batch_idx_np, :max_events_batch] = np.asarray(ords_jax)
 
     # States + params for batch contracts
     for _j, idx in enumerate(batch_idx):
@@ -1687,6 +1758,7 @@ def prepare_pam_batch(
         final_yf[idx, :n_ev] = r.year_fractions
         final_rf[idx, :n_ev] = r.rf_values
         final_mask[idx, :n_ev] = 1.0
+        final_ord[idx, :n_ev] = r.event_ordinals
 
         final_nt[idx] = r.state[0]
         final_ipnr[idx] = r.state[1]
@@ -1698,7 +1770,7 @@ def prepare_pam_batch(
             param_arrays[k][idx] = r.params[k]
 
     # --- Single NumPy → JAX transfer ---
-    return (
+    batch = (
         PAMArrayState(
             nt=jnp.asarray(final_nt),
             ipnr=jnp.asarray(final_ipnr),
@@ -1713,12 +1785,21 @@ def prepare_pam_batch(
         PAMArrayParams(**{k: jnp.asarray(param_arrays[k]) for k in PAMArrayParams._fields}),
         jnp.asarray(final_mask),
     )
+    return batch, jnp.asarray(final_ord)
 
 
 def simulate_pam_portfolio(
     contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
     discount_rate: float | None = None,
     year_fractions_from_valuation: jnp.ndarray | None = None,
+    length_buckets: int | None = None,
+    pad_shape: tuple[int, int] | None = None,
+    devices: int | Sequence[Any] | None = None,
+    canonical_shapes: CanonicalShapes | bool | None = None,
+    precision: PrecisionPolicy | str | None = None,
+    rf_scenarios: RFScenarios | None = None,
+    scenario_output: str = "payoffs",
+    scenario_batch_size: int | None = None,
 ) -> dict[str, Any]:
     """End-to-end portfolio simulation with optional PV.
 
@@ -1729,11 +1810,43 @@ def simulate_pam_portfolio(
             from valuation date for PV discounting.  If ``None`` and
             ``discount_rate`` is set, year fractions are computed from each
             contract's ``status_date``.
+        length_buckets: If set, sort contracts by event count and
+            simulate them in at most this many length buckets, each
+            trimmed to its own longest contract, instead of padding the
+            whole batch to the longest one.
+        pad_shape: If set, pad the batch to at least ``(rows, events)``
+            (events rounded up to a power of two) so repeated calls reuse
+            one compiled kernel; used by chunked streaming.
+        devices: If set, shard the batch axis across this many JAX devices
+            (or this list of devices); results come back in input order.
+        canonical_shapes: If set, pad the batch up to canonical sizes
+            (``True`` for powers of two, or a ``CanonicalShapes`` of
+            allowed sizes) so portfolios of similar size reuse one
+            compiled kernel.
+        precision: Precision policy (``"f32"``, ``"f64"``, ``"mixed"`` or a
+            ``PrecisionPolicy``); defaults to the active policy.  Sets the
+            dtype of the prepared batch and of payoff and PV accumulation.
+        rf_scenarios: If set, an ``[S, B, T]`` array of risk-factor values
+            (or a callable ``(event_ordinals, rf_values) -> [S, B, T]``)
+            run against the shared schedules and parameters in one
+            compiled call; see
+            :func:`~jactus.contracts.array_common.simulate_scenarios`.
+        scenario_output: ``"payoffs"``, ``"totals"`` or ``"portfolio"``
+            (sum over contracts on device), with ``rf_scenarios``.
+        scenario_batch_size: Scenarios evaluated at once with
+            ``rf_scenarios``; ``None`` runs them all together.
 
     Returns:
-        Dict with ``payoffs``, ``masks``, ``final_states``, and optionally
-        ``present_values`` and ``total_pv``.
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``,
+        ``final_states``, optionally ``present_values`` and ``total_pv``, and
+        ``length_buckets`` (the :class:`LengthBuckets` plan) or
+        ``padded_shape`` when bucketing or padding.  With ``rf_scenarios``
+        the totals and present values gain a leading ``[S]`` axis (see
+        :func:`~jactus.contracts.array_common.simulate_scenarios`).
     """
+    policy = resolve_precision(precision)
+    with precision_scope(policy):
+        batch, event_ordinals = _prepare_pam_batch_dated(contracts)
     (
         batched_states,
         batched_et,
@@ -1741,24 +1854,58 @@ def simulate_pam_portfolio(
         batched_rf,
         batched_params,
         batched_masks,
-    ) = prepare_pam_batch(contracts)
+    ) = batch
+
+    if rf_scenarios is not None:
+        check_scenario_options(
+            length_buckets=length_buckets,
+            pad_shape=pad_shape,
+            devices=devices,
+            canonical_shapes=canonical_shapes,
+        )
+        result = simulate_scenarios(
+            batch_simulate_pam_auto,
+            batched_states,
+            (batched_et, batched_yf, batched_rf),
+            batched_params,
+            batched_masks,
+            event_ordinals,
+            rf_scenarios,
+            accumulate_dtype=policy.accumulate_dtype,
+            discount_rate=discount_rate,
+            year_fractions_from_valuation=year_fractions_from_valuation,
+            output=scenario_output,
+            scenario_batch_size=scenario_batch_size,
+        )
+        result["num_contracts"] = len(contracts)
+        return result
 
     # Run batched simulation (auto-selects vmap on GPU/TPU, manual on CPU)
-    final_states, payoffs = batch_simulate_pam_auto(
-        batched_states, batched_et, batched_yf, batched_rf, batched_params
+    final_states, payoffs, layout = run_batch_kernel(
+        batch_simulate_pam_auto,
+        batched_states,
+        (batched_et, batched_yf, batched_rf),
+        batched_params,
+        batched_masks,
+        length_buckets=length_buckets,
+        pad_shape=pad_shape,
+        devices=devices,
+        canonical_shapes=canonical_shapes,
     )
 
     # Mask padding
-    masked_payoffs = payoffs * batched_masks
+    masked_payoffs = payoffs.astype(policy.accumulate_dtype) * batched_masks
     total_cashflows = jnp.sum(masked_payoffs, axis=1)
 
     result = {
         "payoffs": masked_payoffs,
         "masks": batched_masks,
+        "event_ordinals": event_ordinals,
         "final_states": final_states,
         "total_cashflows": total_cashflows,
         "num_contracts": len(contracts),
     }
+    result.update(layout)
 
     if discount_rate is not None:
         # Use cumulative year fractions for discounting
@@ -1766,7 +1913,7 @@ def simulate_pam_portfolio(
             disc_yfs = year_fractions_from_valuation
         else:
             # Approximate: use cumulative sum of per-event year fractions
-            disc_yfs = jnp.cumsum(batched_yf, axis=1)
+            disc_yfs = jnp.cumsum(batched_yf.astype(policy.accumulate_dtype), axis=1)
         discount_factors = 1.0 / (1.0 + discount_rate * disc_yfs)
         pvs = jnp.sum(masked_payoffs * discount_factors, axis=1)
         result["present_values"] = pvs
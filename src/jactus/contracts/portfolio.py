@@ -3,8 +3,9 @@
 Accepts a portfolio of contracts with mixed types, groups them by type,
 dispatches to each type's batch kernel, and returns per-contract results.
 
-Contracts without a dedicated array-mode implementation (CLM, UMP, SWAPS,
-CAPFL, CEG, CEC) fall back to the scalar Python simulation path.
+All 18 contract types have array-mode implementations; a type whose
+portfolio function cannot be imported falls back to the scalar Python
+simulation path.
 
 Example::
 
@@ -23,13 +24,26 @@ Example::
 
 from __future__ import annotations
 
-from typing import Any
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import jax.numpy as jnp
 import numpy as np
 
-from jactus.core import ContractAttributes, ContractType
-from jactus.observers import RiskFactorObserver
+from jactus.contracts.array_common import (
+    SCENARIO_OUTPUTS,
+    CanonicalShapes,
+    PrecisionPolicy,
+    RFScenarios,
+    check_scenario_options,
+    resolve_precision,
+)
+from jactus.contracts.discounting import ZeroCurve, discount_cashflows
+from jactus.core import ActusDateTime, ContractAttributes, ContractType
+from jactus.observers import CurveRiskFactorObserver, RiskFactorObserver
+
+if TYPE_CHECKING:
+    from jactus.contracts.ceg_array import CreditEvents
 
 # ---------------------------------------------------------------------------
 # Type -> portfolio function registry
@@ -93,6 +107,30 @@ def _get_portfolio_fn(ct: ContractType) -> Any | None:
             from jactus.contracts.swppv_array import simulate_swppv_portfolio
 
             fn = simulate_swppv_portfolio
+        elif ct == ContractType.CLM:
+            from jactus.contracts.clm_array import simulate_clm_portfolio
+
+            fn = simulate_clm_portfolio
+        elif ct == ContractType.UMP:
+            from jactus.contracts.ump_array import simulate_ump_portfolio
+
+            fn = simulate_ump_portfolio
+        elif ct == ContractType.CAPFL:
+            from jactus.contracts.capfl_array import simulate_capfl_portfolio
+
+            fn = simulate_capfl_portfolio
+        elif ct == ContractType.SWAPS:
+            from jactus.contracts.swaps_array import simulate_swaps_portfolio
+
+            fn = simulate_swaps_portfolio
+        elif ct == ContractType.CEG:
+            from jactus.contracts.ceg_array import simulate_ceg_portfolio
+
+            fn = simulate_ceg_portfolio
+        elif ct == ContractType.CEC:
+            from jactus.contracts.cec_array import simulate_cec_portfolio
+
+            fn = simulate_cec_portfolio
     except ImportError:
         fn = None
 
@@ -101,16 +139,7 @@ def _get_portfolio_fn(ct: ContractType) -> Any | None:
 
 
 # Contract types that use the scalar Python fallback path
-_FALLBACK_TYPES = frozenset(
-    {
-        ContractType.CLM,
-        ContractType.UMP,
-        ContractType.SWAPS,
-        ContractType.CAPFL,
-        ContractType.CEG,
-        ContractType.CEC,
-    }
-)
+_FALLBACK_TYPES: frozenset[ContractType] = frozenset()
 
 # All types with dedicated array-mode batch kernels
 BATCH_SUPPORTED_TYPES = frozenset(
@@ -127,6 +156,38 @@ BATCH_SUPPORTED_TYPES = frozenset(
         ContractType.FUTUR,
         ContractType.OPTNS,
         ContractType.SWPPV,
+        ContractType.CLM,
+        ContractType.UMP,
+        ContractType.CAPFL,
+        ContractType.SWAPS,
+        ContractType.CEG,
+        ContractType.CEC,
+    }
+)
+
+# Composite types: keyword under which their portfolio function accepts the
+# child contracts (underlier / legs / covered) referenced by ``contract_structure``
+_CHILD_CONTRACTS_KWARG: dict[ContractType, str] = {
+    ContractType.CAPFL: "underliers",
+    ContractType.SWAPS: "legs",
+    ContractType.CEG: "child_contracts",
+    ContractType.CEC: "child_contracts",
+}
+
+# Credit enhancement types: accept observed ``credit_events`` on their children
+_CREDIT_EVENT_TYPES = frozenset({ContractType.CEG, ContractType.CEC})
+
+# Scan-kernel types whose portfolio function accepts ``length_buckets``
+_LENGTH_BUCKET_TYPES = frozenset(
+    {
+        ContractType.PAM,
+        ContractType.LAM,
+        ContractType.NAM,
+        ContractType.ANN,
+        ContractType.LAX,
+        ContractType.CLM,
+        ContractType.UMP,
+        ContractType.SWPPV,
     }
 )
 
@@ -146,9 +207,334 @@ def _simulate_scalar_fallback(
     return sum(float(e.payoff) for e in result.events)
 
 
+class PortfolioChunk(NamedTuple):
+    """One single-type chunk of a streamed portfolio simulation.
+
+    Attributes:
+        contract_type: Contract type of every row in the chunk.
+        indices: ``(n,)`` input positions of the chunk's rows.
+        result: The type's portfolio result for the chunk (``payoffs``,
+            ``masks``, ``event_ordinals``, ``total_cashflows``, ...), or
+            only ``total_cashflows`` for scalar-fallback chunks.
+        fallback: Whether the chunk ran on the scalar Python path.
+    """
+
+    contract_type: ContractType
+    indices: np.ndarray
+    result: dict[str, Any]
+    fallback: bool
+
+
+def _simulate_type_group(
+    ct: ContractType,
+    group_contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    discount_rate: float | None,
+    child_contracts: Mapping[str, ContractAttributes] | None,
+    credit_events: CreditEvents | None,
+    length_buckets: int | None = None,
+    pad_shape: tuple[int, int] | None = None,
+    devices: int | Sequence[Any] | None = None,
+    canonical_shapes: CanonicalShapes | bool | None = None,
+    precision: PrecisionPolicy | str | None = None,
+    rf_scenarios: RFScenarios | None = None,
+    scenario_output: str = "payoffs",
+    scenario_batch_size: int | None = None,
+) -> dict[str, Any] | None:
+    """Run one type's portfolio function; ``None`` if it has no batch kernel."""
+    portfolio_fn = _get_portfolio_fn(ct)
+    if portfolio_fn is None:
+        return None
+
+    kwargs: dict[str, Any] = {}
+    if discount_rate is not None:
+        kwargs["discount_rate"] = discount_rate
+    if child_contracts is not None and ct in _CHILD_CONTRACTS_KWARG:
+        kwargs[_CHILD_CONTRACTS_KWARG[ct]] = child_contracts
+    if credit_events is not None and ct in _CREDIT_EVENT_TYPES:
+        kwargs["credit_events"] = credit_events
+    if ct in _LENGTH_BUCKET_TYPES:
+        if length_buckets is not None:
+            kwargs["length_buckets"] = length_buckets
+        if pad_shape is not None:
+            kwargs["pad_shape"] = pad_shape
+        if devices is not None:
+            kwargs["devices"] = devices
+        if canonical_shapes is not None:
+            kwargs["canonical_shapes"] = canonical_shapes
+        if precision is not None:
+            kwargs["precision"] = precision
+        if rf_scenarios is not None:
+            kwargs["rf_scenarios"] = rf_scenarios
+            kwargs["scenario_output"] = scenario_output
+            kwargs["scenario_batch_size"] = scenario_batch_size
+    return portfolio_fn(group_contracts, **kwargs)  # type: ignore[no-any-return]
+
+
+def iter_portfolio_chunks(
+    contracts: Iterable[tuple[ContractAttributes, RiskFactorObserver]],
+    chunk_size: int,
+    discount_rate: float | None = None,
+    child_contracts: Mapping[str, ContractAttributes] | None = None,
+    credit_events: CreditEvents | None = None,
+    discount_curve: ZeroCurve | CurveRiskFactorObserver | None = None,
+    valuation_date: ActusDateTime | None = None,
+    compounding: str = "continuous",
+    devices: int | Sequence[Any] | None = None,
+    canonical_shapes: CanonicalShapes | bool | None = None,
+    precision: PrecisionPolicy | str | None = None,
+) -> Iterator[PortfolioChunk]:
+    """Simulate a portfolio chunk by chunk, pulling contracts lazily.
+
+    Contracts are buffered per type; whenever a type's buffer reaches
+    ``chunk_size`` it is precomputed, simulated and yielded, so at most
+    ``chunk_size`` contracts per type are held at once.  Scan-kernel
+    types run every chunk padded to ``chunk_size`` rows and a
+    power-of-two event count that only grows, so the kernel compiles
+    once per event-count ceiling rather than once per chunk.
+
+    Args:
+        contracts: Iterable of ``(attributes, rf_observer)`` pairs.
+        chunk_size: Contracts per chunk.
+        discount_rate: Flat-rate PV, as in :func:`simulate_portfolio`.
+        child_contracts: Children of composite contracts.
+        credit_events: Observed credit events for CEG/CEC.
+        discount_curve: Zero curve for per-chunk present values.
+        valuation_date: Valuation date for ``discount_curve``.
+        compounding: Compounding convention for ``discount_curve``.
+        devices: Shard scan kernels across devices, as in
+            :func:`simulate_portfolio`.
+        canonical_shapes: Pad chunk event counts up to canonical sizes,
+            as in :func:`simulate_portfolio`.
+        precision: Precision policy, as in :func:`simulate_portfolio`.
+
+    Yields:
+        :class:`PortfolioChunk` per flushed buffer, full chunks first in
+        the order they fill, then the remainders by type.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    if discount_curve is not None and discount_rate is not None:
+        raise ValueError("Pass either discount_rate or discount_curve, not both")
+
+    policy = resolve_precision(precision)
+    buffers: dict[ContractType, list[tuple[int, ContractAttributes, RiskFactorObserver]]] = {}
+    pad_events: dict[ContractType, int] = {}
+
+    def _flush(
+        ct: ContractType, group: list[tuple[int, ContractAttributes, RiskFactorObserver]]
+    ) -> PortfolioChunk:
+        indices = np.array([g[0] for g in group], dtype=np.int64)
+        group_contracts = [(g[1], g[2]) for g in group]
+        result = _simulate_type_group(
+            ct,
+            group_contracts,
+            discount_rate,
+            child_contracts,
+            credit_events,
+            pad_shape=(chunk_size, pad_events.get(ct, 1)),
+            devices=devices,
+            canonical_shapes=canonical_shapes,
+            precision=policy,
+        )
+        if result is None:
+            totals = [_simulate_scalar_fallback(a, o) for a, o in group_contracts]
+            fallback = {
+                "total_cashflows": jnp.asarray(totals, dtype=policy.accumulate_dtype),
+                "num_contracts": len(group),
+            }
+            return PortfolioChunk(ct, indices, fallback, True)
+        if "padded_shape" in result:
+            pad_events[ct] = result["padded_shape"][1]
+        if discount_curve is not None:
+            result = discount_cashflows(
+                result,
+                discount_curve,
+                valuation_date=valuation_date,
+                contracts=group_contracts,
+                compounding=compounding,
+            )
+        return PortfolioChunk(ct, indices, result, False)
+
+    for i, (attrs, rf_obs) in enumerate(contracts):
+        ct = attrs.contract_type
+        group = buffers.setdefault(ct, [])
+        group.append((i, attrs, rf_obs))
+        if len(group) == chunk_size:
+            yield _flush(ct, group)
+            buffers[ct] = []
+
+    for ct, group in buffers.items():
+        if group:
+            yield _flush(ct, group)
+
+
+def _simulate_portfolio_streaming(
+    contracts: Iterable[tuple[ContractAttributes, RiskFactorObserver]],
+    chunk_size: int,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """Reduce :func:`iter_portfolio_chunks` to per-contract totals and PVs."""
+    totals: list[tuple[np.ndarray, np.ndarray]] = []
+    pvs: list[tuple[np.ndarray, np.ndarray]] = []
+    types_used: set[ContractType] = set()
+    batch_count = 0
+    fallback_count = 0
+    num_chunks = 0
+
+    accumulate_dtype = resolve_precision(kwargs.get("precision")).accumulate_dtype
+    for chunk in iter_portfolio_chunks(contracts, chunk_size, **kwargs):
+        num_chunks += 1
+        types_used.add(chunk.contract_type)
+        totals.append((chunk.indices, np.asarray(chunk.result["total_cashflows"])))
+        if "present_values" in chunk.result:
+            pvs.append((chunk.indices, np.asarray(chunk.result["present_values"])))
+        if chunk.fallback:
+            fallback_count += len(chunk.indices)
+        else:
+            batch_count += len(chunk.indices)
+
+    n = batch_count + fallback_count
+    total_cashflows = np.zeros(n, dtype=accumulate_dtype)
+    for indices, values in totals:
+        total_cashflows[indices] = values
+
+    output: dict[str, Any] = {
+        "total_cashflows": jnp.asarray(total_cashflows),
+        "num_contracts": n,
+        "batch_contracts": batch_count,
+        "fallback_contracts": fallback_count,
+        "types_used": types_used,
+        "per_type_results": {},
+        "per_type_indices": {},
+        "num_chunks": num_chunks,
+    }
+    if pvs:
+        present_values = np.full(n, np.nan, dtype=accumulate_dtype)
+        for indices, values in pvs:
+            present_values[indices] = values
+        output["present_values"] = jnp.asarray(present_values)
+        output["total_pv"] = jnp.asarray(np.nansum(present_values))
+    return output
+
+
+def _simulate_portfolio_scenarios(
+    contracts: Iterable[tuple[ContractAttributes, RiskFactorObserver]],
+    rf_scenarios: RFScenarios | Mapping[ContractType, RFScenarios],
+    scenario_output: str,
+    scenario_batch_size: int | None,
+    discount_rate: float | None,
+    child_contracts: Mapping[str, ContractAttributes] | None,
+    credit_events: CreditEvents | None,
+    precision: PrecisionPolicy | str | None,
+) -> dict[str, Any]:
+    """Run every scan-kernel type over the scenario axis, the rest once."""
+    if scenario_output not in SCENARIO_OUTPUTS:
+        raise ValueError(
+            f"scenario_output must be one of {SCENARIO_OUTPUTS}, got '{scenario_output}'"
+        )
+    policy = resolve_precision(precision)
+    contracts = list(contracts)
+    n = len(contracts)
+    type_groups: dict[ContractType, list[int]] = {}
+    for i, (attrs, _) in enumerate(contracts):
+        type_groups.setdefault(attrs.contract_type, []).append(i)
+
+    # Scenario-dependent rows first, to learn S
+    per_type_results: dict[ContractType, dict[str, Any]] = {}
+    per_type_indices: dict[ContractType, list[int]] = {}
+    for ct, indices in type_groups.items():
+        type_rf = rf_scenarios.get(ct) if isinstance(rf_scenarios, Mapping) else rf_scenarios
+        if ct not in _LENGTH_BUCKET_TYPES or type_rf is None:
+            continue
+        per_type_results[ct] = _simulate_type_group(  # type: ignore[assignment]
+            ct,
+            [contracts[i] for i in indices],
+            discount_rate,
+            child_contracts,
+            credit_events,
+            precision=policy,
+            rf_scenarios=type_rf,
+            scenario_output=scenario_output,
+            scenario_batch_size=scenario_batch_size,
+        )
+        per_type_indices[ct] = indices
+    counts = {r["num_scenarios"] for r in per_type_results.values()}
+    if len(counts) != 1:
+        raise ValueError(
+            "rf_scenarios must cover at least one scan-kernel contract type with the "
+            f"same number of scenarios; got {sorted(counts) or 'none'}"
+        )
+    num_scenarios = counts.pop()
+
+    total_cashflows = np.zeros((num_scenarios, n), dtype=policy.accumulate_dtype)
+    present_values = np.full((num_scenarios, n), np.nan, dtype=policy.accumulate_dtype)
+    for ct, result in per_type_results.items():
+        # "portfolio" results are already summed over contracts: park each
+        # type's sum on its first row so the row sums below still add up
+        rows = per_type_indices[ct][:1] if scenario_output == "portfolio" else per_type_indices[ct]
+        total_cashflows[:, rows] = np.asarray(result["total_cashflows"]).reshape(num_scenarios, -1)
+        if "present_values" in result:
+            pvs = np.asarray(result["present_values"])
+            present_values[:, rows] = pvs.reshape(num_scenarios, -1)
+
+    # Rows that do not depend on the scenarios are simulated once
+    batch_count = sum(len(i) for i in per_type_indices.values())
+    fallback_count = 0
+    for ct, indices in type_groups.items():
+        if ct in per_type_results:
+            continue
+        group = [contracts[i] for i in indices]
+        group_result = _simulate_type_group(
+            ct, group, discount_rate, child_contracts, credit_events, precision=policy
+        )
+        if group_result is None:
+            totals = np.array([_simulate_scalar_fallback(a, o) for a, o in group])
+            fallback_count += len(group)
+        else:
+            per_type_results[ct] = group_result
+            per_type_indices[ct] = indices
+            totals = np.asarray(group_result["total_cashflows"])
+            if "present_values" in group_result:
+                present_values[:, indices] = np.asarray(group_result["present_values"])
+            batch_count += len(group)
+        total_cashflows[:, indices] = totals
+
+    output: dict[str, Any] = {
+        "num_contracts": n,
+        "num_scenarios": num_scenarios,
+        "batch_contracts": batch_count,
+        "fallback_contracts": fallback_count,
+        "types_used": set(type_groups),
+        "per_type_results": per_type_results,
+        "per_type_indices": per_type_indices,
+    }
+    if scenario_output == "portfolio":
+        output["total_cashflows"] = jnp.asarray(total_cashflows.sum(axis=1))
+    else:
+        output["total_cashflows"] = jnp.asarray(total_cashflows)
+        if discount_rate is not None:
+            output["present_values"] = jnp.asarray(present_values)
+    if discount_rate is not None:
+        output["total_pv"] = jnp.asarray(np.nansum(present_values, axis=1))
+    return output
+
+
 def simulate_portfolio(
-    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    contracts: Iterable[tuple[ContractAttributes, RiskFactorObserver]],
     discount_rate: float | None = None,
+    child_contracts: Mapping[str, ContractAttributes] | None = None,
+    credit_events: CreditEvents | None = None,
+    discount_curve: ZeroCurve | CurveRiskFactorObserver | None = None,
+    valuation_date: ActusDateTime | None = None,
+    compounding: str = "continuous",
+    length_buckets: int | None = None,
+    chunk_size: int | None = None,
+    devices: int | Sequence[Any] | None = None,
+    canonical_shapes: CanonicalShapes | bool | None = None,
+    precision: PrecisionPolicy | str | None = None,
+    rf_scenarios: RFScenarios | Mapping[ContractType, RFScenarios] | None = None,
+    scenario_output: str = "payoffs",
+    scenario_batch_size: int | None = None,
 ) -> dict[str, Any]:
     """Simulate a mixed-type portfolio using optimal batch strategies.
 
@@ -157,9 +543,68 @@ def simulate_portfolio(
 
     Args:
         contracts: List of ``(attributes, rf_observer)`` pairs.
-            Contract types may be mixed.
+            Contract types may be mixed.  With ``chunk_size`` any iterable
+            (e.g. a generator reading from disk) is accepted.
         discount_rate: If provided, compute present values (passed to
             each type's portfolio function where supported).
+        child_contracts: Optional mapping of contract IDs to attributes for
+            the children referenced by composite contracts (SWAPS legs,
+            CAPFL underliers, CEG/CEC covered and covering contracts).
+        credit_events: Optional mapping of child contract IDs to observed
+            ``(time, performance)`` credit events, forwarded to CEG/CEC.
+        discount_curve: If provided, discount every batch-simulated event
+            off this zero curve (see
+            :func:`~jactus.contracts.discounting.discount_cashflows`).
+            Mutually exclusive with ``discount_rate``.
+        valuation_date: Valuation date for ``discount_curve``; defaults to
+            the observer's ``reference_date``, else each contract's
+            ``status_date``.
+        compounding: Compounding convention for ``discount_curve``.
+        length_buckets: If set, scan-kernel types (PAM, LAM, NAM, ANN,
+            LAX, CLM, UMP, SWPPV) simulate their contracts in at most this
+            many event-count buckets to cut NOP padding; each of their
+            per-type results then carries the ``length_buckets`` plan.
+        chunk_size: If set, stream the portfolio through
+            :func:`iter_portfolio_chunks` and keep only per-contract
+            totals and present values, so peak memory is bounded by the
+            chunk size.  ``per_type_results`` is then empty; iterate the
+            chunks directly to reduce payoffs (e.g. with
+            :func:`~jactus.engine.aggregation.aggregate_cashflows` on a
+            fixed grid).
+        devices: If set, split the batch axis of the scan-kernel types
+            across this many JAX devices (or this list of devices).  On
+            CPU, expose host cores as devices with
+            ``XLA_FLAGS=--xla_force_host_platform_device_count=N`` before
+            JAX is imported.  Results are gathered in input order.
+        canonical_shapes: If set, pad each scan-kernel type's ``[B, T]``
+            batch up to canonical sizes — ``True`` for powers of two, or a
+            :class:`~jactus.contracts.array_common.CanonicalShapes` of
+            allowed sizes — so runs over slightly different portfolios
+            reuse compiled kernels.  Pair with
+            :func:`~jactus.contracts.array_common.configure_compilation_cache`
+            to reuse them across processes.
+        precision: Floating-point policy for the scan-kernel types —
+            ``"f32"``, ``"f64"``, ``"mixed"`` (float32 state, float64
+            payoff and PV accumulation) or a
+            :class:`~jactus.contracts.array_common.PrecisionPolicy`.
+            Defaults to the policy set with
+            :func:`~jactus.contracts.array_common.set_precision`.  ``"f64"``
+            and ``"mixed"`` need ``jax_enable_x64``.  Per-contract totals
+            are returned in the policy's accumulation dtype.
+        rf_scenarios: Risk-factor scenarios for the scan-kernel types,
+            run against shared schedules and parameters in one compiled
+            call per type: a callable ``(event_ordinals, rf_values) ->
+            [S, B, T]`` applied to each type's batch, or a mapping from
+            contract type to an ``[S, B, T]`` array or callable.  Other
+            types are simulated once and repeated across scenarios.
+            Supports ``discount_rate`` but not ``discount_curve``,
+            ``length_buckets``, ``chunk_size``, ``devices`` or
+            ``canonical_shapes``.
+        scenario_output: With ``rf_scenarios``, ``"payoffs"`` keeps the
+            ``[S, B, T]`` payoffs in ``per_type_results``, ``"totals"``
+            drops them, and ``"portfolio"`` sums over contracts on device.
+        scenario_batch_size: With ``rf_scenarios``, scenarios evaluated at
+            once (``None`` for all), to bound device memory.
 
     Returns:
         Dict with:
@@ -173,8 +618,67 @@ def simulate_portfolio(
             - ``types_used``: Set of ``ContractType`` values present.
             - ``per_type_results``: Dict mapping ``ContractType`` to the
               raw result dict from each type's portfolio function
-              (only for batch-simulated types).
+              (only for batch-simulated types).  Each carries
+              ``payoffs``, ``masks`` and ``event_ordinals`` — the
+              ``[B, T]`` int32 ``date.toordinal()`` of every event,
+              0 wherever ``masks`` is 0.
+            - ``per_type_indices``: Dict mapping ``ContractType`` to the
+              input indices of the rows of its ``per_type_results`` entry.
+            - ``present_values`` and ``total_pv`` when ``discount_curve``
+              is given: ``(N,)`` in input order (NaN for contracts on the
+              scalar fallback path) and their sum over the batch rows.
+              With ``chunk_size`` these are also reported for
+              ``discount_rate``.
+            - ``num_chunks``: Number of chunks, with ``chunk_size`` only.
+            - With ``rf_scenarios``: ``num_scenarios``, and
+              ``total_cashflows`` (plus ``present_values`` with
+              ``discount_rate``) of shape ``(S, N)``, or ``(S,)`` portfolio
+              sums for ``scenario_output="portfolio"``; ``total_pv`` is
+              ``(S,)``.
     """
+    if discount_curve is not None and discount_rate is not None:
+        raise ValueError("Pass either discount_rate or discount_curve, not both")
+
+    if rf_scenarios is not None:
+        check_scenario_options(
+            discount_curve=discount_curve,
+            length_buckets=length_buckets,
+            chunk_size=chunk_size,
+            devices=devices,
+            canonical_shapes=canonical_shapes,
+        )
+        return _simulate_portfolio_scenarios(
+            contracts,
+            rf_scenarios,
+            scenario_output,
+            scenario_batch_size,
+            discount_rate,
+            child_contracts,
+            credit_events,
+            precision,
+        )
+
+    if chunk_size is not None:
+        if length_buckets is not None:
+            raise ValueError("length_buckets cannot be combined with chunk_size")
+        return _simulate_portfolio_streaming(
+            contracts,
+            chunk_size,
+            discount_rate=discount_rate,
+            child_contracts=child_contracts,
+            credit_events=credit_events,
+            discount_curve=discount_curve,
+            valuation_date=valuation_date,
+            compounding=compounding,
+            devices=devices,
+            canonical_shapes=canonical_shapes,
+            precision=precision,
+        )
+    if length_buckets is not None and canonical_shapes not in (None, False):
+        raise ValueError("length_buckets cannot be combined with canonical_shapes")
+
+    policy = resolve_precision(precision)
+    contracts = list(contracts)
     n = len(contracts)
     if n == 0:
         return {
@@ -184,6 +688,7 @@ def simulate_portfolio(
             "fallback_contracts": 0,
             "types_used": set(),
             "per_type_results": {},
+            "per_type_indices": {},
         }
 
     # Group contracts by type, preserving original indices
@@ -195,8 +700,9 @@ def simulate_portfolio(
         type_groups[ct].append((i, attrs, rf_obs))
 
     # Output array
-    total_cashflows = np.zeros(n, dtype=np.float32)
+    total_cashflows = np.zeros(n, dtype=policy.accumulate_dtype)
     per_type_results: dict[ContractType, dict[str, Any]] = {}
+    per_type_indices: dict[ContractType, list[int]] = {}
     batch_count = 0
     fallback_count = 0
 
@@ -204,16 +710,22 @@ def simulate_portfolio(
         indices = [g[0] for g in group]
         group_contracts = [(g[1], g[2]) for g in group]
 
-        portfolio_fn = _get_portfolio_fn(ct)
-
-        if portfolio_fn is not None:
+        result = _simulate_type_group(
+            ct,
+            group_contracts,
+            discount_rate,
+            child_contracts,
+            credit_events,
+            length_buckets=length_buckets,
+            devices=devices,
+            canonical_shapes=canonical_shapes,
+            precision=policy,
+        )
+
+        if result is not None:
             # Batch simulation path
-            kwargs: dict[str, Any] = {}
-            if discount_rate is not None:
-                kwargs["discount_rate"] = discount_rate
-
-            result = portfolio_fn(group_contracts, **kwargs)
             per_type_results[ct] = result
+            per_type_indices[ct] = indices
 
             group_totals = result["total_cashflows"]
             for j, idx in enumerate(indices):
@@ -227,11 +739,30 @@ def simulate_portfolio(
 
             fallback_count += len(group)
 
-    return {
+    output: dict[str, Any] = {
         "total_cashflows": jnp.asarray(total_cashflows),
         "num_contracts": n,
         "batch_contracts": batch_count,
         "fallback_contracts": fallback_count,
         "types_used": set(type_groups.keys()),
         "per_type_results": per_type_results,
+        "per_type_indices": per_type_indices,
     }
+
+    if discount_curve is not None:
+        present_values = jnp.full(n, jnp.nan, dtype=policy.accumulate_dtype)
+        for ct, result in per_type_results.items():
+            indices = per_type_indices[ct]
+            result = discount_cashflows(
+                result,
+                discount_curve,
+                valuation_date=valuation_date,
+                contracts=[contracts[i] for i in indices],
+                compounding=compounding,
+            )
+            per_type_results[ct] = result
+            present_values = present_values.at[jnp.asarray(indices)].set(result["present_values"])
+        output["present_values"] = present_values
+        output["total_pv"] = jnp.nansum(present_values)
+
+    return output
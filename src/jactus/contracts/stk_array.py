@@ -18,6 +18,7 @@ Example::
 
 from __future__ import annotations
 
+from datetime import datetime as _datetime
 from typing import Any, NamedTuple
 
 import jax
@@ -35,6 +36,7 @@ from jactus.contracts.array_common import (
     dt_to_adt,
     fast_schedule,
     get_role_sign,
+    pad_event_ordinals,
 )
 from jactus.core import ContractAttributes
 from jactus.observers import RiskFactorObserver
@@ -178,6 +180,14 @@ def precompute_stk_arrays(
     Returns:
         ``(initial_state, event_types, year_fractions, rf_values, params)``
     """
+    return _precompute_stk_dated(attrs, rf_observer)[0]
+
+
+def _precompute_stk_dated(
+    attrs: ContractAttributes,
+    rf_observer: RiskFactorObserver,
+) -> tuple[tuple[STKArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, STKArrayParams], list[int]]:
+    """``precompute_stk_arrays`` plus the ordinal of each event date."""
     role_sign = get_role_sign(attrs.contract_role)
 
     initial_state = STKArrayState(nt=jnp.array(0.0, dtype=F32))
@@ -188,7 +198,7 @@ def precompute_stk_arrays(
     )
 
     # Build schedule: PRD, DV cycle events, TD
-    schedule: list[tuple[int, float]] = []  # (event_idx, rf_value)
+    schedule: list[tuple[int, _datetime, float]] = []  # (event_idx, event_dt, rf_value)
 
     sd_dt = adt_to_dt(attrs.status_date)
 
@@ -196,7 +206,7 @@ def precompute_stk_arrays(
     if attrs.purchase_date:
         prd_dt = adt_to_dt(attrs.purchase_date)
         if prd_dt > sd_dt:
-            schedule.append((PRD_IDX, 0.0))
+            schedule.append((PRD_IDX, prd_dt, 0.0))
 
     # DV: dividend cycle events
     if attrs.dividend_cycle:
@@ -216,27 +226,28 @@ def precompute_stk_arrays(
                             )
                         except (KeyError, NotImplementedError, TypeError):
                             dv_amount = 0.0
-                    schedule.append((DV_IDX, dv_amount))
+                    schedule.append((DV_IDX, dv_dt, dv_amount))
 
     # TD
     if attrs.termination_date:
         td_dt = adt_to_dt(attrs.termination_date)
         if td_dt > sd_dt:
-            schedule.append((TD_IDX, 0.0))
+            schedule.append((TD_IDX, td_dt, 0.0))
 
     # If empty schedule, add a single AD event
     if not schedule:
-        schedule.append((AD_IDX, 0.0))
+        schedule.append((AD_IDX, sd_dt, 0.0))
 
     n_events = len(schedule)
     et_list = [s[0] for s in schedule]
-    rf_list = [s[1] for s in schedule]
+    rf_list = [s[2] for s in schedule]
 
     event_types = jnp.array(et_list, dtype=jnp.int32)
     year_fractions = jnp.zeros(n_events, dtype=F32)
     rf_values = jnp.array(rf_list, dtype=F32)
 
-    return initial_state, event_types, year_fractions, rf_values, stk_params
+    arrays = (initial_state, event_types, year_fractions, rf_values, stk_params)
+    return arrays, [s[1].toordinal() for s in schedule]
 
 
 def prepare_stk_batch(
@@ -250,8 +261,19 @@ def prepare_stk_batch(
     Returns:
         ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
     """
+    return _prepare_stk_batch_dated(contracts)[0]
+
+
+def _prepare_stk_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+) -> tuple[
+    tuple[STKArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, STKArrayParams, jnp.ndarray],
+    jnp.ndarray,
+]:
+    """``prepare_stk_batch`` plus the ``[B, T]`` int32 event ordinals."""
     n = len(contracts)
-    precomputed = [precompute_stk_arrays(a, o) for a, o in contracts]
+    dated = [_precompute_stk_dated(a, o) for a, o in contracts]
+    precomputed = [arrays for arrays, _ in dated]
 
     # Find max events across all contracts
     max_events = max(p[1].shape[0] for p in precomputed)
@@ -284,7 +306,7 @@ def prepare_stk_batch(
         ptd=jnp.asarray(ptd_arr),
     )
 
-    return (
+    batch = (
         initial_states,
         jnp.asarray(et_batch),
         jnp.asarray(yf_batch),
@@ -292,6 +314,7 @@ def prepare_stk_batch(
         stk_params,
         jnp.asarray(mask_batch),
     )
+    return batch, pad_event_ordinals([ords for _, ords in dated], max_events)
 
 
 def simulate_stk_portfolio(
@@ -305,8 +328,10 @@ def simulate_stk_portfolio(
         discount_rate: If provided, compute present values.
 
     Returns:
-        Dict with ``payoffs``, ``masks``, ``final_states``, ``total_cashflows``.
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``, ``final_states``,
+        ``total_cashflows``.
     """
+    batch, event_ordinals = _prepare_stk_batch_dated(contracts)
     (
         batched_states,
         batched_et,
@@ -314,7 +339,7 @@ def simulate_stk_portfolio(
         batched_rf,
         batched_params,
         batched_masks,
-    ) = prepare_stk_batch(contracts)
+    ) = batch
 
     final_states, payoffs = batch_simulate_stk_auto(
         batched_states, batched_et, batched_yf, batched_rf, batched_params
@@ -326,6 +351,7 @@ def simulate_stk_portfolio(
     result: dict[str, Any] = {
         "payoffs": masked_payoffs,
         "masks": batched_masks,
+        "event_ordinals": event_ordinals,
         "final_states": final_states,
         "total_cashflows": total_cashflows,
         "num_contracts": len(contracts),
@@ -0,0 +1,337 @@
+"""Array-mode SWAPS simulation — leg kernels composed and netted on-device.
+
+A generic swap (SWAPS) is the sum of two explicit child legs.  The scalar
+``GenericSwapContract`` simulates each leg, then merges congruent events in
+Python with ``merge_congruent_events``.  This module keeps the legs in
+array mode end to end:
+
+1. **Leg kernels**: every first and second leg in the book is grouped by
+   contract type (PAM, LAM, NAM, ANN) and run through that type's
+   ``prepare_*_batch`` / ``batch_simulate_*`` pair — one scan per leg type
+   regardless of how many swaps reference it.
+2. **Alignment** (Python, once per book): each leg event is assigned a
+   slot on the swap's merged timeline.  Under cash settlement (DS='S')
+   congruent IED/IP/PR/MD events of both legs share a slot; under
+   delivery settlement (DS='D') every leg event keeps its own slot.
+   Purchase/termination filtering and the PRD/TD price payoffs are folded
+   into the slot masks and a static ``extra_payoffs`` array.
+3. **Netting** (JAX): ``net_leg_payoffs`` scatter-adds the masked leg
+   payoffs into the ``[B, U]`` slot grid — the array equivalent of
+   ``f(z) = f(x) + f(y)`` for congruent events.
+
+Example::
+
+    from jactus.contracts.swaps_array import simulate_swaps_portfolio
+
+    legs = {"LEG1": fixed_leg_attrs, "LEG2": float_leg_attrs}
+    result = simulate_swaps_portfolio([(swap_attrs, rf_obs)], legs=legs)
+    result["total_cashflows"]  # net swap cash flow per contract
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from datetime import datetime as _datetime
+from typing import Any, NamedTuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jactus.contracts.array_common import adt_to_dt, get_evt_priority
+from jactus.contracts.composite_array import (
+    ChildBatch,
+    check_child_type,
+    prepare_child_batches,
+    simulate_child_batches,
+)
+from jactus.core import ContractAttributes, ContractType, EventType
+from jactus.observers import RiskFactorObserver
+
+# Events netted under cash settlement (mirrors GenericSwapContract)
+_CONGRUENT_EVENT_IDX = frozenset(
+    {EventType.IED.index, EventType.IP.index, EventType.PR.index, EventType.MD.index}
+)
+
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+
+class SWAPSAlignment(NamedTuple):
+    """Mapping of leg events onto each swap's merged event timeline.
+
+    Leg-side arrays are ``[B, T_leg]``; timeline arrays are ``[B, U]``.
+    """
+
+    first_slots: jnp.ndarray  # int32 slot per first-leg event
+    first_masks: jnp.ndarray  # 1.0 if the first-leg event is kept
+    second_slots: jnp.ndarray
+    second_masks: jnp.ndarray
+    extra_payoffs: jnp.ndarray  # PRD/TD price payoffs on the timeline
+    event_types: jnp.ndarray  # int32 event type per slot
+    event_ordinals: jnp.ndarray  # int32 proleptic ordinal of each slot date
+    masks: jnp.ndarray  # 1.0 for occupied slots
+
+
+# ============================================================================
+# Netting kernel
+# ============================================================================
+
+
+@jax.jit
+def net_leg_payoffs(
+    first_payoffs: jnp.ndarray,
+    second_payoffs: jnp.ndarray,
+    alignment: SWAPSAlignment,
+) -> jnp.ndarray:
+    """Net both legs onto the swap timeline with a masked scatter-add.
+
+    Args:
+        first_payoffs: ``[B, T_leg]`` first-leg payoffs in leg event order.
+        second_payoffs: ``[B, T_leg]`` second-leg payoffs.
+        alignment: Slot mapping from ``prepare_swaps_batch``.
+
+    Returns:
+        ``[B, U]`` net payoffs (zero in unoccupied slots).
+    """
+    rows = jnp.arange(first_payoffs.shape[0])[:, None]
+    net = alignment.extra_payoffs.at[rows, alignment.first_slots].add(
+        first_payoffs * alignment.first_masks
+    )
+    return net.at[rows, alignment.second_slots].add(second_payoffs * alignment.second_masks)
+
+
+# ============================================================================
+# Pre-computation bridge — Python -> JAX arrays
+# ============================================================================
+
+
+def _leg_ids(attrs: ContractAttributes) -> tuple[str, str]:
+    """Read the FirstLeg/SecondLeg references from ``contract_structure``."""
+    try:
+        ctst = json.loads(attrs.contract_structure or "")
+    except (json.JSONDecodeError, TypeError) as e:
+        raise ValueError(f"SWAPS {attrs.contract_id}: invalid contract_structure: {e}") from e
+    if not isinstance(ctst, dict) or "FirstLeg" not in ctst or "SecondLeg" not in ctst:
+        raise ValueError(
+            f"SWAPS {attrs.contract_id}: contract_structure must contain "
+            "'FirstLeg' and 'SecondLeg' keys"
+        )
+    return ctst["FirstLeg"], ctst["SecondLeg"]
+
+
+def _resolve_leg(
+    swap: ContractAttributes,
+    leg_id: str,
+    legs: Mapping[str, ContractAttributes] | None,
+) -> ContractAttributes:
+    """Look up a leg's attributes and check it has an array-mode kernel."""
+    if legs is None or leg_id not in legs:
+        raise ValueError(f"SWAPS {swap.contract_id}: leg {leg_id!r} must be passed via `legs`")
+    leg = legs[leg_id]
+    check_child_type(swap, leg)
+    return leg
+
+
+def _align_swap(
+    swap: ContractAttributes,
+    first: list[tuple[int, _datetime]],
+    second: list[tuple[int, _datetime]],
+) -> tuple[list[int], list[int], list[tuple[int, _datetime, float]]]:
+    """Assign slots to both legs' events for one swap.
+
+    Returns ``(first_slots, second_slots, timeline)`` where a slot of -1
+    marks a dropped event and ``timeline`` lists ``(event_type, date,
+    extra_payoff)`` per slot in chronological order.
+    """
+    net = (swap.delivery_settlement or "D") == "S"
+    sd = adt_to_dt(swap.status_date)
+    prd = adt_to_dt(swap.purchase_date) if swap.purchase_date else None
+    td = adt_to_dt(swap.termination_date) if swap.termination_date else None
+    role_sign = float(swap.contract_role.get_sign())
+
+    def kept(evt: int, dt: _datetime) -> bool:
+        if dt < sd or (prd is not None and dt <= prd):
+            return False
+        return td is None or dt < td or (dt == td and evt != EventType.MD.index)
+
+    # key -> (event_type, date, extra_payoff); congruent events share a key
+    slots: dict[tuple[Any, ...], tuple[int, _datetime, float]] = {}
+    leg_keys: list[list[tuple[Any, ...] | None]] = []
+    for leg, events in enumerate((first, second)):
+        keys: list[tuple[Any, ...] | None] = []
+        for k, (evt, dt) in enumerate(events):
+            if not kept(evt, dt):
+                keys.append(None)
+                continue
+            key = (dt, evt) if net and evt in _CONGRUENT_EVENT_IDX else (dt, evt, leg, k)
+            slots.setdefault(key, (evt, dt, 0.0))
+            keys.append(key)
+        leg_keys.append(keys)
+
+    if prd is not None:
+        slots[("PRD",)] = (
+            EventType.PRD.index,
+            prd,
+            role_sign * (swap.price_at_purchase_date or 0.0),
+        )
+    if td is not None:
+        slots[("TD",)] = (
+            EventType.TD.index,
+            td,
+            role_sign * (swap.price_at_termination_date or 0.0),
+        )
+    for ad in swap.analysis_dates or []:
+        slots.setdefault(("AD", ad.to_iso()), (EventType.AD.index, adt_to_dt(ad), 0.0))
+
+    order = sorted(slots, key=lambda key: (slots[key][1], get_evt_priority(slots[key][0])))
+    position = {key: u for u, key in enumerate(order)}
+    first_slots, second_slots = (
+        [-1 if key is None else position[key] for key in keys] for keys in leg_keys
+    )
+    return first_slots, second_slots, [slots[key] for key in order]
+
+
+def prepare_swaps_batch(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    legs: Mapping[str, ContractAttributes] | None = None,
+) -> tuple[list[ChildBatch], SWAPSAlignment]:
+    """Pre-compute leg batches and the slot alignment for a swap book.
+
+    Each leg is simulated with its own attributes (including its role),
+    exactly as the scalar path passes child events through; the swap's
+    risk factor observer drives both legs.
+
+    Args:
+        contracts: List of ``(swap_attributes, rf_observer)`` pairs.
+        legs: Mapping of leg contract IDs (as referenced in
+            ``contract_structure``) to leg attributes.
+
+    Returns:
+        ``(leg_batches, alignment)``
+
+    Raises:
+        ValueError: If a leg cannot be resolved or has no array-mode kernel.
+    """
+    n = len(contracts)
+    firsts, seconds = [], []
+    for swap, obs in contracts:
+        first_id, second_id = _leg_ids(swap)
+        firsts.append((_resolve_leg(swap, first_id, legs), obs))
+        seconds.append((_resolve_leg(swap, second_id, legs), obs))
+
+    batches, leg_events = prepare_child_batches(firsts + seconds)
+    t_leg = max((b.event_types.shape[1] for b in batches), default=1)
+
+    aligned = [
+        _align_swap(swap, leg_events[i], leg_events[n + i]) for i, (swap, _) in enumerate(contracts)
+    ]
+    max_slots = max((len(timeline) for _, _, timeline in aligned), default=0)
+    max_slots = max(max_slots, 1)
+
+    first_slots = np.zeros((n, t_leg), dtype=np.int32)
+    first_masks = np.zeros((n, t_leg), dtype=np.float32)
+    second_slots = np.zeros((n, t_leg), dtype=np.int32)
+    second_masks = np.zeros((n, t_leg), dtype=np.float32)
+    extra = np.zeros((n, max_slots), dtype=np.float32)
+    event_types = np.full((n, max_slots), EventType.AD.index, dtype=np.int32)
+    ordinals = np.zeros((n, max_slots), dtype=np.int32)
+    masks = np.zeros((n, max_slots), dtype=np.float32)
+
+    for i, (s1, s2, timeline) in enumerate(aligned):
+        for slots_out, masks_out, slots in (
+            (first_slots, first_masks, s1),
+            (second_slots, second_masks, s2),
+        ):
+            arr = np.asarray(slots, dtype=np.int32)
+            slots_out[i, : len(arr)] = np.maximum(arr, 0)
+            masks_out[i, : len(arr)] = arr >= 0
+        for u, (evt, dt, payoff) in enumerate(timeline):
+            event_types[i, u] = evt
+            ordinals[i, u] = dt.toordinal()
+            extra[i, u] = payoff
+            masks[i, u] = 1.0
+
+    alignment = SWAPSAlignment(
+        first_slots=jnp.asarray(first_slots),
+        first_masks=jnp.asarray(first_masks),
+        second_slots=jnp.asarray(second_slots),
+        second_masks=jnp.asarray(second_masks),
+        extra_payoffs=jnp.asarray(extra),
+        event_types=jnp.asarray(event_types),
+        event_ordinals=jnp.asarray(ordinals),
+        masks=jnp.asarray(masks),
+    )
+    return batches, alignment
+
+
+# ============================================================================
+# Batch / portfolio API
+# ============================================================================
+
+
+def simulate_leg_batches(
+    batches: list[ChildBatch],
+    num_contracts: int,
+) -> tuple[dict[ContractType, Any], jnp.ndarray, jnp.ndarray]:
+    """Run every leg batch and gather payoffs into first/second leg order.
+
+    Returns:
+        ``(final_states, first_payoffs, second_payoffs)`` where
+        ``final_states`` is keyed by leg ``ContractType`` and the payoff
+        arrays are ``[B, T_leg]``.
+    """
+    final_states, leg_payoffs = simulate_child_batches(batches)
+    # Leg order is [first legs..., second legs...]
+    return final_states, leg_payoffs[:num_contracts], leg_payoffs[num_contracts:]
+
+
+def simulate_swaps_portfolio(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    discount_rate: float | None = None,
+    legs: Mapping[str, ContractAttributes] | None = None,
+) -> dict[str, Any]:
+    """End-to-end SWAPS portfolio simulation with optional PV.
+
+    Args:
+        contracts: List of ``(attributes, rf_observer)`` pairs.
+        discount_rate: If provided, compute present values.  Slots are
+            discounted with ``1 / (1 + r * t)`` where ``t`` is the A365
+            year fraction from each swap's status date.
+        legs: Mapping of leg contract IDs to leg attributes.
+
+    Returns:
+        Dict with ``payoffs`` (``[B, U]`` on the merged timeline),
+        ``masks``, ``event_ordinals``, ``final_states`` (keyed by leg
+        ``ContractType``),
+        ``total_cashflows``, ``num_contracts``, and optionally
+        ``present_values`` and ``total_pv``.
+    """
+    n = len(contracts)
+    batches, alignment = prepare_swaps_batch(contracts, legs)
+    final_states, first_payoffs, second_payoffs = simulate_leg_batches(batches, n)
+    masked_payoffs = net_leg_payoffs(first_payoffs, second_payoffs, alignment) * alignment.masks
+
+    result: dict[str, Any] = {
+        "payoffs": masked_payoffs,
+        "masks": alignment.masks,
+        "event_ordinals": alignment.event_ordinals,
+        "final_states": final_states,
+        "total_cashflows": jnp.sum(masked_payoffs, axis=1),
+        "num_contracts": n,
+    }
+
+    if discount_rate is not None:
+        sd_ordinals = np.array(
+            [adt_to_dt(a.status_date).toordinal() for a, _ in contracts], dtype=np.int32
+        )
+        t = (alignment.event_ordinals - jnp.asarray(sd_ordinals)[:, None]) / 365.0
+        discount_factors = 1.0 / (1.0 + discount_rate * jnp.maximum(t, 0.0))
+        pvs = jnp.sum(masked_payoffs * discount_factors, axis=1)
+        result["present_values"] = pvs
+        result["total_pv"] = jnp.sum(pvs)
+
+    return result
@@ -39,6 +39,7 @@ Example::
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import datetime as _datetime
 from typing import Any, NamedTuple
 
@@ -69,7 +70,19 @@ from jactus.contracts.array_common import (
 # Import shared infrastructure from array_common
 from jactus.contracts.array_common import (
     NOP_EVENT_IDX,
+    CanonicalShapes,
+    PrecisionPolicy,
+    RatePath,
+    RFScenarios,
+    check_scenario_options,
     get_yf_fn,
+    pad_event_ordinals,
+    precision_scope,
+    precompute_raw_list,
+    rate_reset_rf_values,
+    resolve_precision,
+    run_batch_kernel,
+    simulate_scenarios,
 )
 from jactus.contracts.array_common import (
     PRD_IDX as _PRD_IDX,
@@ -107,6 +120,9 @@ from jactus.contracts.array_common import (
 from jactus.contracts.array_common import (
     prequery_risk_factors as _prequery_risk_factors,
 )
+from jactus.contracts.array_common import (
+    state_dtype as _state_dtype,
+)
 from jactus.core import (
     ContractAttributes,
     EventType,
@@ -548,6 +564,8 @@ def batch_simulate_swppv(
     year_fractions: jnp.ndarray,
     rf_values: jnp.ndarray,
     params: SWPPVArrayParams,
+    reset_ordinals: jnp.ndarray | None = None,
+    rate_path: RatePath | None = None,
 ) -> tuple[SWPPVArrayState, jnp.ndarray]:
     """Batched SWPPV simulation without vmap — single scan over ``[B]`` arrays.
 
@@ -560,10 +578,17 @@ def batch_simulate_swppv(
         year_fractions: ``[B, T]`` float32.
         rf_values: ``[B, T]`` float32.
         params: ``SWPPVArrayParams`` with each field shape ``[B]``.
+        reset_ordinals: ``[B, T]`` int32 fixing day ordinals (the batch's
+            ``event_ordinals``); required with ``rate_path``.
+        rate_path: Optional on-device rate source (see
+            :data:`~jactus.contracts.array_common.RatePath`).  RR fixings
+            are then looked up from it inside the kernel instead of read
+            from ``rf_values``, and gradients flow back to its values.
 
     Returns:
         ``(final_states, payoffs)`` where ``payoffs`` is ``[B, T]``.
     """
+    rf_values = rate_reset_rf_values(rate_path, event_types, reset_ordinals, rf_values)
     # Transpose to [T, B] so scan iterates over time steps
     et_t = event_types.T
     yf_t = year_fractions.T
@@ -975,6 +1000,7 @@ def _precompute_raw(
         year_fractions=yf_list,
         rf_values=rf_list,
         params=params_raw,
+        event_ordinals=[evt_dt.toordinal() for _, evt_dt, _ in schedule],
     )
 
 
@@ -1027,6 +1053,7 @@ def _precompute_raw_da(
         year_fractions=yf_list,
         rf_values=rf_list,
         params=params_raw,
+        event_ordinals=[evt_dt.toordinal() for _, evt_dt, _ in schedule],
     )
 
 
@@ -1084,6 +1111,7 @@ def _raw_list_to_jax_batch(
     Pads shorter contracts with NOP events and builds NumPy arrays first
     (fast C-level construction) then transfers to JAX via ``jnp.asarray``.
     """
+    float_dtype = _state_dtype()
     max_events = max(len(r.event_types) for r in raw_list)
 
     # State fields: (batch,) each — SWPPV has 6 state fields
@@ -1116,22 +1144,22 @@ def _raw_list_to_jax_batch(
 
     # Build NumPy arrays first (fast C-level), then transfer to JAX
     batched_states = SWPPVArrayState(
-        nt=jnp.asarray(np.array(state_nt, dtype=np.float32)),
-        ipnr=jnp.asarray(np.array(state_ipnr, dtype=np.float32)),
-        ipac1=jnp.asarray(np.array(state_ipac1, dtype=np.float32)),
-        ipac2=jnp.asarray(np.array(state_ipac2, dtype=np.float32)),
-        nsc=jnp.asarray(np.array(state_nsc, dtype=np.float32)),
-        isc=jnp.asarray(np.array(state_isc, dtype=np.float32)),
+        nt=jnp.asarray(np.array(state_nt, dtype=float_dtype)),
+        ipnr=jnp.asarray(np.array(state_ipnr, dtype=float_dtype)),
+        ipac1=jnp.asarray(np.array(state_ipac1, dtype=float_dtype)),
+        ipac2=jnp.asarray(np.array(state_ipac2, dtype=float_dtype)),
+        nsc=jnp.asarray(np.array(state_nsc, dtype=float_dtype)),
+        isc=jnp.asarray(np.array(state_isc, dtype=float_dtype)),
     )
 
     batched_et = jnp.asarray(np.array(et_batch, dtype=np.int32))
-    batched_yf = jnp.asarray(np.array(yf_batch, dtype=np.float32))
-    batched_rf = jnp.asarray(np.array(rf_batch, dtype=np.float32))
-    batched_masks = jnp.asarray(np.array(mask_batch, dtype=np.float32))
+    batched_yf = jnp.asarray(np.array(yf_batch, dtype=float_dtype))
+    batched_rf = jnp.asarray(np.array(rf_batch, dtype=float_dtype))
+    batched_masks = jnp.asarray(np.array(mask_batch, dtype=float_dtype))
 
     batched_params = SWPPVArrayParams(
         **{
-            k: jnp.asarray(np.array(param_fields[k], dtype=np.float32))
+            k: jnp.asarray(np.array(param_fields[k], dtype=float_dtype))
             for k in SWPPVArrayParams._fields
         }
     )
@@ -1141,6 +1169,7 @@ def _raw_list_to_jax_batch(
 
 def prepare_swppv_batch(
     contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
 ) -> tuple[SWPPVArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, SWPPVArrayParams, jnp.ndarray]:
     """Pre-compute and pad arrays for a batch of SWPPV contracts.
 
@@ -1148,19 +1177,42 @@ def prepare_swppv_batch(
 
     Args:
         contracts: List of ``(attributes, rf_observer)`` pairs.
+        workers: If greater than 1, run the per-contract pre-computation
+            in a pool of this many processes (see
+            :func:`~jactus.contracts.array_common.precompute_raw_list`).
 
     Returns:
         ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
         where each array has a leading batch dimension.
     """
-    raw_list = [_precompute_raw(attrs, obs) for attrs, obs in contracts]
-    return _raw_list_to_jax_batch(raw_list)
+    return _prepare_swppv_batch_dated(contracts, workers)[0]
+
+
+def _prepare_swppv_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
+) -> tuple[
+    tuple[SWPPVArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, SWPPVArrayParams, jnp.ndarray],
+    jnp.ndarray,
+]:
+    """``prepare_swppv_batch`` plus the ``[B, T]`` int32 event ordinals."""
+    raw_list = precompute_raw_list(_precompute_raw, contracts, workers)
+    batch = _raw_list_to_jax_batch(raw_list)
+    return batch, pad_event_ordinals([r.event_ordinals for r in raw_list], batch[1].shape[1])
 
 
 def simulate_swppv_portfolio(
     contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
     discount_rate: float | None = None,
     year_fractions_from_valuation: jnp.ndarray | None = None,
+    length_buckets: int | None = None,
+    pad_shape: tuple[int, int] | None = None,
+    devices: int | Sequence[Any] | None = None,
+    canonical_shapes: CanonicalShapes | bool | None = None,
+    precision: PrecisionPolicy | str | None = None,
+    rf_scenarios: RFScenarios | None = None,
+    scenario_output: str = "payoffs",
+    scenario_batch_size: int | None = None,
 ) -> dict[str, Any]:
     """End-to-end portfolio simulation with optional PV.
 
@@ -1171,11 +1223,43 @@ def simulate_swppv_portfolio(
             from valuation date for PV discounting.  If ``None`` and
             ``discount_rate`` is set, year fractions are computed from each
             contract's ``status_date``.
+        length_buckets: If set, sort contracts by event count and
+            simulate them in at most this many length buckets, each
+            trimmed to its own longest contract, instead of padding the
+            whole batch to the longest one.
+        pad_shape: If set, pad the batch to at least ``(rows, events)``
+            (events rounded up to a power of two) so repeated calls reuse
+            one compiled kernel; used by chunked streaming.
+        devices: If set, shard the batch axis across this many JAX devices
+            (or this list of devices); results come back in input order.
+        canonical_shapes: If set, pad the batch up to canonical sizes
+            (``True`` for powers of two, or a ``CanonicalShapes`` of
+            allowed sizes) so portfolios of similar size reuse one
+            compiled kernel.
+        precision: Precision policy (``"f32"``, ``"f64"``, ``"mixed"`` or a
+            ``PrecisionPolicy``); defaults to the active policy.  Sets the
+            dtype of the prepared batch and of payoff and PV accumulation.
+        rf_scenarios: If set, an ``[S, B, T]`` array of risk-factor values
+            (or a callable ``(event_ordinals, rf_values) -> [S, B, T]``)
+            run against the shared schedules and parameters in one
+            compiled call; see
+            :func:`~jactus.contracts.array_common.simulate_scenarios`.
+        scenario_output: ``"payoffs"``, ``"totals"`` or ``"portfolio"``
+            (sum over contracts on device), with ``rf_scenarios``.
+        scenario_batch_size: Scenarios evaluated at once with
+            ``rf_scenarios``; ``None`` runs them all together.
 
     Returns:
-        Dict with ``payoffs``, ``masks``, ``final_states``, and optionally
-        ``present_values`` and ``total_pv``.
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``,
+        ``final_states``, optionally ``present_values`` and ``total_pv``, and
+        ``length_buckets`` (the :class:`LengthBuckets` plan) or
+        ``padded_shape`` when bucketing or padding.  With ``rf_scenarios``
+        the totals and present values gain a leading ``[S]`` axis (see
+        :func:`~jactus.contracts.array_common.simulate_scenarios`).
     """
+    policy = resolve_precision(precision)
+    with precision_scope(policy):
+        batch, event_ordinals = _prepare_swppv_batch_dated(contracts)
     (
         batched_states,
         batched_et,
@@ -1183,24 +1267,58 @@ def simulate_swppv_portfolio(
         batched_rf,
         batched_params,
         batched_masks,
-    ) = prepare_swppv_batch(contracts)
+    ) = batch
+
+    if rf_scenarios is not None:
+        check_scenario_options(
+            length_buckets=length_buckets,
+            pad_shape=pad_shape,
+            devices=devices,
+            canonical_shapes=canonical_shapes,
+        )
+        scenario_result = simulate_scenarios(
+            batch_simulate_swppv_auto,
+            batched_states,
+            (batched_et, batched_yf, batched_rf),
+            batched_params,
+            batched_masks,
+            event_ordinals,
+            rf_scenarios,
+            accumulate_dtype=policy.accumulate_dtype,
+            discount_rate=discount_rate,
+            year_fractions_from_valuation=year_fractions_from_valuation,
+            output=scenario_output,
+            scenario_batch_size=scenario_batch_size,
+        )
+        scenario_result["num_contracts"] = len(contracts)
+        return scenario_result
 
     # Run batched simulation
-    final_states, payoffs = batch_simulate_swppv_auto(
-        batched_states, batched_et, batched_yf, batched_rf, batched_params
+    final_states, payoffs, layout = run_batch_kernel(
+        batch_simulate_swppv_auto,
+        batched_states,
+        (batched_et, batched_yf, batched_rf),
+        batched_params,
+        batched_masks,
+        length_buckets=length_buckets,
+        pad_shape=pad_shape,
+        devices=devices,
+        canonical_shapes=canonical_shapes,
     )
 
     # Mask padding
-    masked_payoffs = payoffs * batched_masks
+    masked_payoffs = payoffs.astype(policy.accumulate_dtype) * batched_masks
     total_cashflows = jnp.sum(masked_payoffs, axis=1)
 
     result: dict[str, Any] = {
         "payoffs": masked_payoffs,
         "masks": batched_masks,
+        "event_ordinals": event_ordinals,
         "final_states": final_states,
         "total_cashflows": total_cashflows,
         "num_contracts": len(contracts),
     }
+    result.update(layout)
 
     if discount_rate is not None:
         # Use cumulative year fractions for discounting
@@ -1208,7 +1326,7 @@ def simulate_swppv_portfolio(
             disc_yfs = year_fractions_from_valuation
         else:
             # Approximate: use cumulative sum of per-event year fractions
-            disc_yfs = jnp.cumsum(batched_yf, axis=1)
+            disc_yfs = jnp.cumsum(batched_yf.astype(policy.accumulate_dtype), axis=1)
         discount_factors = 1.0 / (1.0 + discount_rate * disc_yfs)
         pvs = jnp.sum(masked_payoffs * discount_factors, axis=1)
         result["present_values"] = pvs
@@ -0,0 +1,922 @@
+"""Array-mode UMP simulation — JIT-compiled, vmap-able pure JAX.
+
+This module provides a high-performance simulation path for UMP (Undefined
+Maturity Profile) contracts using ``jax.lax.scan`` for the event loop and
+``jax.lax.switch`` for payoff/state-transition dispatch.  The simulation
+kernel is JIT-compilable and can be vectorized across a portfolio with
+``jax.vmap``.
+
+Architecture:
+    Pre-computation (Python) -> Pure JAX kernel (jit + vmap)
+
+    All principal changes of a UMP come from observed deposit transactions.
+    Pre-computation reads each contract's full transaction schedule from its
+    ``DepositTransactionObserver`` in a single ``get_transaction_schedule()``
+    call and lays the amounts out as PR (outflow) / PI (inflow) events next
+    to the scheduled AD, IED, IPCI, RR, FP and TD events.  The transaction
+    amounts travel in the ``rf_values`` array, which carries the observed
+    market rate at RR events.
+
+Key UMP specifics:
+    - A transaction amount ``a`` (Absolute Funded Delta) moves the signed
+      notional by ``R(CNTRL) * a`` and pays ``-R(CNTRL) * a``, mirroring IED.
+    - IPCI capitalizes ``ipac + yf * ipnr * nt`` into the notional.
+    - RR sets ``ipnr`` to the observed rate without accruing, as in the
+      scalar path.
+    - There is no MD event: maturity is uncertain.
+
+Difference from the scalar path:
+    ``UndefinedMaturityProfileContract`` never schedules PR/PI events, so
+    it ignores deposit transactions.  For a contract with transactions the
+    array path (and ``simulate_portfolio``, which batches UMP) moves the
+    notional and pays the amounts where ``contract.simulate()`` does not.
+    Without transactions the two paths agree.
+
+Example::
+
+    from jactus.contracts.ump_array import precompute_ump_arrays, simulate_ump_array
+
+    arrays = precompute_ump_arrays(attrs, deposit_observer)
+    final_state, payoffs = simulate_ump_array(*arrays)
+
+    # Portfolio:
+    from jactus.contracts.ump_array import simulate_ump_portfolio
+    result = simulate_ump_portfolio(contracts, discount_rate=0.05)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime as _datetime
+from typing import Any, NamedTuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jactus.contracts.array_common import (
+    AD_IDX,
+    F32,
+    FP_IDX,
+    IED_IDX,
+    IPCI_IDX,
+    MD_IDX,
+    NOP_EVENT_IDX,
+    PI_IDX,
+    PR_IDX,
+    RR_IDX,
+    RRF_IDX,
+    TD_IDX,
+    CanonicalShapes,
+    PrecisionPolicy,
+    RawPrecomputed,
+    RFScenarios,
+    adt_to_dt,
+    check_scenario_options,
+    compute_vectorised_year_fractions,
+    dt_to_adt,
+    fast_schedule,
+    get_role_sign,
+    pad_event_ordinals,
+    precision_scope,
+    precompute_raw_list,
+    resolve_precision,
+    run_batch_kernel,
+    simulate_scenarios,
+    state_dtype,
+)
+from jactus.core import ContractAttributes
+from jactus.observers import DepositTransactionObserver, RiskFactorObserver
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+
+class UMPArrayState(NamedTuple):
+    """Minimal scan-loop state for UMP simulation.
+
+    All fields are scalar ``jnp.ndarray`` (float32). ``sd`` (status date) is
+    omitted because year fractions are pre-computed before the JIT boundary.
+    """
+
+    nt: jnp.ndarray  # Notional principal (signed)
+    ipnr: jnp.ndarray  # Nominal interest rate
+    ipac: jnp.ndarray  # Accrued interest
+    feac: jnp.ndarray  # Accrued fees
+    nsc: jnp.ndarray  # Notional scaling multiplier
+    isc: jnp.ndarray  # Interest scaling multiplier
+
+
+class UMPArrayParams(NamedTuple):
+    """Static contract parameters extracted from ``ContractAttributes``.
+
+    These do not change during the scan loop.
+    """
+
+    role_sign: jnp.ndarray  # +1.0 or -1.0
+    notional_principal: jnp.ndarray
+    nominal_interest_rate: jnp.ndarray
+    premium_discount_at_ied: jnp.ndarray
+    rate_reset_next: jnp.ndarray
+    has_rate_reset_next: jnp.ndarray  # 1.0 if RRF fixes the rate, else 0.0
+    fee_rate: jnp.ndarray
+    has_fee_accrual: jnp.ndarray  # 1.0 if fee_rate and fee_basis are set, else 0.0
+    price_at_termination_date: jnp.ndarray
+
+
+# ============================================================================
+# Pure JAX payoff functions  (state, params, yf, rf) -> scalar payoff
+# ============================================================================
+
+
+def _pof_zero(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> jnp.ndarray:
+    """Zero payoff (AD, IPCI, RR, RRF, CE, unused event types and padding)."""
+    return jnp.array(0.0, dtype=F32)
+
+
+def _pof_ied(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> jnp.ndarray:
+    """POF_IED_UMP: R(CNTRL) * (-1) * (NT + PDIED)."""
+    return params.role_sign * (-1.0) * (params.notional_principal + params.premium_discount_at_ied)
+
+
+def _pof_transaction(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> jnp.ndarray:
+    """POF_PR_UMP / POF_PI_UMP: R(CNTRL) * (-1) * AFD.
+
+    ``rf`` carries the observed transaction amount (positive for inflows).
+    """
+    return params.role_sign * (-1.0) * rf
+
+
+def _pof_md(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> jnp.ndarray:
+    """POF_MD_UMP: Nsc * (Nt + Ipac + Y(Sd, t) * Ipnr * Nt)."""
+    return state.nsc * (state.nt + state.ipac + yf * state.ipnr * state.nt)
+
+
+def _pof_fp(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> jnp.ndarray:
+    """POF_FP_UMP: accrued fees, accruing on ``|Nt|`` when a fee rate applies."""
+    accrued = state.nsc * (state.feac + yf * params.fee_rate * jnp.abs(state.nt))
+    return jnp.where(
+        params.has_fee_accrual > 0.5, accrued, params.role_sign * state.nsc * state.feac
+    )
+
+
+def _pof_td(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> jnp.ndarray:
+    """POF_TD_UMP: Nsc * (PTD + Ipac + Y(Sd, t) * Ipnr * Nt)."""
+    return state.nsc * (params.price_at_termination_date + state.ipac + yf * state.ipnr * state.nt)
+
+
+# ============================================================================
+# Pure JAX state transition functions  (state, params, yf, rf) -> new state
+# ============================================================================
+
+
+def _accrue_interest(state: UMPArrayState, yf: jnp.ndarray) -> jnp.ndarray:
+    """Common sub-expression: ipac + yf * ipnr * nt."""
+    return state.ipac + yf * state.ipnr * state.nt
+
+
+def _stf_ad(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> UMPArrayState:
+    return state._replace(ipac=_accrue_interest(state, yf))
+
+
+def _stf_ied(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> UMPArrayState:
+    return UMPArrayState(
+        nt=params.role_sign * params.notional_principal,
+        ipnr=params.nominal_interest_rate,
+        ipac=jnp.array(0.0, dtype=F32),
+        feac=jnp.array(0.0, dtype=F32),
+        nsc=jnp.array(1.0, dtype=F32),
+        isc=jnp.array(1.0, dtype=F32),
+    )
+
+
+def _stf_transaction(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> UMPArrayState:
+    return state._replace(
+        nt=state.nt + params.role_sign * rf,
+        ipac=_accrue_interest(state, yf),
+    )
+
+
+def _stf_md(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> UMPArrayState:
+    return state._replace(
+        nt=jnp.array(0.0, dtype=F32),
+        ipnr=jnp.array(0.0, dtype=F32),
+        ipac=jnp.array(0.0, dtype=F32),
+        feac=jnp.array(0.0, dtype=F32),
+    )
+
+
+def _stf_td(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> UMPArrayState:
+    return state._replace(
+        nt=jnp.array(0.0, dtype=F32),
+        ipac=jnp.array(0.0, dtype=F32),
+        feac=jnp.array(0.0, dtype=F32),
+    )
+
+
+def _stf_fp(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> UMPArrayState:
+    return state._replace(feac=jnp.array(0.0, dtype=F32))
+
+
+def _stf_ipci(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> UMPArrayState:
+    return state._replace(
+        nt=state.nt + _accrue_interest(state, yf),
+        ipac=jnp.array(0.0, dtype=F32),
+    )
+
+
+def _stf_rr(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> UMPArrayState:
+    return state._replace(ipnr=rf)
+
+
+def _stf_rrf(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> UMPArrayState:
+    new_ipnr = jnp.where(params.has_rate_reset_next > 0.5, params.rate_reset_next, state.ipnr)
+    return state._replace(ipnr=new_ipnr)
+
+
+def _stf_noop(
+    state: UMPArrayState, params: UMPArrayParams, yf: jnp.ndarray, rf: jnp.ndarray
+) -> UMPArrayState:
+    """No-op state transition (CE, unused event types and padding)."""
+    return state
+
+
+# ============================================================================
+# Dispatch tables — indexed by EventType.index (0..23) + NOP (24)
+# ============================================================================
+
+# fmt: off
+_POF_TABLE: list[Any] = [
+    _pof_zero,         # 0  AD
+    _pof_ied,          # 1  IED
+    _pof_md,           # 2  MD   (not scheduled: maturity is uncertain)
+    _pof_transaction,  # 3  PR   (observed outflow)
+    _pof_transaction,  # 4  PI   (observed inflow)
+    _pof_zero,         # 5  PP   (not used in UMP)
+    _pof_zero,         # 6  PY   (not used in UMP)
+    _pof_zero,         # 7  PRF  (not used in UMP)
+    _pof_fp,           # 8  FP
+    _pof_zero,         # 9  PRD  (not used in UMP)
+    _pof_td,           # 10 TD
+    _pof_zero,         # 11 IP   (not used in UMP)
+    _pof_zero,         # 12 IPCI
+    _pof_zero,         # 13 IPCB (not used in UMP)
+    _pof_zero,         # 14 RR
+    _pof_zero,         # 15 RRF
+    _pof_zero,         # 16 DV   (not used in UMP)
+    _pof_zero,         # 17 DVF  (not used in UMP)
+    _pof_zero,         # 18 SC   (not used in UMP)
+    _pof_zero,         # 19 STD  (not used in UMP)
+    _pof_zero,         # 20 XD   (not used in UMP)
+    _pof_zero,         # 21 CE
+    _pof_zero,         # 22 IPFX (not used in UMP)
+    _pof_zero,         # 23 IPFL (not used in UMP)
+    _pof_zero,         # 24 NOP  (padding)
+]
+
+_STF_TABLE: list[Any] = [
+    _stf_ad,           # 0  AD
+    _stf_ied,          # 1  IED
+    _stf_md,           # 2  MD
+    _stf_transaction,  # 3  PR
+    _stf_transaction,  # 4  PI
+    _stf_noop,         # 5  PP
+    _stf_noop,         # 6  PY
+    _stf_noop,         # 7  PRF
+    _stf_fp,           # 8  FP
+    _stf_noop,         # 9  PRD
+    _stf_td,           # 10 TD
+    _stf_noop,         # 11 IP
+    _stf_ipci,         # 12 IPCI
+    _stf_noop,         # 13 IPCB
+    _stf_rr,           # 14 RR
+    _stf_rrf,          # 15 RRF
+    _stf_noop,         # 16 DV
+    _stf_noop,         # 17 DVF
+    _stf_noop,         # 18 SC
+    _stf_noop,         # 19 STD
+    _stf_noop,         # 20 XD
+    _stf_noop,         # 21 CE
+    _stf_noop,         # 22 IPFX
+    _stf_noop,         # 23 IPFL
+    _stf_noop,         # 24 NOP
+]
+# fmt: on
+
+assert len(_POF_TABLE) == NOP_EVENT_IDX + 1
+assert len(_STF_TABLE) == NOP_EVENT_IDX + 1
+
+
+# ============================================================================
+# JIT-compiled simulation kernel
+# ============================================================================
+
+
+def simulate_ump_array(
+    initial_state: UMPArrayState,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    params: UMPArrayParams,
+) -> tuple[UMPArrayState, jnp.ndarray]:
+    """Run a UMP simulation as a pure JAX function.
+
+    This function is JIT-compilable and vmap-able.
+
+    Args:
+        initial_state: Starting state (6 scalar fields).
+        event_types: ``(num_events,)`` int32 — ``EventType.index`` values.
+        year_fractions: ``(num_events,)`` float32 — pre-computed YF per event.
+        rf_values: ``(num_events,)`` float32 — transaction amount for PR/PI,
+            observed market rate for RR, 0.0 otherwise.
+        params: Static contract parameters.
+
+    Returns:
+        ``(final_state, payoffs)`` where payoffs is ``(num_events,)`` float32.
+    """
+
+    def step(
+        state: UMPArrayState, inputs: tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]
+    ) -> tuple[UMPArrayState, jnp.ndarray]:
+        evt_idx, yf, rf = inputs
+        payoff = jax.lax.switch(evt_idx, _POF_TABLE, state, params, yf, rf)
+        new_state = jax.lax.switch(evt_idx, _STF_TABLE, state, params, yf, rf)
+        return new_state, payoff
+
+    final_state, payoffs = jax.lax.scan(
+        step, initial_state, (event_types, year_fractions, rf_values), unroll=8
+    )
+    return final_state, payoffs
+
+
+# JIT-compiled version for single-contract use
+simulate_ump_array_jit = jax.jit(simulate_ump_array)
+
+# Vmapped version (kept as fallback)
+batch_simulate_ump_vmap = jax.vmap(simulate_ump_array)
+
+
+def batch_simulate_ump_auto(
+    initial_states: UMPArrayState,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    params: UMPArrayParams,
+) -> tuple[UMPArrayState, jnp.ndarray]:
+    """Batched simulation using the optimal strategy for all backends.
+
+    Uses the single-scan batch approach (``batch_simulate_ump``) which
+    processes all contracts in shaped ``[B, T]`` arrays via a single
+    ``lax.scan``.
+    """
+    return batch_simulate_ump(initial_states, event_types, year_fractions, rf_values, params)  # type: ignore[no-any-return]
+
+
+# ============================================================================
+# Manually-batched simulation — eliminates vmap dispatch overhead on CPU
+# ============================================================================
+
+
+@jax.jit
+def batch_simulate_ump(
+    initial_states: UMPArrayState,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    params: UMPArrayParams,
+) -> tuple[UMPArrayState, jnp.ndarray]:
+    """Batched UMP simulation without vmap — single scan over ``[B]`` arrays.
+
+    Args:
+        initial_states: ``UMPArrayState`` with each field shape ``[B]``.
+        event_types: ``[B, T]`` int32 — event type indices per contract.
+        year_fractions: ``[B, T]`` float32.
+        rf_values: ``[B, T]`` float32 — transaction amounts and RR rates.
+        params: ``UMPArrayParams`` with each field shape ``[B]``.
+
+    Returns:
+        ``(final_states, payoffs)`` where ``payoffs`` is ``[B, T]``.
+    """
+    # Transpose to [T, B] so scan iterates over time steps
+    et_t = event_types.T
+    yf_t = year_fractions.T
+    rf_t = rf_values.T
+
+    def step(
+        states: UMPArrayState,
+        inputs: tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray],
+    ) -> tuple[UMPArrayState, jnp.ndarray]:
+        et, yf, rf = inputs  # each [B]
+
+        # Common sub-expression: interest accrual
+        accrue = states.ipac + yf * states.ipnr * states.nt
+        is_trx = (et == PR_IDX) | (et == PI_IDX)
+
+        # ---- Payoffs (branchless jnp.where dispatch) ----
+        payoff = jnp.zeros_like(states.nt)
+        payoff = jnp.where(
+            et == IED_IDX,
+            params.role_sign
+            * (-1.0)
+            * (params.notional_principal + params.premium_discount_at_ied),
+            payoff,
+        )
+        payoff = jnp.where(is_trx, params.role_sign * (-1.0) * rf, payoff)
+        payoff = jnp.where(
+            et == FP_IDX,
+            jnp.where(
+                params.has_fee_accrual > 0.5,
+                states.nsc * (states.feac + yf * params.fee_rate * jnp.abs(states.nt)),
+                params.role_sign * states.nsc * states.feac,
+            ),
+            payoff,
+        )
+        payoff = jnp.where(
+            et == TD_IDX,
+            states.nsc
+            * (params.price_at_termination_date + states.ipac + yf * states.ipnr * states.nt),
+            payoff,
+        )
+        payoff = jnp.where(et == MD_IDX, states.nsc * (states.nt + accrue), payoff)
+
+        # ---- State transitions (branchless) ----
+
+        # nt: set at IED, moved by transactions, capitalized at IPCI, zero at TD/MD
+        new_nt = states.nt
+        new_nt = jnp.where(et == IED_IDX, params.role_sign * params.notional_principal, new_nt)
+        new_nt = jnp.where(is_trx, states.nt + params.role_sign * rf, new_nt)
+        new_nt = jnp.where(et == IPCI_IDX, states.nt + accrue, new_nt)
+        new_nt = jnp.where((et == TD_IDX) | (et == MD_IDX), 0.0, new_nt)
+
+        # ipnr: set at IED, observed at RR, fixed at RRF, zero at MD
+        new_ipnr = states.ipnr
+        new_ipnr = jnp.where(et == IED_IDX, params.nominal_interest_rate, new_ipnr)
+        new_ipnr = jnp.where(et == RR_IDX, rf, new_ipnr)
+        new_ipnr = jnp.where(
+            (et == RRF_IDX) & (params.has_rate_reset_next > 0.5),
+            params.rate_reset_next,
+            new_ipnr,
+        )
+        new_ipnr = jnp.where(et == MD_IDX, 0.0, new_ipnr)
+
+        # ipac:
+        #   accrue group: AD, PR, PI
+        #   zero group:   IED, IPCI, TD, MD
+        #   default:      unchanged (FP, RR, RRF, CE and padding)
+        is_accrue = (et == AD_IDX) | is_trx
+        is_zero_ipac = (et == IED_IDX) | (et == IPCI_IDX) | (et == TD_IDX) | (et == MD_IDX)
+        new_ipac = jnp.where(is_accrue, accrue, states.ipac)
+        new_ipac = jnp.where(is_zero_ipac, 0.0, new_ipac)
+
+        # feac: zero at IED, FP, TD, MD
+        new_feac = jnp.where(
+            (et == IED_IDX) | (et == FP_IDX) | (et == TD_IDX) | (et == MD_IDX),
+            0.0,
+            states.feac,
+        )
+
+        # nsc, isc: only change at IED (set to 1.0)
+        new_nsc = jnp.where(et == IED_IDX, 1.0, states.nsc)
+        new_isc = jnp.where(et == IED_IDX, 1.0, states.isc)
+
+        new_state = UMPArrayState(
+            nt=new_nt,
+            ipnr=new_ipnr,
+            ipac=new_ipac,
+            feac=new_feac,
+            nsc=new_nsc,
+            isc=new_isc,
+        )
+        return new_state, payoff
+
+    final_states, payoffs_t = jax.lax.scan(step, initial_states, (et_t, yf_t, rf_t), unroll=8)
+    # payoffs_t is [T, B]; transpose back to [B, T]
+    return final_states, payoffs_t.T
+
+
+# ============================================================================
+# Pre-computation bridge — Python -> JAX arrays
+# ============================================================================
+
+
+def _extract_params_raw(attrs: ContractAttributes) -> dict[str, float | int]:
+    """Extract params as plain Python floats (no jnp.array overhead)."""
+    return {
+        "role_sign": get_role_sign(attrs.contract_role),
+        "notional_principal": attrs.notional_principal or 0.0,
+        "nominal_interest_rate": attrs.nominal_interest_rate or 0.0,
+        "premium_discount_at_ied": attrs.premium_discount_at_ied or 0.0,
+        "rate_reset_next": attrs.rate_reset_next or 0.0,
+        "has_rate_reset_next": 1.0 if attrs.rate_reset_next is not None else 0.0,
+        "fee_rate": attrs.fee_rate or 0.0,
+        "has_fee_accrual": 1.0 if attrs.fee_rate and attrs.fee_basis else 0.0,
+        "price_at_termination_date": attrs.price_at_termination_date or 0.0,
+    }
+
+
+def _params_raw_to_jax(raw: dict[str, float | int]) -> UMPArrayParams:
+    """Convert raw Python params to JAX UMPArrayParams."""
+    return UMPArrayParams(**{k: jnp.array(raw[k], dtype=F32) for k in UMPArrayParams._fields})
+
+
+def _deposit_transactions(
+    attrs: ContractAttributes,
+    rf_observer: RiskFactorObserver,
+) -> list[tuple[_datetime, float]]:
+    """Read a contract's full deposit transaction schedule in one call.
+
+    Returns an empty list when the observer is not a
+    ``DepositTransactionObserver`` or has no schedule for the contract.
+    """
+    if not isinstance(rf_observer, DepositTransactionObserver):
+        return []
+    try:
+        schedule = rf_observer.get_transaction_schedule(attrs.contract_id)
+    except KeyError:
+        return []
+    return [(adt_to_dt(t), float(amount)) for t, amount in schedule]
+
+
+def _fast_ump_schedule(
+    attrs: ContractAttributes,
+    transactions: list[tuple[_datetime, float]],
+) -> list[tuple[int, _datetime, _datetime, float]]:
+    """Generate the UMP schedule as (evt_idx, evt_dt, calc_dt, amount) tuples.
+
+    Replicates ``UndefinedMaturityProfileContract.generate_event_schedule``
+    (which always uses EOMC=SD and BDC=NULL) and adds one PR/PI event per
+    non-zero deposit transaction after the status date.  Same-day events
+    keep the scalar insertion order: AD, IED, transactions, IPCI, RR, FP, TD.
+    """
+    sd = attrs.status_date
+    sd_dt = adt_to_dt(sd)
+    ied = attrs.initial_exchange_date
+    ied_dt = adt_to_dt(ied) if ied else None
+    td = attrs.termination_date
+    end_date = td or attrs.maturity_date
+    end_dt = adt_to_dt(end_date) if end_date else None
+
+    events: list[tuple[int, _datetime, _datetime, float]] = [(AD_IDX, sd_dt, sd_dt, 0.0)]
+
+    if ied_dt is not None and sd_dt < ied_dt:
+        events.append((IED_IDX, ied_dt, ied_dt, 0.0))
+
+    # PR/PI: observed deposit transactions (positive amounts are inflows)
+    for trx_dt, amount in transactions:
+        if amount == 0.0 or trx_dt <= sd_dt:
+            continue
+        if ied_dt is not None and trx_dt < ied_dt:
+            continue
+        if end_dt is not None and trx_dt > end_dt:
+            continue
+        evt_idx = PI_IDX if amount > 0.0 else PR_IDX
+        events.append((evt_idx, trx_dt, trx_dt, amount))
+
+    if end_date is not None and ied is not None and end_dt is not None and ied_dt is not None:
+        # IPCI: every interest payment date capitalizes
+        if attrs.interest_payment_cycle:
+            ipci_end = attrs.interest_capitalization_end_date or end_date
+            for dt in fast_schedule(
+                attrs.interest_payment_anchor or ied, attrs.interest_payment_cycle, ipci_end
+            ):
+                if ied_dt < dt < end_dt and dt > sd_dt:
+                    events.append((IPCI_IDX, dt, dt, 0.0))
+
+        # RR: cyclic rate resets
+        if attrs.rate_reset_cycle and attrs.rate_reset_anchor:
+            for dt in fast_schedule(attrs.rate_reset_anchor, attrs.rate_reset_cycle, end_date):
+                if ied_dt < dt < end_dt:
+                    events.append((RR_IDX, dt, dt, 0.0))
+
+        # FP: fee payments
+        if attrs.fee_payment_cycle and attrs.fee_payment_anchor:
+            for dt in fast_schedule(attrs.fee_payment_anchor, attrs.fee_payment_cycle, end_date):
+                if ied_dt < dt <= end_dt:
+                    events.append((FP_IDX, dt, dt, 0.0))
+
+        # TD: termination (UMP has no MD event)
+        if td is not None:
+            td_dt = adt_to_dt(td)
+            events.append((TD_IDX, td_dt, td_dt, 0.0))
+
+    # Stable sort on time only, like the scalar path
+    events.sort(key=lambda e: e[1])
+    return events
+
+
+def _precompute_raw(
+    attrs: ContractAttributes,
+    rf_observer: RiskFactorObserver,
+) -> RawPrecomputed:
+    """Pre-compute all data as pure Python types (no JAX arrays)."""
+    from jactus.core.types import DayCountConvention
+
+    full_schedule = _fast_ump_schedule(attrs, _deposit_transactions(attrs, rf_observer))
+    schedule = [(evt_idx, evt_dt, calc_dt) for evt_idx, evt_dt, calc_dt, _ in full_schedule]
+
+    # rf_values: transaction amount at PR/PI, observed rate at RR
+    identifier = attrs.rate_reset_market_object or "RATE"
+    rf_values: list[float] = []
+    for evt_idx, evt_dt, _calc_dt, amount in full_schedule:
+        rf_val = amount
+        if evt_idx == RR_IDX:
+            try:
+                rf_val = float(rf_observer.observe_risk_factor(identifier, dt_to_adt(evt_dt)))
+            except (KeyError, NotImplementedError, TypeError):
+                rf_val = 0.0
+        rf_values.append(rf_val)
+
+    # The scalar UMP starts from an empty state and only sets it at IED
+    dcc = attrs.day_count_convention or DayCountConvention.A360
+    return RawPrecomputed(
+        state=(0.0, 0.0, 0.0, 0.0, 1.0, 1.0),
+        event_types=[evt_idx for evt_idx, _, _ in schedule],
+        year_fractions=compute_vectorised_year_fractions(
+            schedule, adt_to_dt(attrs.status_date), dcc
+        ),
+        rf_values=rf_values,
+        params=_extract_params_raw(attrs),
+        event_ordinals=[evt_dt.toordinal() for _, evt_dt, _ in schedule],
+    )
+
+
+def _raw_to_jax(
+    raw: RawPrecomputed,
+) -> tuple[UMPArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, UMPArrayParams]:
+    """Convert raw pre-computed data to JAX arrays."""
+    nt, ipnr, ipac, feac, nsc, isc = raw.state
+    return (
+        UMPArrayState(
+            nt=jnp.array(nt, dtype=F32),
+            ipnr=jnp.array(ipnr, dtype=F32),
+            ipac=jnp.array(ipac, dtype=F32),
+            feac=jnp.array(feac, dtype=F32),
+            nsc=jnp.array(nsc, dtype=F32),
+            isc=jnp.array(isc, dtype=F32),
+        ),
+        jnp.array(raw.event_types, dtype=jnp.int32),
+        jnp.array(raw.year_fractions, dtype=F32),
+        jnp.array(raw.rf_values, dtype=F32),
+        _params_raw_to_jax(raw.params),
+    )
+
+
+def precompute_ump_arrays(
+    attrs: ContractAttributes,
+    rf_observer: RiskFactorObserver,
+) -> tuple[UMPArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, UMPArrayParams]:
+    """Pre-compute JAX arrays for array-mode UMP simulation.
+
+    Generates the event schedule directly from attributes (bypassing
+    ``UndefinedMaturityProfileContract``), merges in the contract's deposit
+    transactions, and converts to JAX arrays suitable for
+    ``simulate_ump_array``.
+
+    Args:
+        attrs: Contract attributes (must be UMP type).
+        rf_observer: Risk factor observer.  A ``DepositTransactionObserver``
+            supplies the PR/PI amounts; RR events query it for
+            ``rate_reset_market_object``.
+
+    Returns:
+        ``(initial_state, event_types, year_fractions, rf_values, params)``
+    """
+    return _raw_to_jax(_precompute_raw(attrs, rf_observer))
+
+
+# ============================================================================
+# Batch / portfolio API
+# ============================================================================
+
+
+def _raw_list_to_jax_batch(
+    raw_list: list[RawPrecomputed],
+) -> tuple[UMPArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, UMPArrayParams, jnp.ndarray]:
+    """Convert a list of ``RawPrecomputed`` to padded JAX batch arrays.
+
+    Writes directly into pre-allocated NumPy arrays, then transfers to JAX
+    via ``jnp.asarray``.
+    """
+    float_dtype = state_dtype()
+    n = len(raw_list)
+    max_events = max(max((len(r.event_types) for r in raw_list), default=0), 1)
+
+    et = np.full((n, max_events), NOP_EVENT_IDX, dtype=np.int32)
+    yf = np.zeros((n, max_events), dtype=float_dtype)
+    rf = np.zeros((n, max_events), dtype=float_dtype)
+    mask = np.zeros((n, max_events), dtype=float_dtype)
+    state = np.zeros((len(UMPArrayState._fields), n), dtype=float_dtype)
+    param = np.zeros((len(UMPArrayParams._fields), n), dtype=float_dtype)
+
+    for i, r in enumerate(raw_list):
+        n_ev = len(r.event_types)
+        et[i, :n_ev] = r.event_types
+        yf[i, :n_ev] = r.year_fractions
+        rf[i, :n_ev] = r.rf_values
+        mask[i, :n_ev] = 1.0
+        state[:, i] = r.state
+        for k, name in enumerate(UMPArrayParams._fields):
+            param[k, i] = r.params[name]
+
+    return (
+        UMPArrayState(*(jnp.asarray(s) for s in state)),
+        jnp.asarray(et),
+        jnp.asarray(yf),
+        jnp.asarray(rf),
+        UMPArrayParams(*(jnp.asarray(p) for p in param)),
+        jnp.asarray(mask),
+    )
+
+
+def prepare_ump_batch(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
+) -> tuple[UMPArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, UMPArrayParams, jnp.ndarray]:
+    """Pre-compute and pad arrays for a batch of UMP contracts.
+
+    Args:
+        contracts: List of ``(attributes, rf_observer)`` pairs.
+        workers: If greater than 1, run the per-contract pre-computation
+            in a pool of this many processes (see
+            :func:`~jactus.contracts.array_common.precompute_raw_list`).
+
+    Returns:
+        ``(initial_states, event_types, year_fractions, rf_values, params, masks)``
+        where each array has a leading batch dimension.
+    """
+    return _prepare_ump_batch_dated(contracts, workers)[0]
+
+
+def _prepare_ump_batch_dated(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    workers: int | None = None,
+) -> tuple[
+    tuple[UMPArrayState, jnp.ndarray, jnp.ndarray, jnp.ndarray, UMPArrayParams, jnp.ndarray],
+    jnp.ndarray,
+]:
+    """``prepare_ump_batch`` plus the ``[B, T]`` int32 event ordinals."""
+    raw_list = precompute_raw_list(_precompute_raw, contracts, workers)
+    batch = _raw_list_to_jax_batch(raw_list)
+    return batch, pad_event_ordinals([r.event_ordinals for r in raw_list], batch[1].shape[1])
+
+
+def simulate_ump_portfolio(
+    contracts: list[tuple[ContractAttributes, RiskFactorObserver]],
+    discount_rate: float | None = None,
+    year_fractions_from_valuation: jnp.ndarray | None = None,
+    length_buckets: int | None = None,
+    pad_shape: tuple[int, int] | None = None,
+    devices: int | Sequence[Any] | None = None,
+    canonical_shapes: CanonicalShapes | bool | None = None,
+    precision: PrecisionPolicy | str | None = None,
+    rf_scenarios: RFScenarios | None = None,
+    scenario_output: str = "payoffs",
+    scenario_batch_size: int | None = None,
+) -> dict[str, Any]:
+    """End-to-end UMP portfolio simulation with optional PV.
+
+    Args:
+        contracts: List of ``(attributes, rf_observer)`` pairs.
+        discount_rate: If provided, compute present values.
+        year_fractions_from_valuation: ``(batch, max_events)`` year fractions
+            from valuation date for PV discounting.  If ``None`` and
+            ``discount_rate`` is set, year fractions are computed from each
+            contract's ``status_date``.
+        length_buckets: If set, sort contracts by event count and
+            simulate them in at most this many length buckets, each
+            trimmed to its own longest contract, instead of padding the
+            whole batch to the longest one.
+        pad_shape: If set, pad the batch to at least ``(rows, events)``
+            (events rounded up to a power of two) so repeated calls reuse
+            one compiled kernel; used by chunked streaming.
+        devices: If set, shard the batch axis across this many JAX devices
+            (or this list of devices); results come back in input order.
+        canonical_shapes: If set, pad the batch up to canonical sizes
+            (``True`` for powers of two, or a ``CanonicalShapes`` of
+            allowed sizes) so portfolios of similar size reuse one
+            compiled kernel.
+        precision: Precision policy (``"f32"``, ``"f64"``, ``"mixed"`` or a
+            ``PrecisionPolicy``); defaults to the active policy.  Sets the
+            dtype of the prepared batch and of payoff and PV accumulation.
+        rf_scenarios: If set, an ``[S, B, T]`` array of risk-factor values
+            (or a callable ``(event_ordinals, rf_values) -> [S, B, T]``)
+            run against the shared schedules and parameters in one
+            compiled call; see
+            :func:`~jactus.contracts.array_common.simulate_scenarios`.
+        scenario_output: ``"payoffs"``, ``"totals"`` or ``"portfolio"``
+            (sum over contracts on device), with ``rf_scenarios``.
+        scenario_batch_size: Scenarios evaluated at once with
+            ``rf_scenarios``; ``None`` runs them all together.
+
+    Returns:
+        Dict with ``payoffs``, ``masks``, ``event_ordinals``,
+        ``final_states``, optionally ``present_values`` and ``total_pv``, and
+        ``length_buckets`` (the :class:`LengthBuckets` plan) or
+        ``padded_shape`` when bucketing or padding.  With ``rf_scenarios``
+        the totals and present values gain a leading ``[S]`` axis (see
+        :func:`~jactus.contracts.array_common.simulate_scenarios`).
+    """
+    policy = resolve_precision(precision)
+    with precision_scope(policy):
+        batch, event_ordinals = _prepare_ump_batch_dated(contracts)
+    (
+        batched_states,
+        batched_et,
+        batched_yf,
+        batched_rf,
+        batched_params,
+        batched_masks,
+    ) = batch
+
+    if rf_scenarios is not None:
+        check_scenario_options(
+            length_buckets=length_buckets,
+            pad_shape=pad_shape,
+            devices=devices,
+            canonical_shapes=canonical_shapes,
+        )
+        scenario_result = simulate_scenarios(
+            batch_simulate_ump_auto,
+            batched_states,
+            (batched_et, batched_yf, batched_rf),
+            batched_params,
+            batched_masks,
+            event_ordinals,
+            rf_scenarios,
+            accumulate_dtype=policy.accumulate_dtype,
+            discount_rate=discount_rate,
+            year_fractions_from_valuation=year_fractions_from_valuation,
+            output=scenario_output,
+            scenario_batch_size=scenario_batch_size,
+        )
+        scenario_result["num_contracts"] = len(contracts)
+        return scenario_result
+
+    final_states, payoffs, layout = run_batch_kernel(
+        batch_simulate_ump_auto,
+        batched_states,
+        (batched_et, batched_yf, batched_rf),
+        batched_params,
+        batched_masks,
+        length_buckets=length_buckets,
+        pad_shape=pad_shape,
+        devices=devices,
+        canonical_shapes=canonical_shapes,
+    )
+
+    # Mask padding
+    masked_payoffs = payoffs.astype(policy.accumulate_dtype) * batched_masks
+    total_cashflows = jnp.sum(masked_payoffs, axis=1)
+
+    result: dict[str, Any] = {
+        "payoffs": masked_payoffs,
+        "masks": batched_masks,
+        "event_ordinals": event_ordinals,
+        "final_states": final_states,
+        "total_cashflows": total_cashflows,
+        "num_contracts": len(contracts),
+    }
+    result.update(layout)
+
+    if discount_rate is not None:
+        if year_fractions_from_valuation is not None:
+            disc_yfs = year_fractions_from_valuation
+        else:
+            disc_yfs = jnp.cumsum(batched_yf.astype(policy.accumulate_dtype), axis=1)
+        discount_factors = 1.0 / (1.0 + discount_rate * disc_yfs)
+        pvs = jnp.sum(masked_payoffs * discount_factors, axis=1)
+        result["present_values"] = pvs
+        result["total_pv"] = jnp.sum(pvs)
+
+    return result
@@ -1,5 +1,14 @@
 """Simulation and portfolio engines for contract evaluation."""
 
+from jactus.contracts.array_common import (
+    CanonicalShapes,
+    PrecisionPolicy,
+    configure_compilation_cache,
+    get_precision,
+    precision_scope,
+    set_precision,
+)
+from jactus.engine.aggregation import CashflowBuckets, aggregate_cashflows
 from jactus.engine.lifecycle import (
     ContractPhase,
     calculate_contract_end,
@@ -18,6 +27,7 @@ from jactus.engine.vectorized import (
     BatchSimulationResult,
     validate_pam_for_array_mode,
 )
+from jactus.engine.warmup import WarmupReport, warmup
 
 __all__ = [
     # Lifecycle management
@@ -26,6 +36,19 @@ __all__ = [
     "filter_events_by_lifecycle",
     "get_contract_phase",
     "is_contract_active",
+    # Compilation
+    "CanonicalShapes",
+    "configure_compilation_cache",
+    "WarmupReport",
+    "warmup",
+    # Precision
+    "PrecisionPolicy",
+    "get_precision",
+    "precision_scope",
+    "set_precision",
+    # Aggregation
+    "CashflowBuckets",
+    "aggregate_cashflows",
     # Simulation
     "ContractSimulator",
     "SimulationResult",
@@ -37,9 +37,11 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 import jax.numpy as jnp
+import numpy as np
 import pandas as pd
 
 from jactus.core import ActusDateTime, ContractEvent, ContractState
+from jactus.engine.aggregation import aggregate_cashflows
 from jactus.observers import ChildContractObserver, RiskFactorObserver
 
 if TYPE_CHECKING:
@@ -406,7 +408,9 @@ def create_cashflow_matrix(
     """Create cashflow matrix from multiple simulation results.
 
     Creates a 2D matrix where rows are contracts and columns are time points.
-    Each cell contains the total cashflow for that contract at that time point.
+    Each cell contains the total cashflow for that contract on the calendar
+    day of that time point.  The events are packed into padded arrays and
+    bucketed with :func:`~jactus.engine.aggregation.aggregate_cashflows`.
 
     Args:
         results: List of simulation results
@@ -428,16 +432,29 @@ def create_cashflow_matrix(
         >>> quarterly_totals = matrix.sum(axis=0)
     """
     num_contracts = len(results)
-    num_time_points = len(time_points)
-
-    # Initialize matrix
-    cashflow_matrix = jnp.zeros((num_contracts, num_time_points))
-
-    # Fill matrix
+    if num_contracts == 0 or not time_points:
+        return jnp.zeros((num_contracts, len(time_points)))
+
+    # Pack events into padded [N, T] arrays
+    max_events = max(1, max(len(r.events) for r in results))
+    payoffs = np.zeros((num_contracts, max_events), dtype=np.float32)
+    masks = np.zeros((num_contracts, max_events), dtype=np.float32)
+    ordinals = np.zeros((num_contracts, max_events), dtype=np.int32)
     for i, result in enumerate(results):
-        for j, time_point in enumerate(time_points):
-            # Sum all cashflows at this time point
-            total_cf = sum(float(e.payoff) for e in result.events if e.event_time == time_point)
-            cashflow_matrix = cashflow_matrix.at[i, j].set(total_cf)
-
-    return cashflow_matrix
+        for j, event in enumerate(result.events):
+            payoffs[i, j] = float(event.payoff)
+            masks[i, j] = 1.0
+            ordinals[i, j] = event.event_time.to_datetime().toordinal()
+
+    # One-day buckets [d, d + 1) per requested day; the gaps between them
+    # are buckets of their own that are simply not selected.
+    days = [tp.to_datetime().toordinal() for tp in time_points]
+    edges = sorted(set(days) | {d + 1 for d in days})
+    column = {d: k for k, d in enumerate(edges)}
+
+    buckets = aggregate_cashflows(
+        {"payoffs": payoffs, "masks": masks, "event_ordinals": ordinals},
+        grid=edges,
+        by="contract",
+    )
+    return buckets.amounts[:, jnp.asarray([column[d] for d in days])]
@@ -0,0 +1,237 @@
+"""Ahead-of-time compilation of the array-mode batch kernels.
+
+The first :func:`~jactus.contracts.portfolio.simulate_portfolio` call in a
+fresh process traces and compiles every ``batch_simulate_<type>`` kernel
+it touches.  :func:`warmup` pays that cost up front: it lowers and
+compiles each requested kernel for the declared ``[B, T]`` shapes on
+zero-filled inputs, which populates JAX's in-process executable cache (and
+the persistent cache, when
+:func:`~jactus.contracts.array_common.configure_compilation_cache` is
+set), so later calls with the same shapes dispatch immediately.
+
+Example:
+    >>> from jactus.engine import warmup
+    >>> report = warmup(types=["PAM", "LAM"], shapes=[(1024, 128)])
+    >>> report.total_seconds  # compile time paid at boot
+"""
+
+from __future__ import annotations
+
+import importlib
+import time
+from collections.abc import Iterable, Sequence
+from typing import Any, NamedTuple
+
+import jax.numpy as jnp
+
+from jactus.contracts.array_common import get_precision
+from jactus.core import ContractType
+
+#: Environment variable read by the MCP server: contract types to warm up
+#: (comma separated, or ``all``).
+ENV_WARMUP_TYPES = "ACTUS_JAX_WARMUP_TYPES"
+
+#: Environment variable read by the MCP server: ``BxT`` shapes to warm up
+#: (comma separated).
+ENV_WARMUP_SHAPES = "ACTUS_JAX_WARMUP_SHAPES"
+
+#: Shapes compiled when none are given.
+DEFAULT_WARMUP_SHAPES: tuple[tuple[int, int], ...] = ((1024, 128),)
+
+# Params fields encoded as int32 by the ``prepare_<type>_batch`` functions
+_INT_PARAM_FIELDS = frozenset({"fee_basis", "penalty_type", "ipcb_mode"})
+
+
+class _KernelSpec(NamedTuple):
+    """Where a type's batch kernel lives and how to build its inputs."""
+
+    module: str
+    kernel: str
+    state: str
+    params: str
+    extra_event_arrays: int = 0
+
+
+# Contract type -> batch kernel.  ANN reuses the NAM kernel; composite types
+# (CAPFL, SWAPS, CEG, CEC) run their children's kernels.
+_KERNELS: dict[ContractType, _KernelSpec] = {
+    ContractType.PAM: _KernelSpec(
+        "jactus.contracts.pam_array", "batch_simulate_pam", "PAMArrayState", "PAMArrayParams"
+    ),
+    ContractType.LAM: _KernelSpec(
+        "jactus.contracts.lam_array", "batch_simulate_lam", "LAMArrayState", "LAMArrayParams"
+    ),
+    ContractType.NAM: _KernelSpec(
+        "jactus.contracts.nam_array", "batch_simulate_nam", "NAMArrayState", "NAMArrayParams"
+    ),
+    ContractType.ANN: _KernelSpec(
+        "jactus.contracts.nam_array", "batch_simulate_nam", "NAMArrayState", "NAMArrayParams"
+    ),
+    ContractType.LAX: _KernelSpec(
+        "jactus.contracts.lax_array", "batch_simulate_lax", "LAXArrayState", "LAXArrayParams", 1
+    ),
+    ContractType.CLM: _KernelSpec(
+        "jactus.contracts.clm_array", "batch_simulate_clm", "CLMArrayState", "CLMArrayParams"
+    ),
+    ContractType.UMP: _KernelSpec(
+        "jactus.contracts.ump_array", "batch_simulate_ump", "UMPArrayState", "UMPArrayParams"
+    ),
+    ContractType.SWPPV: _KernelSpec(
+        "jactus.contracts.swppv_array",
+        "batch_simulate_swppv",
+        "SWPPVArrayState",
+        "SWPPVArrayParams",
+    ),
+    ContractType.CSH: _KernelSpec(
+        "jactus.contracts.csh_array", "batch_simulate_csh", "CSHArrayState", "CSHArrayParams"
+    ),
+    ContractType.STK: _KernelSpec(
+        "jactus.contracts.stk_array", "batch_simulate_stk", "STKArrayState", "STKArrayParams"
+    ),
+    ContractType.COM: _KernelSpec(
+        "jactus.contracts.com_array", "batch_simulate_com", "COMArrayState", "COMArrayParams"
+    ),
+    ContractType.FXOUT: _KernelSpec(
+        "jactus.contracts.fxout_array",
+        "batch_simulate_fxout",
+        "FXOUTArrayState",
+        "FXOUTArrayParams",
+    ),
+    ContractType.FUTUR: _KernelSpec(
+        "jactus.contracts.futur_array",
+        "batch_simulate_futur",
+        "FUTURArrayState",
+        "FUTURArrayParams",
+    ),
+    ContractType.OPTNS: _KernelSpec(
+        "jactus.contracts.optns_array",
+        "batch_simulate_optns",
+        "OPTNSArrayState",
+        "OPTNSArrayParams",
+    ),
+}
+
+#: Contract types :func:`warmup` can pre-compile.
+WARMUP_TYPES: frozenset[ContractType] = frozenset(_KERNELS)
+
+
+class WarmupReport(NamedTuple):
+    """Kernels compiled by :func:`warmup`.
+
+    Attributes:
+        compiled: ``(kernel, (B, T), seconds)`` per compiled kernel and
+            shape, in compilation order.  Types sharing a kernel (ANN and
+            NAM) appear once.
+        total_seconds: Wall time spent lowering and compiling.
+    """
+
+    compiled: list[tuple[str, tuple[int, int], float]]
+    total_seconds: float
+
+
+def _zeros_like_fields(cls: Any, num_rows: int, dtype: Any) -> Any:
+    """Zero-filled ``[B]`` instance of a state or params NamedTuple."""
+    return cls(
+        **{
+            k: jnp.zeros(num_rows, dtype=jnp.int32 if k in _INT_PARAM_FIELDS else dtype)
+            for k in cls._fields
+        }
+    )
+
+
+def _resolve_types(types: Iterable[ContractType | str] | None) -> list[ContractType]:
+    if types is None:
+        return list(_KERNELS)
+    resolved = []
+    for t in types:
+        ct = t if isinstance(t, ContractType) else ContractType(str(t).strip().upper())
+        if ct not in _KERNELS:
+            raise ValueError(
+                f"No batch kernel to warm up for {ct.value}; "
+                f"supported: {', '.join(sorted(c.value for c in _KERNELS))}"
+            )
+        resolved.append(ct)
+    return resolved
+
+
+def warmup(
+    types: Iterable[ContractType | str] | None = None,
+    shapes: Sequence[tuple[int, int]] = DEFAULT_WARMUP_SHAPES,
+) -> WarmupReport:
+    """Lower and compile batch kernels ahead of the first simulation.
+
+    Each kernel is compiled once per ``(B, T)`` shape with the same input
+    dtypes the ``prepare_<type>_batch`` functions produce under the active
+    precision policy (see :func:`~jactus.engine.precision_scope`), so a later
+    ``simulate_<type>_portfolio`` call whose padded batch has that shape
+    skips tracing and XLA compilation.  Declare the shapes the workload
+    will actually hit — with ``canonical_shapes`` padding these are the
+    canonical sizes (powers of two by default).
+
+    Args:
+        types: Contract types (enums or codes such as ``"PAM"``); ``None``
+            warms every type in :data:`WARMUP_TYPES`.
+        shapes: ``(B, T)`` batch shapes to compile for.
+
+    Returns:
+        A :class:`WarmupReport` of the compiled kernels and timings.
+
+    Raises:
+        ValueError: If a type has no batch kernel or a shape is not
+            positive.
+    """
+    for b, t in shapes:
+        if b < 1 or t < 1:
+            raise ValueError(f"Warmup shapes must be positive, got {(b, t)}")
+
+    dtype = get_precision().state_dtype
+    compiled: list[tuple[str, tuple[int, int], float]] = []
+    seen: set[tuple[str, str]] = set()
+    start = time.perf_counter()
+    for ct in _resolve_types(types):
+        spec = _KERNELS[ct]
+        if (spec.module, spec.kernel) in seen:
+            continue
+        seen.add((spec.module, spec.kernel))
+
+        module = importlib.import_module(spec.module)
+        kernel = getattr(module, spec.kernel)
+        for b, t in shapes:
+            t0 = time.perf_counter()
+            event_arrays = [jnp.zeros((b, t), dtype=jnp.int32)] + [
+                jnp.zeros((b, t), dtype=dtype) for _ in range(2 + spec.extra_event_arrays)
+            ]
+            kernel.lower(
+                _zeros_like_fields(getattr(module, spec.state), b, dtype),
+                *event_arrays,
+                _zeros_like_fields(getattr(module, spec.params), b, dtype),
+            ).compile()
+            compiled.append((spec.kernel, (b, t), time.perf_counter() - t0))
+
+    return WarmupReport(compiled=compiled, total_seconds=time.perf_counter() - start)
+
+
+def parse_warmup_shapes(spec: str) -> list[tuple[int, int]]:
+    """Parse ``"1024x128,4096x256"`` into ``[(1024, 128), (4096, 256)]``.
+
+    Raises:
+        ValueError: If an entry is not ``<rows>x<events>``.
+    """
+    shapes = []
+    for part in spec.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        rows, sep, events = part.partition("x")
+        if not sep or not rows.isdigit() or not events.isdigit():
+            raise ValueError(f"Invalid warmup shape {part!r}; expected <rows>x<events>")
+        shapes.append((int(rows), int(events)))
+    return shapes
+
+
+def parse_warmup_types(spec: str) -> list[ContractType] | None:
+    """Parse ``"PAM,LAM"`` into contract types; ``"all"`` or empty means all."""
+    codes = [c.strip() for c in spec.split(",") if c.strip()]
+    if not codes or any(c.lower() == "all" for c in codes):
+        return None
+    return _resolve_types(codes)
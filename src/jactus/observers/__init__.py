@@ -14,12 +14,15 @@ from jactus.observers.deposit_transaction import DepositTransactionObserver
 from jactus.observers.prepayment import PrepaymentSurfaceObserver
 from jactus.observers.risk_factor import (
     BaseRiskFactorObserver,
+    BatchRiskFactorObserver,
     CallbackRiskFactorObserver,
     CompositeRiskFactorObserver,
     ConstantRiskFactorObserver,
     CurveRiskFactorObserver,
     DictRiskFactorObserver,
+    JaxCurveRiskFactorObserver,
     JaxRiskFactorObserver,
+    JaxTimeSeriesRiskFactorObserver,
     RiskFactorObserver,
     TimeSeriesRiskFactorObserver,
 )
@@ -28,6 +31,7 @@ from jactus.observers.scenario import Scenario
 __all__ = [
     # Market risk factor observers
     "RiskFactorObserver",
+    "BatchRiskFactorObserver",
     "BaseRiskFactorObserver",
     "ConstantRiskFactorObserver",
     "DictRiskFactorObserver",
@@ -36,6 +40,8 @@ __all__ = [
     "CallbackRiskFactorObserver",
     "CompositeRiskFactorObserver",
     "JaxRiskFactorObserver",
+    "JaxTimeSeriesRiskFactorObserver",
+    "JaxCurveRiskFactorObserver",
     # Behavioral risk factor observers
     "BehaviorRiskFactorObserver",
     "BaseBehaviorRiskFactorObserver",
@@ -23,16 +23,18 @@ References:
 
 from __future__ import annotations
 
+from datetime import date
 from typing import TYPE_CHECKING, Any
 
 import jax.numpy as jnp
+import numpy as np
 
+from jactus.core.types import EventType
 from jactus.observers.behavioral import BaseBehaviorRiskFactorObserver, CalloutEvent
 from jactus.utilities.surface import Surface2D
 
 if TYPE_CHECKING:
     from jactus.core import ActusDateTime, ContractAttributes, ContractState
-    from jactus.core.types import EventType
 
 
 class PrepaymentSurfaceObserver(BaseBehaviorRiskFactorObserver):
@@ -116,6 +118,31 @@ class PrepaymentSurfaceObserver(BaseBehaviorRiskFactorObserver):
             return float(self.market_observer.observe_risk_factor(self.market_rate_id, time))
         return self.fixed_market_rate
 
+    def market_rates(self, ordinals: np.ndarray) -> np.ndarray:
+        """Market reference rates at many dates at once.
+
+        Used by array mode to feed the in-kernel prepayment lookup.  The
+        companion market observer answers in one
+        ``observe_risk_factor_batch`` call when it implements it.
+
+        Args:
+            ordinals: Observation dates as day ordinals.
+
+        Returns:
+            float64 array shaped like ``ordinals``.
+        """
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        if self.market_observer is None or self.market_rate_id is None:
+            return np.full(ordinals.shape, float(self.fixed_market_rate))
+        observe_batch = getattr(self.market_observer, "observe_risk_factor_batch", None)
+        if observe_batch is not None:
+            return np.asarray(observe_batch(self.market_rate_id, ordinals), dtype=np.float64)
+        from jactus.core import ActusDateTime
+
+        days = [date.fromordinal(int(o)) for o in ordinals.ravel()]
+        rates = [self._get_market_rate(ActusDateTime(d.year, d.month, d.day)) for d in days]
+        return np.array(rates, dtype=np.float64).reshape(ordinals.shape)
+
     def _get_risk_factor(
         self,
         identifier: str,
@@ -162,12 +189,25 @@ class PrepaymentSurfaceObserver(BaseBehaviorRiskFactorObserver):
         state: ContractState | None,
         attributes: ContractAttributes | None,
     ) -> Any:
-        """Prepayment observer does not provide event data.
+        """Prepaid principal for a ``PP`` event.
+
+        The amount is the surface rate times the notional outstanding before
+        the event, which is what the array kernels compute in-kernel, so
+        scalar and array simulations prepay the same principal.
+
+        Returns:
+            Prepaid amount as JAX array, signed like ``state.nt``.
 
         Raises:
-            KeyError: Always.
+            KeyError: For any event type other than ``PP``, or when the
+                contract state is not available.
         """
-        raise KeyError(f"PrepaymentSurfaceObserver does not support event data for '{identifier}'")
+        if event_type != EventType.PP or state is None:
+            raise KeyError(
+                f"PrepaymentSurfaceObserver does not support event data for '{identifier}'"
+            )
+        rate = self._get_risk_factor(identifier, time, state, attributes)
+        return rate * state.nt
 
     def contract_start(
         self,
@@ -0,0 +1,460 @@
+"""Interest-rate sensitivities by automatic differentiation.
+
+Finite-difference risk re-simulates a contract once per bump.  The
+functions here instead differentiate the array-mode batch kernels and the
+discounting that follows them, so a whole portfolio's present values and
+their first and second rate derivatives come out of one compiled
+evaluation per contract type.
+
+:func:`rate_sensitivities` follows the convention of the ``jactus risk``
+CLI: each contract's cash flows are discounted at its own nominal
+interest rate (annual compounding, ``DAYS_PER_YEAR`` basis from the
+status date), and a rate shift moves the coupon rate and the discount
+rate together.
+
+:func:`key_rate_durations` values the same kernels off a zero curve and
+returns the sensitivity of every contract to each key rate of a bucket
+grid — discounting and rate-reset fixings both read the bumped curve —
+from one reverse-mode pass.
+
+Example:
+    >>> from jactus.risk import IRRBB_BUCKETS, key_rate_durations, rate_sensitivities
+    >>> risk = rate_sensitivities(contracts)
+    >>> risk.dv01  # [B] PV change per basis point
+    >>> krd = key_rate_durations(contracts, curve, IRRBB_BUCKETS)
+    >>> krd.dv01  # [B, 19] PV change per basis point of each key rate
+"""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import Sequence
+from functools import partial
+from typing import Any, NamedTuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jactus.contracts.array_common import RR_IDX, adt_to_dt
+from jactus.contracts.discounting import (
+    _check_curve_options,
+    _curve_valuation_ordinals,
+    _interpolate_zero,
+    _zero_discount_factors,
+    as_zero_curve,
+)
+from jactus.core import ActusDateTime, ContractAttributes, ContractType
+from jactus.observers import ConstantRiskFactorObserver
+from jactus.observers.risk_factor import DAYS_PER_YEAR
+
+#: Basis point, the default DV01 scale.
+BASIS_POINT = 1e-4
+
+# Contract type -> (module, dated prepare function, batch kernel).  ANN is
+# left out: its annuity payment is fixed from the nominal rate before the
+# kernel runs, so the kernel alone does not see that dependency.
+_KERNELS: dict[ContractType, tuple[str, str, str]] = {
+    ContractType.PAM: (
+        "jactus.contracts.pam_array",
+        "_prepare_pam_batch_dated",
+        "batch_simulate_pam",
+    ),
+    ContractType.LAM: (
+        "jactus.contracts.lam_array",
+        "_prepare_lam_batch_dated",
+        "batch_simulate_lam",
+    ),
+    ContractType.NAM: (
+        "jactus.contracts.nam_array",
+        "_prepare_nam_batch_dated",
+        "batch_simulate_nam",
+    ),
+}
+
+#: Contract types :func:`rate_sensitivities` can differentiate.
+RISK_TYPES: frozenset[ContractType] = frozenset(_KERNELS)
+
+# Key rates move the curve, not the contract rate, so the swap kernel
+# (whose floating leg resets off the curve) is covered as well.
+_KEY_RATE_KERNELS: dict[ContractType, tuple[str, str, str]] = {
+    **_KERNELS,
+    ContractType.SWPPV: (
+        "jactus.contracts.swppv_array",
+        "_prepare_swppv_batch_dated",
+        "batch_simulate_swppv",
+    ),
+}
+
+#: Contract types :func:`key_rate_durations` can differentiate.
+KEY_RATE_TYPES: frozenset[ContractType] = frozenset(_KEY_RATE_KERNELS)
+
+#: Midpoints in years of the 19 IRRBB standardised time buckets
+#: (overnight to beyond 20 years).
+IRRBB_BUCKETS: tuple[float, ...] = (
+    0.0028,
+    0.0417,
+    0.1667,
+    0.375,
+    0.625,
+    0.875,
+    1.25,
+    1.75,
+    2.5,
+    3.5,
+    4.5,
+    5.5,
+    6.5,
+    7.5,
+    8.5,
+    9.5,
+    12.5,
+    17.5,
+    25.0,
+)
+
+
+class RateSensitivities(NamedTuple):
+    """Per-contract rate risk, each field ``[B]`` in input order.
+
+    Attributes:
+        present_values: PV at the unshifted rate.
+        delta: ``dPV/dr``.
+        gamma: ``d2PV/dr2``.
+        dv01: PV change for a ``bump`` rate rise (first-order).
+        modified_duration: ``-dPV/dr / PV`` in years.
+        macaulay_duration: ``modified_duration * (1 + r)``.
+        convexity: ``d2PV/dr2 / PV`` in years squared.
+    """
+
+    present_values: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    dv01: np.ndarray
+    modified_duration: np.ndarray
+    macaulay_duration: np.ndarray
+    convexity: np.ndarray
+
+
+class KeyRateSensitivities(NamedTuple):
+    """Per-contract key-rate risk, rows in input order.
+
+    Attributes:
+        buckets: ``[K]`` key-rate tenors in years.
+        present_values: ``[B]`` PV off the unbumped curve.
+        dv01: ``[B, K]`` PV change for a 1bp rise of each key rate.
+        durations: ``[B, K]`` key-rate durations ``-dPV/dk / PV`` in years
+            (0 where the PV is 0).  Each row sums to the effective
+            duration for a parallel shift.
+    """
+
+    buckets: np.ndarray
+    present_values: np.ndarray
+    dv01: np.ndarray
+    durations: np.ndarray
+
+
+def _as_pair(contract: Any) -> tuple[ContractAttributes, Any]:
+    if isinstance(contract, tuple):
+        return contract
+    return contract, ConstantRiskFactorObserver(0.0)
+
+
+@partial(jax.jit, static_argnums=0)
+def _rate_risk(
+    kernel: Any,
+    states: Any,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    params: Any,
+    masks: jnp.ndarray,
+    times: jnp.ndarray,
+) -> tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+    """``(PV, dPV/dr, d2PV/dr2)`` per row for a parallel rate shift.
+
+    Rows are independent, so the gradient of the summed PV is the
+    per-row first derivative and its JVP along a ones tangent is the
+    Hessian diagonal — the per-row second derivative.
+    """
+    base_rate = params.nominal_interest_rate
+    # Rows already past IED start with the coupon rate and the interest
+    # accrued at it in the state; the rest pick both up from params at IED.
+    live = states.nt != 0.0
+    # Accrual the prepare step derived from the rate scales with it; an
+    # explicit accrued_interest attribute (the only non-zero source of
+    # params.accrued_interest) is a fixed amount, as in the scalar engine.
+    fixed_accrual = (base_rate == 0.0) | (params.accrued_interest != 0.0)
+    safe_rate = jnp.where(base_rate == 0.0, 1.0, base_rate)
+
+    def present_values(shift: jnp.ndarray) -> jnp.ndarray:
+        rate = base_rate + shift
+        accrual_scale = jnp.where(fixed_accrual, 1.0, rate / safe_rate)
+        shifted_states = states._replace(
+            ipnr=jnp.where(live, states.ipnr + shift, states.ipnr),
+            ipac=jnp.where(live, states.ipac * accrual_scale, states.ipac),
+        )
+        shifted_params = params._replace(
+            nominal_interest_rate=rate, ied_ipac=params.ied_ipac * accrual_scale
+        )
+        _, payoffs = kernel(shifted_states, event_types, year_fractions, rf_values, shifted_params)
+        discount = (1.0 + rate[:, None]) ** (-times)
+        return jnp.sum(payoffs * masks * discount, axis=1)
+
+    def total(shift: jnp.ndarray) -> tuple[jnp.ndarray, jnp.ndarray]:
+        pvs = present_values(shift)
+        return jnp.sum(pvs), pvs
+
+    zero = jnp.zeros_like(base_rate)
+    (first, pvs), (second, _) = jax.jvp(
+        jax.grad(total, has_aux=True), (zero,), (jnp.ones_like(base_rate),)
+    )
+    return pvs, first, second
+
+
+def rate_sensitivities(
+    contracts: Sequence[Any],
+    bump: float = BASIS_POINT,
+    discounted: bool = True,
+) -> RateSensitivities:
+    """PV, DV01, duration and convexity of each contract in one pass per type.
+
+    Contracts are grouped by type and each group is prepared once; the
+    present values and their first and second derivatives with respect
+    to a parallel shift of the nominal rate come from a single jitted
+    forward-over-reverse evaluation of the batch kernel and discounting.
+    Interest accrued before the first simulated event is treated as the
+    scalar engine treats it when the nominal rate attribute is bumped: an
+    explicit ``accrued_interest`` stays fixed, while accrual derived from
+    the rate moves with it.
+
+    Args:
+        contracts: ``ContractAttributes`` or ``(attributes, observer)``
+            pairs of the types in :data:`RISK_TYPES`.  Bare attributes are
+            simulated with a zero ``ConstantRiskFactorObserver``.
+        bump: Rate move that ``dv01`` is quoted for (default 1bp).
+        discounted: Discount at the nominal rate.  ``False`` values each
+            contract as the plain sum of its cash flows.
+
+    Returns:
+        :class:`RateSensitivities` with one entry per contract.  Duration
+        and convexity are 0 where the PV is 0.
+
+    Raises:
+        ValueError: If a contract has no differentiable kernel (see
+            :func:`is_differentiable`).
+    """
+    pairs = [_as_pair(c) for c in contracts]
+    groups = _group_by_type(pairs, _KERNELS)
+
+    n = len(pairs)
+    pvs, first, second, rates = (np.zeros(n) for _ in range(4))
+    for ct, rows in groups.items():
+        module_name, prepare_name, kernel_name = _KERNELS[ct]
+        module = importlib.import_module(module_name)
+        group = [pairs[i] for i in rows]
+        (states, et, yf, rf, params, masks), ordinals = getattr(module, prepare_name)(group)
+        status = np.array([adt_to_dt(a.status_date).toordinal() for a, _ in group])
+        times = jnp.maximum(ordinals - jnp.asarray(status)[:, None], 0) / DAYS_PER_YEAR
+        if not discounted:
+            times = jnp.zeros_like(times)
+        result = _rate_risk(
+            getattr(module, kernel_name),
+            states,
+            et,
+            yf,
+            rf,
+            params,
+            masks,
+            times.astype(yf.dtype),
+        )
+        pvs[rows], first[rows], second[rows] = (np.asarray(x, dtype=np.float64) for x in result)
+        rates[rows] = np.asarray(params.nominal_interest_rate, dtype=np.float64)
+
+    safe_pv = np.where(pvs == 0.0, 1.0, pvs)
+    modified = np.where(pvs == 0.0, 0.0, -first / safe_pv)
+    return RateSensitivities(
+        present_values=pvs,
+        delta=first,
+        gamma=second,
+        dv01=first * bump,
+        modified_duration=modified,
+        macaulay_duration=modified * (1.0 + rates),
+        convexity=np.where(pvs == 0.0, 0.0, second / safe_pv),
+    )
+
+
+def is_differentiable(attrs: ContractAttributes) -> bool:
+    """Whether :func:`rate_sensitivities` can value ``attrs``.
+
+    The type must be in :data:`RISK_TYPES`.  A NAM also needs
+    ``next_principal_redemption_amount``: without it the batch kernel
+    derives a redemption amount where the scalar contract redeems
+    nothing, so the two would value different contracts.
+    """
+    return _unsupported_reason(attrs, _KERNELS) is None
+
+
+def _unsupported_reason(attrs: ContractAttributes, kernels: dict[ContractType, Any]) -> str | None:
+    if attrs.contract_type not in kernels:
+        return (
+            f"No differentiable kernel for {attrs.contract_type.value}; "
+            f"supported: {', '.join(sorted(c.value for c in kernels))}"
+        )
+    if attrs.contract_type == ContractType.NAM and attrs.next_principal_redemption_amount is None:
+        return (
+            f"No differentiable kernel for NAM contract {attrs.contract_id} "
+            "without next_principal_redemption_amount"
+        )
+    return None
+
+
+def _group_by_type(
+    pairs: list[tuple[ContractAttributes, Any]], kernels: dict[ContractType, Any]
+) -> dict[ContractType, list[int]]:
+    """Row indices per contract type, rejecting contracts without a kernel."""
+    groups: dict[ContractType, list[int]] = {}
+    for i, (attrs, _) in enumerate(pairs):
+        reason = _unsupported_reason(attrs, kernels)
+        if reason is not None:
+            raise ValueError(reason)
+        groups.setdefault(attrs.contract_type, []).append(i)
+    return groups
+
+
+@partial(jax.jit, static_argnums=(0, 1, 2))
+def _key_rate_risk(
+    kernel: Any,
+    interpolation: str,
+    compounding: str,
+    states: Any,
+    event_types: jnp.ndarray,
+    year_fractions: jnp.ndarray,
+    rf_values: jnp.ndarray,
+    params: Any,
+    masks: jnp.ndarray,
+    times: jnp.ndarray,
+    tenors: jnp.ndarray,
+    rates: jnp.ndarray,
+    buckets: jnp.ndarray,
+) -> tuple[jnp.ndarray, jnp.ndarray]:
+    """``(PV [B], dPV/dk [B, K])`` for key-rate shifts of the zero curve.
+
+    Key rate ``k`` moves the zero curve by a tent that peaks at its bucket
+    and falls to zero at the neighbouring buckets (flat beyond the end
+    buckets).  Every row gets its own ``[K]`` shifts, so the gradient of
+    the summed PV is the full ``[B, K]`` matrix in one reverse pass.
+    """
+    num_buckets = buckets.shape[0]
+    left = jnp.clip(jnp.searchsorted(buckets, times, side="right") - 1, 0, num_buckets - 1)
+    right = jnp.minimum(left + 1, num_buckets - 1)
+    span = buckets[right] - buckets[left]
+    weight = jnp.where(
+        span > 0.0, jnp.clip((times - buckets[left]) / jnp.where(span > 0.0, span, 1.0), 0, 1), 0.0
+    )
+    zero = _interpolate_zero(tenors, rates, times, interpolation).astype(times.dtype)
+    is_reset = event_types == RR_IDX
+
+    def present_values(shifts: jnp.ndarray) -> jnp.ndarray:
+        shift = jnp.take_along_axis(shifts, left, axis=1) * (1.0 - weight)
+        shift = shift + jnp.take_along_axis(shifts, right, axis=1) * weight
+        rate = zero + shift
+        # RR fixings are the (bumped) zero rate at the reset date
+        _, payoffs = kernel(
+            states, event_types, year_fractions, jnp.where(is_reset, rate, rf_values), params
+        )
+        discount = _zero_discount_factors(rate, times, compounding)
+        return jnp.sum(payoffs * masks * discount, axis=1)
+
+    def total(shifts: jnp.ndarray) -> tuple[jnp.ndarray, jnp.ndarray]:
+        pvs = present_values(shifts)
+        return jnp.sum(pvs), pvs
+
+    shifts = jnp.zeros((times.shape[0], num_buckets), dtype=times.dtype)
+    grads, pvs = jax.grad(total, has_aux=True)(shifts)
+    return pvs, grads
+
+
+def key_rate_durations(
+    contracts: Sequence[Any],
+    curve: Any,
+    buckets: Sequence[float] = IRRBB_BUCKETS,
+    valuation_date: ActusDateTime | None = None,
+    compounding: str = "continuous",
+    curve_identifier: str | None = None,
+) -> KeyRateSensitivities:
+    """Bucketed DV01 and key-rate durations of each contract off a zero curve.
+
+    Contracts are valued as in
+    :func:`~jactus.contracts.discounting.discount_cashflows`, except that
+    rate-reset fixings are also read from the curve (the zero rate at the
+    reset date), so a key-rate bump moves both the floating coupons and
+    the discount factors.  Contract rates, and the interest accrued at
+    them before the first simulated event, do not move with the curve.
+    The ``[B, K]`` sensitivities come from one jitted reverse-mode pass
+    per contract type instead of ``K`` bump-and-reprice runs.
+
+    Args:
+        contracts: ``ContractAttributes`` or ``(attributes, observer)``
+            pairs of the types in :data:`KEY_RATE_TYPES`.  The observer
+            still supplies any non-rate risk factors.
+        curve: ``ZeroCurve``, ``(tenors, rates)`` pair,
+            ``CurveRiskFactorObserver`` or ``JaxCurveRiskFactorObserver``.
+        buckets: Strictly increasing key-rate tenors in years; defaults to
+            :data:`IRRBB_BUCKETS`.
+        valuation_date: Common valuation date.  Defaults to the curve's
+            reference date, else each contract's ``status_date``.
+        compounding: One of
+            :data:`~jactus.contracts.discounting.COMPOUNDING`.
+        curve_identifier: Curve to use from a multi-curve observer.
+
+    Returns:
+        :class:`KeyRateSensitivities`.
+
+    Raises:
+        ValueError: If a contract has no differentiable kernel, the
+            buckets are empty or not increasing, or the curve options are
+            unknown.
+    """
+    bucket_array = np.asarray(buckets, dtype=np.float64)
+    if bucket_array.ndim != 1 or bucket_array.size == 0 or np.any(np.diff(bucket_array) <= 0):
+        raise ValueError("buckets must be a non-empty, strictly increasing sequence of tenors")
+    zero_curve = as_zero_curve(curve, curve_identifier)
+    _check_curve_options(zero_curve, compounding)
+
+    pairs = [_as_pair(c) for c in contracts]
+    groups = _group_by_type(pairs, _KEY_RATE_KERNELS)
+    pvs = np.zeros(len(pairs))
+    grads = np.zeros((len(pairs), bucket_array.size))
+    for ct, rows in groups.items():
+        module_name, prepare_name, kernel_name = _KEY_RATE_KERNELS[ct]
+        module = importlib.import_module(module_name)
+        group = [pairs[i] for i in rows]
+        (states, et, yf, rf, params, masks), ordinals = getattr(module, prepare_name)(group)
+        valuation = _curve_valuation_ordinals(curve, valuation_date, group, len(group))
+        times = (jnp.maximum(ordinals - valuation, 0) / DAYS_PER_YEAR).astype(yf.dtype)
+        group_pvs, group_grads = _key_rate_risk(
+            getattr(module, kernel_name),
+            zero_curve.interpolation,
+            compounding,
+            states,
+            et,
+            yf,
+            rf,
+            params,
+            masks,
+            times,
+            jnp.asarray(zero_curve.tenors, dtype=yf.dtype),
+            jnp.asarray(zero_curve.rates, dtype=yf.dtype),
+            jnp.asarray(bucket_array, dtype=yf.dtype),
+        )
+        pvs[rows] = np.asarray(group_pvs, dtype=np.float64)
+        grads[rows] = np.asarray(group_grads, dtype=np.float64)
+
+    safe_pv = np.where(pvs == 0.0, 1.0, pvs)[:, None]
+    return KeyRateSensitivities(
+        buckets=bucket_array,
+        present_values=pvs,
+        dv01=grads * BASIS_POINT,
+        durations=np.where(pvs[:, None] == 0.0, 0.0, -grads / safe_pv),
+    )
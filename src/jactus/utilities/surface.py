@@ -11,6 +11,8 @@ Key features:
 - Bilinear interpolation on 2D grids
 - Configurable extrapolation: ``"constant"`` (nearest edge) or ``"raise"``
 - JAX array storage for automatic differentiation compatibility
+- Vectorised, jittable lookups (``Surface2D.evaluate_batch``,
+  ``LabeledSurface2D.get_batch``) for whole pools of contracts
 - Support for both numeric and label-based margins via ``LabeledSurface2D``
 
 References:
@@ -19,11 +21,55 @@ References:
 
 from __future__ import annotations
 
-import bisect
 from dataclasses import dataclass
 from typing import Any
 
+import jax
 import jax.numpy as jnp
+import numpy as np
+
+
+def bilinear_interpolate(
+    x_margins: jnp.ndarray,
+    y_margins: jnp.ndarray,
+    values: jnp.ndarray,
+    xs: jnp.ndarray,
+    ys: jnp.ndarray,
+) -> jnp.ndarray:
+    """Bilinear interpolation on a rectangular grid, clamped at the edges.
+
+    Pure ``jnp``: query points are bracketed with ``jnp.searchsorted`` and
+    clamped to the grid, so the function can be jitted, vmapped and
+    differentiated with respect to ``values``.
+
+    Args:
+        x_margins: Sorted ``[Nx]`` x-axis breakpoints.
+        y_margins: Sorted ``[Ny]`` y-axis breakpoints.
+        values: ``[Nx, Ny]`` grid values.
+        xs: X query values (any shape).
+        ys: Y query values, broadcastable with ``xs``.
+
+    Returns:
+        Interpolated values with the broadcast shape of ``xs`` and ``ys``.
+    """
+    xs, ys = jnp.broadcast_arrays(jnp.asarray(xs), jnp.asarray(ys))
+    x_c = jnp.clip(xs, x_margins[0], x_margins[-1])
+    y_c = jnp.clip(ys, y_margins[0], y_margins[-1])
+
+    xi = jnp.clip(jnp.searchsorted(x_margins, x_c, side="right") - 1, 0, x_margins.shape[0] - 2)
+    yi = jnp.clip(jnp.searchsorted(y_margins, y_c, side="right") - 1, 0, y_margins.shape[0] - 2)
+
+    x0, x1 = x_margins[xi], x_margins[xi + 1]
+    y0, y1 = y_margins[yi], y_margins[yi + 1]
+    x_frac = jnp.where(x1 != x0, (x_c - x0) / jnp.where(x1 != x0, x1 - x0, 1.0), 0.0)
+    y_frac = jnp.where(y1 != y0, (y_c - y0) / jnp.where(y1 != y0, y1 - y0, 1.0), 0.0)
+
+    return (
+        values[xi, yi] * (1 - x_frac) * (1 - y_frac)
+        + values[xi + 1, yi] * x_frac * (1 - y_frac)
+        + values[xi, yi + 1] * (1 - x_frac) * y_frac
+        + values[xi + 1, yi + 1] * x_frac * y_frac
+    )
 
 
 @dataclass(frozen=True)
@@ -108,52 +154,49 @@ class Surface2D:
         Example:
             >>> value = surface.evaluate(1.5, 2.0)
         """
-        x_arr = [float(v) for v in self.x_margins]
-        y_arr = [float(v) for v in self.y_margins]
-
-        # Handle extrapolation
-        x_clamped, y_clamped = float(x), float(y)
-
-        if x_clamped < x_arr[0] or x_clamped > x_arr[-1]:
-            if self.extrapolation == "raise":
-                raise ValueError(f"x={x} is outside the grid [{x_arr[0]}, {x_arr[-1]}]")
-            x_clamped = max(x_arr[0], min(x_arr[-1], x_clamped))
-
-        if y_clamped < y_arr[0] or y_clamped > y_arr[-1]:
-            if self.extrapolation == "raise":
-                raise ValueError(f"y={y} is outside the grid [{y_arr[0]}, {y_arr[-1]}]")
-            y_clamped = max(y_arr[0], min(y_arr[-1], y_clamped))
-
-        # Find x interval
-        xi = bisect.bisect_right(x_arr, x_clamped) - 1
-        xi = max(0, min(xi, len(x_arr) - 2))
-
-        # Find y interval
-        yi = bisect.bisect_right(y_arr, y_clamped) - 1
-        yi = max(0, min(yi, len(y_arr) - 2))
-
-        # Bilinear interpolation fractions
-        x0, x1 = x_arr[xi], x_arr[xi + 1]
-        y0, y1 = y_arr[yi], y_arr[yi + 1]
-
-        x_frac = (x_clamped - x0) / (x1 - x0) if x1 != x0 else 0.0
-        y_frac = (y_clamped - y0) / (y1 - y0) if y1 != y0 else 0.0
-
-        # Four corner values
-        q00 = float(self.values[xi, yi])
-        q10 = float(self.values[xi + 1, yi])
-        q01 = float(self.values[xi, yi + 1])
-        q11 = float(self.values[xi + 1, yi + 1])
-
-        # Bilinear interpolation
-        result = (
-            q00 * (1 - x_frac) * (1 - y_frac)
-            + q10 * x_frac * (1 - y_frac)
-            + q01 * (1 - x_frac) * y_frac
-            + q11 * x_frac * y_frac
-        )
+        if self.extrapolation == "raise":
+            self._check_in_grid(np.asarray(x), np.asarray(y))
+        return self.evaluate_batch(jnp.asarray(x), jnp.asarray(y)).astype(jnp.float32)
 
-        return jnp.array(result, dtype=jnp.float32)
+    def evaluate_batch(self, xs: jnp.ndarray, ys: jnp.ndarray) -> jnp.ndarray:
+        """Evaluate the surface at many points at once.
+
+        Pure ``jnp`` bilinear interpolation (see :func:`bilinear_interpolate`),
+        usable inside ``jax.jit`` and differentiable with respect to
+        ``values``.  Points outside the grid are clamped to the nearest
+        edge.  With ``extrapolation="raise"`` concrete inputs are checked
+        first; traced inputs cannot be, and are clamped.
+
+        Args:
+            xs: X-axis query values (any shape).
+            ys: Y-axis query values, broadcastable with ``xs``.
+
+        Returns:
+            Interpolated values with the broadcast shape of ``xs`` and ``ys``.
+
+        Raises:
+            ValueError: If ``extrapolation="raise"`` and a concrete point is
+                outside the grid.
+
+        Example:
+            >>> rates = surface.evaluate_batch(spreads, ages)  # [B] each
+        """
+        if self.extrapolation == "raise" and not any(
+            isinstance(a, jax.core.Tracer) for a in (xs, ys)
+        ):
+            self._check_in_grid(np.asarray(xs), np.asarray(ys))
+        return bilinear_interpolate(self.x_margins, self.y_margins, self.values, xs, ys)
+
+    def _check_in_grid(self, xs: np.ndarray, ys: np.ndarray) -> None:
+        """Raise ValueError if any point lies outside the grid."""
+        x_lo, x_hi = float(self.x_margins[0]), float(self.x_margins[-1])
+        y_lo, y_hi = float(self.y_margins[0]), float(self.y_margins[-1])
+        outside_x = xs[(xs < x_lo) | (xs > x_hi)]
+        if outside_x.size:
+            raise ValueError(f"x={outside_x.flat[0]} is outside the grid [{x_lo}, {x_hi}]")
+        outside_y = ys[(ys < y_lo) | (ys > y_hi)]
+        if outside_y.size:
+            raise ValueError(f"y={outside_y.flat[0]} is outside the grid [{y_lo}, {y_hi}]")
 
     @staticmethod
     def from_dict(data: dict[str, Any]) -> Surface2D:
@@ -305,6 +348,53 @@ class LabeledSurface2D:
             raise KeyError(f"y_label '{y_label}' not found. Available: {self.y_labels}")
         return self.values[:, self._y_index[y_label]]
 
+    def indices(self, x_labels: list[str], y_labels: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Map labels to integer grid indices for :meth:`get_batch`.
+
+        Args:
+            x_labels: X-axis labels, one per query.
+            y_labels: Y-axis labels, one per query.
+
+        Returns:
+            ``(x_indices, y_indices)`` int32 arrays.
+
+        Raises:
+            KeyError: If any label is not found.
+        """
+        for label in x_labels:
+            if label not in self._x_index:
+                raise KeyError(f"x_label '{label}' not found. Available: {self.x_labels}")
+        for label in y_labels:
+            if label not in self._y_index:
+                raise KeyError(f"y_label '{label}' not found. Available: {self.y_labels}")
+        return (
+            np.array([self._x_index[label] for label in x_labels], dtype=np.int32),
+            np.array([self._y_index[label] for label in y_labels], dtype=np.int32),
+        )
+
+    def get_batch(self, x_indices: jnp.ndarray, y_indices: jnp.ndarray) -> jnp.ndarray:
+        """Gather values at integer grid indices.
+
+        The indexed counterpart of :meth:`get`: a pure ``jnp`` gather that
+        can be jitted and differentiated with respect to ``values``.
+        Indices are clamped to the grid.
+
+        Args:
+            x_indices: X-axis indices (any shape), e.g. from :meth:`indices`.
+            y_indices: Y-axis indices, broadcastable with ``x_indices``.
+
+        Returns:
+            Values with the broadcast shape of the indices.
+
+        Example:
+            >>> xi, yi = surface.indices(["DEPOSIT-001", "DEPOSIT-002"], ["2024-07-01"] * 2)
+            >>> amounts = surface.get_batch(xi, yi)
+        """
+        return self.values[
+            jnp.clip(jnp.asarray(x_indices), 0, self.values.shape[0] - 1),
+            jnp.clip(jnp.asarray(y_indices), 0, self.values.shape[1] - 1),
+        ]
+
     @staticmethod
     def from_dict(data: dict[str, Any]) -> LabeledSurface2D:
         """Create from dictionary representation.
@@ -328,3 +418,20 @@ class LabeledSurface2D:
             "y_labels": self.y_labels,
             "values": [[float(v) for v in row] for row in self.values],
         }
+
+
+def _surface_unflatten(extrapolation: str, arrays: tuple[Any, ...]) -> Surface2D:
+    """Unflatten Surface2D without re-validating (leaves may be tracers)."""
+    surface = object.__new__(Surface2D)
+    for name, value in zip(("x_margins", "y_margins", "values"), arrays, strict=True):
+        object.__setattr__(surface, name, value)
+    object.__setattr__(surface, "extrapolation", extrapolation)
+    return surface
+
+
+# Register with JAX so surfaces can be passed to jitted functions
+jax.tree_util.register_pytree_node(
+    Surface2D,
+    lambda s: ((s.x_margins, s.y_margins, s.values), s.extrapolation),
+    _surface_unflatten,
+)
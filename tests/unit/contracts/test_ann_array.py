@@ -7,14 +7,18 @@ Tolerance matches the ACTUS cross-validation standard (atol=1.0).
 
 import jax
 import jax.numpy as jnp
+import numpy as np
+import pytest
 
 from jactus.contracts.ann import AnnuityContract
 from jactus.contracts.ann_array import (
     precompute_ann_arrays,
+    prepare_ann_batch,
     simulate_ann_array,
     simulate_ann_array_jit,
     simulate_ann_portfolio,
 )
+from jactus.contracts.array_common import PP_IDX
 from jactus.core import (
     ActusDateTime,
     ContractAttributes,
@@ -22,7 +26,12 @@ from jactus.core import (
     ContractType,
     DayCountConvention,
 )
-from jactus.observers import ConstantRiskFactorObserver, TimeSeriesRiskFactorObserver
+from jactus.observers import (
+    ConstantRiskFactorObserver,
+    PrepaymentSurfaceObserver,
+    TimeSeriesRiskFactorObserver,
+)
+from jactus.utilities.surface import Surface2D
 
 ATOL = 1.0
 
@@ -415,3 +424,44 @@ class TestGradients:
         grad = jax.grad(total_cashflow)(params.nominal_interest_rate)
         assert jnp.isfinite(grad)
         assert float(grad) != 0.0
+
+
+# ============================================================================
+# In-kernel prepayment
+# ============================================================================
+
+
+class TestInKernelPrepayment:
+    """PP amounts looked up from the surface with the live scan state."""
+
+    def test_prepayment_shortens_annuity(self):
+        surface = Surface2D(
+            x_margins=jnp.array([0.0, 0.04]),
+            y_margins=jnp.array([0.0, 5.0]),
+            values=jnp.array([[0.0, 0.0], [0.10, 0.10]]),
+        )
+        observer = PrepaymentSurfaceObserver(surface, fixed_market_rate=0.02, prepayment_cycle="1Y")
+        attrs = _make_fixed_ann_attrs(rate=0.06)
+        with_pp = simulate_ann_portfolio([(attrs, observer)])
+        plain = simulate_ann_portfolio([(attrs, ConstantRiskFactorObserver(0.0))])
+
+        event_types = np.asarray(prepare_ann_batch([(attrs, observer)])[1])[0]
+        payoffs = np.asarray(with_pp["payoffs"])[0]
+        assert np.all(payoffs[event_types == PP_IDX][:3] > 0.0)
+        # Prepaid principal earns no interest: total cashflow drops
+        assert float(with_pp["total_cashflows"][0]) < float(plain["total_cashflows"][0]) - ATOL
+        assert float(with_pp["final_states"].nt[0]) == pytest.approx(0.0, abs=ATOL)
+
+    def test_matches_scalar_path(self):
+        surface = Surface2D(
+            x_margins=jnp.array([0.0, 0.04]),
+            y_margins=jnp.array([0.0, 5.0]),
+            values=jnp.array([[0.0, 0.0], [0.10, 0.10]]),
+        )
+        observer = PrepaymentSurfaceObserver(surface, fixed_market_rate=0.02, prepayment_cycle="1Y")
+        attrs = _make_fixed_ann_attrs(rate=0.06)
+        py_result = _simulate_python_path(attrs, observer)
+        assert any(e.event_type.name == "PP" and float(e.payoff) > 0.0 for e in py_result.events)
+        result = simulate_ann_portfolio([(attrs, observer)])
+        payoffs = np.asarray(result["payoffs"])[0][np.asarray(result["masks"])[0] > 0]
+        _assert_payoffs_match(py_result, jnp.asarray(payoffs))
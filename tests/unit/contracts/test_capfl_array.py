@@ -0,0 +1,268 @@
+"""Equivalence tests for array-mode CAPFL simulation.
+
+Runs identical caps/floors on embedded underlier terms through both the
+Python path (CapFloorContract) and the array-mode path
+(simulate_capfl_array), asserting matching cap/floor payouts.
+Tolerance matches the ACTUS cross-validation standard (atol=1.0).
+"""
+
+import json
+
+import jax
+import jax.numpy as jnp
+import pytest
+
+from jactus.contracts.capfl import CapFloorContract
+from jactus.contracts.capfl_array import (
+    batch_simulate_capfl,
+    precompute_capfl_arrays,
+    prepare_capfl_batch,
+    simulate_capfl_array,
+    simulate_capfl_array_jit,
+    simulate_capfl_portfolio,
+)
+from jactus.core import (
+    ActusDateTime,
+    ContractAttributes,
+    ContractRole,
+    ContractType,
+    EventType,
+)
+from jactus.observers import MockChildContractObserver, TimeSeriesRiskFactorObserver
+
+ATOL = 1.0
+
+_UNDERLYING_TERMS = {
+    "contractType": "PAM",
+    "initialExchangeDate": "2024-01-15T00:00:00",
+    "maturityDate": "2026-01-15T00:00:00",
+    "notionalPrincipal": 1_000_000,
+    "nominalInterestRate": 0.04,
+    "dayCountConvention": "A365",
+    "cycleOfInterestPayment": "P3ML0",
+    "cycleOfRateReset": "P3ML0",
+    "marketObjectCodeOfRateReset": "SOFR",
+}
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+def _make_capfl_attrs(
+    contract_id: str = "CAPFL-TEST",
+    cap: float | None = 0.05,
+    floor: float | None = None,
+    role: ContractRole = ContractRole.BUY,
+    underlying: dict | str | None = None,
+) -> ContractAttributes:
+    """Create CAPFL attributes on a quarterly-resetting PAM underlier."""
+    return ContractAttributes(
+        contract_id=contract_id,
+        contract_type=ContractType.CAPFL,
+        contract_role=role,
+        status_date=ActusDateTime(2024, 1, 1),
+        maturity_date=ActusDateTime(2026, 1, 15),
+        currency="USD",
+        rate_reset_cap=cap,
+        rate_reset_floor=floor,
+        contract_structure=json.dumps(
+            {"Underlying": _UNDERLYING_TERMS if underlying is None else underlying}
+        ),
+    )
+
+
+def _rate_path() -> TimeSeriesRiskFactorObserver:
+    return TimeSeriesRiskFactorObserver(
+        {
+            "SOFR": [
+                (ActusDateTime(2024, 1, 1), 0.030),
+                (ActusDateTime(2024, 6, 1), 0.060),
+                (ActusDateTime(2025, 3, 1), 0.045),
+            ]
+        }
+    )
+
+
+def _simulate_python_path(attrs, rf_observer):
+    """Run simulation through the standard Python path (standalone mode)."""
+    contract = CapFloorContract(attrs, rf_observer, MockChildContractObserver())
+    return contract.simulate()
+
+
+def _simulate_array_path(attrs, rf_observer):
+    """Run simulation through the array-mode path."""
+    arrays = precompute_capfl_arrays(attrs, rf_observer)
+    return simulate_capfl_array(*arrays)
+
+
+def _assert_ip_payoffs_match(py_result, et, payoffs, atol=ATOL):
+    """Assert that Python and array IP payoffs match within tolerance."""
+    py_ip = [float(e.payoff) for e in py_result.events if e.event_type == EventType.IP]
+    arr_ip = [
+        float(p) for t, p in zip(et.tolist(), payoffs, strict=True) if t == EventType.IP.index
+    ]
+    assert len(py_ip) == len(arr_ip), f"IP count mismatch: Python={len(py_ip)}, Array={len(arr_ip)}"
+    for i, (a, p) in enumerate(zip(arr_ip, py_ip, strict=True)):
+        assert abs(a - p) <= atol, f"IP {i}: array={a:.2f}, python={p:.2f}"
+
+
+# ============================================================================
+# End-to-end equivalence tests
+# ============================================================================
+
+
+class TestScanEquivalence:
+    """End-to-end equivalence: simulate_capfl_array vs contract.simulate()."""
+
+    @pytest.mark.parametrize(
+        ("cap", "floor"),
+        [(0.05, None), (None, 0.035), (0.05, 0.035)],
+        ids=["cap", "floor", "collar"],
+    )
+    def test_cap_floor_collar(self, cap, floor):
+        attrs = _make_capfl_attrs(cap=cap, floor=floor)
+        rf_obs = _rate_path()
+        _, et, _, _, _ = precompute_capfl_arrays(attrs, rf_obs)
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_ip_payoffs_match(_simulate_python_path(attrs, rf_obs), et, payoffs)
+
+    def test_seller_role(self):
+        """A seller of protection pays the differential."""
+        attrs = _make_capfl_attrs(role=ContractRole.SEL)
+        rf_obs = _rate_path()
+        _, et, _, _, _ = precompute_capfl_arrays(attrs, rf_obs)
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        assert float(jnp.sum(payoffs)) < 0.0
+        _assert_ip_payoffs_match(_simulate_python_path(attrs, rf_obs), et, payoffs)
+
+    def test_out_of_the_money_pays_nothing(self):
+        attrs = _make_capfl_attrs(cap=0.10)
+        _, payoffs = _simulate_array_path(attrs, _rate_path())
+        assert jnp.allclose(payoffs, 0.0)
+
+    def test_lam_underlier(self):
+        """An amortizing underlier pays on its declining notional."""
+        terms = dict(
+            _UNDERLYING_TERMS,
+            contractType="LAM",
+            cycleOfPrincipalRedemption="P3ML0",
+            nextPrincipalRedemptionPayment=125_000,
+        )
+        rf_obs = _rate_path()
+        pam_attrs = _make_capfl_attrs()
+        lam_attrs = _make_capfl_attrs(underlying=terms)
+        _, pam_payoffs = _simulate_array_path(pam_attrs, rf_obs)
+        _, lam_payoffs = _simulate_array_path(lam_attrs, rf_obs)
+        assert 0.0 < float(jnp.sum(lam_payoffs)) < float(jnp.sum(pam_payoffs))
+
+    def test_underlier_by_reference(self):
+        """An underlier ID is resolved through the ``underliers`` mapping."""
+        from jactus.contracts.capfl_array import _underlier_attributes
+
+        embedded = _make_capfl_attrs()
+        ul_attrs = _underlier_attributes(embedded)
+        by_ref = _make_capfl_attrs(underlying="LOAN-1")
+
+        rf_obs = _rate_path()
+        _, payoffs = _simulate_array_path(embedded, rf_obs)
+        result = simulate_capfl_portfolio([(by_ref, rf_obs)], underliers={"LOAN-1": ul_attrs})
+        assert abs(float(result["total_cashflows"][0]) - float(jnp.sum(payoffs))) <= ATOL
+
+    def test_unresolved_underlier_raises(self):
+        with pytest.raises(ValueError, match="underliers"):
+            precompute_capfl_arrays(_make_capfl_attrs(underlying="LOAN-1"), _rate_path())
+
+
+# ============================================================================
+# Batch equivalence tests
+# ============================================================================
+
+
+class TestBatchEquivalence:
+    """Batch CAPFL simulation equivalence tests."""
+
+    def test_batch_matches_python(self):
+        """Portfolio totals should match the scalar path for each contract."""
+        rf_obs = _rate_path()
+        contracts = [
+            (_make_capfl_attrs(cap=0.05), rf_obs),
+            (_make_capfl_attrs(cap=None, floor=0.035), rf_obs),
+            (_make_capfl_attrs(cap=0.045, floor=0.035, role=ContractRole.SEL), rf_obs),
+        ]
+
+        result = simulate_capfl_portfolio(contracts)
+        for i, (attrs, obs) in enumerate(contracts):
+            py_total = sum(float(e.payoff) for e in _simulate_python_path(attrs, obs).events)
+            assert abs(float(result["total_cashflows"][i]) - py_total) <= ATOL, (
+                f"Contract {i}: batch={float(result['total_cashflows'][i]):.2f}, "
+                f"python={py_total:.2f}"
+            )
+
+    def test_batch_kernel_matches_single(self):
+        """The stacked [2B, T] kernel should match per-contract simulation."""
+        rf_obs = _rate_path()
+        contracts = [
+            (_make_capfl_attrs(cap=0.05), rf_obs),
+            (_make_capfl_attrs(floor=0.035), rf_obs),
+        ]
+        states, et, yf, rf, params, masks = prepare_capfl_batch(contracts)
+        _, payoffs = batch_simulate_capfl(states, et, yf, rf, params)
+
+        for i, (attrs, obs) in enumerate(contracts):
+            _, single = _simulate_array_path(attrs, obs)
+            t = single.shape[0]
+            assert jnp.allclose(payoffs[i, :t] * masks[i, :t], single, atol=1e-2)
+
+    def test_mixed_underlier_types(self):
+        """PAM and LAM underliers are grouped and reassembled in input order."""
+        lam_terms = dict(
+            _UNDERLYING_TERMS,
+            contractType="LAM",
+            cycleOfPrincipalRedemption="P3ML0",
+            nextPrincipalRedemptionPayment=125_000,
+        )
+        rf_obs = _rate_path()
+        contracts = [
+            (_make_capfl_attrs(underlying=lam_terms), rf_obs),
+            (_make_capfl_attrs(), rf_obs),
+        ]
+        result = simulate_capfl_portfolio(contracts, discount_rate=0.05)
+        assert set(result["final_states"]) == {ContractType.PAM, ContractType.LAM}
+        for i, (attrs, obs) in enumerate(contracts):
+            _, payoffs = _simulate_array_path(attrs, obs)
+            assert abs(float(result["total_cashflows"][i]) - float(jnp.sum(payoffs))) <= ATOL
+        assert result["present_values"].shape == (2,)
+
+
+# ============================================================================
+# JIT and gradient tests
+# ============================================================================
+
+
+class TestJITCompilation:
+    """Test JIT compilation works correctly."""
+
+    def test_jit_matches_eager(self):
+        """JIT-compiled version should match eager execution."""
+        arrays = precompute_capfl_arrays(_make_capfl_attrs(cap=0.05, floor=0.035), _rate_path())
+        _, payoffs_eager = simulate_capfl_array(*arrays)
+        _, payoffs_jit = simulate_capfl_array_jit(*arrays)
+        assert jnp.allclose(payoffs_eager, payoffs_jit, atol=1e-3)
+
+
+class TestGradients:
+    """Test that gradients can be computed through CAPFL simulation."""
+
+    def test_gradient_wrt_cap_rate(self):
+        """Raising the strike lowers a cap's payout: dPayout/dCap < 0."""
+        state, et, yf, rf, params = precompute_capfl_arrays(_make_capfl_attrs(), _rate_path())
+
+        def total_payout(cap):
+            _, payoffs = simulate_capfl_array(state, et, yf, rf, params._replace(cap_rate=cap))
+            return jnp.sum(payoffs)
+
+        grad = jax.grad(total_payout)(params.cap_rate)
+        assert jnp.isfinite(grad)
+        assert float(grad) < 0.0
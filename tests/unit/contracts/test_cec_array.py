@@ -0,0 +1,184 @@
+"""Equivalence tests for array-mode CEC simulation.
+
+Runs identical collateral contracts through both the Python path
+(CreditEnhancementCollateralContract fed by a SimulatedChildContractObserver
+with injected credit events) and the array-mode path
+(simulate_cec_portfolio), asserting matching cash flows.
+Tolerance matches the ACTUS cross-validation standard (atol=1.0).
+"""
+
+import json
+
+import pytest
+
+from jactus.contracts.cec import CreditEnhancementCollateralContract
+from jactus.contracts.cec_array import prepare_cec_batch, simulate_cec_portfolio
+from jactus.contracts.portfolio import simulate_portfolio
+from jactus.core import (
+    ActusDateTime,
+    ContractAttributes,
+    ContractPerformance,
+    ContractRole,
+    ContractType,
+)
+from jactus.observers import DictRiskFactorObserver
+
+from .test_ceg_array import _DEFAULT, _child_observer, _children, _make_loan_attrs
+
+ATOL = 1.0
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+def _cec_children() -> dict[str, ContractAttributes]:
+    children = _children()
+    children["DEPOSIT"] = _make_loan_attrs("DEPOSIT", notional=300_000.0)
+    children["GOLD"] = ContractAttributes(
+        contract_id="GOLD",
+        contract_type=ContractType.COM,
+        contract_role=ContractRole.RPA,
+        status_date=ActusDateTime(2024, 1, 1),
+        currency="USD",
+        quantity=200.0,
+        market_object_code="XAU",
+    )
+    return children
+
+
+def _make_cec_attrs(
+    covered: list[str] | str = "LOAN-A",
+    covering: list[str] | str = "DEPOSIT",
+    contract_id: str = "CEC-TEST",
+    **overrides,
+) -> ContractAttributes:
+    structure = {
+        "CoveredContracts" if isinstance(covered, list) else "CoveredContract": covered,
+        "CoveringContracts" if isinstance(covering, list) else "CoveringContract": covering,
+    }
+    kwargs = {
+        "contract_id": contract_id,
+        "contract_type": ContractType.CEC,
+        "contract_role": ContractRole.BUY,
+        "status_date": ActusDateTime(2024, 1, 1),
+        "currency": "USD",
+        "coverage": 1.0,
+        "contract_structure": json.dumps(structure),
+    }
+    kwargs.update(overrides)
+    return ContractAttributes(**kwargs)
+
+
+def _rf_observer() -> DictRiskFactorObserver:
+    return DictRiskFactorObserver({"RATE": 0.05, "XAU": 2_000.0})
+
+
+def _simulate_python_path(attrs, rf_observer, credit_events):
+    child_obs = _child_observer(_cec_children(), credit_events, rf_observer)
+    return CreditEnhancementCollateralContract(
+        attrs.model_copy(), rf_observer, child_obs
+    ).simulate()
+
+
+def _assert_collateral_matches(attrs, result, i, rf_observer, credit_events):
+    py_result = _simulate_python_path(attrs, rf_observer, credit_events)
+    py_total = sum(float(e.payoff) for e in py_result.events)
+    assert abs(float(result["total_cashflows"][i]) - py_total) <= ATOL, (
+        f"CEC {i}: array={float(result['total_cashflows'][i]):.2f}, python={py_total:.2f}"
+    )
+    assert int(result["masks"][i].sum()) == len(py_result.events)
+
+
+# ============================================================================
+# End-to-end equivalence tests
+# ============================================================================
+
+
+class TestScanEquivalence:
+    """End-to-end equivalence: simulate_cec_portfolio vs contract.simulate()."""
+
+    @pytest.mark.parametrize(
+        "covering",
+        ["DEPOSIT", "GOLD", ["DEPOSIT", "GOLD"]],
+        ids=["notional", "commodity", "mixed"],
+    )
+    def test_settles_min_of_coverage_and_collateral(self, covering):
+        attrs = _make_cec_attrs(covering=covering)
+        events = {"LOAN-A": [(_DEFAULT, ContractPerformance.DF)]}
+        rf_obs = _rf_observer()
+        result = simulate_cec_portfolio(
+            [(attrs, rf_obs)], child_contracts=_cec_children(), credit_events=events
+        )
+        assert float(result["exercise_amounts"][0]) < 1_000_000.0
+        _assert_collateral_matches(attrs, result, 0, rf_obs, events)
+
+    def test_no_credit_event_matures(self):
+        attrs = _make_cec_attrs()
+        rf_obs = _rf_observer()
+        result = simulate_cec_portfolio([(attrs, rf_obs)], child_contracts=_cec_children())
+        assert not bool(result["exercised"][0])
+        _assert_collateral_matches(attrs, result, 0, rf_obs, {})
+
+    def test_missing_covering_contract_raises(self):
+        with pytest.raises(ValueError, match="child_contracts"):
+            simulate_cec_portfolio(
+                [(_make_cec_attrs(covering="NOPE"), _rf_observer())],
+                child_contracts=_cec_children(),
+            )
+
+
+# ============================================================================
+# Batch equivalence tests
+# ============================================================================
+
+
+class TestBatchEquivalence:
+    """Batch CEC simulation equivalence tests."""
+
+    def test_batch_matches_python(self):
+        rf_obs = _rf_observer()
+        events = {
+            "LOAN-A": [(_DEFAULT, ContractPerformance.DF)],
+            "LOAN-B": [(ActusDateTime(2025, 3, 3), ContractPerformance.DF)],
+        }
+        contracts = [
+            _make_cec_attrs(contract_id="C0"),
+            _make_cec_attrs(
+                contract_id="C1",
+                covered=["LOAN-B", "LOAN-C"],
+                covering=["GOLD", "DEPOSIT"],
+                credit_enhancement_guarantee_extent="NI",
+                coverage=0.5,
+            ),
+            _make_cec_attrs(contract_id="C2", covered="LOAN-C", contract_role=ContractRole.SEL),
+        ]
+        result = simulate_cec_portfolio(
+            [(c, rf_obs) for c in contracts],
+            child_contracts=_cec_children(),
+            credit_events=events,
+        )
+        for i, attrs in enumerate(contracts):
+            _assert_collateral_matches(attrs, result, i, rf_obs, events)
+
+    def test_covering_and_covered_share_batches(self):
+        """COM collateral is valued from prices; other children run once per type."""
+        rf_obs = _rf_observer()
+        contracts = [
+            (_make_cec_attrs(contract_id="C0", covering=["DEPOSIT", "GOLD"]), rf_obs),
+            (_make_cec_attrs(contract_id="C1", covered="DEPOSIT", covering="GOLD"), rf_obs),
+        ]
+        batches, _ = prepare_cec_batch(contracts, child_contracts=_cec_children())
+        assert [(b.contract_type, len(b.rows)) for b in batches] == [(ContractType.PAM, 2)]
+
+    def test_portfolio_routes_cec_to_batch_kernel(self):
+        rf_obs = _rf_observer()
+        events = {"LOAN-A": [(_DEFAULT, ContractPerformance.DF)]}
+        result = simulate_portfolio(
+            [(_make_cec_attrs(), rf_obs)],
+            child_contracts=_cec_children(),
+            credit_events=events,
+        )
+        assert result["batch_contracts"] == 1
+        assert ContractType.CEC in result["per_type_results"]
@@ -0,0 +1,327 @@
+"""Equivalence tests for array-mode CEG simulation.
+
+Runs identical guarantees through both the Python path
+(CreditEnhancementGuaranteeContract fed by a SimulatedChildContractObserver
+with injected credit events, as in the ACTUS cross-validation runner) and
+the array-mode path (simulate_ceg_portfolio), asserting matching cash flows.
+Tolerance matches the ACTUS cross-validation standard (atol=1.0).
+"""
+
+import json
+
+import jax
+import jax.numpy as jnp
+import pytest
+
+from jactus.contracts import create_contract
+from jactus.contracts.ceg import CreditEnhancementGuaranteeContract
+from jactus.contracts.ceg_array import (
+    prepare_ceg_batch,
+    settle_credit_events,
+    simulate_ceg_portfolio,
+)
+from jactus.contracts.composite_array import simulate_child_trajectories
+from jactus.contracts.portfolio import simulate_portfolio
+from jactus.core import (
+    ActusDateTime,
+    ContractAttributes,
+    ContractEvent,
+    ContractPerformance,
+    ContractRole,
+    ContractState,
+    ContractType,
+    DayCountConvention,
+    EventType,
+)
+from jactus.observers import ConstantRiskFactorObserver
+from jactus.observers.child_contract import SimulatedChildContractObserver
+from jactus.utilities.conventions import year_fraction
+
+ATOL = 1.0
+
+_DEFAULT = ActusDateTime(2025, 8, 20)
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+def _make_loan_attrs(
+    contract_id: str,
+    contract_type: ContractType = ContractType.PAM,
+    notional: float = 1_000_000.0,
+    **overrides,
+) -> ContractAttributes:
+    """Create a 3-year quarterly-paying loan."""
+    kwargs = {
+        "contract_id": contract_id,
+        "contract_type": contract_type,
+        "contract_role": ContractRole.RPA,
+        "status_date": ActusDateTime(2024, 1, 1),
+        "initial_exchange_date": ActusDateTime(2024, 1, 15),
+        "maturity_date": ActusDateTime(2027, 1, 15),
+        "currency": "USD",
+        "notional_principal": notional,
+        "nominal_interest_rate": 0.05,
+        "day_count_convention": DayCountConvention.A360,
+        "interest_payment_cycle": "3M",
+    }
+    kwargs.update(overrides)
+    return ContractAttributes(**kwargs)
+
+
+def _children() -> dict[str, ContractAttributes]:
+    return {
+        "LOAN-A": _make_loan_attrs("LOAN-A"),
+        "LOAN-B": _make_loan_attrs(
+            "LOAN-B",
+            contract_type=ContractType.LAM,
+            notional=500_000.0,
+            principal_redemption_cycle="3M",
+            next_principal_redemption_amount=40_000.0,
+        ),
+        "LOAN-C": _make_loan_attrs(
+            "LOAN-C",
+            contract_type=ContractType.ANN,
+            notional=250_000.0,
+            principal_redemption_cycle="3M",
+        ),
+    }
+
+
+def _make_ceg_attrs(
+    covered: list[str] | str = "LOAN-A",
+    contract_id: str = "CEG-TEST",
+    **overrides,
+) -> ContractAttributes:
+    key = "CoveredContracts" if isinstance(covered, list) else "CoveredContract"
+    kwargs = {
+        "contract_id": contract_id,
+        "contract_type": ContractType.CEG,
+        "contract_role": ContractRole.BUY,
+        "status_date": ActusDateTime(2024, 1, 1),
+        "currency": "USD",
+        "coverage": 0.8,
+        "contract_structure": json.dumps({key: covered}),
+    }
+    kwargs.update(overrides)
+    return ContractAttributes(**kwargs)
+
+
+def _rf_observer() -> ConstantRiskFactorObserver:
+    return ConstantRiskFactorObserver(0.05)
+
+
+def _child_observer(children, credit_events, rf_observer):
+    """Simulate children and inject observed credit events (cross-validation runner)."""
+    obs = SimulatedChildContractObserver()
+    for cid, attrs in children.items():
+        result = create_contract(attrs, rf_observer).simulate()
+        obs.register_simulation(cid, result.events, attrs, initial_state=result.initial_state)
+    for cid, observed in credit_events.items():
+        for time, perf in observed:
+            state = obs.observe_state(cid, time)
+            dcc = children[cid].day_count_convention or DayCountConvention.A365
+            yf = year_fraction(state.sd, time, dcc)
+            ce_state = ContractState(
+                tmd=state.tmd,
+                sd=time,
+                nt=state.nt,
+                ipnr=state.ipnr,
+                ipac=jnp.array(float(state.ipac) + yf * float(state.ipnr) * float(state.nt)),
+                feac=state.feac,
+                nsc=state.nsc,
+                isc=state.isc,
+                prf=ContractPerformance(perf),
+            )
+            obs._events[cid].append(
+                ContractEvent(
+                    event_type=EventType.CE,
+                    event_time=time,
+                    payoff=jnp.array(0.0),
+                    currency="USD",
+                    state_pre=state,
+                    state_post=ce_state,
+                )
+            )
+            obs._histories[cid].append((time, ce_state))
+            obs._histories[cid].sort(key=lambda x: x[0])
+    return obs
+
+
+def _simulate_python_path(attrs, rf_observer, credit_events):
+    child_obs = _child_observer(_children(), credit_events, rf_observer)
+    return CreditEnhancementGuaranteeContract(attrs.model_copy(), rf_observer, child_obs).simulate()
+
+
+def _assert_guarantee_matches(attrs, result, i, rf_observer, credit_events):
+    py_result = _simulate_python_path(attrs, rf_observer, credit_events)
+    py_total = sum(float(e.payoff) for e in py_result.events)
+    assert abs(float(result["total_cashflows"][i]) - py_total) <= ATOL, (
+        f"Guarantee {i}: array={float(result['total_cashflows'][i]):.2f}, python={py_total:.2f}"
+    )
+    assert int(result["masks"][i].sum()) == len(py_result.events)
+
+
+# ============================================================================
+# End-to-end equivalence tests
+# ============================================================================
+
+
+class TestScanEquivalence:
+    """End-to-end equivalence: simulate_ceg_portfolio vs contract.simulate()."""
+
+    @pytest.mark.parametrize("extent", ["NO", "NI"])
+    def test_default_triggers_settlement(self, extent):
+        attrs = _make_ceg_attrs(credit_enhancement_guarantee_extent=extent)
+        events = {"LOAN-A": [(_DEFAULT, ContractPerformance.DF)]}
+        rf_obs = _rf_observer()
+        result = simulate_ceg_portfolio(
+            [(attrs, rf_obs)], child_contracts=_children(), credit_events=events
+        )
+        assert bool(result["exercised"][0])
+        _assert_guarantee_matches(attrs, result, 0, rf_obs, events)
+
+    def test_no_credit_event_matures(self):
+        attrs = _make_ceg_attrs(fee_payment_cycle="6M", fee_rate=1_500.0)
+        rf_obs = _rf_observer()
+        result = simulate_ceg_portfolio([(attrs, rf_obs)], child_contracts=_children())
+        assert not bool(result["exercised"][0])
+        _assert_guarantee_matches(attrs, result, 0, rf_obs, {})
+
+    def test_fees_stop_at_settlement(self):
+        """Fees are paid up to the settlement date, then the guarantee pays out."""
+        attrs = _make_ceg_attrs(
+            fee_payment_cycle="6M",
+            fee_rate=1_500.0,
+            purchase_date=ActusDateTime(2024, 2, 1),
+            price_at_purchase_date=2_000.0,
+            settlement_period="P10D",
+        )
+        events = {"LOAN-A": [(_DEFAULT, ContractPerformance.DF)]}
+        rf_obs = _rf_observer()
+        result = simulate_ceg_portfolio(
+            [(attrs, rf_obs)], child_contracts=_children(), credit_events=events
+        )
+        _assert_guarantee_matches(attrs, result, 0, rf_obs, events)
+
+    def test_non_matching_performance_ignored(self):
+        """A delay (DL) does not trigger a guarantee on default (DF)."""
+        attrs = _make_ceg_attrs()
+        events = {"LOAN-A": [(_DEFAULT, ContractPerformance.DL)]}
+        rf_obs = _rf_observer()
+        result = simulate_ceg_portfolio(
+            [(attrs, rf_obs)], child_contracts=_children(), credit_events=events
+        )
+        assert not bool(result["exercised"][0])
+        _assert_guarantee_matches(attrs, result, 0, rf_obs, events)
+
+    def test_multiple_covered_contracts(self):
+        """Coverage sums every covered contract; the first defaulting one triggers."""
+        attrs = _make_ceg_attrs(
+            covered=["LOAN-A", "LOAN-B", "LOAN-C"],
+            credit_enhancement_guarantee_extent="NI",
+        )
+        events = {
+            "LOAN-B": [(ActusDateTime(2025, 3, 3), ContractPerformance.DF)],
+            "LOAN-C": [(ActusDateTime(2024, 11, 5), ContractPerformance.DF)],
+        }
+        rf_obs = _rf_observer()
+        result = simulate_ceg_portfolio(
+            [(attrs, rf_obs)], child_contracts=_children(), credit_events=events
+        )
+        _assert_guarantee_matches(attrs, result, 0, rf_obs, events)
+
+    def test_missing_child_raises(self):
+        with pytest.raises(ValueError, match="child_contracts"):
+            simulate_ceg_portfolio([(_make_ceg_attrs(covered="NOPE"), _rf_observer())])
+
+
+# ============================================================================
+# Batch equivalence tests
+# ============================================================================
+
+
+class TestBatchEquivalence:
+    """Batch CEG simulation equivalence tests."""
+
+    def test_batch_matches_python(self):
+        rf_obs = _rf_observer()
+        events = {"LOAN-A": [(_DEFAULT, ContractPerformance.DF)]}
+        guarantees = [
+            _make_ceg_attrs(contract_id="G0"),
+            _make_ceg_attrs(contract_id="G1", covered=["LOAN-B", "LOAN-C"]),
+            _make_ceg_attrs(
+                contract_id="G2",
+                covered=["LOAN-C", "LOAN-A"],
+                contract_role=ContractRole.SEL,
+                fee_payment_cycle="1Y",
+                fee_rate=900.0,
+            ),
+        ]
+        result = simulate_ceg_portfolio(
+            [(g, rf_obs) for g in guarantees], child_contracts=_children(), credit_events=events
+        )
+        for i, attrs in enumerate(guarantees):
+            _assert_guarantee_matches(attrs, result, i, rf_obs, events)
+
+    def test_shared_children_simulated_once(self):
+        """Each covered contract gets one batch row however many guarantees use it."""
+        rf_obs = _rf_observer()
+        contracts = [
+            (_make_ceg_attrs(contract_id=f"G{i}", covered=["LOAN-A", "LOAN-B"]), rf_obs)
+            for i in range(4)
+        ]
+        batches, _ = prepare_ceg_batch(contracts, child_contracts=_children())
+        assert sorted(len(b.rows) for b in batches) == [1, 1]
+
+    def test_portfolio_routes_ceg_to_batch_kernel(self):
+        rf_obs = _rf_observer()
+        events = {"LOAN-A": [(_DEFAULT, ContractPerformance.DF)]}
+        attrs = _make_ceg_attrs()
+        result = simulate_portfolio(
+            [(attrs, rf_obs)], child_contracts=_children(), credit_events=events
+        )
+        assert result["batch_contracts"] == 1
+        direct = simulate_ceg_portfolio(
+            [(attrs, rf_obs)], child_contracts=_children(), credit_events=events
+        )
+        assert jnp.allclose(result["total_cashflows"], direct["total_cashflows"])
+
+    def test_portfolio_pv(self):
+        rf_obs = _rf_observer()
+        events = {"LOAN-A": [(_DEFAULT, ContractPerformance.DF)]}
+        result = simulate_ceg_portfolio(
+            [(_make_ceg_attrs(), rf_obs)],
+            discount_rate=0.05,
+            child_contracts=_children(),
+            credit_events=events,
+        )
+        assert result["present_values"].shape == (1,)
+        assert 0.0 < float(result["total_pv"]) < float(result["total_cashflows"][0])
+
+
+# ============================================================================
+# Gradient tests
+# ============================================================================
+
+
+class TestGradients:
+    """Test that gradients flow from the payout to the covered contracts."""
+
+    def test_gradient_wrt_coverage_ratio(self):
+        rf_obs = _rf_observer()
+        events = {"LOAN-A": [(_DEFAULT, ContractPerformance.DF)]}
+        batches, arrays = prepare_ceg_batch(
+            [(_make_ceg_attrs(), rf_obs)], child_contracts=_children(), credit_events=events
+        )
+        _, trajectory = simulate_child_trajectories(batches)
+
+        def payout(coverage):
+            settlement = settle_credit_events(trajectory, arrays._replace(coverage=coverage))
+            return jnp.sum(settlement.payoffs)
+
+        grad = jax.grad(payout)(arrays.coverage)
+        # d(payout)/d(CECV) is the covered notional
+        assert abs(float(grad[0]) - 1_000_000.0) <= ATOL
@@ -0,0 +1,283 @@
+"""Equivalence tests for array-mode CLM simulation.
+
+Runs identical contracts through both the Python path (CallMoneyContract)
+and the array-mode path (simulate_clm_array), asserting matching results.
+Tolerance matches the ACTUS cross-validation standard (atol=1.0).
+"""
+
+import jax
+import jax.numpy as jnp
+
+from jactus.contracts.clm import CallMoneyContract
+from jactus.contracts.clm_array import (
+    batch_simulate_clm,
+    batch_simulate_clm_vmap,
+    precompute_clm_arrays,
+    prepare_clm_batch,
+    simulate_clm_array,
+    simulate_clm_array_jit,
+    simulate_clm_portfolio,
+)
+from jactus.core import (
+    ActusDateTime,
+    ContractAttributes,
+    ContractRole,
+    ContractType,
+    DayCountConvention,
+)
+from jactus.core.types import BusinessDayConvention
+from jactus.observers import ConstantRiskFactorObserver, TimeSeriesRiskFactorObserver
+
+ATOL = 1.0
+
+_STATUS_DATE = ActusDateTime(2024, 1, 1)
+_MATURITY = ActusDateTime(2025, 1, 15)
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+def _make_clm_attrs(
+    notional: float = 100_000.0,
+    rate: float = 0.05,
+    maturity: ActusDateTime | None = _MATURITY,
+    dcc: DayCountConvention = DayCountConvention.A360,
+    ip_cycle: str | None = "3M",
+    role: ContractRole = ContractRole.RPA,
+    status_date: ActusDateTime = _STATUS_DATE,
+    **overrides,
+) -> ContractAttributes:
+    """Create CLM attributes with an observed maturity and quarterly IPCI."""
+    kwargs = {
+        "contract_id": "CLM-TEST",
+        "contract_type": ContractType.CLM,
+        "contract_role": role,
+        "status_date": status_date,
+        "initial_exchange_date": ActusDateTime(2024, 1, 15),
+        "maturity_date": maturity,
+        "currency": "USD",
+        "notional_principal": notional,
+        "nominal_interest_rate": rate,
+        "day_count_convention": dcc,
+        "interest_payment_cycle": ip_cycle,
+    }
+    kwargs.update(overrides)
+    return ContractAttributes(**kwargs)
+
+
+def _make_rr_attrs(**overrides) -> ContractAttributes:
+    """CLM with quarterly rate resets against a market object."""
+    return _make_clm_attrs(
+        rate_reset_cycle="3M",
+        rate_reset_anchor=ActusDateTime(2024, 4, 15),
+        rate_reset_market_object="EURIBOR",
+        rate_reset_spread=0.005,
+        rate_reset_multiplier=1.0,
+        **overrides,
+    )
+
+
+def _rate_path() -> TimeSeriesRiskFactorObserver:
+    return TimeSeriesRiskFactorObserver(
+        {
+            "EURIBOR": [
+                (ActusDateTime(2024, 1, 1), 0.030),
+                (ActusDateTime(2024, 7, 1), 0.045),
+                (ActusDateTime(2024, 10, 1), 0.020),
+            ]
+        }
+    )
+
+
+def _simulate_python_path(attrs, rf_observer):
+    """Run simulation through the standard Python path."""
+    contract = CallMoneyContract(attrs, rf_observer)
+    return contract.simulate()
+
+
+def _simulate_array_path(attrs, rf_observer):
+    """Run simulation through the array-mode path."""
+    arrays = precompute_clm_arrays(attrs, rf_observer)
+    return simulate_clm_array(*arrays)
+
+
+def _assert_payoffs_match(py_result, payoffs, atol=ATOL):
+    """Assert that Python and array payoffs match within tolerance."""
+    py_payoffs = jnp.array([float(e.payoff) for e in py_result.events])
+    assert py_payoffs.shape == payoffs.shape, (
+        f"Event count mismatch: Python={py_payoffs.shape[0]}, Array={payoffs.shape[0]}"
+    )
+    for i in range(len(py_result.events)):
+        assert abs(float(payoffs[i]) - float(py_payoffs[i])) <= atol, (
+            f"Event {i} ({py_result.events[i].event_type.name}): "
+            f"array={float(payoffs[i]):.2f}, python={float(py_payoffs[i]):.2f}"
+        )
+
+
+# ============================================================================
+# End-to-end equivalence tests
+# ============================================================================
+
+
+class TestScanEquivalence:
+    """End-to-end equivalence: simulate_clm_array vs contract.simulate()."""
+
+    def test_ipci_capitalization(self):
+        """Quarterly IPCI with interest paid once at the observed maturity."""
+        attrs = _make_clm_attrs()
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_payoffs_match(_simulate_python_path(attrs, rf_obs), payoffs)
+
+    def test_no_ip_cycle(self):
+        """Without an IP cycle, interest accrues to the single IP at MD."""
+        attrs = _make_clm_attrs(ip_cycle=None)
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_payoffs_match(_simulate_python_path(attrs, rf_obs), payoffs)
+
+    def test_unobserved_maturity(self):
+        """Without an observed maturity only AD and IED are scheduled."""
+        attrs = _make_clm_attrs(maturity=None)
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        state, payoffs = _simulate_array_path(attrs, rf_obs)
+        py_result = _simulate_python_path(attrs, rf_obs)
+        _assert_payoffs_match(py_result, payoffs)
+        assert abs(float(state.nt) - 100_000.0) <= ATOL
+
+    def test_rpl_role(self):
+        """Liability side mirrors the cash flow signs."""
+        attrs = _make_clm_attrs(role=ContractRole.RPL)
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_payoffs_match(_simulate_python_path(attrs, rf_obs), payoffs)
+
+    def test_rate_resets(self):
+        """Rate resets observe the market object with spread applied."""
+        attrs = _make_rr_attrs()
+        rf_obs = _rate_path()
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_payoffs_match(_simulate_python_path(attrs, rf_obs), payoffs)
+
+    def test_rate_reset_floor_cap(self):
+        """Floor and cap clamp the reset rate."""
+        attrs = _make_rr_attrs(rate_reset_floor=0.03, rate_reset_cap=0.045)
+        rf_obs = _rate_path()
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_payoffs_match(_simulate_python_path(attrs, rf_obs), payoffs)
+
+    def test_midlife_contract(self):
+        """SD after IED starts from the attribute state without an IED event."""
+        attrs = _make_clm_attrs(
+            status_date=ActusDateTime(2024, 6, 1),
+            accrued_interest=250.0,
+        )
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_payoffs_match(_simulate_python_path(attrs, rf_obs), payoffs)
+
+    def test_different_dcc_a365(self):
+        attrs = _make_clm_attrs(dcc=DayCountConvention.A365)
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_payoffs_match(_simulate_python_path(attrs, rf_obs), payoffs)
+
+    def test_business_day_convention_fallback_schedule(self):
+        """BDC-shifted schedules go through the scalar schedule generator."""
+        attrs = _make_rr_attrs(
+            business_day_convention=BusinessDayConvention.SCF,
+            maturity=ActusDateTime(2025, 6, 15),
+        )
+        rf_obs = _rate_path()
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_payoffs_match(_simulate_python_path(attrs, rf_obs), payoffs)
+
+    def test_final_state_equivalence(self):
+        """Notional and accruals are cleared at maturity in both paths."""
+        attrs = _make_clm_attrs()
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        state, _ = _simulate_array_path(attrs, rf_obs)
+        assert abs(float(state.nt)) <= ATOL
+        assert abs(float(state.ipac)) <= ATOL
+
+
+# ============================================================================
+# Batch equivalence tests
+# ============================================================================
+
+
+class TestBatchEquivalence:
+    """Batch CLM simulation equivalence tests."""
+
+    def test_batch_matches_individual(self):
+        """Batch simulation should match individual simulations."""
+        rf_obs = _rate_path()
+        contracts = [
+            (_make_clm_attrs(notional=100_000.0), rf_obs),
+            (_make_clm_attrs(notional=50_000.0, role=ContractRole.RPL), rf_obs),
+            (_make_clm_attrs(maturity=None), rf_obs),
+            (_make_rr_attrs(), rf_obs),
+        ]
+
+        result = simulate_clm_portfolio(contracts)
+        for i, (attrs, obs) in enumerate(contracts):
+            py_total = sum(float(e.payoff) for e in _simulate_python_path(attrs, obs).events)
+            assert abs(float(result["total_cashflows"][i]) - py_total) <= ATOL, (
+                f"Contract {i}: batch={float(result['total_cashflows'][i]):.2f}, "
+                f"python={py_total:.2f}"
+            )
+
+    def test_batch_kernel_matches_vmap(self):
+        """Branchless batch kernel should match vmap over the scan kernel."""
+        rf_obs = _rate_path()
+        contracts = [(_make_clm_attrs(), rf_obs), (_make_rr_attrs(), rf_obs)]
+        states, et, yf, rf, params, masks = prepare_clm_batch(contracts)
+
+        _, payoffs_batch = batch_simulate_clm(states, et, yf, rf, params)
+        _, payoffs_vmap = batch_simulate_clm_vmap(states, et, yf, rf, params)
+        assert jnp.allclose(payoffs_batch * masks, payoffs_vmap * masks, atol=1e-3)
+
+    def test_portfolio_pv(self):
+        """Discounting yields present values for every contract."""
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        contracts = [(_make_clm_attrs(), rf_obs), (_make_clm_attrs(notional=1.0), rf_obs)]
+        result = simulate_clm_portfolio(contracts, discount_rate=0.05)
+        assert result["present_values"].shape == (2,)
+        assert jnp.isfinite(result["total_pv"])
+
+
+# ============================================================================
+# JIT and gradient tests
+# ============================================================================
+
+
+class TestJITCompilation:
+    """Test JIT compilation works correctly."""
+
+    def test_jit_matches_eager(self):
+        """JIT-compiled version should match eager execution."""
+        arrays = precompute_clm_arrays(_make_rr_attrs(), _rate_path())
+        _, payoffs_eager = simulate_clm_array(*arrays)
+        _, payoffs_jit = simulate_clm_array_jit(*arrays)
+        assert jnp.allclose(payoffs_eager, payoffs_jit, atol=1e-6)
+
+
+class TestGradients:
+    """Test that gradients can be computed through CLM simulation."""
+
+    def test_gradient_wrt_interest_rate(self):
+        """dTotalCashflow/dRate should be finite and positive for a lender."""
+        state, et, yf, rf, params = precompute_clm_arrays(
+            _make_clm_attrs(), ConstantRiskFactorObserver(0.0)
+        )
+
+        def total_cashflow(rate):
+            p = params._replace(nominal_interest_rate=rate)
+            _, payoffs = simulate_clm_array(state, et, yf, rf, p)
+            return jnp.sum(payoffs)
+
+        grad = jax.grad(total_cashflow)(params.nominal_interest_rate)
+        assert jnp.isfinite(grad)
+        assert float(grad) > 0.0
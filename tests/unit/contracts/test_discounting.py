@@ -0,0 +1,242 @@
+"""Tests for term-structure discounting of array-mode results.
+
+Checks the jitted curve interpolation and compounding against closed
+forms, discount_cashflows against a per-event Python reference, and
+gradients of present values with respect to the curve nodes.
+"""
+
+import subprocess
+import sys
+import textwrap
+from datetime import date
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+import pytest
+
+from jactus.contracts.discounting import (
+    ZeroCurve,
+    as_zero_curve,
+    curve_discount_factors,
+    discount_cashflows,
+)
+from jactus.contracts.pam_array import simulate_pam_portfolio
+from jactus.contracts.portfolio import simulate_portfolio
+from jactus.core import (
+    ActusDateTime,
+    ContractAttributes,
+    ContractRole,
+    ContractType,
+    DayCountConvention,
+)
+from jactus.observers import ConstantRiskFactorObserver, CurveRiskFactorObserver
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+_TENORS = [0.5, 1.0, 3.0, 5.0]
+_RATES = [0.030, 0.035, 0.040, 0.042]
+
+
+def _curve() -> ZeroCurve:
+    return ZeroCurve(jnp.array(_TENORS), jnp.array(_RATES))
+
+
+def _make_pam(contract_id: str, ct: ContractType = ContractType.PAM) -> ContractAttributes:
+    extra = {"principal_redemption_cycle": "1Y"} if ct == ContractType.LAM else {}
+    return ContractAttributes(
+        contract_id=contract_id,
+        contract_type=ct,
+        contract_role=ContractRole.RPA,
+        status_date=ActusDateTime(2024, 1, 1),
+        initial_exchange_date=ActusDateTime(2024, 1, 15),
+        maturity_date=ActusDateTime(2028, 1, 15),
+        currency="USD",
+        notional_principal=100_000.0,
+        nominal_interest_rate=0.05,
+        day_count_convention=DayCountConvention.A360,
+        interest_payment_cycle="6M",
+        **extra,
+    )
+
+
+def _contracts():
+    rf_obs = ConstantRiskFactorObserver(0.0)
+    return [(_make_pam("P0"), rf_obs), (_make_pam("L0", ContractType.LAM), rf_obs)]
+
+
+# ============================================================================
+# Curve evaluation
+# ============================================================================
+
+
+class TestCurveDiscountFactors:
+    """Interpolation and compounding conventions."""
+
+    @pytest.mark.parametrize(
+        ("compounding", "expected"),
+        [
+            ("simple", 1.0 / 1.035),
+            ("annual", 1.0 / 1.035),
+            ("semiannual", (1.0 + 0.035 / 2) ** -2),
+            ("monthly", (1.0 + 0.035 / 12) ** -12),
+            ("continuous", np.exp(-0.035)),
+        ],
+    )
+    def test_compounding_at_node(self, compounding, expected):
+        df = curve_discount_factors(_curve(), jnp.array([1.0]), compounding)
+        assert float(df[0]) == pytest.approx(expected, rel=1e-5)
+
+    def test_interpolation_and_flat_extrapolation(self):
+        times = jnp.array([0.1, 2.0, 10.0])
+        zero = -np.log(np.asarray(curve_discount_factors(_curve(), times))) / np.asarray(times)
+        np.testing.assert_allclose(zero, [0.030, 0.0375, 0.042], rtol=1e-4)
+
+        log_curve = _curve()._replace(interpolation="log_linear")
+        zero = -np.log(float(curve_discount_factors(log_curve, jnp.array([2.0]))[0])) / 2.0
+        assert zero == pytest.approx(np.sqrt(0.035 * 0.040), rel=1e-4)
+
+    def test_from_observer(self):
+        observer = CurveRiskFactorObserver(
+            curves={"USD": list(zip(_TENORS, _RATES, strict=True))},
+            reference_date=ActusDateTime(2024, 1, 1),
+        )
+        curve = as_zero_curve(observer)
+        np.testing.assert_allclose(np.asarray(curve.rates), _RATES, rtol=1e-6)
+        with pytest.raises(ValueError, match="not found"):
+            as_zero_curve(observer, "EUR")
+
+    def test_from_jax_curve(self):
+        observer = CurveRiskFactorObserver(
+            curves={"USD": list(zip(_TENORS, _RATES, strict=True))},
+            reference_date=ActusDateTime(2024, 1, 1),
+        )
+        contracts = [(_make_pam("P0"), ConstantRiskFactorObserver(0.0))]
+        sim = simulate_pam_portfolio(contracts)
+        from_observer = discount_cashflows(sim, observer)
+        from_jax = discount_cashflows(sim, observer.to_jax("USD"))
+        assert float(from_jax["total_pv"]) == pytest.approx(
+            float(from_observer["total_pv"]), rel=1e-6
+        )
+
+    def test_unknown_compounding_raises(self):
+        with pytest.raises(ValueError, match="compounding"):
+            curve_discount_factors(_curve(), jnp.array([1.0]), "daily")
+
+
+# ============================================================================
+# Discounting results
+# ============================================================================
+
+
+class TestDiscountCashflows:
+    """Present values of simulated portfolios."""
+
+    def test_matches_per_event_reference(self):
+        contracts = [(_make_pam("P0"), ConstantRiskFactorObserver(0.0))]
+        result = discount_cashflows(
+            simulate_pam_portfolio(contracts), _curve(), contracts=contracts
+        )
+
+        valuation = date(2024, 1, 1).toordinal()
+        expected = 0.0
+        for payoff, mask, ordinal in zip(
+            np.asarray(result["payoffs"][0]),
+            np.asarray(result["masks"][0]),
+            np.asarray(result["event_ordinals"][0]),
+            strict=True,
+        ):
+            if mask > 0:
+                t = max(int(ordinal) - valuation, 0) / 365.25
+                rate = np.interp(t, _TENORS, _RATES)
+                expected += float(payoff) * np.exp(-rate * t)
+        assert float(result["present_values"][0]) == pytest.approx(expected, abs=1.0)
+
+    def test_gradient_wrt_curve_nodes(self):
+        contracts = [(_make_pam("P0"), ConstantRiskFactorObserver(0.0))]
+        sim = simulate_pam_portfolio(contracts)
+        curve = _curve()
+
+        def total_pv(rates):
+            discounted = discount_cashflows(sim, curve._replace(rates=rates), contracts=contracts)
+            return discounted["total_pv"]
+
+        grad = np.asarray(jax.grad(total_pv)(curve.rates))
+        assert np.all(grad[1:] < 0.0)
+        bump = jnp.zeros(len(_RATES)).at[2].set(1e-3)
+        fd = (float(total_pv(curve.rates + bump)) - float(total_pv(curve.rates - bump))) / 2e-3
+        assert grad[2] == pytest.approx(fd, rel=0.05)
+
+    def test_requires_valuation(self):
+        sim = simulate_pam_portfolio([(_make_pam("P0"), ConstantRiskFactorObserver(0.0))])
+        with pytest.raises(ValueError, match="valuation_date"):
+            discount_cashflows(sim, _curve())
+
+
+class TestPortfolioDiscountCurve:
+    """simulate_portfolio discount_curve stage."""
+
+    def test_present_values_in_input_order(self):
+        contracts = _contracts()
+        result = simulate_portfolio(contracts, discount_curve=_curve())
+        for ct, indices in result["per_type_indices"].items():
+            per_type = result["per_type_results"][ct]
+            np.testing.assert_allclose(
+                np.asarray(result["present_values"])[indices],
+                np.asarray(per_type["present_values"]),
+            )
+        assert float(result["total_pv"]) == pytest.approx(
+            float(np.asarray(result["present_values"]).sum()), rel=1e-6
+        )
+
+    def test_f64_policy_discounts_with_float64_curve(self):
+        """Curve nodes follow the precision policy instead of forcing float32."""
+        script = textwrap.dedent(
+            """
+            import jax
+
+            jax.config.update("jax_enable_x64", True)
+
+            import numpy as np
+            from jactus.contracts.discounting import as_zero_curve, discount_cashflows
+            from jactus.contracts.pam_array import simulate_pam_portfolio
+            from jactus.core import ActusDateTime, ContractAttributes, ContractRole, ContractType
+            from jactus.engine import precision_scope
+            from jactus.observers import ConstantRiskFactorObserver, CurveRiskFactorObserver
+
+            attrs = ContractAttributes(
+                contract_id="P",
+                contract_type=ContractType.PAM,
+                contract_role=ContractRole.RPA,
+                status_date=ActusDateTime(2024, 1, 1),
+                initial_exchange_date=ActusDateTime(2024, 1, 15),
+                maturity_date=ActusDateTime(2029, 1, 15),
+                notional_principal=123_456_789.0,
+                nominal_interest_rate=0.0537,
+                interest_payment_cycle="6M",
+            )
+            contracts = [(attrs, ConstantRiskFactorObserver(0.0))]
+            observer = CurveRiskFactorObserver(
+                curves={"YC": [(0.5, 0.0301), (5.0, 0.0423)]},
+                reference_date=ActusDateTime(2024, 1, 1),
+            )
+            with precision_scope("f64"):
+                curve = as_zero_curve(observer)
+                assert curve.tenors.dtype == curve.rates.dtype == np.float64
+                result = discount_cashflows(simulate_pam_portfolio(contracts), observer)
+            assert result["discount_factors"].dtype == np.float64
+            assert result["present_values"].dtype == np.float64
+            print("ok")
+            """
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, timeout=600
+        )
+        assert proc.returncode == 0, proc.stderr
+        assert proc.stdout.strip().endswith("ok")
+
+    def test_rate_and_curve_are_exclusive(self):
+        with pytest.raises(ValueError, match="either"):
+            simulate_portfolio(_contracts(), discount_rate=0.05, discount_curve=_curve())
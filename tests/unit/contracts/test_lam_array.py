@@ -7,10 +7,16 @@ Tolerance matches the ACTUS cross-validation standard (atol=1.0).
 
 import jax
 import jax.numpy as jnp
+import numpy as np
+import pytest
 
+from jactus.contracts.array_common import IP_IDX, MD_IDX, PP_IDX, PR_IDX, prepayment_inputs
 from jactus.contracts.lam import LinearAmortizerContract
 from jactus.contracts.lam_array import (
+    _prepare_lam_batch_dated,
+    batch_simulate_lam_prepayment,
     precompute_lam_arrays,
+    prepare_lam_batch,
     simulate_lam_array,
     simulate_lam_array_jit,
     simulate_lam_portfolio,
@@ -22,7 +28,12 @@ from jactus.core import (
     ContractType,
     DayCountConvention,
 )
-from jactus.observers import ConstantRiskFactorObserver, TimeSeriesRiskFactorObserver
+from jactus.observers import (
+    ConstantRiskFactorObserver,
+    PrepaymentSurfaceObserver,
+    TimeSeriesRiskFactorObserver,
+)
+from jactus.utilities.surface import Surface2D
 
 ATOL = 1.0
 
@@ -403,6 +414,17 @@ class TestBatchEquivalence:
         result = simulate_lam_portfolio(contracts)
         assert result["num_contracts"] == 2
 
+    def test_prepare_with_workers_matches(self):
+        """Pre-computation in a process pool gives the same batch."""
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        contracts = [(_make_fixed_lam_attrs(notional=10_000.0 * (i + 1)), rf_obs) for i in range(4)]
+        contracts.append((_make_monthly_lam_attrs(), rf_obs))
+
+        pooled = prepare_lam_batch(contracts, workers=2)
+        serial = prepare_lam_batch(contracts)
+        for a, b in zip(jax.tree.leaves(pooled), jax.tree.leaves(serial), strict=True):
+            np.testing.assert_array_equal(np.asarray(a), np.asarray(b))
+
 
 # ============================================================================
 # JIT and vmap tests
@@ -449,3 +471,119 @@ class TestGradients:
         grad = jax.grad(total_cashflow)(params.nominal_interest_rate)
         assert jnp.isfinite(grad)
         assert float(grad) != 0.0
+
+
+# ============================================================================
+# In-kernel prepayment
+# ============================================================================
+
+
+def _prepayment_observer(fixed_market_rate: float = 0.03) -> PrepaymentSurfaceObserver:
+    """Annual prepayment model: rate rises with spread (x) and loan age (y)."""
+    surface = Surface2D(
+        x_margins=jnp.array([0.0, 0.02, 0.04]),
+        y_margins=jnp.array([0.0, 5.0]),
+        values=jnp.array([[0.0, 0.0], [0.05, 0.10], [0.10, 0.20]]),
+    )
+    return PrepaymentSurfaceObserver(
+        surface, fixed_market_rate=fixed_market_rate, prepayment_cycle="1Y"
+    )
+
+
+class TestInKernelPrepayment:
+    """PP amounts looked up from the surface with the live scan state."""
+
+    def test_prepayment_reduces_notional(self):
+        attrs = _make_fixed_lam_attrs(rate=0.06)
+        result = simulate_lam_portfolio([(attrs, _prepayment_observer())])
+        event_types = np.asarray(prepare_lam_batch([(attrs, _prepayment_observer())])[1])[0]
+        payoffs = np.asarray(result["payoffs"])[0]
+
+        pp = payoffs[event_types == PP_IDX]
+        assert len(pp) == 4
+        # First callout after one year: nt = 60k after two redemptions,
+        # spread 3% and age ~1y interpolate to a 9% prepayment rate
+        assert pp[0] == pytest.approx(0.09 * 60_000.0, rel=1e-3)
+        # Later prepayments shrink with the notional, down to nothing once repaid
+        assert np.all(np.diff(pp) < 0.0)
+        # Principal still sums to the notional: MD pays what is left
+        principal = payoffs[np.isin(event_types, (PR_IDX, PP_IDX, MD_IDX))].sum()
+        assert principal == pytest.approx(100_000.0, abs=ATOL)
+
+    def test_rows_without_surface_unchanged(self):
+        attrs = _make_fixed_lam_attrs(rate=0.06)
+        plain = (attrs, ConstantRiskFactorObserver(0.0))
+        mixed = simulate_lam_portfolio([(attrs, _prepayment_observer()), plain])
+        alone = simulate_lam_portfolio([plain])
+        n = alone["payoffs"].shape[1]
+        np.testing.assert_allclose(mixed["payoffs"][1, :n], alone["payoffs"][0], atol=1e-3)
+
+    def test_market_rate_above_contract_rate_disables_prepayment(self):
+        attrs = _make_fixed_lam_attrs(rate=0.06)
+        with_pp = simulate_lam_portfolio([(attrs, _prepayment_observer(0.07))])
+        plain = simulate_lam_portfolio([(attrs, ConstantRiskFactorObserver(0.0))])
+        np.testing.assert_allclose(with_pp["total_cashflows"], plain["total_cashflows"], atol=ATOL)
+
+    def test_gradient_wrt_surface(self):
+        observer = _prepayment_observer()
+        contracts = [(_make_fixed_lam_attrs(rate=0.06), observer)]
+        (states, et, yf, rf, params, masks), ordinals = _prepare_lam_batch_dated(contracts)
+        inputs = prepayment_inputs(contracts, et, ordinals)
+
+        def total_interest(values):
+            surface = Surface2D(observer.surface.x_margins, observer.surface.y_margins, values)
+            _, payoffs = batch_simulate_lam_prepayment(
+                states,
+                et,
+                yf,
+                rf,
+                inputs.market_rates,
+                inputs.loan_ages,
+                inputs.surface_ids,
+                params,
+                (surface,),
+            )
+            return jnp.sum(jnp.where(et == IP_IDX, payoffs, 0.0) * masks)
+
+        grad = jax.grad(total_interest)(observer.surface.values)
+        # Faster prepayment means less interest; the 0% spread row is never hit
+        assert np.all(np.asarray(grad[1:]) < 0.0)
+        np.testing.assert_array_equal(np.asarray(grad[0]), 0.0)
+
+    def test_rf_scenarios_rejected(self):
+        attrs = _make_fixed_lam_attrs(rate=0.06)
+        with pytest.raises(ValueError, match="in-kernel prepayment"):
+            simulate_lam_portfolio(
+                [(attrs, _prepayment_observer())], rf_scenarios=np.zeros((2, 1, 1))
+            )
+
+    def test_matches_scalar_path(self):
+        attrs = _make_fixed_lam_attrs(rate=0.06)
+        observer = _prepayment_observer()
+        py_result = _simulate_python_path(attrs, observer)
+        assert float(py_result.events[4].payoff) > 0.0  # first PP
+        result = simulate_lam_portfolio([(attrs, observer)])
+        payoffs = np.asarray(result["payoffs"])[0][np.asarray(result["masks"])[0] > 0]
+        _assert_payoffs_match(py_result, jnp.asarray(payoffs))
+
+    def test_surfaces_grouped_per_row(self):
+        attrs = _make_fixed_lam_attrs(rate=0.06)
+        faster = _prepayment_observer()
+        faster.surface = Surface2D(
+            faster.surface.x_margins, faster.surface.y_margins, faster.surface.values * 2.0
+        )
+        contracts = [
+            (attrs, _prepayment_observer()),
+            (attrs, faster),
+            (attrs, _prepayment_observer()),
+        ]
+        (_, et, _, _, _, _), ordinals = _prepare_lam_batch_dated(contracts)
+        # Equal surfaces share one lookup; the doubled one gets its own
+        assert len(prepayment_inputs(contracts, et, ordinals).surfaces) == 2
+
+        mixed = simulate_lam_portfolio(contracts)
+        for row, observer in enumerate((_prepayment_observer(), faster)):
+            alone = simulate_lam_portfolio([(attrs, observer)])
+            np.testing.assert_allclose(mixed["payoffs"][row], alone["payoffs"][0], atol=1e-3)
+        np.testing.assert_allclose(mixed["payoffs"][2], mixed["payoffs"][0])
+        assert float(mixed["total_cashflows"][1]) < float(mixed["total_cashflows"][0])
@@ -7,8 +7,10 @@ Tolerance matches the ACTUS cross-validation standard (atol=1.0).
 
 import jax
 import jax.numpy as jnp
+import numpy as np
 import pytest
 
+from jactus.contracts.array_common import RR_IDX, curve_rf_values
 from jactus.contracts.pam import PrincipalAtMaturityContract
 from jactus.contracts.pam_array import (
     NOP_EVENT_IDX,
@@ -26,6 +28,7 @@ from jactus.contracts.pam_array import (
     _pof_rr,
     _pof_rrf,
     _pof_sc,
+    _prepare_pam_batch_dated,
     _prepare_pam_batch_sequential,
     _stf_ad,
     _stf_ied,
@@ -55,7 +58,13 @@ from jactus.engine.vectorized import (
     BatchSimulationResult,
     validate_pam_for_array_mode,
 )
-from jactus.observers import ConstantRiskFactorObserver, TimeSeriesRiskFactorObserver
+from jactus.observers import (
+    ConstantRiskFactorObserver,
+    CurveRiskFactorObserver,
+    JaxCurveRiskFactorObserver,
+    JaxTimeSeriesRiskFactorObserver,
+    TimeSeriesRiskFactorObserver,
+)
 
 # Tolerance matching ACTUS cross-validation standard
 ATOL = 1.0
@@ -915,8 +924,14 @@ class TestBatchSchedule:
     def test_batch_matches_sequential_simple(self):
         """Batch path produces identical results to sequential for simple contracts."""
         contracts = self._make_contracts(10)
-        states_b, et_b, yf_b, rf_b, params_b, masks_b = prepare_pam_batch(contracts)
-        states_s, et_s, yf_s, rf_s, params_s, masks_s = _prepare_pam_batch_sequential(contracts)
+        (states_b, et_b, yf_b, rf_b, params_b, masks_b), ords_b = _prepare_pam_batch_dated(
+            contracts
+        )
+        (states_s, et_s, yf_s, rf_s, params_s, masks_s), ords_s = _prepare_pam_batch_sequential(
+            contracts
+        )
+
+        assert jnp.array_equal(ords_b, ords_s), "Event ordinals differ"
 
         assert jnp.array_equal(et_b, et_s), "Event types differ"
         assert jnp.allclose(yf_b, yf_s, atol=1e-6), (
@@ -947,7 +962,9 @@ class TestBatchSchedule:
             contracts.append((attrs, rf))
 
         states_b, et_b, yf_b, rf_b, params_b, masks_b = prepare_pam_batch(contracts)
-        states_s, et_s, yf_s, rf_s, params_s, masks_s = _prepare_pam_batch_sequential(contracts)
+        (states_s, et_s, yf_s, rf_s, params_s, masks_s), _ = _prepare_pam_batch_sequential(
+            contracts
+        )
 
         assert jnp.array_equal(et_b, et_s), "Event types differ for varied cycles"
         assert jnp.allclose(yf_b, yf_s, atol=1e-6), "Year fractions differ"
@@ -962,7 +979,7 @@ class TestBatchSchedule:
         ]:
             contracts = self._make_contracts(3, dcc=dcc)
             states_b, et_b, yf_b, rf_b, _, masks_b = prepare_pam_batch(contracts)
-            states_s, et_s, yf_s, rf_s, _, masks_s = _prepare_pam_batch_sequential(contracts)
+            (states_s, et_s, yf_s, rf_s, _, masks_s), _ = _prepare_pam_batch_sequential(contracts)
             assert jnp.array_equal(et_b, et_s), f"ET differ for {dcc}"
             assert jnp.allclose(yf_b, yf_s, atol=1e-6), (
                 f"YF differ for {dcc}: max diff = {float(jnp.max(jnp.abs(yf_b - yf_s)))}"
@@ -1012,10 +1029,15 @@ class TestBatchSchedule:
         assert fallback_idx == [1], "RR should be fallback"
 
         # Run both paths and compare
-        states_b, et_b, yf_b, rf_b, params_b, masks_b = prepare_pam_batch(contracts)
-        states_s, et_s, yf_s, rf_s, params_s, masks_s = _prepare_pam_batch_sequential(contracts)
+        (states_b, et_b, yf_b, rf_b, params_b, masks_b), ords_b = _prepare_pam_batch_dated(
+            contracts
+        )
+        (states_s, et_s, yf_s, rf_s, params_s, masks_s), ords_s = _prepare_pam_batch_sequential(
+            contracts
+        )
 
         assert jnp.array_equal(et_b, et_s), "ET differ for mixed batch"
+        assert jnp.array_equal(ords_b, ords_s), "Event ordinals differ for mixed batch"
         assert jnp.allclose(yf_b, yf_s, atol=1e-6), "YF differ for mixed batch"
 
     def test_batch_all_fallback(self):
@@ -1047,6 +1069,53 @@ class TestBatchSchedule:
         states, et, yf, rf_v, params, masks = prepare_pam_batch(contracts)
         assert et.shape[0] == 3
 
+    def test_batch_process_pool_workers(self):
+        """Fallback pre-computation in a process pool matches the in-process path."""
+        rf = ConstantRiskFactorObserver(constant_value=0.03)
+        contracts = self._make_contracts(2)
+        for i in range(4):
+            attrs = contracts[0][0].model_copy(
+                update={
+                    "contract_id": f"FLOAT-{i}",
+                    "notional_principal": 10_000.0 * (i + 1),
+                    "rate_reset_cycle": "3M",
+                    "rate_reset_anchor": ActusDateTime(2024, 4, 15),
+                }
+            )
+            contracts.append((attrs, rf))
+
+        (_, et_p, yf_p, rf_p, params_p, masks_p), ords_p = _prepare_pam_batch_dated(
+            contracts, workers=2
+        )
+        (_, et_s, yf_s, rf_s, params_s, masks_s), ords_s = _prepare_pam_batch_dated(contracts)
+
+        assert jnp.array_equal(et_p, et_s)
+        assert jnp.array_equal(ords_p, ords_s)
+        assert jnp.array_equal(yf_p, yf_s)
+        assert jnp.array_equal(rf_p, rf_s)
+        assert jnp.array_equal(masks_p, masks_s)
+        assert jnp.array_equal(params_p.notional_principal, params_s.notional_principal)
+
+    def test_batch_process_pool_reused(self):
+        """Later calls with the same worker count reuse the running pool."""
+        from jactus.contracts import array_common
+        from jactus.contracts.pam_array import _precompute_raw
+
+        contracts = self._make_contracts(4)
+        try:
+            array_common.precompute_raw_list(_precompute_raw, contracts, workers=2)
+            pool = array_common._POOL
+            array_common.precompute_raw_list(_precompute_raw, contracts, workers=2)
+            assert array_common._POOL is pool
+        finally:
+            array_common.shutdown_precompute_pool()
+        assert array_common._POOL is None
+
+    def test_batch_invalid_workers(self):
+        """workers must be positive."""
+        with pytest.raises(ValueError, match="workers"):
+            prepare_pam_batch(self._make_contracts(2), workers=0)
+
     def test_batch_single_contract(self):
         """Single contract uses sequential path."""
         contracts = self._make_contracts(1)
@@ -1073,7 +1142,9 @@ class TestBatchSchedule:
         contracts = [(attrs, rf)]
 
         states_b, et_b, yf_b, rf_b, params_b, masks_b = prepare_pam_batch(contracts)
-        states_s, et_s, yf_s, rf_s, params_s, masks_s = _prepare_pam_batch_sequential(contracts)
+        (states_s, et_s, yf_s, rf_s, params_s, masks_s), _ = _prepare_pam_batch_sequential(
+            contracts
+        )
 
         assert jnp.array_equal(et_b, et_s), (
             f"Stub ET mismatch:\n  batch={et_b[0].tolist()}\n  seq={et_s[0].tolist()}"
@@ -1100,7 +1171,9 @@ class TestBatchSchedule:
             contracts.append((attrs, rf))
 
         states_b, et_b, yf_b, rf_b, params_b, masks_b = prepare_pam_batch(contracts)
-        states_s, et_s, yf_s, rf_s, params_s, masks_s = _prepare_pam_batch_sequential(contracts)
+        (states_s, et_s, yf_s, rf_s, params_s, masks_s), _ = _prepare_pam_batch_sequential(
+            contracts
+        )
 
         assert jnp.array_equal(et_b, et_s), "IED<SD ET mismatch"
         assert jnp.allclose(yf_b, yf_s, atol=1e-6), "IED<SD YF mismatch"
@@ -1313,3 +1386,183 @@ class TestBatchPythonEquivalence:
                 f"{attrs.contract_id}: ipac={ipac:.2f} exceeds one year "
                 f"interest={max_one_period:.2f} — accrual start likely wrong"
             )
+
+
+class TestBatchRiskFactorQuery:
+    """Pre-computation uses observe_risk_factor_batch when the observer has it."""
+
+    def _series(self):
+        return {
+            "LIBOR-6M": [
+                (ActusDateTime(2024, 1, 1), 0.04),
+                (ActusDateTime(2024, 7, 1), 0.045),
+                (ActusDateTime(2025, 1, 1), 0.05),
+            ]
+        }
+
+    def _attrs(self):
+        return _make_variable_rate_attrs().model_copy(
+            update={"rate_reset_anchor": ActusDateTime(2024, 7, 15)}
+        )
+
+    def test_batch_and_scalar_agree(self, monkeypatch):
+        observer = TimeSeriesRiskFactorObserver(self._series(), interpolation="linear")
+        batch_calls = []
+        original = observer.observe_risk_factor_batch
+
+        def counting(identifier, ordinals):
+            batch_calls.append(len(ordinals))
+            return original(identifier, ordinals)
+
+        monkeypatch.setattr(observer, "observe_risk_factor_batch", counting)
+        batched = prepare_pam_batch([(self._attrs(), observer)])
+        assert len(batch_calls) == 1 and batch_calls[0] > 1
+
+        monkeypatch.setattr(
+            observer,
+            "observe_risk_factor",
+            lambda *a, **k: pytest.fail("scalar lookup used despite batch method"),
+        )
+        prepare_pam_batch([(self._attrs(), observer)])
+
+        scalar_only = TimeSeriesRiskFactorObserver(self._series(), interpolation="linear")
+        monkeypatch.setattr(scalar_only, "observe_risk_factor_batch", None)
+        scalar = prepare_pam_batch([(self._attrs(), scalar_only)])
+        assert jnp.allclose(batched[3], scalar[3], atol=1e-6)
+        assert float(jnp.max(batched[3])) > 0.0
+
+
+class TestCurveRiskFactors:
+    """Curve-observed rate resets are filled batch-wide and differentiable."""
+
+    def _observer(self):
+        return CurveRiskFactorObserver(
+            {"LIBOR-6M": [(0.25, 0.03), (1.0, 0.035), (5.0, 0.045)]},
+            reference_date=ActusDateTime(2024, 1, 1),
+        )
+
+    def _contracts(self, observer, n=3):
+        return [
+            (
+                _make_variable_rate_attrs(notional=100_000.0 * (i + 1)).model_copy(
+                    update={"contract_id": f"V{i}", "rate_reset_anchor": ActusDateTime(2024, 7, 15)}
+                ),
+                observer,
+            )
+            for i in range(n)
+        ]
+
+    def test_batch_fill_matches_curve(self):
+        observer = self._observer()
+        batch, ordinals = _prepare_pam_batch_dated(self._contracts(observer))
+        event_types, rf = np.asarray(batch[1]), np.asarray(batch[3])
+        is_rr = event_types == RR_IDX
+        assert is_rr.sum() >= 3
+        assert not np.isnan(rf).any()
+        expected = observer.observe_risk_factor_batch("LIBOR-6M", np.asarray(ordinals))
+        np.testing.assert_allclose(rf[is_rr], expected[is_rr], rtol=1e-6)
+
+    def test_curve_node_sensitivities(self):
+        observer = self._observer()
+        contracts = self._contracts(observer)
+        (states, event_types, yfs, rf, params, masks), ordinals = _prepare_pam_batch_dated(
+            contracts
+        )
+        curve = observer.to_jax("LIBOR-6M")
+
+        def total(rates):
+            rf_curve = curve_rf_values(
+                JaxCurveRiskFactorObserver(
+                    curve.tenors, rates, reference_ordinal=curve.reference_ordinal
+                ),
+                event_types,
+                ordinals,
+                rf,
+            )
+            _, payoffs = batch_simulate_pam(states, event_types, yfs, rf_curve, params)
+            return jnp.sum(payoffs * masks)
+
+        rates = jnp.asarray(curve.rates, dtype=jnp.float32)
+        assert float(total(rates)) == pytest.approx(
+            float(jnp.sum(batch_simulate_pam(states, event_types, yfs, rf, params)[1] * masks)),
+            rel=1e-6,
+        )
+        grads = jax.jit(jax.grad(total))(rates)
+        assert float(jnp.sum(grads)) > 0.0  # higher fixings, higher interest received
+        bump = jnp.array([0.0, 1e-3, 0.0])
+        fd = (total(rates + bump) - total(rates - bump)) / 2e-3
+        assert float(grads[1]) == pytest.approx(float(fd), rel=1e-2)
+
+
+class TestInKernelRateReset:
+    """RR fixings looked up from an on-device rate path inside the kernel."""
+
+    def _observer(self):
+        return TimeSeriesRiskFactorObserver(
+            {
+                "LIBOR-6M": [
+                    (ActusDateTime(2024, 1, 1), 0.04),
+                    (ActusDateTime(2024, 7, 1), 0.045),
+                    (ActusDateTime(2025, 7, 1), 0.05),
+                ]
+            }
+        )
+
+    def _batch(self, observer):
+        contracts = [
+            (
+                _make_variable_rate_attrs(notional=100_000.0 * (i + 1)).model_copy(
+                    update={"contract_id": f"V{i}", "rate_reset_anchor": ActusDateTime(2024, 7, 15)}
+                ),
+                observer,
+            )
+            for i in range(3)
+        ]
+        return _prepare_pam_batch_dated(contracts)
+
+    def test_rate_path_matches_prequeried_fixings(self):
+        observer = self._observer()
+        (states, et, yf, rf, params, masks), ordinals = self._batch(observer)
+        assert int(jnp.sum(et == RR_IDX)) >= 3
+        _, expected = batch_simulate_pam(states, et, yf, rf, params)
+
+        # Phase-1 fixings are ignored: they come from the path
+        stale = jnp.where(et == RR_IDX, 0.0, rf)
+        _, payoffs = batch_simulate_pam(
+            states,
+            et,
+            yf,
+            stale,
+            params,
+            reset_ordinals=ordinals,
+            rate_path=observer.to_jax("LIBOR-6M"),
+        )
+        np.testing.assert_allclose(payoffs * masks, expected * masks, atol=1e-2)
+
+    def test_many_paths_and_path_gradients(self):
+        observer = self._observer()
+        (states, et, yf, rf, params, masks), ordinals = self._batch(observer)
+        base = observer.to_jax("LIBOR-6M")
+
+        def total(values):
+            path = JaxTimeSeriesRiskFactorObserver(base.offsets, values, origin=base.origin)
+            _, payoffs = batch_simulate_pam(
+                states, et, yf, rf, params, reset_ordinals=ordinals, rate_path=path
+            )
+            return jnp.sum(payoffs * masks)
+
+        shocks = jnp.linspace(-0.01, 0.01, 5)
+        totals = jax.jit(jax.vmap(total))(base.values[None, :] + shocks[:, None])
+        assert totals.shape == (5,)
+        assert np.all(np.diff(np.asarray(totals)) > 0.0)
+
+        grads = jax.grad(total)(base.values)
+        assert grads.shape == base.values.shape
+        assert float(jnp.sum(grads)) > 0.0
+        assert float(grads[0]) == 0.0  # no reset falls before the second observation
+
+    def test_rate_path_requires_reset_ordinals(self):
+        observer = self._observer()
+        (states, et, yf, rf, params, _), _ = self._batch(observer)
+        with pytest.raises(ValueError, match="reset_ordinals"):
+            batch_simulate_pam(states, et, yf, rf, params, rate_path=observer.to_jax("LIBOR-6M"))
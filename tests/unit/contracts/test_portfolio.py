@@ -5,10 +5,35 @@ dispatches to batch kernels, and falls back to scalar path for
 unsupported types.
 """
 
-import jax.numpy as jnp
+import os
+import subprocess
+import sys
+import textwrap
+import threading
 
+import jax
+import jax.numpy as jnp
+import numpy as np
+import pytest
+
+from jactus.contracts import create_contract, pam_array, portfolio
+from jactus.contracts.array_common import (
+    ENV_COMPILATION_CACHE_DIR,
+    CanonicalShapes,
+    PrecisionPolicy,
+    canonical_size,
+    configure_compilation_cache,
+    get_precision,
+    plan_length_buckets,
+    precision_scope,
+    resolve_devices,
+    resolve_precision,
+    set_precision,
+)
+from jactus.contracts.discounting import ZeroCurve
 from jactus.contracts.portfolio import (
     BATCH_SUPPORTED_TYPES,
+    iter_portfolio_chunks,
     simulate_portfolio,
 )
 from jactus.core import (
@@ -20,6 +45,8 @@ from jactus.core import (
 )
 from jactus.observers import ConstantRiskFactorObserver, DictRiskFactorObserver
 
+from .test_lax_array import _make_basic_lax_attrs
+
 ATOL = 1.0
 
 
@@ -295,49 +322,53 @@ class TestEquivalenceWithIndividual:
             assert abs(float(port_result["total_cashflows"][i]) - py_total) <= ATOL
 
 
+def _make_clm() -> ContractAttributes:
+    return ContractAttributes(
+        contract_id="CLM-001",
+        contract_type=ContractType.CLM,
+        contract_role=ContractRole.RPA,
+        status_date=ActusDateTime(2024, 1, 1),
+        initial_exchange_date=ActusDateTime(2024, 1, 15),
+        maturity_date=ActusDateTime(2025, 1, 15),
+        currency="USD",
+        notional_principal=100_000.0,
+        nominal_interest_rate=0.05,
+        day_count_convention=DayCountConvention.A360,
+        interest_payment_cycle="1M",
+    )
+
+
 class TestFallbackPath:
     """Tests for the scalar Python fallback path."""
 
-    def test_clm_uses_fallback(self):
-        """CLM should use the scalar fallback path."""
-        attrs = ContractAttributes(
-            contract_id="CLM-001",
-            contract_type=ContractType.CLM,
-            contract_role=ContractRole.RPA,
-            status_date=ActusDateTime(2024, 1, 1),
-            initial_exchange_date=ActusDateTime(2024, 1, 15),
-            maturity_date=ActusDateTime(2025, 1, 15),
-            currency="USD",
-            notional_principal=100_000.0,
-            nominal_interest_rate=0.05,
-            day_count_convention=DayCountConvention.A360,
-            interest_payment_cycle="1M",
-        )
+    def test_clm_uses_batch_kernel(self):
+        """CLM should use the array-mode batch kernel."""
         rf_obs = ConstantRiskFactorObserver(0.0)
-        result = simulate_portfolio([(attrs, rf_obs)])
+        result = simulate_portfolio([(_make_clm(), rf_obs)])
+        assert result["fallback_contracts"] == 0
+        assert result["batch_contracts"] == 1
+        assert ContractType.CLM in result["per_type_results"]
+
+        contract = create_contract(_make_clm(), rf_obs)
+        py_total = sum(float(e.payoff) for e in contract.simulate().events)
+        assert abs(float(result["total_cashflows"][0]) - py_total) <= ATOL
+
+    def test_unregistered_type_uses_fallback(self, monkeypatch):
+        """A type without a portfolio function should use the scalar path."""
+        monkeypatch.setitem(portfolio._PORTFOLIO_FN_REGISTRY, ContractType.CLM, None)
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        result = simulate_portfolio([(_make_clm(), rf_obs)])
         assert result["fallback_contracts"] == 1
         assert result["batch_contracts"] == 0
         assert float(result["total_cashflows"][0]) != 0.0
 
-    def test_mixed_batch_and_fallback(self):
+    def test_mixed_batch_and_fallback(self, monkeypatch):
         """Portfolio with both batch and fallback types."""
-        clm_attrs = ContractAttributes(
-            contract_id="CLM-001",
-            contract_type=ContractType.CLM,
-            contract_role=ContractRole.RPA,
-            status_date=ActusDateTime(2024, 1, 1),
-            initial_exchange_date=ActusDateTime(2024, 1, 15),
-            maturity_date=ActusDateTime(2025, 1, 15),
-            currency="USD",
-            notional_principal=100_000.0,
-            nominal_interest_rate=0.05,
-            day_count_convention=DayCountConvention.A360,
-            interest_payment_cycle="1M",
-        )
+        monkeypatch.setitem(portfolio._PORTFOLIO_FN_REGISTRY, ContractType.CLM, None)
         rf_obs = ConstantRiskFactorObserver(0.0)
         contracts = [
             (_make_pam(), rf_obs),
-            (clm_attrs, rf_obs),
+            (_make_clm(), rf_obs),
             (_make_csh(), rf_obs),
         ]
         result = simulate_portfolio(contracts)
@@ -367,11 +398,501 @@ class TestPerTypeResults:
         assert pam_result["num_contracts"] == 2
 
 
+class TestEventOrdinals:
+    """Verify per-event dates are returned alongside the payoffs."""
+
+    def test_event_ordinals_match_scalar_event_dates(self):
+        """Masked ordinals equal the scalar path's event dates, in order."""
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        spx_obs = DictRiskFactorObserver({"SPX": 110.0})
+        contracts = [
+            (_make_pam(), rf_obs),
+            (_make_lam(), rf_obs),
+            (_make_csh(), rf_obs),
+            (_make_stk(), rf_obs),
+            (_make_fxout(), rf_obs),
+            (_make_optns(), spx_obs),
+            (_make_ann(), rf_obs),
+            (_make_swppv(), rf_obs),
+            (_make_clm(), rf_obs),
+        ]
+        result = simulate_portfolio(contracts)
+        for attrs, obs in contracts:
+            type_result = result["per_type_results"][attrs.contract_type]
+            ordinals = type_result["event_ordinals"]
+            masks = type_result["masks"]
+            assert ordinals.dtype == jnp.int32
+            assert ordinals.shape == masks.shape
+            assert not bool(jnp.any(jnp.where(masks > 0, 0, ordinals)))
+
+            events = create_contract(attrs, obs).simulate().events
+            expected = [e.event_time.to_datetime().toordinal() for e in events]
+            assert ordinals[0][masks[0] > 0].tolist() == expected, attrs.contract_type
+
+    def test_event_ordinals_padding_follows_masks(self):
+        """Contracts with fewer events carry zero ordinals in the padding."""
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        short = _make_pam().model_copy(update={"maturity_date": ActusDateTime(2024, 7, 15)})
+        result = simulate_portfolio([(_make_pam(), rf_obs), (short, rf_obs)])
+        pam_result = result["per_type_results"][ContractType.PAM]
+        masks = pam_result["masks"]
+        ordinals = pam_result["event_ordinals"]
+        assert float(masks[1].sum()) < float(masks[0].sum())
+        assert bool(jnp.all((ordinals > 0) == (masks > 0)))
+
+
+class TestLengthBuckets:
+    """Verify length-bucketed simulation matches the single padded batch."""
+
+    def test_plan_separates_long_tail(self):
+        """One long contract no longer pads the short ones."""
+        plan = plan_length_buckets(np.array([12] * 100 + [360]), 2)
+        assert plan.lengths == [12, 360]
+        assert [len(r) for r in plan.rows] == [100, 1]
+        assert plan.padding_ratio == 0.0
+        assert plan.unbucketed_padding_ratio > 0.9
+
+    def test_bucketed_matches_unbucketed(self):
+        """Payoffs, totals and final states are unchanged by bucketing."""
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        monthly = _make_pam().model_copy(
+            update={"contract_id": "PAM-M", "interest_payment_cycle": "1M"}
+        )
+        short = _make_pam().model_copy(
+            update={"contract_id": "PAM-S", "maturity_date": ActusDateTime(2024, 7, 15)}
+        )
+        contracts = [
+            (monthly, rf_obs),
+            (_make_pam(), rf_obs),
+            (short, rf_obs),
+            (_make_lam(), rf_obs),
+            (_make_basic_lax_attrs(), rf_obs),
+            (_make_lam().model_copy(update={"contract_id": "LAM-2"}), rf_obs),
+        ]
+        plain = simulate_portfolio(contracts)
+        bucketed = simulate_portfolio(contracts, length_buckets=2)
+
+        np.testing.assert_allclose(
+            np.asarray(bucketed["total_cashflows"]), np.asarray(plain["total_cashflows"])
+        )
+        for ct in (ContractType.PAM, ContractType.LAM, ContractType.LAX):
+            expected = plain["per_type_results"][ct]
+            got = bucketed["per_type_results"][ct]
+            np.testing.assert_allclose(np.asarray(got["payoffs"]), np.asarray(expected["payoffs"]))
+            for field, value in got["final_states"]._asdict().items():
+                np.testing.assert_allclose(
+                    np.asarray(value), np.asarray(getattr(expected["final_states"], field))
+                )
+        plan = bucketed["per_type_results"][ContractType.PAM]["length_buckets"]
+        assert plan.padding_ratio < plan.unbucketed_padding_ratio
+
+
+class TestChunkedStreaming:
+    """Verify chunked streaming matches the in-memory portfolio run."""
+
+    def _contracts(self):
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        short = _make_pam().model_copy(update={"maturity_date": ActusDateTime(2024, 7, 15)})
+        return [
+            (_make_pam(), rf_obs),
+            (_make_lam(), rf_obs),
+            (short, rf_obs),
+            (_make_csh(), rf_obs),
+            (_make_pam(50_000.0), rf_obs),
+            (_make_lam(20_000.0), rf_obs),
+            (_make_pam(10_000.0), rf_obs),
+        ]
+
+    def test_chunked_totals_match(self):
+        """Totals from a generator in chunks equal the one-shot run."""
+        contracts = self._contracts()
+        plain = simulate_portfolio(contracts)
+        chunked = simulate_portfolio(iter(contracts), chunk_size=2)
+
+        assert chunked["num_contracts"] == len(contracts)
+        assert chunked["num_chunks"] == 4  # PAM x2, LAM, CSH
+        assert chunked["types_used"] == plain["types_used"]
+        np.testing.assert_allclose(
+            np.asarray(chunked["total_cashflows"]),
+            np.asarray(plain["total_cashflows"]),
+            atol=ATOL,
+        )
+
+    def test_chunks_reuse_padded_shape(self):
+        """Every PAM chunk runs the kernel with one padded shape."""
+        chunks = list(iter_portfolio_chunks(self._contracts(), chunk_size=2))
+        pam_chunks = [c for c in chunks if c.contract_type == ContractType.PAM]
+        assert [len(c.indices) for c in pam_chunks] == [2, 2]
+        shapes = {c.result["padded_shape"] for c in pam_chunks}
+        assert len(shapes) == 1
+        rows, events = shapes.pop()
+        assert rows == 2
+        assert events & (events - 1) == 0
+
+    def test_chunked_present_values(self):
+        """Curve PVs streamed per chunk equal the one-shot run."""
+        curve = ZeroCurve(jnp.array([1.0, 5.0]), jnp.array([0.03, 0.04]))
+        contracts = self._contracts()
+        plain = simulate_portfolio(contracts, discount_curve=curve)
+        chunked = simulate_portfolio(contracts, discount_curve=curve, chunk_size=3)
+        np.testing.assert_allclose(
+            np.asarray(chunked["present_values"]),
+            np.asarray(plain["present_values"]),
+            atol=ATOL,
+        )
+
+
+class TestSharding:
+    """Verify multi-device sharding of the scan kernels."""
+
+    def test_devices_match_plain(self):
+        """Sharded results equal the single-device run, in input order."""
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        contracts = [(_make_pam(n), rf_obs) for n in (100_000.0, 50_000.0, 10_000.0)]
+        contracts.append((_make_lam(), rf_obs))
+        plain = simulate_portfolio(contracts)
+        sharded = simulate_portfolio(contracts, devices=jax.devices())
+        np.testing.assert_allclose(
+            np.asarray(sharded["total_cashflows"]),
+            np.asarray(plain["total_cashflows"]),
+            atol=ATOL,
+        )
+
+    def test_host_device_count(self):
+        """Rows split over four forced host devices are gathered back in order."""
+        script = textwrap.dedent(
+            """
+            import numpy as np
+            from jactus.contracts.pam_array import simulate_pam_portfolio
+            from jactus.core import ActusDateTime, ContractAttributes, ContractRole, ContractType
+            from jactus.observers import ConstantRiskFactorObserver
+
+            rf_obs = ConstantRiskFactorObserver(0.0)
+            contracts = [
+                (
+                    ContractAttributes(
+                        contract_id=f"P{i}",
+                        contract_type=ContractType.PAM,
+                        contract_role=ContractRole.RPA,
+                        status_date=ActusDateTime(2024, 1, 1),
+                        initial_exchange_date=ActusDateTime(2024, 1, 15),
+                        maturity_date=ActusDateTime(2026, 1, 15),
+                        notional_principal=1000.0 * (i + 1),
+                        nominal_interest_rate=0.05,
+                        interest_payment_cycle="6M",
+                    ),
+                    rf_obs,
+                )
+                for i in range(6)
+            ]
+            plain = simulate_pam_portfolio(contracts)
+            sharded = simulate_pam_portfolio(contracts, devices=4)
+            np.testing.assert_allclose(
+                np.asarray(sharded["payoffs"]), np.asarray(plain["payoffs"]), atol=1e-3
+            )
+            print("ok")
+            """
+        )
+        env = dict(os.environ, XLA_FLAGS="--xla_force_host_platform_device_count=4")
+        env["JAX_PLATFORMS"] = "cpu"
+        proc = subprocess.run(
+            [sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=600
+        )
+        assert proc.returncode == 0, proc.stderr
+        assert proc.stdout.strip().endswith("ok")
+
+    def test_too_many_devices_raises(self):
+        """Asking for more devices than JAX exposes points at XLA_FLAGS."""
+        with pytest.raises(ValueError, match="xla_force_host_platform_device_count"):
+            resolve_devices(len(jax.devices()) + 1)
+
+
+class TestCanonicalShapes:
+    """Verify canonical-shape padding and the persistent compilation cache."""
+
+    def test_canonical_size(self):
+        """Configured sizes win; beyond them, powers of two."""
+        assert canonical_size(5) == 8
+        assert canonical_size(8) == 8
+        assert canonical_size(5, (6, 12)) == 6
+        assert canonical_size(13, (6, 12)) == 16
+        assert CanonicalShapes(rows=(10,)).shape(3, 9) == (10, 16)
+
+    def test_canonical_matches_plain(self):
+        """Padded runs give the same cash flows and report the padded shape."""
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        contracts = [(_make_pam(n), rf_obs) for n in (100_000.0, 50_000.0, 10_000.0)]
+        plain = simulate_portfolio(contracts)
+        padded = simulate_portfolio(contracts, canonical_shapes=True)
+        np.testing.assert_allclose(
+            np.asarray(padded["total_cashflows"]),
+            np.asarray(plain["total_cashflows"]),
+            atol=ATOL,
+        )
+        pam = padded["per_type_results"][ContractType.PAM]
+        rows, events = pam["padded_shape"]
+        assert rows == 4
+        assert events & (events - 1) == 0
+        assert pam["payoffs"].shape == plain["per_type_results"][ContractType.PAM]["payoffs"].shape
+
+        bucketed = simulate_portfolio(contracts, canonical_shapes=CanonicalShapes((16,), (40,)))
+        assert bucketed["per_type_results"][ContractType.PAM]["padded_shape"] == (16, 40)
+
+    def test_length_buckets_exclusive(self):
+        with pytest.raises(ValueError, match="canonical_shapes"):
+            simulate_portfolio(
+                [(_make_pam(), ConstantRiskFactorObserver(0.0))],
+                length_buckets=2,
+                canonical_shapes=True,
+            )
+
+    def test_cache_dir_from_env(self, tmp_path):
+        """ACTUS_JAX_COMPILATION_CACHE_DIR persists compiled kernels to disk."""
+        script = textwrap.dedent(
+            """
+            from jactus.contracts.pam_array import simulate_pam_portfolio
+            from jactus.core import ActusDateTime, ContractAttributes, ContractRole, ContractType
+            from jactus.observers import ConstantRiskFactorObserver
+
+            attrs = ContractAttributes(
+                contract_id="P0",
+                contract_type=ContractType.PAM,
+                contract_role=ContractRole.RPA,
+                status_date=ActusDateTime(2024, 1, 1),
+                initial_exchange_date=ActusDateTime(2024, 1, 15),
+                maturity_date=ActusDateTime(2026, 1, 15),
+                notional_principal=1000.0,
+                nominal_interest_rate=0.05,
+                interest_payment_cycle="6M",
+            )
+            simulate_pam_portfolio([(attrs, ConstantRiskFactorObserver(0.0))])
+            """
+        )
+        env = dict(os.environ, ACTUS_JAX_COMPILATION_CACHE_DIR=str(tmp_path / "xla"))
+        proc = subprocess.run(
+            [sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=600
+        )
+        assert proc.returncode == 0, proc.stderr
+        assert any(
+            p.name.startswith("jit_batch_simulate_pam") for p in (tmp_path / "xla").iterdir()
+        )
+
+    def test_configure_without_dir_is_noop(self, monkeypatch):
+        monkeypatch.delenv(ENV_COMPILATION_CACHE_DIR, raising=False)
+        assert configure_compilation_cache() is None
+
+
+def _make_floating_pam(notional: float = 100_000.0) -> ContractAttributes:
+    return _make_pam(notional).model_copy(
+        update={
+            "rate_reset_cycle": "6M",
+            "rate_reset_anchor": ActusDateTime(2024, 7, 15),
+            "rate_reset_market_object": "SOFR",
+            "rate_reset_spread": 0.01,
+            "rate_reset_multiplier": 1.0,
+        }
+    )
+
+
+class TestScenarios:
+    """Verify the [S, B, T] risk-factor scenario axis."""
+
+    SHIFTS = jnp.array([0.0, 0.01, 0.02])
+
+    def _parallel(self, event_ordinals, rf_values):
+        return rf_values[None] + self.SHIFTS[:, None, None]
+
+    def test_matches_one_run_per_scenario(self):
+        """Each scenario equals a separate run with the shifted observer."""
+        contracts = [(_make_floating_pam(n), ConstantRiskFactorObserver(0.03)) for n in (1e5, 5e4)]
+        result = pam_array.simulate_pam_portfolio(
+            contracts, discount_rate=0.02, rf_scenarios=self._parallel
+        )
+        assert result["payoffs"].shape[:2] == (3, 2)
+        assert result["total_cashflows"].shape == (3, 2)
+        assert result["total_pv"].shape == (3,)
+        for s, shift in enumerate((0.0, 0.01, 0.02)):
+            rf_obs = ConstantRiskFactorObserver(0.03 + shift)
+            single = pam_array.simulate_pam_portfolio(
+                [(a, rf_obs) for a, _ in contracts], discount_rate=0.02
+            )
+            np.testing.assert_allclose(
+                np.asarray(result["total_cashflows"][s]),
+                np.asarray(single["total_cashflows"]),
+                rtol=1e-5,
+            )
+            np.testing.assert_allclose(
+                float(result["total_pv"][s]), float(single["total_pv"]), rtol=1e-5
+            )
+
+    def test_array_broadcasts_over_contracts(self):
+        contracts = [(_make_floating_pam(n), ConstantRiskFactorObserver(0.03)) for n in (1e5, 5e4)]
+        _, event_types, *_ = pam_array.prepare_pam_batch(contracts)
+        rf = np.full((2, 1, event_types.shape[1]), 0.04, dtype=np.float32)
+        by_array = pam_array.simulate_pam_portfolio(contracts, rf_scenarios=rf)
+        by_fn = pam_array.simulate_pam_portfolio(
+            contracts, rf_scenarios=lambda o, r: jnp.full((2, *r.shape), 0.04)
+        )
+        np.testing.assert_allclose(
+            np.asarray(by_array["total_cashflows"]), np.asarray(by_fn["total_cashflows"])
+        )
+
+    def test_portfolio_reduction(self):
+        """Non-scan types repeat across scenarios; "portfolio" sums rows on device."""
+        rf_obs = ConstantRiskFactorObserver(0.03)
+        contracts = [
+            (_make_floating_pam(), rf_obs),
+            (_make_lam(), rf_obs),
+            (_make_csh(), rf_obs),
+        ]
+        totals = simulate_portfolio(
+            contracts, rf_scenarios=self._parallel, scenario_output="totals"
+        )
+        assert totals["num_scenarios"] == 3
+        assert totals["total_cashflows"].shape == (3, 3)
+        assert "payoffs" not in totals["per_type_results"][ContractType.PAM]
+        plain = np.asarray(simulate_portfolio(contracts)["total_cashflows"])
+        for row in np.asarray(totals["total_cashflows"]):
+            np.testing.assert_allclose(row[1:], plain[1:], rtol=1e-6)
+
+        reduced = simulate_portfolio(
+            contracts,
+            discount_rate=0.02,
+            rf_scenarios=self._parallel,
+            scenario_output="portfolio",
+            scenario_batch_size=2,
+        )
+        assert reduced["total_cashflows"].shape == (3,)
+        assert reduced["total_pv"].shape == (3,)
+        np.testing.assert_allclose(
+            np.asarray(reduced["total_cashflows"]),
+            np.asarray(totals["total_cashflows"]).sum(axis=1),
+            rtol=1e-5,
+        )
+
+    def test_invalid_options(self):
+        contracts = [(_make_floating_pam(), ConstantRiskFactorObserver(0.03))]
+        with pytest.raises(ValueError, match="length_buckets"):
+            simulate_portfolio(contracts, rf_scenarios=self._parallel, length_buckets=2)
+        with pytest.raises(ValueError, match="scenario_output"):
+            simulate_portfolio(contracts, rf_scenarios=self._parallel, scenario_output="x")
+        with pytest.raises(ValueError, match=r"\[S, B, T\]"):
+            pam_array.simulate_pam_portfolio(contracts, rf_scenarios=np.zeros((2, 3)))
+        with pytest.raises(ValueError, match="scan-kernel"):
+            simulate_portfolio(
+                [(_make_csh(), ConstantRiskFactorObserver(0.0))], rf_scenarios=self._parallel
+            )
+
+
+class TestPrecision:
+    """Verify the f32 / f64 / mixed precision policies."""
+
+    def test_default_is_f32(self):
+        result = simulate_portfolio([(_make_pam(), ConstantRiskFactorObserver(0.0))])
+        assert get_precision().name == "f32"
+        assert result["total_cashflows"].dtype == jnp.float32
+        assert result["per_type_results"][ContractType.PAM]["payoffs"].dtype == jnp.float32
+
+    def test_unknown_policy_raises(self):
+        with pytest.raises(ValueError, match="Unknown precision policy"):
+            resolve_precision("f16")
+
+    @pytest.mark.skipif(jax.config.jax_enable_x64, reason="x64 already enabled")
+    def test_f64_requires_x64(self):
+        with pytest.raises(ValueError, match="jax_enable_x64"):
+            simulate_portfolio([(_make_pam(), ConstantRiskFactorObserver(0.0))], precision="f64")
+
+    def test_scope_restores_previous(self):
+        previous = set_precision("f32")
+        with precision_scope("f32") as policy:
+            assert get_precision() is policy
+        assert get_precision().name == "f32"
+        set_precision(previous)
+
+    def test_default_visible_in_new_threads(self):
+        """set_precision is process-wide; precision_scope stays thread-local."""
+        custom = PrecisionPolicy("custom", np.float32, np.float32)
+        previous = set_precision(custom)
+        try:
+            seen = []
+            with precision_scope("f32"):
+                worker = threading.Thread(target=lambda: seen.append(get_precision()))
+                worker.start()
+                worker.join()
+            assert seen == [custom]
+        finally:
+            set_precision(previous)
+
+    def test_f64_and_mixed(self):
+        """f64 runs float64 kernels; mixed keeps f32 state, f64 accumulation."""
+        script = textwrap.dedent(
+            """
+            import jax
+
+            jax.config.update("jax_enable_x64", True)
+
+            import numpy as np
+            from jactus.contracts.lam_array import prepare_lam_batch
+            from jactus.contracts.portfolio import simulate_portfolio
+            from jactus.core import ActusDateTime, ContractAttributes, ContractRole, ContractType
+            from jactus.engine import precision_scope
+            from jactus.observers import ConstantRiskFactorObserver
+
+            def make(ct, **kw):
+                return ContractAttributes(
+                    contract_id=ct.value,
+                    contract_type=ct,
+                    contract_role=ContractRole.RPA,
+                    status_date=ActusDateTime(2024, 1, 1),
+                    initial_exchange_date=ActusDateTime(2024, 1, 15),
+                    maturity_date=ActusDateTime(2029, 1, 15),
+                    notional_principal=123_456_789.0,
+                    nominal_interest_rate=0.0537,
+                    interest_payment_cycle="1M",
+                    **kw,
+                )
+
+            rf_obs = ConstantRiskFactorObserver(0.0)
+            contracts = [
+                (make(ContractType.PAM), rf_obs),
+                (make(ContractType.LAM, principal_redemption_cycle="1M",
+                      next_principal_redemption_amount=2_000_000.0), rf_obs),
+            ]
+            runs = {
+                p: simulate_portfolio(contracts, discount_rate=0.03, precision=p)
+                for p in ("f32", "mixed", "f64")
+            }
+            for p, dtype in (("f32", np.float32), ("mixed", np.float64), ("f64", np.float64)):
+                r = runs[p]
+                assert r["total_cashflows"].dtype == dtype, p
+                for res in r["per_type_results"].values():
+                    assert res["payoffs"].dtype == dtype, p
+                    assert res["present_values"].dtype == dtype, p
+            with precision_scope("mixed"):
+                assert prepare_lam_batch(contracts[1:])[0].nt.dtype == np.float32
+            with precision_scope("f64"):
+                assert prepare_lam_batch(contracts[1:])[0].nt.dtype == np.float64
+
+            exact = np.asarray(runs["f64"]["total_cashflows"])
+            err = {p: np.max(np.abs(np.asarray(runs[p]["total_cashflows"]) - exact))
+                   for p in ("f32", "mixed")}
+            assert err["mixed"] <= err["f32"], err
+            np.testing.assert_allclose(exact, np.asarray(runs["f32"]["total_cashflows"]), rtol=1e-5)
+            print("ok")
+            """
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, timeout=600
+        )
+        assert proc.returncode == 0, proc.stderr
+        assert proc.stdout.strip().endswith("ok")
+
+
 class TestBatchSupportedTypes:
     """Verify the BATCH_SUPPORTED_TYPES constant."""
 
     def test_all_batch_types_listed(self):
-        """All 12 batch-supported types should be in the constant."""
+        """All 18 batch-supported types should be in the constant."""
         expected = {
             ContractType.PAM,
             ContractType.LAM,
@@ -385,5 +906,11 @@ class TestBatchSupportedTypes:
             ContractType.FUTUR,
             ContractType.OPTNS,
             ContractType.SWPPV,
+            ContractType.CLM,
+            ContractType.UMP,
+            ContractType.CAPFL,
+            ContractType.SWAPS,
+            ContractType.CEG,
+            ContractType.CEC,
         }
         assert expected == BATCH_SUPPORTED_TYPES
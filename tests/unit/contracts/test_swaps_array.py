@@ -0,0 +1,272 @@
+"""Equivalence tests for array-mode SWAPS simulation.
+
+Runs identical swaps through both the Python path (GenericSwapContract fed
+by a SimulatedChildContractObserver) and the array-mode path
+(simulate_swaps_portfolio), asserting matching net cash flows.
+Tolerance matches the ACTUS cross-validation standard (atol=1.0).
+"""
+
+import json
+
+import jax
+import jax.numpy as jnp
+import pytest
+
+from jactus.contracts import create_contract
+from jactus.contracts.portfolio import simulate_portfolio
+from jactus.contracts.swaps import GenericSwapContract
+from jactus.contracts.swaps_array import (
+    net_leg_payoffs,
+    prepare_swaps_batch,
+    simulate_leg_batches,
+    simulate_swaps_portfolio,
+)
+from jactus.core import (
+    ActusDateTime,
+    ContractAttributes,
+    ContractRole,
+    ContractType,
+    DayCountConvention,
+)
+from jactus.observers import ConstantRiskFactorObserver
+from jactus.observers.child_contract import SimulatedChildContractObserver
+
+ATOL = 1.0
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+def _make_leg_attrs(
+    contract_id: str,
+    contract_type: ContractType = ContractType.PAM,
+    role: ContractRole = ContractRole.RPA,
+    rate: float = 0.04,
+    **overrides,
+) -> ContractAttributes:
+    """Create a 3-year semi-annual leg."""
+    kwargs = {
+        "contract_id": contract_id,
+        "contract_type": contract_type,
+        "contract_role": role,
+        "status_date": ActusDateTime(2024, 1, 1),
+        "initial_exchange_date": ActusDateTime(2024, 1, 15),
+        "maturity_date": ActusDateTime(2027, 1, 15),
+        "currency": "USD",
+        "notional_principal": 1_000_000.0,
+        "nominal_interest_rate": rate,
+        "day_count_convention": DayCountConvention.A360,
+        "interest_payment_cycle": "6M",
+    }
+    kwargs.update(overrides)
+    return ContractAttributes(**kwargs)
+
+
+def _legs() -> dict[str, ContractAttributes]:
+    return {
+        "FIXED": _make_leg_attrs("FIXED", rate=0.04),
+        "FLOAT": _make_leg_attrs(
+            "FLOAT",
+            role=ContractRole.RPL,
+            rate=0.03,
+            rate_reset_cycle="6M",
+            rate_reset_anchor=ActusDateTime(2024, 7, 15),
+            rate_reset_market_object="RATE",
+        ),
+        "AMORT": _make_leg_attrs(
+            "AMORT",
+            contract_type=ContractType.LAM,
+            role=ContractRole.RPL,
+            rate=0.035,
+            principal_redemption_cycle="6M",
+            next_principal_redemption_amount=100_000.0,
+        ),
+        "ANNUITY": _make_leg_attrs(
+            "ANNUITY",
+            contract_type=ContractType.ANN,
+            rate=0.05,
+            principal_redemption_cycle="6M",
+        ),
+    }
+
+
+def _make_swap_attrs(
+    first: str = "FIXED",
+    second: str = "FLOAT",
+    ds: str = "S",
+    contract_id: str = "SWAP-TEST",
+    **overrides,
+) -> ContractAttributes:
+    kwargs = {
+        "contract_id": contract_id,
+        "contract_type": ContractType.SWAPS,
+        "contract_role": ContractRole.RFL,
+        "status_date": ActusDateTime(2024, 1, 1),
+        "maturity_date": ActusDateTime(2027, 1, 15),
+        "currency": "USD",
+        "delivery_settlement": ds,
+        "contract_structure": json.dumps({"FirstLeg": first, "SecondLeg": second}),
+    }
+    kwargs.update(overrides)
+    return ContractAttributes(**kwargs)
+
+
+def _rf_observer() -> ConstantRiskFactorObserver:
+    return ConstantRiskFactorObserver(0.045)
+
+
+def _simulate_python_path(attrs, rf_observer):
+    """Run the swap through the scalar path with simulated child legs."""
+    child_obs = SimulatedChildContractObserver()
+    for leg_id, leg in _legs().items():
+        leg_result = create_contract(leg, rf_observer).simulate()
+        child_obs.register_simulation(
+            leg_id, leg_result.events, leg, initial_state=leg_result.initial_state
+        )
+    return GenericSwapContract(attrs, rf_observer, child_obs).simulate()
+
+
+def _assert_swap_matches(attrs, result, i, rf_observer):
+    py_result = _simulate_python_path(attrs, rf_observer)
+    py_total = sum(float(e.payoff) for e in py_result.events)
+    assert abs(float(result["total_cashflows"][i]) - py_total) <= ATOL, (
+        f"Swap {i}: array={float(result['total_cashflows'][i]):.2f}, python={py_total:.2f}"
+    )
+    assert int(result["masks"][i].sum()) == len(py_result.events)
+
+
+# ============================================================================
+# End-to-end equivalence tests
+# ============================================================================
+
+
+class TestScanEquivalence:
+    """End-to-end equivalence: simulate_swaps_portfolio vs contract.simulate()."""
+
+    @pytest.mark.parametrize("ds", ["S", "D"], ids=["net", "gross"])
+    def test_fixed_float_swap(self, ds):
+        attrs = _make_swap_attrs(ds=ds)
+        rf_obs = _rf_observer()
+        result = simulate_swaps_portfolio([(attrs, rf_obs)], legs=_legs())
+        _assert_swap_matches(attrs, result, 0, rf_obs)
+
+    @pytest.mark.parametrize(
+        ("first", "second"),
+        [("ANNUITY", "AMORT"), ("FLOAT", "AMORT")],
+        ids=["ann-lam", "pam-lam"],
+    )
+    def test_mixed_leg_types(self, first, second):
+        attrs = _make_swap_attrs(first=first, second=second)
+        rf_obs = _rf_observer()
+        result = simulate_swaps_portfolio([(attrs, rf_obs)], legs=_legs())
+        _assert_swap_matches(attrs, result, 0, rf_obs)
+
+    def test_net_settlement_merges_congruent_events(self):
+        """Net settlement occupies fewer slots than gross settlement."""
+        rf_obs = _rf_observer()
+        result = simulate_swaps_portfolio(
+            [(_make_swap_attrs(ds="S"), rf_obs), (_make_swap_attrs(ds="D"), rf_obs)],
+            legs=_legs(),
+        )
+        assert float(result["masks"][0].sum()) < float(result["masks"][1].sum())
+        assert abs(float(result["total_cashflows"][0] - result["total_cashflows"][1])) <= ATOL
+
+    def test_termination(self):
+        """Events after TD are dropped and the termination price is paid."""
+        attrs = _make_swap_attrs(
+            termination_date=ActusDateTime(2025, 3, 1),
+            price_at_termination_date=2_500.0,
+        )
+        rf_obs = _rf_observer()
+        result = simulate_swaps_portfolio([(attrs, rf_obs)], legs=_legs())
+        _assert_swap_matches(attrs, result, 0, rf_obs)
+
+    def test_purchase(self):
+        """Events up to PRD are dropped and the purchase price is paid."""
+        attrs = _make_swap_attrs(
+            purchase_date=ActusDateTime(2024, 3, 1),
+            price_at_purchase_date=-1_000.0,
+        )
+        rf_obs = _rf_observer()
+        result = simulate_swaps_portfolio([(attrs, rf_obs)], legs=_legs())
+        _assert_swap_matches(attrs, result, 0, rf_obs)
+
+    def test_missing_leg_raises(self):
+        with pytest.raises(ValueError, match="legs"):
+            simulate_swaps_portfolio(
+                [(_make_swap_attrs(second="NOPE"), _rf_observer())], legs=_legs()
+            )
+
+
+# ============================================================================
+# Batch equivalence tests
+# ============================================================================
+
+
+class TestBatchEquivalence:
+    """Batch SWAPS simulation equivalence tests."""
+
+    def test_batch_matches_python(self):
+        """A mixed book shares leg kernels and matches the scalar path."""
+        rf_obs = _rf_observer()
+        swaps = [
+            _make_swap_attrs(contract_id="S0"),
+            _make_swap_attrs(contract_id="S1", ds="D"),
+            _make_swap_attrs(contract_id="S2", first="ANNUITY", second="AMORT"),
+            _make_swap_attrs(contract_id="S3", first="FLOAT", second="FIXED"),
+        ]
+        result = simulate_swaps_portfolio([(s, rf_obs) for s in swaps], legs=_legs())
+        for i, attrs in enumerate(swaps):
+            _assert_swap_matches(attrs, result, i, rf_obs)
+
+    def test_legs_grouped_by_type(self):
+        """One leg batch per contract type, however many swaps use it."""
+        rf_obs = _rf_observer()
+        contracts = [
+            (_make_swap_attrs(contract_id="S0"), rf_obs),
+            (_make_swap_attrs(contract_id="S1", first="ANNUITY", second="AMORT"), rf_obs),
+        ]
+        batches, _ = prepare_swaps_batch(contracts, legs=_legs())
+        assert sorted(b.contract_type.value for b in batches) == ["ANN", "LAM", "PAM"]
+
+    def test_portfolio_routes_swaps_to_batch_kernel(self):
+        """simulate_portfolio forwards child contracts to the SWAPS kernel."""
+        rf_obs = _rf_observer()
+        attrs = _make_swap_attrs()
+        result = simulate_portfolio([(attrs, rf_obs)], child_contracts=_legs())
+        assert result["batch_contracts"] == 1
+        assert ContractType.SWAPS in result["per_type_results"]
+        direct = simulate_swaps_portfolio([(attrs, rf_obs)], legs=_legs())
+        assert jnp.allclose(result["total_cashflows"], direct["total_cashflows"])
+
+    def test_portfolio_pv(self):
+        rf_obs = _rf_observer()
+        contracts = [(_make_swap_attrs(), rf_obs), (_make_swap_attrs(ds="D"), rf_obs)]
+        result = simulate_swaps_portfolio(contracts, discount_rate=0.05, legs=_legs())
+        assert result["present_values"].shape == (2,)
+        assert jnp.isfinite(result["total_pv"])
+
+
+# ============================================================================
+# Gradient tests
+# ============================================================================
+
+
+class TestGradients:
+    """Test that gradients flow through the leg kernels and the netting."""
+
+    def test_gradient_wrt_floating_rate_path(self):
+        """Paying floating: a higher observed rate lowers the net cash flow."""
+        contracts = [(_make_swap_attrs(), _rf_observer())]
+        batches, alignment = prepare_swaps_batch(contracts, legs=_legs())
+
+        def total_net(rf_values):
+            b = batches[0]._replace(rf_values=rf_values)
+            _, first, second = simulate_leg_batches([b], 1)
+            return jnp.sum(net_leg_payoffs(first, second, alignment) * alignment.masks)
+
+        grad = jax.grad(total_net)(batches[0].rf_values)
+        assert jnp.all(jnp.isfinite(grad))
+        assert float(jnp.sum(grad)) < 0.0
@@ -10,6 +10,8 @@ import jax.numpy as jnp
 
 from jactus.contracts.swppv import PlainVanillaSwapContract
 from jactus.contracts.swppv_array import (
+    _prepare_swppv_batch_dated,
+    batch_simulate_swppv,
     precompute_swppv_arrays,
     simulate_swppv_array,
     simulate_swppv_array_jit,
@@ -22,7 +24,11 @@ from jactus.core import (
     ContractType,
     DayCountConvention,
 )
-from jactus.observers import ConstantRiskFactorObserver, TimeSeriesRiskFactorObserver
+from jactus.observers import (
+    ConstantRiskFactorObserver,
+    JaxTimeSeriesRiskFactorObserver,
+    TimeSeriesRiskFactorObserver,
+)
 
 ATOL = 1.0
 
@@ -460,3 +466,43 @@ class TestGradients:
         grad = jax.grad(total_cashflow)(params.fixed_rate)
         assert jnp.isfinite(grad)
         assert float(grad) != 0.0
+
+
+# ============================================================================
+# In-kernel rate reset
+# ============================================================================
+
+
+class TestInKernelRateReset:
+    """Floating-leg fixings looked up from an on-device rate path."""
+
+    def test_rate_path_matches_prequeried_fixings(self):
+        rf_obs = TimeSeriesRiskFactorObserver(
+            {
+                "LIBOR-3M": [
+                    (ActusDateTime(2024, 1, 1), 0.03),
+                    (ActusDateTime(2024, 10, 1), 0.035),
+                    (ActusDateTime(2025, 4, 1), 0.04),
+                ]
+            }
+        )
+        (states, et, yf, rf, params, masks), ordinals = _prepare_swppv_batch_dated(
+            [(_make_fixed_vs_float_attrs(), rf_obs)]
+        )
+        _, expected = batch_simulate_swppv(states, et, yf, rf, params)
+
+        path = rf_obs.to_jax("LIBOR-3M")
+        _, payoffs = batch_simulate_swppv(
+            states, et, yf, jnp.zeros_like(rf), params, reset_ordinals=ordinals, rate_path=path
+        )
+        assert jnp.allclose(payoffs * masks, expected * masks, atol=1e-2)
+
+        def net(values):
+            shifted = JaxTimeSeriesRiskFactorObserver(path.offsets, values, origin=path.origin)
+            _, p = batch_simulate_swppv(
+                states, et, yf, rf, params, reset_ordinals=ordinals, rate_path=shifted
+            )
+            return jnp.sum(p * masks)
+
+        # RPA receives fixed and pays floating: higher fixings, lower net cashflow
+        assert float(jnp.sum(jax.grad(net)(path.values))) < 0.0
@@ -0,0 +1,317 @@
+"""Equivalence tests for array-mode UMP simulation.
+
+Contracts without deposit transactions run through both the Python path
+(UndefinedMaturityProfileContract) and the array-mode path
+(simulate_ump_array), asserting matching results.  Contracts with a
+DepositTransactionObserver are checked against hand-computed balances;
+the scalar path schedules no PR/PI events, and a test pins that it
+ignores the transactions the array path applies.
+Tolerance matches the ACTUS cross-validation standard (atol=1.0).
+"""
+
+import jax
+import jax.numpy as jnp
+
+from jactus.contracts.ump import UndefinedMaturityProfileContract
+from jactus.contracts.ump_array import (
+    batch_simulate_ump,
+    batch_simulate_ump_vmap,
+    precompute_ump_arrays,
+    prepare_ump_batch,
+    simulate_ump_array,
+    simulate_ump_array_jit,
+    simulate_ump_portfolio,
+)
+from jactus.core import (
+    ActusDateTime,
+    ContractAttributes,
+    ContractRole,
+    ContractType,
+    DayCountConvention,
+    EventType,
+)
+from jactus.observers import ConstantRiskFactorObserver, DepositTransactionObserver
+
+ATOL = 1.0
+
+_MATURITY = ActusDateTime(2025, 1, 15)
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+def _make_ump_attrs(
+    contract_id: str = "UMP-TEST",
+    notional: float = 100_000.0,
+    rate: float = 0.06,
+    maturity: ActusDateTime | None = _MATURITY,
+    ip_cycle: str | None = "3M",
+    role: ContractRole = ContractRole.RPA,
+    **overrides,
+) -> ContractAttributes:
+    """Create UMP attributes with quarterly interest capitalization."""
+    kwargs = {
+        "contract_id": contract_id,
+        "contract_type": ContractType.UMP,
+        "contract_role": role,
+        "status_date": ActusDateTime(2024, 1, 1),
+        "initial_exchange_date": ActusDateTime(2024, 1, 15),
+        "maturity_date": maturity,
+        "currency": "USD",
+        "notional_principal": notional,
+        "nominal_interest_rate": rate,
+        "day_count_convention": DayCountConvention.A360,
+        "interest_payment_cycle": ip_cycle,
+    }
+    kwargs.update(overrides)
+    return ContractAttributes(**kwargs)
+
+
+def _deposit_observer() -> DepositTransactionObserver:
+    return DepositTransactionObserver(
+        transactions={
+            "UMP-TEST": [
+                (ActusDateTime(2024, 3, 1), 10_000.0),
+                (ActusDateTime(2024, 6, 1), -25_000.0),
+            ],
+        }
+    )
+
+
+def _simulate_python_path(attrs, rf_observer):
+    """Run simulation through the standard Python path."""
+    contract = UndefinedMaturityProfileContract(attrs, rf_observer)
+    return contract.simulate()
+
+
+def _simulate_array_path(attrs, rf_observer):
+    """Run simulation through the array-mode path."""
+    arrays = precompute_ump_arrays(attrs, rf_observer)
+    return simulate_ump_array(*arrays)
+
+
+def _assert_payoffs_match(py_result, payoffs, atol=ATOL):
+    """Assert that Python and array payoffs match within tolerance."""
+    py_payoffs = jnp.array([float(e.payoff) for e in py_result.events])
+    assert py_payoffs.shape == payoffs.shape, (
+        f"Event count mismatch: Python={py_payoffs.shape[0]}, Array={payoffs.shape[0]}"
+    )
+    for i in range(len(py_result.events)):
+        assert abs(float(payoffs[i]) - float(py_payoffs[i])) <= atol, (
+            f"Event {i} ({py_result.events[i].event_type.name}): "
+            f"array={float(payoffs[i]):.2f}, python={float(py_payoffs[i]):.2f}"
+        )
+
+
+# ============================================================================
+# End-to-end equivalence tests
+# ============================================================================
+
+
+class TestScanEquivalence:
+    """End-to-end equivalence: simulate_ump_array vs contract.simulate()."""
+
+    def test_ipci_capitalization(self):
+        """Quarterly IPCI grows the notional exactly as the scalar path."""
+        attrs = _make_ump_attrs()
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        state, payoffs = _simulate_array_path(attrs, rf_obs)
+        py_result = _simulate_python_path(attrs, rf_obs)
+        _assert_payoffs_match(py_result, payoffs)
+        assert abs(float(state.nt) - float(py_result.events[-1].state_post.nt)) <= ATOL
+
+    def test_uncertain_maturity(self):
+        """Without an end date only AD and IED are scheduled."""
+        attrs = _make_ump_attrs(maturity=None)
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_payoffs_match(_simulate_python_path(attrs, rf_obs), payoffs)
+
+    def test_termination(self):
+        """TD pays the termination price plus accrued interest."""
+        attrs = _make_ump_attrs(
+            termination_date=ActusDateTime(2024, 9, 1),
+            price_at_termination_date=100_500.0,
+        )
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_payoffs_match(_simulate_python_path(attrs, rf_obs), payoffs)
+
+    def test_rate_resets(self):
+        """RR sets the rate to the observed market value."""
+        attrs = _make_ump_attrs(
+            rate_reset_cycle="6M",
+            rate_reset_anchor=ActusDateTime(2024, 7, 15),
+            rate_reset_market_object="RATE",
+        )
+        rf_obs = ConstantRiskFactorObserver(0.04)
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_payoffs_match(_simulate_python_path(attrs, rf_obs), payoffs)
+
+    def test_rpl_role(self):
+        attrs = _make_ump_attrs(role=ContractRole.RPL)
+        rf_obs = ConstantRiskFactorObserver(0.0)
+        _, payoffs = _simulate_array_path(attrs, rf_obs)
+        _assert_payoffs_match(_simulate_python_path(attrs, rf_obs), payoffs)
+
+
+# ============================================================================
+# Deposit transaction tests
+# ============================================================================
+
+
+class TestDepositTransactions:
+    """Observed deposit transactions become PR/PI events in the kernel."""
+
+    def test_transactions_move_notional(self):
+        """Inflows raise and outflows lower the notional; payoffs mirror them."""
+        attrs = _make_ump_attrs(ip_cycle=None)
+        state, et, yf, rf, params = precompute_ump_arrays(attrs, _deposit_observer())
+
+        assert EventType.PI.index in et.tolist()
+        assert EventType.PR.index in et.tolist()
+
+        final_state, payoffs = simulate_ump_array(state, et, yf, rf, params)
+        pi_pos = et.tolist().index(EventType.PI.index)
+        pr_pos = et.tolist().index(EventType.PR.index)
+        assert abs(float(payoffs[pi_pos]) + 10_000.0) <= ATOL
+        assert abs(float(payoffs[pr_pos]) - 25_000.0) <= ATOL
+        assert abs(float(final_state.nt) - 85_000.0) <= ATOL
+
+    def test_interest_accrues_on_running_balance(self):
+        """Accrued interest follows the balance between transactions."""
+        attrs = _make_ump_attrs(ip_cycle=None)
+        final_state, _ = _simulate_array_path(attrs, _deposit_observer())
+
+        # 2024-01-15 -> 03-01 on 100k, 03-01 -> 06-01 on 110k (A360)
+        expected = (46 / 360) * 0.06 * 100_000.0 + (92 / 360) * 0.06 * 110_000.0
+        assert abs(float(final_state.ipac) - expected) <= ATOL
+
+    def test_transactions_outside_horizon_ignored(self):
+        """Transactions before SD or after the end date are dropped."""
+        observer = DepositTransactionObserver(
+            transactions={
+                "UMP-TEST": [
+                    (ActusDateTime(2023, 6, 1), 5_000.0),
+                    (ActusDateTime(2026, 6, 1), 5_000.0),
+                ],
+            }
+        )
+        _, et, _, _, _ = precompute_ump_arrays(_make_ump_attrs(), observer)
+        assert EventType.PI.index not in et.tolist()
+
+    def test_schedule_read_once_per_contract(self):
+        """Phase 1 reads each transaction schedule in a single call."""
+
+        class CountingObserver(DepositTransactionObserver):
+            calls = 0
+
+            def get_transaction_schedule(self, contract_id):
+                CountingObserver.calls += 1
+                return super().get_transaction_schedule(contract_id)
+
+            def _get_risk_factor(self, identifier, time, state, attributes):
+                raise AssertionError("per-event observation should not be needed")
+
+        observer = CountingObserver(
+            transactions={"UMP-TEST": [(ActusDateTime(2024, 3, 1), 10_000.0)]}
+        )
+        precompute_ump_arrays(_make_ump_attrs(), observer)
+        assert CountingObserver.calls == 1
+
+    def test_scalar_path_ignores_transactions(self):
+        """Pin the known divergence: contract.simulate() skips transactions."""
+        attrs = _make_ump_attrs()
+        py_result = _simulate_python_path(attrs, _deposit_observer())
+        assert not {e.event_type for e in py_result.events} & {EventType.PR, EventType.PI}
+        py_nt = float(py_result.events[-1].state_post.nt)
+        py_total = sum(float(e.payoff) for e in py_result.events)
+
+        # The scalar result is the array result without any transactions...
+        state, payoffs = _simulate_array_path(attrs, DepositTransactionObserver(transactions={}))
+        assert abs(float(state.nt) - py_nt) <= ATOL
+        assert abs(float(jnp.sum(payoffs)) - py_total) <= ATOL
+
+        # ...while the array path pays them and ends on a different balance
+        state, payoffs = _simulate_array_path(attrs, _deposit_observer())
+        assert abs(float(state.nt) - py_nt) > 10_000.0
+        assert abs(float(jnp.sum(payoffs)) - py_total - 15_000.0) <= ATOL
+
+    def test_unknown_contract_has_no_transactions(self):
+        """A deposit observer without the contract's ID yields no PR/PI."""
+        attrs = _make_ump_attrs(contract_id="UMP-OTHER")
+        _, et, _, _, _ = precompute_ump_arrays(attrs, _deposit_observer())
+        assert EventType.PI.index not in et.tolist()
+        assert EventType.PR.index not in et.tolist()
+
+
+# ============================================================================
+# Batch equivalence tests
+# ============================================================================
+
+
+class TestBatchEquivalence:
+    """Batch UMP simulation equivalence tests."""
+
+    def test_batch_matches_individual(self):
+        """Batch simulation should match individual simulations."""
+        deposits = _deposit_observer()
+        contracts = [
+            (_make_ump_attrs(), deposits),
+            (_make_ump_attrs(notional=50_000.0, role=ContractRole.RPL), deposits),
+            (_make_ump_attrs(maturity=None), ConstantRiskFactorObserver(0.0)),
+        ]
+
+        result = simulate_ump_portfolio(contracts)
+        for i, (attrs, obs) in enumerate(contracts):
+            _, payoffs = _simulate_array_path(attrs, obs)
+            assert abs(float(result["total_cashflows"][i]) - float(jnp.sum(payoffs))) <= ATOL
+
+    def test_batch_kernel_matches_vmap(self):
+        """Branchless batch kernel should match vmap over the scan kernel."""
+        contracts = [
+            (_make_ump_attrs(), _deposit_observer()),
+            (_make_ump_attrs(termination_date=ActusDateTime(2024, 9, 1)), _deposit_observer()),
+        ]
+        states, et, yf, rf, params, masks = prepare_ump_batch(contracts)
+
+        final_batch, payoffs_batch = batch_simulate_ump(states, et, yf, rf, params)
+        final_vmap, payoffs_vmap = batch_simulate_ump_vmap(states, et, yf, rf, params)
+        assert jnp.allclose(payoffs_batch * masks, payoffs_vmap * masks, atol=1e-2)
+        assert jnp.allclose(final_batch.nt, final_vmap.nt, atol=1e-2)
+
+
+# ============================================================================
+# JIT and gradient tests
+# ============================================================================
+
+
+class TestJITCompilation:
+    """Test JIT compilation works correctly."""
+
+    def test_jit_matches_eager(self):
+        """JIT-compiled version should match eager execution."""
+        arrays = precompute_ump_arrays(_make_ump_attrs(), _deposit_observer())
+        _, payoffs_eager = simulate_ump_array(*arrays)
+        _, payoffs_jit = simulate_ump_array_jit(*arrays)
+        assert jnp.allclose(payoffs_eager, payoffs_jit, atol=1e-6)
+
+
+class TestGradients:
+    """Test that gradients can be computed through UMP simulation."""
+
+    def test_gradient_wrt_transaction_amounts(self):
+        """dFinalNotional/dAmounts is the role sign at every PR/PI event."""
+        state, et, yf, rf, params = precompute_ump_arrays(
+            _make_ump_attrs(ip_cycle=None), _deposit_observer()
+        )
+
+        def final_notional(rf_values):
+            final_state, _ = simulate_ump_array(state, et, yf, rf_values, params)
+            return final_state.nt
+
+        grad = jax.grad(final_notional)(rf)
+        is_trx = (et == EventType.PR.index) | (et == EventType.PI.index)
+        assert jnp.allclose(jnp.where(is_trx, grad, 1.0), 1.0)
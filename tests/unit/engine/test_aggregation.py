@@ -0,0 +1,194 @@
+"""Unit tests for time-bucket cash-flow aggregation.
+
+Tests aggregate_cashflows on hand-built padded arrays (grids, masks,
+grouping) and end-to-end on simulate_portfolio results.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from jactus.contracts.portfolio import simulate_portfolio
+from jactus.core import (
+    ActusDateTime,
+    ContractAttributes,
+    ContractRole,
+    ContractType,
+    DayCountConvention,
+)
+from jactus.engine import aggregate_cashflows
+from jactus.engine.aggregation import _stack_result
+from jactus.observers import ConstantRiskFactorObserver
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+def _ord(y: int, m: int, d: int) -> int:
+    return date(y, m, d).toordinal()
+
+
+def _arrays() -> dict[str, np.ndarray]:
+    """Two contracts, three event slots each; the last slot of row 1 is padding."""
+    return {
+        "payoffs": np.array([[10.0, 20.0, 30.0], [1.0, 2.0, 99.0]], dtype=np.float32),
+        "masks": np.array([[1.0, 1.0, 1.0], [1.0, 1.0, 0.0]], dtype=np.float32),
+        "event_ordinals": np.array(
+            [
+                [_ord(2024, 1, 15), _ord(2024, 2, 1), _ord(2024, 4, 30)],
+                [_ord(2024, 1, 31), _ord(2024, 7, 1), 0],
+            ],
+            dtype=np.int32,
+        ),
+    }
+
+
+def _make_loan(contract_id: str, ct: ContractType, currency: str) -> ContractAttributes:
+    extra = {"principal_redemption_cycle": "1Y"} if ct == ContractType.LAM else {}
+    return ContractAttributes(
+        contract_id=contract_id,
+        contract_type=ct,
+        contract_role=ContractRole.RPA,
+        status_date=ActusDateTime(2024, 1, 1),
+        initial_exchange_date=ActusDateTime(2024, 1, 15),
+        maturity_date=ActusDateTime(2027, 1, 15),
+        currency=currency,
+        notional_principal=100_000.0,
+        nominal_interest_rate=0.05,
+        day_count_convention=DayCountConvention.A360,
+        interest_payment_cycle="1Y",
+        **extra,
+    )
+
+
+def _portfolio() -> list[tuple[ContractAttributes, ConstantRiskFactorObserver]]:
+    rf_obs = ConstantRiskFactorObserver(0.0)
+    return [
+        (_make_loan("P0", ContractType.PAM, "USD"), rf_obs),
+        (_make_loan("L0", ContractType.LAM, "EUR"), rf_obs),
+        (_make_loan("P1", ContractType.PAM, "EUR"), rf_obs),
+    ]
+
+
+# ============================================================================
+# Grids
+# ============================================================================
+
+
+class TestGrids:
+    """Calendar and custom bucket boundaries."""
+
+    def test_monthly(self):
+        buckets = aggregate_cashflows(_arrays(), "monthly")
+        assert buckets.groups == ["total"]
+        assert buckets.periods == [
+            "2024-01",
+            "2024-02",
+            "2024-03",
+            "2024-04",
+            "2024-05",
+            "2024-06",
+            "2024-07",
+        ]
+        np.testing.assert_allclose(
+            np.asarray(buckets.amounts[0]), [11.0, 20.0, 0.0, 30.0, 0.0, 0.0, 2.0]
+        )
+        assert np.asarray(buckets.counts).sum() == 5
+
+    def test_quarterly_and_annual_labels(self):
+        quarterly = aggregate_cashflows(_arrays(), "quarterly")
+        assert quarterly.periods == ["2024-Q1", "2024-Q2", "2024-Q3"]
+        np.testing.assert_allclose(np.asarray(quarterly.totals()), [31.0, 30.0, 2.0])
+
+        annual = aggregate_cashflows(_arrays(), "annual")
+        assert annual.periods == ["2024"]
+        assert float(annual.totals()[0]) == pytest.approx(63.0)
+
+    def test_daily_spans_first_to_last_event(self):
+        buckets = aggregate_cashflows(_arrays(), "daily")
+        assert buckets.periods[0] == "2024-01-15"
+        assert buckets.periods[-1] == "2024-07-01"
+        assert float(buckets.totals().sum()) == pytest.approx(63.0)
+
+    def test_custom_grid_drops_events_outside(self):
+        grid = [ActusDateTime(2024, 1, 20), date(2024, 2, 2), _ord(2024, 5, 1)]
+        buckets = aggregate_cashflows(_arrays(), grid)
+        assert buckets.periods == ["2024-01-20", "2024-02-02"]
+        np.testing.assert_allclose(np.asarray(buckets.amounts[0]), [21.0, 30.0])
+
+    def test_invalid_grids_raise(self):
+        with pytest.raises(ValueError, match="Unknown grid"):
+            aggregate_cashflows(_arrays(), "weekly")
+        with pytest.raises(ValueError, match="strictly increasing"):
+            aggregate_cashflows(_arrays(), [date(2024, 2, 1), date(2024, 1, 1)])
+
+
+# ============================================================================
+# Grouping
+# ============================================================================
+
+
+class TestGrouping:
+    """Group keys and user labels."""
+
+    def test_by_contract_and_labels(self):
+        per_contract = aggregate_cashflows(_arrays(), "quarterly", by="contract")
+        assert per_contract.groups == ["0", "1"]
+        np.testing.assert_allclose(np.asarray(per_contract.amounts), [[30, 30, 0], [1, 0, 2]])
+
+        labelled = aggregate_cashflows(_arrays(), "annual", by=["desk-b", "desk-a"])
+        assert labelled.groups == ["desk-a", "desk-b"]
+        np.testing.assert_allclose(np.asarray(labelled.amounts[:, 0]), [3.0, 60.0])
+
+    def test_label_count_must_match(self):
+        with pytest.raises(ValueError, match="labels"):
+            aggregate_cashflows(_arrays(), by=["only-one"])
+
+    def test_currency_requires_contracts(self):
+        with pytest.raises(ValueError, match="requires"):
+            aggregate_cashflows(_arrays(), by="currency")
+
+
+# ============================================================================
+# Portfolio results
+# ============================================================================
+
+
+class TestPortfolioAggregation:
+    """Aggregation over mixed-type simulate_portfolio results."""
+
+    def test_totals_match_portfolio(self):
+        contracts = _portfolio()
+        result = simulate_portfolio(contracts)
+        buckets = aggregate_cashflows(result, "annual", by="contract", contracts=contracts)
+        assert buckets.groups == ["P0", "L0", "P1"]
+        np.testing.assert_allclose(
+            np.asarray(buckets.amounts.sum(axis=1)),
+            np.asarray(result["total_cashflows"]),
+            atol=1.0,
+        )
+
+    def test_stacking_keeps_float64_payoffs(self):
+        """Under the f64 / mixed policies payoffs are not cut to float32."""
+        arrays = _arrays()
+        arrays["payoffs"] = arrays["payoffs"].astype(np.float64) + 123_456_789.01
+        result = {"per_type_results": {ContractType.PAM: arrays}, "num_contracts": 2}
+        payoffs = _stack_result(result)[0]
+        assert payoffs.dtype == np.float64
+        assert payoffs[0, 0] == 123_456_799.01
+
+    def test_by_contract_type_and_currency(self):
+        contracts = _portfolio()
+        result = simulate_portfolio(contracts)
+        total = float(np.asarray(result["total_cashflows"]).sum())
+
+        by_type = aggregate_cashflows(result, "quarterly", by="contract_type")
+        assert by_type.groups == ["LAM", "PAM"]
+        assert float(by_type.amounts.sum()) == pytest.approx(total, abs=1.0)
+
+        by_ccy = aggregate_cashflows(result, "quarterly", by="currency", contracts=contracts)
+        assert by_ccy.groups == ["EUR", "USD"]
+        usd = float(result["total_cashflows"][0])
+        assert float(by_ccy.amounts[1].sum()) == pytest.approx(usd, abs=1.0)
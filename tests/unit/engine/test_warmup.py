@@ -0,0 +1,118 @@
+"""Unit tests for ahead-of-time batch kernel warmup."""
+
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from jactus.contracts.pam_array import prepare_pam_batch, simulate_pam_portfolio
+from jactus.core import ActusDateTime, ContractAttributes, ContractRole, ContractType
+from jactus.engine import WarmupReport, warmup
+from jactus.engine.warmup import WARMUP_TYPES, parse_warmup_shapes, parse_warmup_types
+from jactus.observers import ConstantRiskFactorObserver
+
+
+def _make_pam(contract_id: str) -> ContractAttributes:
+    return ContractAttributes(
+        contract_id=contract_id,
+        contract_type=ContractType.PAM,
+        contract_role=ContractRole.RPA,
+        status_date=ActusDateTime(2024, 1, 1),
+        initial_exchange_date=ActusDateTime(2024, 1, 15),
+        maturity_date=ActusDateTime(2026, 1, 15),
+        currency="USD",
+        notional_principal=100_000.0,
+        nominal_interest_rate=0.05,
+        interest_payment_cycle="1Y",
+    )
+
+
+class TestWarmup:
+    def test_report_lists_each_kernel_and_shape(self):
+        report = warmup(types=["PAM", ContractType.CSH], shapes=[(3, 5), (3, 7)])
+        assert isinstance(report, WarmupReport)
+        assert [(k, s) for k, s, _ in report.compiled] == [
+            ("batch_simulate_pam", (3, 5)),
+            ("batch_simulate_pam", (3, 7)),
+            ("batch_simulate_csh", (3, 5)),
+            ("batch_simulate_csh", (3, 7)),
+        ]
+        assert report.total_seconds >= sum(t for _, _, t in report.compiled)
+
+    def test_shared_kernel_compiled_once(self):
+        report = warmup(types=["NAM", "ANN"], shapes=[(2, 3)])
+        assert [k for k, _, _ in report.compiled] == ["batch_simulate_nam"]
+
+    def test_warmed_shape_skips_compilation(self):
+        contracts = [(_make_pam(f"P{i}"), ConstantRiskFactorObserver(0.0)) for i in range(3)]
+        shape = prepare_pam_batch(contracts)[1].shape
+        warmup(types=["PAM"], shapes=[shape])
+
+        start = time.perf_counter()
+        result = simulate_pam_portfolio(contracts)
+        result["total_cashflows"].block_until_ready()
+        assert result["payoffs"].shape == shape
+        assert time.perf_counter() - start < 2.0
+
+    def test_inputs_follow_precision_policy(self):
+        """Under the f64 policy the kernels are compiled for float64 inputs."""
+        script = textwrap.dedent(
+            """
+            import jax
+
+            jax.config.update("jax_enable_x64", True)
+
+            import numpy as np
+            from jactus.contracts import pam_array
+            from jactus.engine import precision_scope, warmup
+
+            seen = []
+            kernel = pam_array.batch_simulate_pam
+
+            class Spy:
+                def lower(self, *args):
+                    seen.extend(jax.tree_util.tree_leaves(args))
+                    return kernel.lower(*args)
+
+            pam_array.batch_simulate_pam = Spy()
+            with precision_scope("f64"):
+                warmup(types=["PAM"], shapes=[(2, 3)])
+            floats = {x.dtype for x in seen if x.dtype.kind == "f"}
+            assert floats == {np.dtype(np.float64)}, floats
+            print("ok")
+            """
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, timeout=600
+        )
+        assert proc.returncode == 0, proc.stderr
+        assert proc.stdout.strip().endswith("ok")
+
+    def test_default_covers_all_types(self):
+        assert ContractType.PAM in WARMUP_TYPES
+        assert ContractType.OPTNS in WARMUP_TYPES
+        assert ContractType.SWAPS not in WARMUP_TYPES
+
+    def test_unsupported_type_rejected(self):
+        with pytest.raises(ValueError, match="No batch kernel"):
+            warmup(types=["SWAPS"], shapes=[(1, 1)])
+
+    def test_non_positive_shape_rejected(self):
+        with pytest.raises(ValueError, match="positive"):
+            warmup(types=["PAM"], shapes=[(0, 4)])
+
+
+class TestParsing:
+    def test_parse_shapes(self):
+        assert parse_warmup_shapes("1024x128, 16X8,") == [(1024, 128), (16, 8)]
+
+    def test_parse_shapes_invalid(self):
+        with pytest.raises(ValueError, match="rows"):
+            parse_warmup_shapes("1024")
+
+    def test_parse_types(self):
+        assert parse_warmup_types("pam, LAM") == [ContractType.PAM, ContractType.LAM]
+        assert parse_warmup_types("all") is None
+        assert parse_warmup_types("") is None
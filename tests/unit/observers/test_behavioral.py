@@ -10,6 +10,7 @@ Tests for:
 """
 
 import jax.numpy as jnp
+import numpy as np
 import pytest
 
 from jactus.core import ActusDateTime, ContractAttributes, ContractState
@@ -317,6 +318,44 @@ class TestPrepaymentSurfaceObserver:
         observer = PrepaymentSurfaceObserver(surface=prepayment_surface)
         assert isinstance(observer, BehaviorRiskFactorObserver)
 
+    def test_observe_event_pp_amount(self, prepayment_surface, sample_state, sample_attributes):
+        """PP event data is the surface rate times the outstanding notional."""
+        from jactus.core.types import EventType
+
+        observer = PrepaymentSurfaceObserver(surface=prepayment_surface, fixed_market_rate=0.04)
+        time = ActusDateTime(2025, 1, 15)
+        rate = observer.observe_risk_factor(
+            "id", time, state=sample_state, attributes=sample_attributes
+        )
+        amount = observer.observe_event(
+            "id", EventType.PP, time, state=sample_state, attributes=sample_attributes
+        )
+        assert float(amount) == pytest.approx(float(rate) * 80_000.0)
+
+        with pytest.raises(KeyError):
+            observer.observe_event("id", EventType.PP, time)
+        with pytest.raises(KeyError):
+            observer.observe_event(
+                "id", EventType.IP, time, state=sample_state, attributes=sample_attributes
+            )
+
+    def test_market_rates_batch(self, prepayment_surface):
+        """market_rates answers many dates at once from any rate source."""
+        ordinals = np.array([[738000, 738100], [738200, 738300]])
+        fixed = PrepaymentSurfaceObserver(surface=prepayment_surface, fixed_market_rate=0.04)
+        np.testing.assert_allclose(fixed.market_rates(ordinals), np.full((2, 2), 0.04))
+
+        for market_obs in (
+            ConstantRiskFactorObserver(0.035),
+            DictRiskFactorObserver({"UST-5Y": 0.035}),
+        ):
+            observer = PrepaymentSurfaceObserver(
+                surface=prepayment_surface, market_rate_id="UST-5Y", market_observer=market_obs
+            )
+            rates = observer.market_rates(ordinals)
+            assert rates.shape == (2, 2)
+            np.testing.assert_allclose(rates, 0.035)
+
 
 # ============================================================================
 # DepositTransactionObserver tests
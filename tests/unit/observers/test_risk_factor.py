@@ -10,20 +10,26 @@ Tests for:
 - JAX compatibility
 """
 
+import datetime
+
 import jax
 import jax.numpy as jnp
+import numpy as np
 import pytest
 
 from jactus.core import ActusDateTime, ContractAttributes, ContractState
 from jactus.core.types import ContractRole, ContractType, EventType
 from jactus.observers import (
     BaseRiskFactorObserver,
+    BatchRiskFactorObserver,
     CallbackRiskFactorObserver,
     CompositeRiskFactorObserver,
     ConstantRiskFactorObserver,
     CurveRiskFactorObserver,
     DictRiskFactorObserver,
+    JaxCurveRiskFactorObserver,
     JaxRiskFactorObserver,
+    JaxTimeSeriesRiskFactorObserver,
     RiskFactorObserver,
     TimeSeriesRiskFactorObserver,
 )
@@ -1239,3 +1245,158 @@ class TestCompositeRiskFactorObserver:
         """CompositeRiskFactorObserver implements RiskFactorObserver protocol."""
         composite = CompositeRiskFactorObserver([ConstantRiskFactorObserver(0.0)])
         assert isinstance(composite, RiskFactorObserver)
+
+
+class TestObserveRiskFactorBatch:
+    """Test observe_risk_factor_batch against the scalar lookup."""
+
+    SERIES = {
+        "LIBOR-3M": [
+            (ActusDateTime(2024, 7, 1), 0.045),
+            (ActusDateTime(2024, 1, 1), 0.04),
+            (ActusDateTime(2025, 1, 1), 0.05),
+        ]
+    }
+    CURVE = {"USD": [(0.25, 0.03), (1.0, 0.04), (5.0, 0.05)]}
+
+    @staticmethod
+    def _dates():
+        start = datetime.date(2023, 10, 1)
+        return [start + datetime.timedelta(days=23 * k) for k in range(40)]
+
+    def _assert_matches_scalar(self, observer, identifier):
+        dates = self._dates()
+        ordinals = np.array([d.toordinal() for d in dates])
+        batch = observer.observe_risk_factor_batch(identifier, ordinals)
+        scalar = [
+            float(observer.observe_risk_factor(identifier, ActusDateTime(d.year, d.month, d.day)))
+            for d in dates
+        ]
+        assert batch.shape == ordinals.shape
+        np.testing.assert_allclose(batch, scalar, rtol=1e-6)
+
+    @pytest.mark.parametrize(
+        ("observer", "identifier"),
+        [
+            (ConstantRiskFactorObserver(0.03), "ANY"),
+            (DictRiskFactorObserver({"RATE": 0.02}), "RATE"),
+            (TimeSeriesRiskFactorObserver(SERIES), "LIBOR-3M"),
+            (TimeSeriesRiskFactorObserver(SERIES, interpolation="linear"), "LIBOR-3M"),
+            (CurveRiskFactorObserver(CURVE, reference_date=ActusDateTime(2024, 1, 1)), "USD"),
+            (
+                CurveRiskFactorObserver(
+                    CURVE, reference_date=ActusDateTime(2024, 1, 1), interpolation="log_linear"
+                ),
+                "USD",
+            ),
+        ],
+    )
+    def test_matches_scalar(self, observer, identifier):
+        assert isinstance(observer, BatchRiskFactorObserver)
+        self._assert_matches_scalar(observer, identifier)
+
+    def test_unknown_identifier_raises(self):
+        with pytest.raises(KeyError):
+            DictRiskFactorObserver({"RATE": 0.02}).observe_risk_factor_batch("FX", np.arange(3))
+        with pytest.raises(KeyError):
+            TimeSeriesRiskFactorObserver(self.SERIES).observe_risk_factor_batch("FX", np.arange(3))
+
+    def test_raise_extrapolation(self):
+        observer = TimeSeriesRiskFactorObserver(self.SERIES, extrapolation="raise")
+        inside = np.array([datetime.date(2024, 3, 1).toordinal()])
+        assert observer.observe_risk_factor_batch("LIBOR-3M", inside)[0] == pytest.approx(0.04)
+        with pytest.raises(KeyError, match="before first"):
+            observer.observe_risk_factor_batch("LIBOR-3M", inside - 100)
+
+    def test_callback_is_scalar_only(self):
+        observer = CallbackRiskFactorObserver(callback=lambda i, t: 0.01)
+        assert not isinstance(observer, BatchRiskFactorObserver)
+
+
+class TestJaxTimeSeriesRiskFactorObserver:
+    """Test the JAX-native time series lookup against the NumPy one."""
+
+    SERIES = TestObserveRiskFactorBatch.SERIES
+
+    @pytest.mark.parametrize("interpolation", ["step", "linear"])
+    def test_matches_numpy_lookup(self, interpolation):
+        observer = TimeSeriesRiskFactorObserver(self.SERIES, interpolation=interpolation)
+        ordinals = np.array([d.toordinal() for d in TestObserveRiskFactorBatch._dates()])
+        jax_obs = observer.to_jax("LIBOR-3M")
+        result = jax.jit(jax_obs.get_batch)(jnp.asarray(ordinals))
+        np.testing.assert_allclose(
+            result, observer.observe_risk_factor_batch("LIBOR-3M", ordinals), rtol=1e-6
+        )
+
+    def test_pytree_argument_and_vmap(self):
+        jax_obs = TimeSeriesRiskFactorObserver(self.SERIES).to_jax("LIBOR-3M")
+        ordinals = jnp.array([[738886, 739068], [739252, 739300]])
+        result = jax.jit(lambda obs, o: jax.vmap(obs.get_batch)(o))(jax_obs, ordinals)
+        np.testing.assert_allclose(result, [[0.04, 0.045], [0.05, 0.05]], rtol=1e-6)
+
+    def test_grad_with_respect_to_values(self):
+        jax_obs = TimeSeriesRiskFactorObserver(self.SERIES, interpolation="linear").to_jax(
+            "LIBOR-3M"
+        )
+
+        def rate(values):
+            obs = JaxTimeSeriesRiskFactorObserver(
+                jax_obs.offsets, values, interpolation="linear", origin=jax_obs.origin
+            )
+            return obs.get(datetime.date(2024, 4, 1).toordinal())
+
+        grads = jax.grad(rate)(jax_obs.values)
+        assert float(jnp.sum(grads)) == pytest.approx(1.0)
+        assert float(grads[2]) == 0.0
+
+    def test_to_jax_unknown_identifier(self):
+        with pytest.raises(KeyError):
+            TimeSeriesRiskFactorObserver(self.SERIES).to_jax("FX")
+
+
+class TestJaxCurveRiskFactorObserver:
+    """Test the JAX-native curve against the NumPy one."""
+
+    CURVE = TestObserveRiskFactorBatch.CURVE
+    REF = ActusDateTime(2024, 1, 1)
+
+    @pytest.mark.parametrize("interpolation", ["linear", "log_linear"])
+    def test_matches_numpy_lookup(self, interpolation):
+        observer = CurveRiskFactorObserver(
+            self.CURVE, reference_date=self.REF, interpolation=interpolation
+        )
+        ordinals = np.array([d.toordinal() for d in TestObserveRiskFactorBatch._dates()])
+        curve = observer.to_jax("USD")
+        result = jax.jit(lambda c, o: c.evaluate_at(o))(curve, jnp.asarray(ordinals))
+        np.testing.assert_allclose(
+            result, observer.observe_risk_factor_batch("USD", ordinals), rtol=1e-6
+        )
+        np.testing.assert_array_equal(curve.get_batch(jnp.asarray(ordinals)), result)
+
+    def test_evaluate_vmap(self):
+        curve = CurveRiskFactorObserver(self.CURVE).to_jax("USD")
+        assert isinstance(curve, JaxCurveRiskFactorObserver)
+        tenors = jnp.array([[0.1, 0.25, 0.625], [1.0, 3.0, 10.0]])
+        result = jax.vmap(curve.evaluate)(tenors)
+        np.testing.assert_allclose(result, [[0.03, 0.03, 0.035], [0.04, 0.045, 0.05]], rtol=1e-6)
+
+    @pytest.mark.parametrize("interpolation", ["linear", "log_linear"])
+    def test_grad_with_respect_to_rates(self, interpolation):
+        curve = CurveRiskFactorObserver(self.CURVE, interpolation=interpolation).to_jax("USD")
+        grads = jax.grad(lambda c: c.evaluate(3.0))(curve).rates
+        assert float(grads[0]) == 0.0
+        assert float(grads[1]) > 0.0 and float(grads[2]) > 0.0
+        if interpolation == "linear":
+            np.testing.assert_allclose(grads, [0.0, 0.5, 0.5], rtol=1e-6)
+
+    def test_evaluate_at_requires_reference(self):
+        curve = CurveRiskFactorObserver(self.CURVE).to_jax("USD")
+        assert curve.reference_ordinal is None
+        with pytest.raises(ValueError, match="reference"):
+            curve.evaluate_at(jnp.array([739000]))
+        result = curve.evaluate_at(jnp.array([[739000]]), jnp.array([[739000]]))
+        assert float(result[0, 0]) == pytest.approx(0.03)
+
+    def test_to_jax_unknown_identifier(self):
+        with pytest.raises(KeyError):
+            CurveRiskFactorObserver(self.CURVE).to_jax("EUR")
@@ -0,0 +1,242 @@
+"""Unit tests for AD-based rate sensitivities."""
+
+import jax.numpy as jnp
+import numpy as np
+import pytest
+
+from jactus.contracts import create_contract
+from jactus.contracts.discounting import ZeroCurve, curve_discount_factors, discount_cashflows
+from jactus.contracts.pam_array import simulate_pam_portfolio
+from jactus.core import ActusDateTime, ContractAttributes, ContractRole, ContractType
+from jactus.observers import ConstantRiskFactorObserver, CurveRiskFactorObserver
+from jactus.risk import (
+    IRRBB_BUCKETS,
+    KEY_RATE_TYPES,
+    RISK_TYPES,
+    is_differentiable,
+    key_rate_durations,
+    rate_sensitivities,
+)
+
+
+def _make(contract_type: ContractType, rate: float, **overrides) -> ContractAttributes:
+    fields = {
+        "contract_id": f"{contract_type.value}-{rate}",
+        "contract_type": contract_type,
+        "contract_role": ContractRole.RPA,
+        "status_date": ActusDateTime(2024, 1, 1),
+        "initial_exchange_date": ActusDateTime(2024, 1, 15),
+        "maturity_date": ActusDateTime(2029, 1, 15),
+        "currency": "USD",
+        "notional_principal": 100_000.0,
+        "nominal_interest_rate": rate,
+        "interest_payment_cycle": "6M",
+    }
+    if contract_type != ContractType.PAM:
+        fields["principal_redemption_cycle"] = "6M"
+        fields["next_principal_redemption_amount"] = 8_000.0
+    fields.update(overrides)
+    return ContractAttributes(**fields)
+
+
+def _bumped_pv(attrs: ContractAttributes, bump: float) -> float:
+    rate = attrs.nominal_interest_rate + bump
+    shifted = attrs.model_copy(update={"nominal_interest_rate": rate})
+    return float(rate_sensitivities([shifted]).present_values[0])
+
+
+class TestRateSensitivities:
+    def test_dv01_matches_bump_and_reprice(self):
+        contracts = [
+            _make(ContractType.PAM, 0.05),
+            _make(ContractType.LAM, 0.04, initial_exchange_date=ActusDateTime(2023, 1, 15)),
+            _make(ContractType.NAM, 0.06),
+        ]
+        risk = rate_sensitivities(contracts)
+        for i, attrs in enumerate(contracts):
+            fd = (_bumped_pv(attrs, 5e-4) - _bumped_pv(attrs, -5e-4)) / 10.0
+            assert risk.dv01[i] == pytest.approx(fd, rel=0.02)
+
+    def test_durations_and_rows_in_input_order(self):
+        contracts = [
+            _make(ContractType.LAM, 0.03),
+            _make(ContractType.PAM, 0.05),
+            _make(ContractType.PAM, 0.02),
+        ]
+        risk = rate_sensitivities(contracts)
+        alone = rate_sensitivities([contracts[2]])
+        assert risk.present_values[2] == pytest.approx(alone.present_values[0], rel=1e-5)
+        np.testing.assert_allclose(
+            risk.modified_duration, -risk.dv01 / 1e-4 / risk.present_values, rtol=1e-6
+        )
+        np.testing.assert_allclose(
+            risk.macaulay_duration, risk.modified_duration * np.array([1.03, 1.05, 1.02])
+        )
+        assert np.all(np.isfinite(risk.convexity))
+
+    def test_unsupported_type_rejected(self):
+        assert ContractType.ANN not in RISK_TYPES
+        with pytest.raises(ValueError, match="No differentiable kernel"):
+            rate_sensitivities([_make(ContractType.ANN, 0.05)])
+
+    def test_nam_without_next_redemption_stays_on_scalar_path(self):
+        from jactus.cli import risk as cli_risk
+
+        raw = {
+            "contract_type": "NAM",
+            "contract_id": "NAM-NO-PRNXT",
+            "contract_role": "RPA",
+            "status_date": "2024-01-01",
+            "initial_exchange_date": "2024-01-15",
+            "maturity_date": "2025-01-15",
+            "notional_principal": 100_000.0,
+            "nominal_interest_rate": 0.05,
+            "interest_payment_cycle": "3M",
+            "principal_redemption_cycle": "3M",
+            "currency": "USD",
+        }
+        attrs = cli_risk._contract_attributes(raw)
+        assert not is_differentiable(attrs)
+        with pytest.raises(ValueError, match="next_principal_redemption_amount"):
+            rate_sensitivities([attrs])
+
+        # The CLI routes it to finite differences, so it matches the scalar NPV
+        assert not cli_risk._is_differentiable(raw)
+        scalar_npv = cli_risk._simulate_npv(raw)[0]
+        assert cli_risk._fd_metrics(raw, {"dv01"})["npv"] == pytest.approx(scalar_npv)
+
+        # With the amount set, the AD path agrees with the scalar engine
+        raw["next_principal_redemption_amount"] = 20_000.0
+        assert cli_risk._is_differentiable(raw)
+        ad = cli_risk._ad_metrics([raw])[0]
+        fd = cli_risk._fd_metrics(raw, {"dv01"})
+        assert ad["npv"] == pytest.approx(fd["npv"], rel=1e-4)
+        assert ad["dv01"] == pytest.approx(fd["dv01"], rel=0.03)
+
+    @pytest.mark.parametrize("accrued_interest", [None, 1_200.0])
+    def test_live_contracts_match_scalar_bumps(self, accrued_interest):
+        from jactus.cli import risk as cli_risk
+
+        raws = []
+        for contract_type in ("PAM", "LAM", "NAM"):
+            raw = {
+                "contract_type": contract_type,
+                "contract_id": f"{contract_type}-LIVE",
+                "contract_role": "RPA",
+                "status_date": "2025-03-01",
+                "initial_exchange_date": "2023-01-15",
+                "maturity_date": "2029-01-15",
+                "notional_principal": 100_000.0,
+                "nominal_interest_rate": 0.05,
+                "interest_payment_cycle": "6M",
+                "currency": "USD",
+            }
+            if contract_type != "PAM":
+                raw["principal_redemption_cycle"] = "6M"
+                raw["next_principal_redemption_amount"] = 8_000.0
+            if accrued_interest is not None:
+                # Fixed by the attribute: a rate bump leaves it alone
+                raw["accrued_interest"] = accrued_interest
+            raws.append(raw)
+
+        for raw, ad in zip(raws, cli_risk._ad_metrics(raws), strict=True):
+            fd = cli_risk._fd_metrics(raw, {"dv01", "duration"})
+            assert ad["npv"] == pytest.approx(fd["npv"], rel=1e-5)
+            assert ad["dv01"] == pytest.approx(fd["dv01"], rel=0.01)
+            assert ad["modified_duration"] == pytest.approx(fd["modified_duration"], rel=0.01)
+
+
+def _floating_pam() -> tuple[ContractAttributes, ConstantRiskFactorObserver]:
+    attrs = _make(
+        ContractType.PAM,
+        0.03,
+        rate_reset_cycle="6M",
+        rate_reset_anchor=ActusDateTime(2024, 7, 15),
+        rate_reset_market_object="SOFR",
+    )
+    return attrs, ConstantRiskFactorObserver(0.03)
+
+
+_BUCKETS = [0.5, 1.0, 2.0, 3.0, 5.0]
+_CURVE = ZeroCurve(jnp.array(_BUCKETS), jnp.array([0.03, 0.032, 0.035, 0.037, 0.04]))
+
+
+class TestKeyRateDurations:
+    def test_matches_node_bump_and_reprice(self):
+        contracts = [_make(ContractType.PAM, 0.04), _floating_pam()]
+        krd = key_rate_durations(contracts, _CURVE, _BUCKETS)
+        assert krd.dv01.shape == (2, len(_BUCKETS))
+
+        # With the curve nodes on the buckets, a key-rate tent is a node bump
+        h = 1e-3
+        for k in (1, 3):
+            bump = np.zeros(len(_BUCKETS))
+            bump[k] = h
+            up = key_rate_durations(contracts, _CURVE._replace(rates=_CURVE.rates + bump), _BUCKETS)
+            down = key_rate_durations(
+                contracts, _CURVE._replace(rates=_CURVE.rates - bump), _BUCKETS
+            )
+            fd = (up.present_values - down.present_values) / (2 * h) * 1e-4
+            np.testing.assert_allclose(krd.dv01[:, k], fd, rtol=1e-2, atol=1e-3)
+
+        # The floating leg re-fixes off the curve, so it moves less than the fixed one
+        assert abs(krd.dv01[1].sum()) < abs(krd.dv01[0].sum())
+
+    def test_buckets_sum_to_scalar_parallel_bump(self):
+        def curve_observer(shift):
+            points = list(zip(_BUCKETS, (float(r) + shift for r in _CURVE.rates), strict=True))
+            return CurveRiskFactorObserver(
+                {"SOFR": points}, reference_date=ActusDateTime(2024, 1, 1)
+            )
+
+        def scalar_pv(attrs, shift):
+            # Floating coupons re-fix off the shifted curve, then discount off it
+            result = create_contract(attrs, curve_observer(shift)).simulate()
+            times = jnp.array(
+                [
+                    max(attrs.status_date.days_between(e.event_time), 0) / 365.25
+                    for e in result.events
+                ]
+            )
+            curve = _CURVE._replace(rates=_CURVE.rates + shift)
+            factors = curve_discount_factors(curve, times, "continuous")
+            payoffs = jnp.array([float(e.payoff) for e in result.events])
+            return float(jnp.sum(payoffs * factors))
+
+        live = _make(
+            ContractType.PAM,
+            0.04,
+            status_date=ActusDateTime(2025, 3, 1),
+            initial_exchange_date=ActusDateTime(2023, 1, 15),
+            accrued_interest=1_200.0,
+        )
+        floating, _ = _floating_pam()
+        contracts = [(live, curve_observer(0.0)), (floating, curve_observer(0.0))]
+        krd = key_rate_durations(contracts, _CURVE, _BUCKETS)
+
+        h = 1e-3
+        for i, (attrs, _) in enumerate(contracts):
+            fd = (scalar_pv(attrs, h) - scalar_pv(attrs, -h)) / (2 * h) * 1e-4
+            assert krd.present_values[i] == pytest.approx(scalar_pv(attrs, 0.0), rel=1e-4)
+            assert krd.dv01[i].sum() == pytest.approx(fd, rel=1e-2)
+
+    def test_present_values_match_discount_cashflows(self):
+        contracts = [
+            (_make(ContractType.PAM, r), ConstantRiskFactorObserver(0.0)) for r in (0.02, 0.05)
+        ]
+        expected = discount_cashflows(
+            simulate_pam_portfolio(contracts), _CURVE, contracts=contracts
+        )
+        krd = key_rate_durations(contracts, _CURVE, IRRBB_BUCKETS)
+        assert krd.dv01.shape == (2, 19)
+        np.testing.assert_allclose(krd.present_values, expected["present_values"], rtol=1e-4)
+        np.testing.assert_allclose(
+            krd.durations, -krd.dv01 / 1e-4 / krd.present_values[:, None], rtol=1e-5
+        )
+
+    def test_invalid_inputs_rejected(self):
+        assert ContractType.SWPPV in KEY_RATE_TYPES
+        with pytest.raises(ValueError, match="strictly increasing"):
+            key_rate_durations([_make(ContractType.PAM, 0.05)], _CURVE, [1.0, 1.0])
+        with pytest.raises(ValueError, match="No differentiable kernel"):
+            key_rate_durations([_make(ContractType.ANN, 0.05)], _CURVE, _BUCKETS)
@@ -5,7 +5,9 @@ Tests for:
 - LabeledSurface2D (string-labeled margins)
 """
 
+import jax
 import jax.numpy as jnp
+import numpy as np
 import pytest
 
 from jactus.utilities.surface import LabeledSurface2D, Surface2D
@@ -284,3 +286,94 @@ class TestLabeledSurface2D:
         assert restored.x_labels == labeled_surface.x_labels
         assert restored.y_labels == labeled_surface.y_labels
         assert float(restored.get("DEPOSIT-001", "2024-Q1")) == pytest.approx(1000.0)
+
+
+# ============================================================================
+# Vectorised lookups
+# ============================================================================
+
+
+def _prepayment_surface(extrapolation: str = "constant") -> Surface2D:
+    return Surface2D(
+        x_margins=jnp.array([-1.0, 0.0, 1.0, 2.0]),
+        y_margins=jnp.array([0.0, 1.0, 3.0, 5.0]),
+        values=jnp.array(
+            [
+                [0.00, 0.00, 0.00, 0.00],
+                [0.00, 0.01, 0.02, 0.00],
+                [0.00, 0.02, 0.05, 0.01],
+                [0.01, 0.05, 0.10, 0.02],
+            ]
+        ),
+        extrapolation=extrapolation,
+    )
+
+
+class TestSurface2DEvaluateBatch:
+    """Test Surface2D.evaluate_batch against the scalar lookup."""
+
+    def test_matches_scalar(self):
+        surface = _prepayment_surface()
+        rng = np.random.default_rng(0)
+        xs = rng.uniform(-2.0, 3.0, size=50)
+        ys = rng.uniform(-1.0, 6.0, size=50)
+        batch = surface.evaluate_batch(jnp.asarray(xs), jnp.asarray(ys))
+        scalar = [float(surface.evaluate(x, y)) for x, y in zip(xs, ys, strict=True)]
+        assert batch.shape == (50,)
+        np.testing.assert_allclose(batch, scalar, atol=1e-7)
+
+    def test_broadcasting_and_jit(self):
+        surface = _prepayment_surface()
+        xs = jnp.array([[0.5], [1.5]])
+        ys = jnp.array([0.0, 2.0, 5.0])
+        result = jax.jit(lambda s, x, y: s.evaluate_batch(x, y))(surface, xs, ys)
+        assert result.shape == (2, 3)
+        assert float(result[1, 1]) == pytest.approx(float(surface.evaluate(1.5, 2.0)))
+
+    def test_grad_with_respect_to_values(self):
+        surface = _prepayment_surface()
+
+        def total(values):
+            return jnp.sum(
+                Surface2D(surface.x_margins, surface.y_margins, values).evaluate_batch(
+                    jnp.array([0.5, 5.0]), jnp.array([2.0, 9.0])
+                )
+            )
+
+        grads = jax.grad(total)(surface.values)
+        # (0.5, 2.0) spreads weight over one cell; (5.0, 9.0) clamps to a corner
+        assert float(jnp.sum(grads)) == pytest.approx(2.0)
+        assert float(grads[3, 3]) == pytest.approx(1.0)
+        assert float(grads[1, 1]) == pytest.approx(0.25)
+
+    def test_raise_extrapolation(self):
+        surface = _prepayment_surface("raise")
+        with pytest.raises(ValueError, match="outside"):
+            surface.evaluate_batch(jnp.array([0.0, 4.0]), jnp.array([1.0, 1.0]))
+        # Traced inputs cannot be checked and are clamped
+        clamped = jax.jit(surface.evaluate_batch)(jnp.array([4.0]), jnp.array([1.0]))
+        assert float(clamped[0]) == pytest.approx(0.05)
+
+
+class TestLabeledSurface2DBatch:
+    """Test LabeledSurface2D indexed lookups."""
+
+    def test_get_batch_matches_get(self):
+        surface = LabeledSurface2D(
+            x_labels=["A", "B"],
+            y_labels=["Q1", "Q2", "Q3"],
+            values=jnp.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]),
+        )
+        xi, yi = surface.indices(["B", "A", "B"], ["Q3", "Q1", "Q2"])
+        result = jax.jit(surface.get_batch)(xi, yi)
+        np.testing.assert_allclose(result, [6.0, 1.0, 5.0])
+
+        grads = jax.grad(
+            lambda v: jnp.sum(LabeledSurface2D(["A", "B"], ["Q1", "Q2", "Q3"], v).get_batch(xi, yi))
+        )(surface.values)
+        np.testing.assert_allclose(grads, [[1.0, 0.0, 0.0], [0.0, 1.0, 1.0]])
+
+    def test_indices_unknown_label(self):
+        surface = LabeledSurface2D(["A"], ["Q1"], jnp.array([[1.0]]))
+        with pytest.raises(KeyError, match="not found"):
+            surface.indices(["A", "Z"], ["Q1", "Q1"])
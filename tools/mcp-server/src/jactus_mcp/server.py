@@ -8,6 +8,7 @@ validation, and discovery without hallucination.
 import functools
 import json
 import logging
+import os
 import time
 from typing import Any
 
@@ -432,25 +433,42 @@ def jactus_get_version_info() -> dict[str, Any]:
 @mcp.tool()
 @log_tool_call
 def jactus_compute_risk(
-    attributes: dict[str, Any],
-    risk_metric: str = "dv01",
+    contracts: list[dict[str, Any]] | None = None,
+    metrics: list[str] | None = None,
     base_rate: float = 0.05,
     bump_size: float = 0.0001,
+    attributes: dict[str, Any] | None = None,
+    risk_metric: str | None = None,
 ) -> dict[str, Any]:
-    """Compute risk metrics (DV01, delta, gamma, PV01) for a contract.
+    """Compute risk metrics (DV01, delta, gamma, PV01) for a list of contracts.
+
+    Sensitivities of total cashflow to the nominal interest rate. PAM, LAM
+    and NAM contracts get every requested metric from one automatic-
+    differentiation pass through the batch kernels; other types use
+    finite differences. Returns the base PV and metric values per contract.
 
-    Uses finite difference approximation on the nominal interest rate.
-    Returns the metric value, base PV, and computation parameters.
+    The single-contract form (``attributes`` and ``risk_metric``) is still
+    accepted; its reply also carries the top-level ``metric``, ``value``
+    and ``base_pv`` of that contract.
 
     Args:
-        attributes: Contract attributes dict (same format as simulate).
-        risk_metric: One of "dv01", "delta", "gamma", "pv01".
+        contracts: Array of contract attribute dicts (same format as simulate).
+        metrics: Any of "dv01", "delta", "gamma", "pv01" (default ["dv01"]).
         base_rate: Base nominal interest rate (default 0.05).
         bump_size: Finite difference bump size (default 0.0001 = 1bp).
+        attributes: One contract attribute dict, instead of ``contracts``.
+        risk_metric: One metric name, instead of ``metrics``.
     """
+    if contracts is None and attributes is None:
+        return {
+            "success": False,
+            "error": "No contracts given",
+            "error_code": "empty_portfolio",
+            "suggestion": "Provide the contracts array (or a single attributes dict).",
+        }
     return risk.compute_risk(
-        attributes=attributes,
-        risk_metric=risk_metric,
+        contracts=contracts if contracts is not None else attributes or {},
+        metrics=metrics or risk_metric or "dv01",
         base_rate=base_rate,
         bump_size=bump_size,
     )
@@ -532,8 +550,8 @@ def create_contract(contract_type: str = "PAM") -> str:
     schema = contracts.get_contract_schema(contract_type)
     return f"""I want to create a {contract_type} contract in JACTUS.
 
-Required fields: {list(schema.get('required_fields', {}).keys())}
-Optional fields: {list(schema.get('optional_fields', {}).keys())}
+Required fields: {list(schema.get("required_fields", {}).keys())}
+Optional fields: {list(schema.get("optional_fields", {}).keys())}
 
 Please help me create a complete, working example with proper validation."""
 
@@ -582,8 +600,43 @@ What are the key differences? When should I use each one?"""
 # ---- Entry point ----
 
 
+def warmup_kernels() -> None:
+    """Pre-compile array-mode kernels at startup when requested.
+
+    Runs when ``ACTUS_JAX_WARMUP_TYPES`` or ``ACTUS_JAX_WARMUP_SHAPES`` is set
+    (e.g. ``ACTUS_JAX_WARMUP_TYPES=PAM,LAM`` and
+    ``ACTUS_JAX_WARMUP_SHAPES=1024x128``), so compile cost is paid at boot
+    instead of on the first tool call.
+    """
+    from jactus.engine.warmup import (
+        DEFAULT_WARMUP_SHAPES,
+        ENV_WARMUP_SHAPES,
+        ENV_WARMUP_TYPES,
+        parse_warmup_shapes,
+        parse_warmup_types,
+        warmup,
+    )
+
+    types_spec = os.environ.get(ENV_WARMUP_TYPES)
+    shapes_spec = os.environ.get(ENV_WARMUP_SHAPES)
+    if types_spec is None and shapes_spec is None:
+        return
+    try:
+        report = warmup(
+            parse_warmup_types(types_spec or "all"),
+            parse_warmup_shapes(shapes_spec) if shapes_spec else DEFAULT_WARMUP_SHAPES,
+        )
+    except ValueError as e:
+        logger.error(f"Kernel warmup skipped: {e}")
+        return
+    logger.info(
+        f"Kernel warmup compiled {len(report.compiled)} kernels in {report.total_seconds:.1f}s"
+    )
+
+
 def main():
     """Run the MCP server."""
+    warmup_kernels()
     mcp.run()
 
 
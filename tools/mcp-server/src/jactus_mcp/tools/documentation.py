@@ -445,14 +445,17 @@ kernels operating on batched `[B, T]` arrays instead of Python-level event loops
 
 ## Supported Types
 
-12 of 18 types have array-mode kernels:
+All 18 types have array-mode kernels:
 
 | Pattern | Types | Kernel |
 |---------|-------|--------|
-| **Stateful** | PAM, LAM, NAM, ANN, LAX, SWPPV | `jax.lax.scan` |
+| **Stateful** | PAM, LAM, NAM, ANN, LAX, SWPPV, CLM, UMP | `jax.lax.scan` |
 | **Simple** | CSH, STK, COM, FXOUT, FUTUR, OPTNS | Vectorized `jnp.where` |
+| **Derived** | CAPFL | Underlier PAM/LAM kernel |
+| **Composite** | SWAPS, CEG, CEC | Child batch kernels + on-device netting/settlement |
 
-Fallback types (scalar Python): CLM, UMP, SWAPS, CAPFL, CEG, CEC
+Composite types take their children via `simulate_portfolio(..., child_contracts=...)`;
+CEG/CEC also take observed `credit_events`.
 
 ## Quick Start: Portfolio API
 
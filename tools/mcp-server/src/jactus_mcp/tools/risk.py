@@ -37,100 +37,205 @@ def _total_cashflow_at_nominal_rate(
     return sum(float(e.payoff) for e in result.events)
 
 
-def compute_risk(
-    attributes: dict[str, Any],
-    risk_metric: str = "dv01",
-    base_rate: float = 0.05,
-    bump_size: float = 0.0001,
-) -> dict[str, Any]:
-    """Compute a risk metric for a contract using finite differences.
-
-    Supports DV01, delta, gamma, and PV01 risk metrics. Uses finite
-    difference approximation on the nominal_interest_rate.
-
-    Args:
-        attributes: Contract attributes dictionary.
-        risk_metric: One of "dv01", "delta", "gamma", "pv01".
-        base_rate: The base nominal interest rate (default 0.05).
-        bump_size: The bump size for finite difference (default 0.0001 = 1bp).
+_VALID_METRICS = ("delta", "dv01", "gamma", "pv01")
 
-    Returns:
-        Dictionary with metric name, value, base rate, and bump size.
-    """
-    valid_metrics = {"dv01", "delta", "gamma", "pv01"}
-    metric = risk_metric.lower()
-    if metric not in valid_metrics:
-        return {
-            "success": False,
-            "error": f"Invalid risk_metric '{risk_metric}'. Valid: {', '.join(sorted(valid_metrics))}",
-            "error_code": "invalid_metric",
-            "suggestion": "Use one of: dv01, delta, gamma, pv01",
-        }
 
+def _metric_values(delta: float, gamma: float, metrics: list[str]) -> dict[str, float]:
+    """Map ``dPV/dr`` and ``d2PV/dr2`` onto the requested metric names."""
+    values = {
+        "delta": delta,
+        # DV01 / PV01: change in PV for a 1bp parallel shift
+        "dv01": delta * 0.0001,
+        "pv01": delta * 0.0001,
+        "gamma": gamma,
+    }
+    return {m: values[m] for m in metrics}
+
+
+def _finite_difference_risk(
+    attrs_with_rate: dict[str, Any], base_rate: float, bump_size: float, need_gamma: bool
+) -> tuple[float, float, float]:
+    """``(base PV, delta, gamma)`` from bumped scalar simulations."""
+    pv_base = _total_cashflow_at_nominal_rate(attrs_with_rate, base_rate)
+    pv_up = _total_cashflow_at_nominal_rate(attrs_with_rate, base_rate + bump_size)
+    delta = (pv_up - pv_base) / bump_size
+    gamma = 0.0
+    if need_gamma:
+        pv_down = _total_cashflow_at_nominal_rate(attrs_with_rate, base_rate - bump_size)
+        gamma = (pv_up - 2 * pv_base + pv_down) / (bump_size**2)
+    return pv_base, delta, gamma
+
+
+def _finite_difference_entry(
+    entry: dict[str, Any],
+    attrs_with_rate: dict[str, Any],
+    base_rate: float,
+    bump_size: float,
+    metrics: list[str],
+) -> None:
+    """Fill one contract's result entry by finite differences, or its error."""
     try:
-        # Ensure nominal_interest_rate is set to base_rate
-        attrs_with_rate = dict(attributes)
-        attrs_with_rate["nominal_interest_rate"] = base_rate
-
-        # Compute base PV
-        pv_base = _total_cashflow_at_nominal_rate(attrs_with_rate, base_rate)
-
-        if metric in ("dv01", "delta", "pv01"):
-            # First-order finite difference: dPV/dr
-            pv_up = _total_cashflow_at_nominal_rate(attrs_with_rate, base_rate + bump_size)
-            value = (pv_up - pv_base) / bump_size
-
-            if metric == "dv01":
-                # DV01: change in PV per 1bp move (absolute)
-                value = value * 0.0001
-            elif metric == "pv01":
-                # PV01: change in PV for a 1bp parallel shift (same as DV01 here)
-                value = value * 0.0001
-
-        elif metric == "gamma":
-            # Second-order finite difference: d²PV/dr²
-            pv_up = _total_cashflow_at_nominal_rate(attrs_with_rate, base_rate + bump_size)
-            pv_down = _total_cashflow_at_nominal_rate(attrs_with_rate, base_rate - bump_size)
-            value = (pv_up - 2 * pv_base + pv_down) / (bump_size ** 2)
+        pv_base, delta, gamma = _finite_difference_risk(
+            attrs_with_rate, base_rate, bump_size, "gamma" in metrics
+        )
+    except Exception as e:
+        entry.update(_contract_error(e))
+        return
+    entry["method"] = "finite_difference"
+    entry["base_pv"] = pv_base
+    entry["values"] = _metric_values(delta, gamma, metrics)
 
-        return {
-            "success": True,
-            "metric": metric,
-            "value": value,
-            "base_rate": base_rate,
-            "bump_size": bump_size,
-            "base_pv": pv_base,
-            "contract_type": attributes.get("contract_type", "unknown"),
-            "contract_id": attributes.get("contract_id", "unknown"),
-        }
 
-    except KeyError as e:
+def _contract_error(e: Exception) -> dict[str, Any]:
+    """Structured error entry for one contract."""
+    if isinstance(e, KeyError):
         return {
-            "success": False,
             "error": f"Invalid attribute value: {e!s}",
             "error_code": "invalid_attribute",
             "suggestion": "Use jactus_get_contract_schema to see valid enum values.",
         }
-    except ValidationError as e:
+    if isinstance(e, ValidationError):
         errors = []
         for error in e.errors():
             field = " -> ".join(str(loc) for loc in error["loc"])
             errors.append(f"{field}: {error['msg']}")
         return {
-            "success": False,
             "error": f"Validation failed: {'; '.join(errors)}",
             "error_code": "validation_error",
             "suggestion": "Use jactus_validate_attributes to check attributes first.",
         }
-    except Exception as e:
-        logger.error(f"Risk computation error: {e}", exc_info=True)
+    logger.error(f"Risk computation error: {e}", exc_info=True)
+    return {
+        "error": str(e),
+        "error_code": "computation_error",
+        "suggestion": "Check attributes and try jactus_simulate_contract first.",
+    }
+
+
+def compute_risk(
+    contracts: list[dict[str, Any]] | dict[str, Any],
+    metrics: list[str] | str = "dv01",
+    base_rate: float = 0.05,
+    bump_size: float = 0.0001,
+) -> dict[str, Any]:
+    """Compute risk metrics for one or more contracts.
+
+    Supports DV01, delta, gamma, and PV01 on the total cashflow with
+    respect to the nominal_interest_rate, which is set to ``base_rate``
+    for every contract.  PAM, LAM and NAM contracts are differentiated
+    through the array-mode batch kernels, all of them and every metric
+    in one evaluation per type (a NAM only when it sets
+    next_principal_redemption_amount).  Other contracts, and every
+    contract of a batch that fails as a whole, fall back to finite
+    differences with ``bump_size``.
+
+    Args:
+        contracts: Contract attribute dictionaries (or a single one).
+        metrics: Metric names, any of "dv01", "delta", "gamma", "pv01"
+            (or a single name).
+        base_rate: The base nominal interest rate (default 0.05).
+        bump_size: The bump size for finite differences (default 0.0001 = 1bp).
+
+    Returns:
+        Dictionary with the metrics, base rate, bump size and, per
+        contract, its base PV and metric values (or an error).  Called
+        with a single contract and a single metric name, it also carries
+        that contract's ``metric``, ``value`` and ``base_pv`` (or its
+        error) at the top level, as the single-contract tool returned.
+    """
+    from jactus.risk import is_differentiable, rate_sensitivities
+
+    single = isinstance(contracts, dict) and isinstance(metrics, str)
+    if isinstance(contracts, dict):
+        contracts = [contracts]
+    if isinstance(metrics, str):
+        metrics = [metrics]
+    requested = list(dict.fromkeys(m.lower() for m in metrics))
+    invalid = [m for m in requested if m not in _VALID_METRICS]
+    if invalid or not requested:
         return {
             "success": False,
-            "error": str(e),
-            "error_code": "computation_error",
-            "suggestion": "Check attributes and try jactus_simulate_contract first.",
+            "error": f"Invalid metrics {invalid or metrics}. Valid: {', '.join(_VALID_METRICS)}",
+            "error_code": "invalid_metric",
+            "suggestion": "Use any of: dv01, delta, gamma, pv01",
+        }
+    if not contracts:
+        return {
+            "success": False,
+            "error": "Empty contracts list",
+            "error_code": "empty_portfolio",
+            "suggestion": "Provide at least one contract in the contracts array.",
         }
 
+    valid_fields = set(ContractAttributes.model_fields.keys())
+    rf = ConstantRiskFactorObserver(constant_value=0.0)
+    results: list[dict[str, Any]] = []
+    ad_rows: list[int] = []
+    ad_pairs: list[tuple[ContractAttributes, ConstantRiskFactorObserver]] = []
+    ad_raws: list[dict[str, Any]] = []
+
+    for i, raw_attrs in enumerate(contracts):
+        attrs_with_rate = dict(raw_attrs)
+        attrs_with_rate["nominal_interest_rate"] = base_rate
+        entry: dict[str, Any] = {
+            "contract_id": raw_attrs.get("contract_id", f"contract-{i}"),
+            "contract_type": raw_attrs.get("contract_type", "unknown"),
+        }
+        results.append(entry)
+        try:
+            prepared = prepare_attributes(attrs_with_rate)
+            prepared = {k: v for k, v in prepared.items() if k in valid_fields}
+            attrs = ContractAttributes(**prepared)
+        except Exception as e:
+            entry.update(_contract_error(e))
+            continue
+        if is_differentiable(attrs):
+            ad_rows.append(i)
+            ad_pairs.append((attrs, rf))
+            ad_raws.append(attrs_with_rate)
+        else:
+            _finite_difference_entry(entry, attrs_with_rate, base_rate, bump_size, requested)
+
+    if ad_pairs:
+        try:
+            risk = rate_sensitivities(ad_pairs, discounted=False)
+        except Exception as e:
+            # One bad row must not fail the rest: bump each contract instead
+            logger.warning(f"Batched autodiff failed, using finite differences: {e}")
+            for i, attrs_with_rate in zip(ad_rows, ad_raws, strict=True):
+                _finite_difference_entry(
+                    results[i], attrs_with_rate, base_rate, bump_size, requested
+                )
+        else:
+            for k, i in enumerate(ad_rows):
+                results[i]["method"] = "autodiff"
+                results[i]["base_pv"] = float(risk.present_values[k])
+                results[i]["values"] = _metric_values(
+                    float(risk.delta[k]), float(risk.gamma[k]), requested
+                )
+
+    failed = sum(1 for r in results if "error" in r)
+    response: dict[str, Any] = {
+        "success": failed == 0,
+        "metrics": requested,
+        "base_rate": base_rate,
+        "bump_size": bump_size,
+        "contracts": results,
+        "successful": len(results) - failed,
+        "failed": failed,
+    }
+    if single:
+        (entry,) = results
+        response["metric"] = requested[0]
+        response["contract_id"] = entry["contract_id"]
+        response["contract_type"] = entry["contract_type"]
+        if "error" in entry:
+            response.update({k: entry[k] for k in ("error", "error_code", "suggestion")})
+        else:
+            response["value"] = entry["values"][requested[0]]
+            response["base_pv"] = entry["base_pv"]
+    return response
+
 
 def simulate_portfolio(
     contracts: list[dict[str, Any]],
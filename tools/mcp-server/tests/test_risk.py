@@ -0,0 +1,143 @@
+"""Tests for risk analytics tools."""
+
+import json
+
+import pytest
+
+from jactus_mcp.tools import risk
+
+
+@pytest.fixture
+def pam_attributes():
+    """Two-year PAM with semiannual interest."""
+    return {
+        "contract_type": "PAM",
+        "contract_id": "RISK-PAM-001",
+        "contract_role": "RPA",
+        "status_date": "2024-01-01",
+        "initial_exchange_date": "2024-01-15",
+        "maturity_date": "2026-01-15",
+        "notional_principal": 100000.0,
+        "nominal_interest_rate": 0.05,
+        "interest_payment_cycle": "6M",
+        "day_count_convention": "30E360",
+    }
+
+
+def test_compute_risk_all_metrics_per_contract(pam_attributes):
+    """Every requested metric comes back for every contract."""
+    second = dict(pam_attributes, contract_id="RISK-PAM-002", notional_principal=50000.0)
+    result = risk.compute_risk([pam_attributes, second], ["dv01", "delta", "gamma", "pv01"])
+
+    assert result["success"] is True
+    assert [c["contract_id"] for c in result["contracts"]] == ["RISK-PAM-001", "RISK-PAM-002"]
+    first = result["contracts"][0]
+    assert first["method"] == "autodiff"
+    assert set(first["values"]) == {"dv01", "delta", "gamma", "pv01"}
+    # Total interest over 2 years is 2 * notional * rate
+    assert first["base_pv"] == pytest.approx(10000.0, rel=1e-4)
+    assert first["values"]["delta"] == pytest.approx(200000.0, rel=1e-3)
+    assert first["values"]["dv01"] == pytest.approx(20.0, rel=1e-3)
+    assert result["contracts"][1]["values"]["dv01"] == pytest.approx(10.0, rel=1e-3)
+    json.dumps(result)
+
+
+def test_compute_risk_autodiff_matches_finite_difference(pam_attributes):
+    """The AD path agrees with bumping the scalar engine."""
+    ad = risk.compute_risk(pam_attributes, "delta")["contracts"][0]["values"]["delta"]
+    _, fd, _ = risk._finite_difference_risk(pam_attributes, 0.05, 0.0001, need_gamma=False)
+    assert ad == pytest.approx(fd, rel=1e-3)
+
+
+@pytest.mark.parametrize("contract_type", ["PAM", "LAM", "NAM"])
+def test_compute_risk_live_contract_with_accrued_interest(pam_attributes, contract_type):
+    """Accrued interest given on a live contract stays fixed under the bump."""
+    live = dict(
+        pam_attributes,
+        contract_type=contract_type,
+        status_date="2025-03-01",
+        initial_exchange_date="2023-01-15",
+        maturity_date="2027-01-15",
+        accrued_interest=1200.0,
+    )
+    if contract_type != "PAM":
+        live.update(principal_redemption_cycle="6M", next_principal_redemption_amount=10000.0)
+    entry = risk.compute_risk(live, ["delta", "gamma"])["contracts"][0]
+    pv, delta, _ = risk._finite_difference_risk(live, 0.05, 0.0001, need_gamma=False)
+
+    assert entry["method"] == "autodiff"
+    assert entry["base_pv"] == pytest.approx(pv, rel=1e-4)
+    assert entry["values"]["delta"] == pytest.approx(delta, rel=1e-3)
+
+
+def test_compute_risk_single_contract_form(pam_attributes):
+    """A single contract and metric name also get the top-level value."""
+    result = risk.compute_risk(pam_attributes, "dv01")
+    assert result["success"] is True
+    assert result["metric"] == "dv01"
+    assert result["contract_id"] == "RISK-PAM-001"
+    assert result["value"] == result["contracts"][0]["values"]["dv01"]
+    assert result["base_pv"] == pytest.approx(10000.0, rel=1e-4)
+
+    bad = risk.compute_risk(dict(pam_attributes, contract_role="NOPE"), "dv01")
+    assert bad["success"] is False
+    assert bad["error_code"] == "validation_error"
+    assert "value" not in bad
+
+
+def test_compute_risk_fallback_and_errors_per_contract(pam_attributes):
+    """Unsupported types fall back; bad contracts fail on their own."""
+    csh = {
+        "contract_type": "CSH",
+        "contract_id": "RISK-CSH",
+        "contract_role": "RPA",
+        "status_date": "2024-01-01",
+        "notional_principal": 1000.0,
+        "currency": "USD",
+    }
+    bad = dict(pam_attributes, contract_id="BAD", contract_role="NOPE")
+    result = risk.compute_risk([pam_attributes, csh, bad], ["dv01"])
+
+    assert result["success"] is False
+    assert result["successful"] == 2
+    assert result["contracts"][1]["method"] == "finite_difference"
+    assert result["contracts"][2]["error_code"] == "validation_error"
+
+
+def test_compute_risk_invalid_metric(pam_attributes):
+    """Unknown metric names are rejected up front."""
+    result = risk.compute_risk([pam_attributes], ["dv01", "vega"])
+    assert result["success"] is False
+    assert result["error_code"] == "invalid_metric"
+
+
+def test_compute_risk_nam_without_next_redemption_uses_finite_difference(pam_attributes):
+    """A NAM the batch kernel would value differently stays on the scalar path."""
+    nam = dict(
+        pam_attributes,
+        contract_type="NAM",
+        contract_id="RISK-NAM",
+        principal_redemption_cycle="6M",
+    )
+    with_prnxt = dict(nam, contract_id="RISK-NAM-PRNXT", next_principal_redemption_amount=20000.0)
+    result = risk.compute_risk([nam, with_prnxt], ["delta"])
+
+    assert result["success"] is True
+    assert [c["method"] for c in result["contracts"]] == ["finite_difference", "autodiff"]
+    scalar = risk._total_cashflow_at_nominal_rate(nam, 0.05)
+    assert result["contracts"][0]["base_pv"] == pytest.approx(scalar)
+
+
+def test_compute_risk_batch_failure_falls_back_per_contract(pam_attributes, monkeypatch):
+    """If the batched AD call fails, each contract is bumped on its own."""
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("kernel failure")
+
+    monkeypatch.setattr("jactus.risk.rate_sensitivities", fail)
+    second = dict(pam_attributes, contract_id="RISK-PAM-002")
+    result = risk.compute_risk([pam_attributes, second], ["dv01"])
+
+    assert result["success"] is True
+    assert [c["method"] for c in result["contracts"]] == ["finite_difference"] * 2
+    assert result["contracts"][0]["values"]["dv01"] == pytest.approx(20.0, rel=1e-3)